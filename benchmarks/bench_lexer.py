@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Benchmark the comment/string lexer on typical and adversarial input.
+
+Times lexer.lex for each grammar on the generated sources from
+bench_language_extractors and on inputs built to defeat a backtracking
+regex: runs of escaped quotes after an unterminated string, unclosed
+block comments and raw strings, a minified one-line bundle, a large
+generated header. With --baseline the alternation regex the lexer
+replaced runs too (expect tens of seconds on the adversarial rows).
+
+Usage:
+    python3 benchmarks/bench_lexer.py
+    python3 benchmarks/bench_lexer.py --size 20000 --baseline
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_language_extractors import generate  # noqa: E402
+from streamrag.languages.lexer import (  # noqa: E402
+    C_GRAMMAR, CPP_GRAMMAR, DEFAULT_GRAMMAR, JAVA_GRAMMAR, RUST_GRAMMAR, Grammar, lex,
+)
+
+# The regexes lex() replaced, for --baseline
+_BASELINE = {
+    "default": r'''(?://[^\n]*|/\*[\s\S]*?\*/|\'\'\'[\s\S]*?\'\'\'|"""[\s\S]*?"""'''
+               r'''|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`)''',
+    "c": r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")''',
+    "cpp": r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"'''
+           r'''|R"([^(]*)\([\s\S]*?\)\1")''',
+    "java": r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"'''
+            r'''|"""[\s\S]*?""")''',
+    "rust": r'''(?://[^\n]*|/\*[\s\S]*?\*/|r#+"[\s\S]*?"#+\s|r"[^"]*"'''
+            r'''|b?'(?:[^'\\]|\\.)*'|b?"(?:[^"\\]|\\.)*")''',
+}
+
+_TYPICAL = [
+    ("ts", DEFAULT_GRAMMAR), ("js", DEFAULT_GRAMMAR), ("c", C_GRAMMAR),
+    ("cpp", CPP_GRAMMAR), ("java", JAVA_GRAMMAR), ("rs", RUST_GRAMMAR),
+]
+
+
+def _adversarial(n: int) -> List[Tuple[str, Grammar, str]]:
+    header = "".join(
+        f"#define REG_{i:05d} 0x{i:08x} /* register {i} */\n"
+        f"static const char *name_{i} = \"reg\\\\{i}\";\n"
+        for i in range(n // 2)
+    )
+    return [
+        ("escaped quotes", C_GRAMMAR, '"' + '\\"' * n),
+        ("unclosed comments", DEFAULT_GRAMMAR, "x = 1 /* note\n" * n),
+        ("unclosed raw strings", CPP_GRAMMAR, 'auto s = R"(\n' * n),
+        ("unclosed rust raw", RUST_GRAMMAR, 'let s = r#"x\n' * n),
+        ("unclosed triple", DEFAULT_GRAMMAR, "'''\n" * n),
+        ("minified bundle", DEFAULT_GRAMMAR, "var a='x',b=\"y\"/2,c=`z`;" * n),
+        ("generated header", C_GRAMMAR, header),
+    ]
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20000, help="Lines/units per input")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of runs per input")
+    parser.add_argument("--baseline", action="store_true", help="Also time the old regexes")
+    args = parser.parse_args()
+
+    baselines: Dict[str, re.Pattern] = {k: re.compile(v) for k, v in _BASELINE.items()}
+    inputs = [(f"generated .{ext}", g, generate(ext, args.size)) for ext, g in _TYPICAL]
+    inputs += _adversarial(args.size)
+
+    print(f"{'input':<22} {'grammar':<8} {'KB':>7} {'tokens':>8} {'lex ms':>9}"
+          + (f" {'regex ms':>10}" if args.baseline else ""))
+    for label, grammar, source in inputs:
+        tokens = len(lex(source, grammar).tokens)
+        best = _time(lambda: lex(source, grammar), args.repeat)
+        row = (f"{label:<22} {grammar.name:<8} {len(source) / 1024:>7.0f} {tokens:>8} "
+               f"{best * 1e3:>9.1f}")
+        if args.baseline:
+            pattern = baselines[grammar.name]
+            old = _time(lambda: pattern.sub(
+                lambda m: re.sub(r'[^\n]', ' ', m.group(0)), source), 1)
+            row += f" {old * 1e3:>10.1f}"
+        print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Per-file benchmark: fused single-pass vs multi-pass Python extractor.
+
+Extracts every .py file under a corpus directory (default: the Python
+standard library) with both extractors, checks the outputs are identical,
+and reports per-file timings and the overall speedup. With --edits, also
+times re-extraction after a one-line edit: full parse vs the incremental
+extractor, which re-parses only the touched top-level block.
+
+Usage:
+    python3 benchmarks/bench_python_extractor.py
+    python3 benchmarks/bench_python_extractor.py --corpus /path/to/project --repeat 5
+    python3 benchmarks/bench_python_extractor.py --edits
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import sysconfig
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamrag.extractor import ASTExtractor  # noqa: E402
+from streamrag.incremental_extractor import IncrementalExtractor  # noqa: E402
+from tests.multipass_extractor import MultiPassASTExtractor  # noqa: E402
+
+
+def _corpus_files(root: str, limit: int):
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ("__pycache__", "site-packages", "test", "tests"))
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                files.append(os.path.join(dirpath, name))
+                if len(files) >= limit:
+                    return files
+    return files
+
+
+def _best_of(fn, source: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(source)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _edit_in_middle(source: str):
+    """Append a statement to the body line nearest the middle of the file."""
+    lines = source.splitlines(keepends=True)
+    for offset in range(len(lines)):
+        for index in (len(lines) // 2 + offset, len(lines) // 2 - offset):
+            if 0 <= index < len(lines) and lines[index].startswith("    return "):
+                indent = lines[index][:len(lines[index]) - len(lines[index].lstrip())]
+                return "".join(lines[:index] + [f"{indent}_probe = 1\n"] + lines[index:])
+    return None
+
+
+def _bench_edits(paths, repeat: int) -> int:
+    rows = []
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        edited = _edit_in_middle(source)
+        if edited is None:
+            continue
+        expected = ASTExtractor().extract(edited)
+        if not expected:
+            continue
+        t_full = _best_of(ASTExtractor().extract, edited, repeat)
+        best = float("inf")
+        for _ in range(repeat):
+            inc = IncrementalExtractor()
+            inc.extract(source, path)
+            start = time.perf_counter()
+            got = inc.extract(edited, path)
+            best = min(best, time.perf_counter() - start)
+        if got != expected:
+            print(f"OUTPUT MISMATCH (incremental): {path}")
+            return 1
+        rows.append((source.count("\n"), t_full, best, inc.incremental))
+    if not rows:
+        return 0
+    total_full = sum(r[1] for r in rows)
+    total_inc = sum(r[2] for r in rows)
+    print(f"\nOne-line edit, {len(rows)} files ({sum(r[3] for r in rows)} went incremental):")
+    print(f"Total: full {total_full * 1e3:.1f} ms, incremental {total_inc * 1e3:.1f} ms, "
+          f"speedup {total_full / total_inc:.2f}x")
+    big = [r for r in rows if r[0] >= 2000]
+    if big:
+        print(f"Files >= 2000 lines ({len(big)}): full {sum(r[1] for r in big) * 1e3:.1f} ms, "
+              f"incremental {sum(r[2] for r in big) * 1e3:.1f} ms")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=sysconfig.get_paths()["stdlib"])
+    parser.add_argument("--limit", type=int, default=400, help="Max files")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of runs per file")
+    parser.add_argument("--top", type=int, default=10, help="Largest files to list")
+    parser.add_argument("--edits", action="store_true", help="Also time incremental re-extraction")
+    args = parser.parse_args()
+
+    rows = []
+    mismatches = []
+    paths = _corpus_files(args.corpus, args.limit)
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        fused, multi = ASTExtractor(), MultiPassASTExtractor()
+        if fused.extract(source) != multi.extract(source):
+            mismatches.append(path)
+            continue
+        t_multi = _best_of(multi.extract, source, args.repeat)
+        t_fused = _best_of(fused.extract, source, args.repeat)
+        rows.append((os.path.relpath(path, args.corpus), source.count("\n"), t_multi, t_fused))
+
+    if not rows:
+        print("No files extracted")
+        return 1
+
+    total_multi = sum(r[2] for r in rows)
+    total_fused = sum(r[3] for r in rows)
+    ratios = [r[2] / r[3] for r in rows if r[3] > 0]
+    print(f"Corpus: {args.corpus} ({len(rows)} files, {sum(r[1] for r in rows)} lines)")
+    print(f"{'file':<48} {'lines':>7} {'multi ms':>9} {'fused ms':>9} {'speedup':>8}")
+    for rel, lines, t_multi, t_fused in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{rel[-48:]:<48} {lines:>7} {t_multi * 1e3:>9.2f} {t_fused * 1e3:>9.2f} "
+              f"{t_multi / t_fused:>7.2f}x")
+    print(f"\nTotal: multi {total_multi * 1e3:.1f} ms, fused {total_fused * 1e3:.1f} ms, "
+          f"speedup {total_multi / total_fused:.2f}x")
+    print(f"Per-file speedup: median {statistics.median(ratios):.2f}x, "
+          f"min {min(ratios):.2f}x, max {max(ratios):.2f}x")
+    if mismatches:
+        print(f"\nOUTPUT MISMATCH in {len(mismatches)} files:")
+        for path in mismatches[:20]:
+            print(f"  {path}")
+        return 1
+    if args.edits:
+        return _bench_edits(paths, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
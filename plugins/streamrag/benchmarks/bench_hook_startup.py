@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Measure hook cold-start time: fresh interpreter, registry, first lookup.
+
+Every hook invocation is a new python3 process, so import cost is paid on
+each edit. Each row runs a fresh subprocess --runs times and reports the
+median wall time:
+
+- bare interpreter (python3 -c pass)
+- on_file_change.py for an unsupported file (exits after the registry check)
+- registry creation plus can_handle, no extractor needed
+- registry creation plus the first extractor of each language
+- registry creation with every language loaded (the old eager start-up)
+
+Usage:
+    python3 benchmarks/bench_hook_startup.py
+    python3 benchmarks/bench_hook_startup.py --runs 21
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOOK = os.path.join(ROOT, "hooks", "scripts", "on_file_change.py")
+
+_REGISTRY = "from streamrag.languages.registry import create_default_registry\n" \
+            "r = create_default_registry()\n"
+
+_LANGUAGES = [
+    ("python", "a.py"), ("typescript", "a.ts"), ("javascript", "a.js"),
+    ("rust", "a.rs"), ("cpp", "a.cpp"), ("c", "a.c"), ("java", "A.java"),
+]
+
+
+def _median_ms(argv: List[str], runs: int, stdin: Optional[str] = None) -> float:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, input=stdin, capture_output=True, text=True, env=env, cwd=ROOT)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=11, help="Subprocess runs per row")
+    args = parser.parse_args()
+
+    py = sys.executable
+    # Warm the bytecode cache so rows measure imports, not compilation
+    subprocess.run([py, "-c", _REGISTRY + "[r.get_extractor(p) for _, p in %r]" % _LANGUAGES],
+                   env=dict(os.environ, PYTHONPATH=ROOT), cwd=ROOT, check=True)
+
+    edit = json.dumps({"tool_name": "Edit", "tool_input": {"file_path": "README.md"}})
+    rows: List[Tuple[str, float]] = [
+        ("python3 -c pass", _median_ms([py, "-c", "pass"], args.runs)),
+        ("hook, unsupported file", _median_ms([py, HOOK], args.runs, stdin=edit)),
+        ("registry + can_handle", _median_ms(
+            [py, "-c", _REGISTRY + "r.can_handle('a.rs')"], args.runs)),
+    ]
+    for language, path in _LANGUAGES:
+        rows.append((f"registry + {language}", _median_ms(
+            [py, "-c", _REGISTRY + f"r.get_extractor({path!r})"], args.runs)))
+    rows.append(("registry, all loaded", _median_ms(
+        [py, "-c", _REGISTRY + "[r.get_extractor(p) for _, p in %r]" % _LANGUAGES],
+        args.runs)))
+
+    base = rows[0][1]
+    print(f"{'case':<26} {'median ms':>10} {'over bare':>10}")
+    for label, ms in rows:
+        print(f"{label:<26} {ms:>10.1f} {ms - base:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Benchmark ShadowAST on half-typed code: error-guided isolation vs binary search.
+
+For each .py file of a corpus (default: the Python standard library),
+types a new statement into the function body nearest the middle of the
+file, one keystroke at a time. Most intermediate sources do not parse
+(the call is left open). Every keystroke is parsed with:
+
+- baseline: the recursive binary search ShadowAST used before, fresh per
+  keystroke (as the bridge's shadow fallback called it)
+- cold: the current ShadowAST, fresh per keystroke
+- warm: one current ShadowAST across all keystrokes, so valid blocks
+  are re-used between them
+
+and reports per-keystroke time, ast.parse calls (including the ones
+inside extraction) and the functions/classes found in VALID regions.
+"same" is the share of keystrokes where warm and cold agree exactly.
+
+Usage:
+    python3 benchmarks/bench_shadow_ast.py
+    python3 benchmarks/bench_shadow_ast.py --corpus /path/to/project --files 40
+"""
+
+import argparse
+import ast
+import os
+import statistics
+import sys
+import sysconfig
+import time
+from typing import Callable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from streamrag.extractor import ASTExtractor  # noqa: E402
+from streamrag.v2.shadow_ast import ParseRegion, ParseStatus, ShadowAST  # noqa: E402
+
+STATEMENT = "value = compute(first, second.attr, [item for item in items])"
+
+
+class BaselineShadowAST(ShadowAST):
+    """The previous strategy: re-parse halves recursively, extract every valid chunk."""
+
+    def parse(self, source: str) -> List[ParseRegion]:
+        if not source.strip():
+            return []
+        lines = source.splitlines(keepends=True)
+        try:
+            ast.parse(source)
+            entities = ASTExtractor().extract(source)
+            return [ParseRegion(1, len(lines), ParseStatus.VALID, entities, 1.0, source)]
+        except SyntaxError:
+            pass
+        return self._binary_search_regions(lines, 1, len(lines))
+
+    def _binary_search_regions(self, lines: List[str], start: int, end: int) -> List[ParseRegion]:
+        if start > end:
+            return []
+        chunk = "".join(lines[start - 1:end])
+        try:
+            ast.parse(chunk)
+            entities = ASTExtractor().extract(chunk)
+            for e in entities:
+                e.line_start += start - 1
+                e.line_end += start - 1
+            return [ParseRegion(start, end, ParseStatus.VALID, entities, 1.0, chunk)]
+        except SyntaxError:
+            pass
+        if start == end:
+            entities = self._regex_extract(chunk, start)
+            return [ParseRegion(start, end, ParseStatus.INVALID, entities,
+                                0.5 if entities else 0.0, chunk)]
+        mid = (start + end) // 2
+        return (self._binary_search_regions(lines, start, mid)
+                + self._binary_search_regions(lines, mid + 1, end))
+
+
+def _corpus_files(root: str, limit: int, min_lines: int) -> List[str]:
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in ("__pycache__", "site-packages", "test", "tests"))
+        for name in sorted(filenames):
+            if not name.endswith(".py"):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                with open(path, "r") as f:
+                    if sum(1 for _ in f) < min_lines:
+                        continue
+            except (OSError, UnicodeDecodeError):
+                continue
+            files.append(path)
+            if len(files) >= limit:
+                return files
+    return files
+
+
+def _keystrokes(source: str) -> Optional[List[str]]:
+    """Sources after each keystroke of STATEMENT typed into a mid-file body."""
+    lines = source.splitlines(keepends=True)
+    for offset in range(len(lines)):
+        for index in (len(lines) // 2 + offset, len(lines) // 2 - offset):
+            if 0 <= index < len(lines) and lines[index].startswith("    return "):
+                indent = lines[index][:len(lines[index]) - len(lines[index].lstrip())]
+                before, after = "".join(lines[:index]), "".join(lines[index:])
+                return [before + indent + STATEMENT[:n] + "\n" + after
+                        for n in range(1, len(STATEMENT) + 1)]
+    return None
+
+
+class _ParseCounter:
+    def __init__(self) -> None:
+        self.calls = 0
+        self._parse = ast.parse
+
+    def __enter__(self) -> "_ParseCounter":
+        def counting(*args, **kwargs):
+            self.calls += 1
+            return self._parse(*args, **kwargs)
+        ast.parse = counting
+        return self
+
+    def __exit__(self, *exc) -> None:
+        ast.parse = self._parse
+
+
+def _valid_entities(regions: List[ParseRegion]) -> List[Tuple[str, int]]:
+    return sorted((e.name.rsplit(".", 1)[-1], e.line_start) for r in regions
+                  if r.status == ParseStatus.VALID for e in r.entities
+                  if e.entity_type in ("function", "class"))
+
+
+def _layout(regions: List[ParseRegion]):
+    return [(r.start_line, r.end_line, r.status,
+             sorted((e.entity_type, e.name, e.line_start, e.signature_hash) for e in r.entities))
+            for r in regions]
+
+
+def _run(parse: Callable[[str], List[ParseRegion]], sources: List[str]):
+    with _ParseCounter() as counter:
+        start = time.perf_counter()
+        results = [parse(s) for s in sources]
+        elapsed = time.perf_counter() - start
+    return elapsed, counter.calls, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=sysconfig.get_paths()["stdlib"])
+    parser.add_argument("--files", type=int, default=20, help="Files to edit")
+    parser.add_argument("--min-lines", type=int, default=400, help="Skip smaller files")
+    args = parser.parse_args()
+
+    print(f"{'file':<32} {'lines':>6} {'base ms':>8} {'cold ms':>8} {'warm ms':>8} "
+          f"{'base p':>7} {'cold p':>7} {'warm p':>7} {'base n':>7} {'warm n':>7} {'same':>5}")
+    totals = {"base": [], "cold": [], "warm": []}
+    for path in _corpus_files(args.corpus, args.files * 3, args.min_lines):
+        with open(path, "r") as f:
+            source = f.read()
+        sources = _keystrokes(source)
+        if sources is None:
+            continue
+        n = len(sources)
+        base_t, base_p, base_r = _run(lambda s: BaselineShadowAST().parse(s), sources)
+        cold_t, cold_p, cold_r = _run(lambda s: ShadowAST().parse(s), sources)
+        warm = ShadowAST()
+        warm.parse(source)  # The file as it was before the edit started
+        warm_t, warm_p, warm_r = _run(warm.parse, sources)
+        base_n = sum(len(_valid_entities(r)) for r in base_r)
+        warm_n = sum(len(_valid_entities(r)) for r in warm_r)
+        same = sum(_layout(c) == _layout(w) for c, w in zip(cold_r, warm_r))
+        for key, t in (("base", base_t), ("cold", cold_t), ("warm", warm_t)):
+            totals[key].append(t / n)
+        label = os.path.relpath(path, args.corpus)[-32:]
+        print(f"{label:<32} {source.count(chr(10)):>6} {base_t / n * 1e3:>8.2f} "
+              f"{cold_t / n * 1e3:>8.2f} {warm_t / n * 1e3:>8.2f} {base_p / n:>7.1f} "
+              f"{cold_p / n:>7.1f} {warm_p / n:>7.1f} {base_n / n:>7.1f} {warm_n / n:>7.1f} {same / n:>5.0%}")
+        if len(totals["base"]) >= args.files:
+            break
+
+    if totals["base"]:
+        base = statistics.median(totals["base"])
+        print(f"\nmedian per keystroke: baseline {base * 1e3:.2f} ms, "
+              f"cold {statistics.median(totals['cold']) * 1e3:.2f} ms "
+              f"({base / statistics.median(totals['cold']):.1f}x), "
+              f"warm {statistics.median(totals['warm']) * 1e3:.2f} ms "
+              f"({base / statistics.median(totals['warm']):.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,7 @@ if PLUGIN_ROOT:
 try:
     from streamrag.models import SUPPORTED_EXTENSIONS
     from streamrag.languages.registry import create_default_registry
+    from streamrag.ts_module_index import is_ts_config
 except ImportError as e:
     error_msg = {"systemMessage": f"StreamRAG import error: {e}"}
     print(json.dumps(error_msg), file=sys.stdout)
@@ -30,6 +31,8 @@ except ImportError as e:
 def _fallback_process_change(input_data, file_path, abs_file_path, registry):
     """Original logic: load graph from disk, process change, save."""
     from streamrag.bridge import DeltaGraphBridge
+    from streamrag.extraction_budget import default_extraction_budget
+    from streamrag.extraction_cache import default_extraction_cache
     from streamrag.models import CodeChange
     from streamrag.storage.memory import (
         load_state, save_state,
@@ -48,6 +51,8 @@ def _fallback_process_change(input_data, file_path, abs_file_path, registry):
         bridge = load_state(session_id)
     if bridge is None:
         bridge = DeltaGraphBridge()
+    bridge._extraction_cache = default_extraction_cache()
+    bridge._extraction_budget = default_extraction_budget()
 
     # Enable versioned graph
     if bridge._versioned is None:
@@ -71,37 +76,14 @@ def _fallback_process_change(input_data, file_path, abs_file_path, registry):
     # Auto-init (skip if graph already populated)
     tracked = bridge._tracked_files or set(bridge._file_contents.keys())
     if bridge.graph.node_count == 0 or len(tracked) == 0:
-        import time
         _max_files = int(os.environ.get("STREAMRAG_MAX_FILES", "200"))
         _max_files = min(_max_files, 2000)
         if project_path and os.path.isdir(project_path) and len(tracked) < _max_files:
-            skip_dirs = {".git", "__pycache__", "node_modules", "venv", ".venv",
-                         ".tox", ".mypy_cache", ".pytest_cache", "dist", "build", ".eggs",
-                         "target", "out", "bin", "obj"}
-            start = time.time()
-            for root, dirs, files in os.walk(project_path):
-                dirs[:] = [d for d in dirs if not d.startswith(".") and d not in skip_dirs]
-                for fname in files:
-                    if not registry.can_handle(fname):
-                        continue
-                    if len(tracked) >= _max_files:
-                        break
-                    fpath = os.path.join(root, fname)
-                    rel = os.path.relpath(fpath, project_path)
-                    if rel in tracked:
-                        continue
-                    if time.time() - start > 7.0:
-                        break
-                    try:
-                        with open(fpath, "r") as f:
-                            content = f.read()
-                    except (IOError, UnicodeDecodeError):
-                        continue
-                    bridge.process_change(CodeChange(file_path=rel, old_content="", new_content=content))
-                    tracked.add(rel)
-                else:
-                    continue
-                break
+            from streamrag.indexer import index_project
+            index_project(bridge, project_path, registry=registry,
+                          max_files=_max_files, timeout_s=7.0, skip_paths=tracked,
+                          extraction_cache=bridge._extraction_cache,
+                          extraction_budget=bridge._extraction_budget)
 
     # Get old content from cache
     old_content = bridge._file_contents.get(file_path, "")
@@ -176,13 +158,14 @@ def main():
     if not file_path:
         sys.exit(0)
 
-    # Check if supported
+    # Check if supported (tsconfig/jsconfig edits go to the daemon's TS module index)
+    ts_config = is_ts_config(file_path)
     try:
         registry = create_default_registry()
-        if not registry.can_handle(file_path):
+        if not ts_config and not registry.can_handle(file_path):
             sys.exit(0)
     except Exception:
-        if not any(file_path.endswith(ext) for ext in SUPPORTED_EXTENSIONS):
+        if not ts_config and not any(file_path.endswith(ext) for ext in SUPPORTED_EXTENSIONS):
             sys.exit(0)
         registry = None
 
@@ -214,7 +197,9 @@ def main():
     except Exception:
         pass
 
-    # Fallback: direct processing
+    # Fallback: direct processing (configs are picked up by the next index)
+    if ts_config:
+        sys.exit(0)
     result = _fallback_process_change(input_data, file_path, abs_file_path, registry)
     print(json.dumps(result), file=sys.stdout)
     sys.exit(0)
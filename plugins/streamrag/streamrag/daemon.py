@@ -35,20 +35,22 @@ from streamrag.models import CodeChange, SUPPORTED_EXTENSIONS
 from streamrag.storage.memory import (
     load_project_state,
     save_project_state,
-    is_state_stale,
     serialize_graph,
     deserialize_graph,
 )
+from streamrag.extraction_budget import default_extraction_budget
+from streamrag.extraction_cache import default_extraction_cache
 from streamrag.languages.registry import create_default_registry
+from streamrag.indexer import index_project, record_file_stats, warm_sync
+from streamrag.ts_module_index import is_ts_config
 
 logger = logging.getLogger("streamrag.daemon")
 
 SAVE_INTERVAL_S = 60.0
-SKIP_DIRS = {
-    ".git", "__pycache__", "node_modules", "venv", ".venv",
-    ".tox", ".mypy_cache", ".pytest_cache", "dist", "build", ".eggs",
-    "target", "out", "bin", "obj",
-}
+DRAIN_INTERVAL_S = 0.5  # How often the drain task wakes up
+DRAIN_IDLE_S = 1.0  # Quiet period (no requests) before draining
+DRAIN_SLICE_MS = 20.0  # Work per slice before yielding to the event loop
+DRAIN_SLICE_ITEMS = 10
 
 
 def _get_state_dir() -> str:
@@ -76,21 +78,35 @@ class StreamRAGDaemon:
         self.project_path = os.path.abspath(project_path)
         self.bridge: Optional[DeltaGraphBridge] = None
         self.registry = create_default_registry()
+        self.extraction_cache = default_extraction_cache()
+        self.extraction_budget = default_extraction_budget()
         self._dirty = False
         self._initialized = False
         self._save_task: Optional[asyncio.Task] = None
+        self._drain_task: Optional[asyncio.Task] = None
+        self._last_request_at = 0.0  # monotonic
+        self._drain_slices = 0
         self._server: Optional[asyncio.AbstractServer] = None
         self._cleanup_counter = 0
+        self._warm_sync_stats: Dict[str, int] = {}
 
     # ---- lifecycle --------------------------------------------------------
 
     def _load_or_create_bridge(self) -> DeltaGraphBridge:
-        """Load existing state or create fresh bridge."""
-        bridge = None
-        if not is_state_stale(self.project_path):
-            bridge = load_project_state(self.project_path)
+        """Load existing state (warm-synced with disk) or create fresh bridge."""
+        bridge = load_project_state(self.project_path)
+        loaded = bridge is not None
         if bridge is None:
             bridge = DeltaGraphBridge()
+        bridge._extraction_cache = self.extraction_cache
+        bridge._extraction_budget = self.extraction_budget
+        if loaded and os.path.isdir(self.project_path):
+            # Catch up on edits made while the daemon was down (git pull, formatters)
+            self._warm_sync_stats = warm_sync(
+                bridge, self.project_path, registry=self.registry, max_added=200,
+            )
+            if any(self._warm_sync_stats.get(k) for k in ("touched", "changed", "added", "deleted")):
+                self._dirty = True
 
         # Enable versioned graph
         if bridge._versioned is None:
@@ -136,35 +152,12 @@ class StreamRAGDaemon:
             self._initialized = True
             return
 
-        supported_count = 0
-        new_count = 0
-        start = time.time()
-
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if not d.startswith(".") and d not in SKIP_DIRS]
-            for fname in files:
-                if not self.registry.can_handle(fname):
-                    continue
-                supported_count += 1
-                if supported_count > max_files:
-                    break
-                fpath = os.path.join(root, fname)
-                rel_path = os.path.relpath(fpath, self.project_path)
-                if rel_path in tracked:
-                    continue
-                if time.time() - start > timeout_s:
-                    break
-                try:
-                    with open(fpath, "r") as f:
-                        content = f.read()
-                except (IOError, UnicodeDecodeError):
-                    continue
-                change = CodeChange(file_path=rel_path, old_content="", new_content=content)
-                bridge.process_change(change)
-                new_count += 1
-            else:
-                continue
-            break
+        new_count = index_project(
+            bridge, self.project_path, registry=self.registry,
+            max_files=max_files, timeout_s=timeout_s, skip_paths=tracked,
+            extraction_cache=self.extraction_cache,
+            extraction_budget=self.extraction_budget,
+        )
 
         if new_count > 0:
             self._dirty = True
@@ -196,6 +189,30 @@ class StreamRAGDaemon:
             except Exception as e:
                 logger.warning("Failed to save state: %s", e)
 
+    def _drain_propagation_slice(self) -> List[str]:
+        """Refresh one time slice of queued dependents. Returns processed files."""
+        bridge = self.bridge
+        if bridge is None or bridge._propagator is None:
+            return []
+        if bridge._propagator.async_queue_size == 0:
+            return []
+        processed = bridge.drain_propagation(
+            max_items=DRAIN_SLICE_ITEMS, time_budget_ms=DRAIN_SLICE_MS,
+        )
+        if processed:
+            self._drain_slices += 1
+            self._dirty = True
+        return processed
+
+    async def _drain_loop(self) -> None:
+        """Drain async propagation in short slices while no requests arrive."""
+        while True:
+            await asyncio.sleep(DRAIN_INTERVAL_S)
+            while time.monotonic() - self._last_request_at >= DRAIN_IDLE_S:
+                if not self._drain_propagation_slice():
+                    break
+                await asyncio.sleep(0)  # Let pending client requests run first
+
     async def _periodic_save_loop(self) -> None:
         """Save state every SAVE_INTERVAL_S if dirty."""
         while True:
@@ -210,8 +227,19 @@ class StreamRAGDaemon:
             "alive": True,
             "nodes": bridge.graph.node_count,
             "edges": bridge.graph.edge_count,
+            "content_cache": bridge._file_contents.stats(),
+            "warm_sync": self._warm_sync_stats,
+            "extraction_budget": self.extraction_budget.stats() if self.extraction_budget else {},
+            "propagation_queue": self._propagation_queue_stats(bridge),
         }
 
+    def _propagation_queue_stats(self, bridge: DeltaGraphBridge) -> Dict[str, Any]:
+        if bridge._propagator is None:
+            return {}
+        stats = bridge._propagator.queue_stats()
+        stats["drain_slices"] = self._drain_slices
+        return stats
+
     def handle_shutdown(self, _req: dict) -> dict:
         self._save_if_dirty()
         # Schedule server stop
@@ -233,8 +261,9 @@ class StreamRAGDaemon:
         if not file_path:
             return {}
 
-        # Check if supported
-        if not self.registry.can_handle(file_path):
+        # Check if supported (tsconfig/jsconfig edits update the TS module index)
+        ts_config = is_ts_config(file_path)
+        if not ts_config and not self.registry.can_handle(file_path):
             return {}
 
         bridge = self._ensure_bridge()
@@ -248,6 +277,17 @@ class StreamRAGDaemon:
             except ValueError:
                 pass
 
+        if ts_config:
+            read_path = abs_file_path if os.path.isabs(abs_file_path) else os.path.join(self.project_path, file_path)
+            try:
+                with open(read_path, "r") as f:
+                    content: Optional[str] = f.read()
+            except (IOError, OSError, UnicodeDecodeError):
+                content = None
+            bridge.update_ts_config(file_path, content)
+            self._dirty = True
+            return {}
+
         # Auto-init on first change
         self._maybe_auto_init()
 
@@ -271,6 +311,7 @@ class StreamRAGDaemon:
             new_content=new_content,
         )
         ops = bridge.process_change(change)
+        record_file_stats(bridge, self.project_path, [(file_path, new_content)])
         self._dirty = True
 
         if not ops:
@@ -588,6 +629,7 @@ class StreamRAGDaemon:
     }
 
     def dispatch(self, request: dict) -> dict:
+        self._last_request_at = time.monotonic()
         cmd = request.get("cmd", "")
         handler_name = self.HANDLERS.get(cmd)
         if handler_name is None:
@@ -648,6 +690,7 @@ class StreamRAGDaemon:
 
         self._server = await asyncio.start_unix_server(self._handle_client, path=sock_path)
         self._save_task = asyncio.create_task(self._periodic_save_loop())
+        self._drain_task = asyncio.create_task(self._drain_loop())
 
         logger.info("Daemon started: pid=%d socket=%s nodes=%d edges=%d",
                      os.getpid(), sock_path,
@@ -674,12 +717,13 @@ class StreamRAGDaemon:
 
     async def _cleanup(self, sock_path: str, pid_path: str) -> None:
         """Clean up socket and PID files."""
-        if self._save_task:
-            self._save_task.cancel()
-            try:
-                await self._save_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._save_task, self._drain_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
 
         self._save_if_dirty()
 
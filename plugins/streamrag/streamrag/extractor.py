@@ -2,7 +2,9 @@
 
 import ast
 import hashlib
-from typing import List, Optional
+from bisect import bisect_left
+from operator import itemgetter
+from typing import List, Optional, Tuple
 
 from streamrag.models import ASTEntity, BUILTINS, COMMON_ATTR_METHODS, KNOWN_EXTERNAL_PACKAGES, STDLIB_MODULES
 
@@ -12,18 +14,200 @@ def _sha256_short(text: str, length: int = 12) -> str:
     return hashlib.sha256(text.encode()).hexdigest()[:length]
 
 
-class ASTExtractor(ast.NodeVisitor):
+def _scalar_bytes(value) -> bytes:
+    if value is None:
+        return b"-"
+    if value.__class__ is str:  # identifiers, mostly: skip repr()
+        text = value.encode("utf-8", "surrogatepass")
+        return b"u%d:%s" % (len(text), text)
+    text = repr(value).encode("utf-8", "surrogatepass")
+    return b"s%d:%s" % (len(text), text)
+
+
+# Subtrees hashed on their own and rolled into the enclosing digest
+_DIGEST_ROOTS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _ast_digest(node: ast.AST, memo: dict) -> bytes:
+    """Merkle digest of an AST subtree: equal exactly when ast.dump() is.
+
+    Covers node types and field values but not positions (ast.dump's
+    default). Nested definitions contribute their own memoized digest, so
+    a class body and each of its methods are serialized once per
+    extraction instead of once per enclosing scope.
+    """
+    digest = memo.get(id(node))
+    if digest is None:
+        out: List[bytes] = []
+        _serialize(node, out, memo)
+        digest = hashlib.blake2b(b"".join(out), digest_size=16).digest()
+        memo[id(node)] = digest
+    return digest
+
+
+def _serialize(node: ast.AST, out: List[bytes], memo: dict) -> None:
+    """Append an unambiguous encoding of node's fields (children inline)."""
+    out.append(node.__class__.__name__.encode() + b"(")
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, list):
+            out.append(b"[%d" % len(value))
+            for item in value:
+                if isinstance(item, ast.AST):
+                    if item.__class__ in _DIGEST_ROOTS:
+                        out.append(b"#" + _ast_digest(item, memo))
+                    else:
+                        _serialize(item, out, memo)
+                else:
+                    out.append(_scalar_bytes(item))
+        elif isinstance(value, ast.AST):
+            _serialize(value, out, memo)
+        else:
+            out.append(_scalar_bytes(value))
+
+
+def _stdlib_import_names(node) -> List[str]:
+    """Names bound by an Import/ImportFrom of a stdlib or known external package."""
+    names = []
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            top = alias.name.split(".")[0]
+            if top in STDLIB_MODULES or top in KNOWN_EXTERNAL_PACKAGES:
+                names.append(alias.asname or alias.name)
+    else:
+        top = (node.module or "").split(".")[0]
+        if top in STDLIB_MODULES or top in KNOWN_EXTERNAL_PACKAGES:
+            for alias in (node.names or []):
+                names.append(alias.asname or alias.name)
+    return names
+
+
+def _external_type_import_names(node) -> List[str]:
+    """PascalCase names bound by an Import/ImportFrom of a known external package."""
+    names = []
+    if isinstance(node, ast.ImportFrom):
+        top = (node.module or "").split(".")[0]
+        if top in KNOWN_EXTERNAL_PACKAGES:
+            for alias in (node.names or []):
+                name = alias.asname or alias.name
+                if name and name[0].isupper():
+                    names.append(name)
+    else:
+        for alias in node.names:
+            top = alias.name.split(".")[0]
+            if top in KNOWN_EXTERNAL_PACKAGES:
+                name = alias.asname or alias.name
+                if name and name[0].isupper():
+                    names.append(name)
+    return names
+
+
+def _param_type_context(node) -> dict:
+    """Parameter annotations: def foo(x: SomeClass) -> {"x": "SomeClass"}."""
+    type_map: dict = {}
+    args_node = getattr(node, "args", None)
+    for arg in (args_node.args if args_node else []):
+        if arg.annotation:
+            if isinstance(arg.annotation, ast.Name):
+                if arg.arg not in ("self", "cls"):
+                    type_map[arg.arg] = arg.annotation.id
+            elif isinstance(arg.annotation, ast.Attribute):
+                if arg.arg not in ("self", "cls"):
+                    type_map[arg.arg] = arg.annotation.attr
+    return type_map
+
+
+def _type_assignments(node) -> List[Tuple[str, str]]:
+    """(variable, type) pairs from `x = SomeClass()` or `x: SomeClass = ...`."""
+    if isinstance(node, ast.Assign):
+        if (isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name)):
+            return [(target.id, node.value.func.id)
+                    for target in node.targets if isinstance(target, ast.Name)]
+    elif (isinstance(node.target, ast.Name)
+            and isinstance(node.annotation, ast.Name)):
+        return [(node.target.id, node.annotation.id)]
+    return []
+
+
+def _module_type_pairs(stmt: ast.stmt) -> List[Tuple[str, str]]:
+    """(variable, type) pairs a top-level statement adds to the module type context."""
+    if isinstance(stmt, ast.Assign):
+        if isinstance(stmt.value, ast.Call):
+            func = stmt.value.func
+            if isinstance(func, ast.Name):
+                type_name = func.id
+            elif isinstance(func, ast.Attribute):
+                type_name = func.attr
+            else:
+                return []
+            return [(target.id, type_name)
+                    for target in stmt.targets if isinstance(target, ast.Name)]
+    elif isinstance(stmt, ast.AnnAssign):
+        if (isinstance(stmt.target, ast.Name)
+                and isinstance(stmt.annotation, ast.Name)):
+            return [(stmt.target.id, stmt.annotation.id)]
+    return []
+
+
+def module_code_entity(calls: List[str]) -> ASTEntity:
+    """Synthetic __module__ entity carrying module-level calls."""
+    return ASTEntity(
+        entity_type="module_code",
+        name="__module__",
+        line_start=1,
+        line_end=1,
+        signature_hash="module",
+        structure_hash="module",
+        calls=calls,
+        uses=[],
+        inherits=[],
+        imports=[],
+    )
+
+
+def _is_export_list(name: str, node: ast.Assign) -> bool:
+    return name == "__all__" and isinstance(node.value, (ast.List, ast.Tuple))
+
+
+# Type annotation names to ignore (builtins and typing constructs)
+_TYPE_BUILTINS = frozenset({
+    "str", "int", "float", "bool", "list", "dict", "set", "tuple",
+    "None", "bytes", "complex", "object", "type",
+    "Any", "Optional", "List", "Dict", "Set", "Tuple", "Union", "Type",
+    "Callable", "Iterator", "Generator", "Sequence", "Mapping",
+    "FrozenSet", "Deque", "DefaultDict", "OrderedDict", "Counter",
+    "ClassVar", "Final", "Literal", "TypeVar", "Protocol",
+})
+
+
+class ASTExtractor:
     """Extract code entities from Python source using the AST.
 
     Handles: FunctionDef, AsyncFunctionDef, ClassDef, module-level Assign,
     Import/ImportFrom, and module-level Expr(Call) as synthetic __module__.
+
+    Single traversal: calls, Name loads and type-revealing assignments are
+    recorded once, in preorder, with their depth. An entity's subtree is a contiguous preorder range,
+    and sorting that slice by depth (stable) reproduces ast.walk order, so
+    nested code is no longer re-walked for every enclosing scope.
+
+    With semantic_paths=True the same traversal also fills self.paths with
+    SemanticPath records (see streamrag.v2.semantic_path), sharing the
+    scope chain and the entities' signature hashes. Off by default, so
+    plain extraction does no extra work.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, semantic_paths: bool = False, file_path: str = "") -> None:
         self._current_scope: List[str] = []
         self._entities: List[ASTEntity] = []
         self._stdlib_names: set = set()
-        self._type_context: dict = {}
+        self._external_type_names: set = set()
+        self._module_type_context: dict = {}
+        self._digests: dict = {}  # id(node) -> Merkle digest, per extraction
+        self._semantic_paths = semantic_paths
+        self.file_path = file_path
+        self.paths: List["SemanticPath"] = []
 
     def extract(self, source: str) -> List[ASTEntity]:
         """Extract all entities from Python source code.
@@ -37,58 +221,254 @@ class ASTExtractor(ast.NodeVisitor):
             tree = ast.parse(source)
         except SyntaxError:
             return []
-
+        return self.extract_tree(tree)
+
+    def extract_with_paths(
+        self, source: str, file_path: str = ""
+    ) -> Tuple[List[ASTEntity], List["SemanticPath"]]:
+        """(entities, semantic paths) from one parse and one traversal."""
+        self._semantic_paths = True
+        if file_path:
+            self.file_path = file_path
+        self.paths = []
+        entities = self.extract(source)
+        return entities, self.paths
+
+    def extract_tree(
+        self,
+        tree: ast.Module,
+        stdlib_names: Optional[set] = None,
+        external_type_names: Optional[set] = None,
+        module_type_context: Optional[dict] = None,
+    ) -> List[ASTEntity]:
+        """Extract entities from an already parsed module.
+
+        The optional arguments supply file-wide context (import-derived
+        name sets, module-level type context) when tree is only a slice of
+        a file, as in incremental re-extraction. Import names found in the
+        tree are recorded in import_lines as (lineno, stdlib, external).
+        """
         self._current_scope = []
         self._entities = []
-        self._stdlib_names = self._collect_stdlib_imports(tree)
-        self._external_type_names = self._collect_external_type_names(tree)
-        self._type_context = {}
-        self._module_type_context: dict = self._collect_module_type_context(tree)
-        self.visit(tree)
+        self._stdlib_names = set(stdlib_names or ())
+        self._external_type_names = set(external_type_names or ())
+        if module_type_context is None:
+            module_type_context = self._collect_module_type_context(tree)
+        self._module_type_context = module_type_context
+        self._digests = {}
+        self.import_lines: List[Tuple[int, List[str], List[str]]] = []
+        self.paths = []
+        paths = self.paths if self._semantic_paths else None
+        if paths is not None:
+            from streamrag.v2.semantic_path import SemanticPath
+
+        # Preorder index lists (for bisect) + parallel (depth, payload) events
+        call_pre: List[int] = []
+        call_ev: List[tuple] = []
+        name_pre: List[int] = []
+        name_ev: List[tuple] = []
+        assign_pre: List[int] = []
+        assign_ev: List[tuple] = []
+        # [entity, node, start, end, enclosing_scope] per function/class/variable
+        scopes: List[list] = []
+
+        _Name, _Load, _Call = ast.Name, ast.Load, ast.Call
+        _defs = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        iter_children = ast.iter_child_nodes
+        stack: List[tuple] = [(tree, 0)]
+        pre = 0
+        while stack:
+            node, depth = stack.pop()
+            if node is None:  # end of a definition's subtree
+                depth[3] = pre
+                self._current_scope.pop()
+                continue
+            cls = node.__class__
+            if cls is _Name:  # only child is ctx
+                if node.ctx.__class__ is _Load:
+                    name_pre.append(pre)
+                    name_ev.append((depth, node.id))
+                pre += 1
+                continue
+            index = pre
+            pre += 1
+            if cls is _Call:
+                call_pre.append(index)
+                call_ev.append((depth, node.func))
+            elif cls in _defs:
+                record = [self._definition_entity(node), node, index, index,
+                          self._current_scope[-1] if self._current_scope else None]
+                self._entities.append(record[0])
+                scopes.append(record)
+                stack.append((None, record))
+                if paths is not None:
+                    self._definition_paths(node, record[0], paths, SemanticPath)
+                self._current_scope.append(node.name)
+            elif cls is ast.Import or cls is ast.ImportFrom:
+                stdlib = _stdlib_import_names(node)
+                external = _external_type_import_names(node)
+                self._stdlib_names.update(stdlib)
+                self._external_type_names.update(external)
+                self.import_lines.append((node.lineno, stdlib, external))
+                self._append_imports(node)
+                if paths is not None:
+                    scope = tuple(self._current_scope)
+                    for entity in self._entities[-len(node.names):]:
+                        paths.append(SemanticPath(
+                            self.file_path, scope, "import", entity.name,
+                            entity.signature_hash, entity.line_start, entity.line_end))
+            elif cls is ast.Assign or cls is ast.AnnAssign:
+                pairs = _type_assignments(node)
+                if pairs:
+                    assign_pre.append(index)
+                    assign_ev.append((depth, pairs))
+                if paths is not None and cls is ast.Assign:
+                    self._variable_paths(node, paths, SemanticPath)
+                if cls is ast.Assign and not self._current_scope:
+                    entity = self._variable_entity(node, self._digests)
+                    if entity is not None:
+                        self._entities.append(entity)
+                        if not _is_export_list(entity.name, node):
+                            # Assign holds no definitions: range ends at the next sibling
+                            record = [entity, node, index, None, None]
+                            scopes.append(record)
+                            stack.append((None, record))
+                            self._current_scope.append("")
+            stack.extend([(child, depth + 1) for child in reversed(list(iter_children(node)))])
+
+        def _in_walk_order(pres, events, start, end):
+            return sorted(events[bisect_left(pres, start):bisect_left(pres, end)],
+                          key=itemgetter(0))
+
+        by_depth = itemgetter(0)
+        for entity, node, start, end, enclosing in scopes:
+            entity.uses = [n for _, n in _in_walk_order(name_pre, name_ev, start, end)]
+            if entity.entity_type == "variable":
+                continue
+            type_ctx: dict = {}
+            if entity.entity_type == "function":
+                type_ctx = _param_type_context(node)
+                for _, pairs in _in_walk_order(assign_pre, assign_ev, start, end):
+                    for var_name, type_name in pairs:
+                        type_ctx[var_name] = type_name
+                entity.type_context = type_ctx
+            calls = []
+            for _, func in sorted(call_ev[bisect_left(call_pre, start):bisect_left(call_pre, end)],
+                                  key=by_depth):
+                name = self._call_name(func, enclosing, type_ctx)
+                if name is not None:
+                    calls.append(name)
+            entity.calls = calls
+
         self._extract_module_calls(tree)
+        self._digests = {}
         return self._entities
 
-    @staticmethod
-    def _collect_stdlib_imports(tree: ast.Module) -> set:
-        """Pre-pass: collect names imported from stdlib or external packages."""
-        stdlib_names: set = set()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    top = alias.name.split(".")[0]
-                    if top in STDLIB_MODULES or top in KNOWN_EXTERNAL_PACKAGES:
-                        stdlib_names.add(alias.asname or alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                top = (node.module or "").split(".")[0]
-                if top in STDLIB_MODULES or top in KNOWN_EXTERNAL_PACKAGES:
-                    for alias in (node.names or []):
-                        stdlib_names.add(alias.asname or alias.name)
-        return stdlib_names
+    def _definition_paths(self, node, entity: ASTEntity, paths: list, path_cls) -> None:
+        """Path for a function/class, then one per parameter of a function."""
+        scope = tuple(self._current_scope)
+        paths.append(path_cls(
+            self.file_path, scope, entity.entity_type, node.name,
+            entity.signature_hash, entity.line_start, entity.line_end))
+        if entity.entity_type == "function":
+            param_scope = scope + (node.name,)
+            for arg in node.args.args:
+                paths.append(path_cls(
+                    self.file_path, param_scope, "parameter", arg.arg,
+                    _sha256_short(f"param:{arg.arg}"), node.lineno, node.lineno))
+
+    def _variable_paths(self, node: ast.Assign, paths: list, path_cls) -> None:
+        """One path per plain-name target, at any scope.
+
+        Hashed like a module-level variable entity, so a single-name
+        module assignment shares its entity's signature hash.
+        """
+        scope = tuple(self._current_scope)
+        value = None
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if value is None:
+                    value = _ast_digest(node.value, self._digests).hex()
+                paths.append(path_cls(
+                    self.file_path, scope, "variable", target.id,
+                    _sha256_short(f"var:{target.id}|{value}"),
+                    node.lineno, node.end_lineno or node.lineno))
+
+    def extract_declarations(self, source: str) -> List[ASTEntity]:
+        """Imports, functions, classes and module variables, marked partial.
+
+        The cheap mode for oversized or generated files: only statement
+        lists are walked, so no calls, uses or type context are recorded.
+        """
+        if not source.strip():
+            return []
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return []
+        self._current_scope = []
+        self._entities = []
+        self._digests = {}
+        _defs = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        # match_case is 3.10+; isinstance() accepts the empty tuple on 3.9
+        _blocks = (ast.stmt, ast.excepthandler, getattr(ast, "match_case", ()))
+
+        def walk(parent) -> None:
+            for node in ast.iter_child_nodes(parent):
+                if isinstance(node, _defs):
+                    self._entities.append(self._definition_entity(node))
+                    self._current_scope.append(node.name)
+                    walk(node)
+                    self._current_scope.pop()
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    self._append_imports(node)
+                elif isinstance(node, ast.Assign) and not self._current_scope:
+                    entity = self._variable_entity(node, self._digests)
+                    if entity is not None:
+                        self._entities.append(entity)
+                elif isinstance(node, _blocks):
+                    walk(node)
+
+        walk(tree)
+        for entity in self._entities:
+            entity.partial = True
+        self._digests = {}
+        return self._entities
 
-    @staticmethod
-    def _collect_external_type_names(tree: ast.Module) -> set:
-        """Pre-pass: collect PascalCase names imported from external packages.
+    def _definition_entity(self, node) -> ASTEntity:
+        """Entity for a function/class, minus the subtree-derived fields."""
+        name = self._scoped_name(node.name)
+        if isinstance(node, ast.ClassDef):
+            base_names = []
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    base_names.append(base.id)
+                elif isinstance(base, ast.Attribute):
+                    base_names.append(base.attr)
+            return ASTEntity(
+                entity_type="class",
+                name=name,
+                line_start=node.lineno,
+                line_end=node.end_lineno or node.lineno,
+                signature_hash=self._compute_signature_hash(node, "class"),
+                structure_hash=self._compute_structure_hash(node, "class"),
+                inherits=base_names,
+                decorators=self._extract_decorators(node),
+            )
+        return ASTEntity(
+            entity_type="function",
+            name=name,
+            line_start=node.lineno,
+            line_end=node.end_lineno or node.lineno,
+            signature_hash=self._compute_signature_hash(node, "function"),
+            structure_hash=self._compute_structure_hash(node, "function"),
+            type_refs=self._extract_type_refs(node),
+            params=[arg.arg for arg in node.args.args if arg.arg not in ("self", "cls")],
+            decorators=self._extract_decorators(node),
+        )
 
-        e.g. `from httpx import AsyncClient` → {"AsyncClient"}
-        These are used to filter out method calls on external types.
-        """
-        external_types: set = set()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                top = (node.module or "").split(".")[0]
-                if top in KNOWN_EXTERNAL_PACKAGES:
-                    for alias in (node.names or []):
-                        name = alias.asname or alias.name
-                        if name and name[0].isupper():
-                            external_types.add(name)
-            elif isinstance(node, ast.Import):
-                for alias in node.names:
-                    top = alias.name.split(".")[0]
-                    if top in KNOWN_EXTERNAL_PACKAGES:
-                        name = alias.asname or alias.name
-                        if name and name[0].isupper():
-                            external_types.add(name)
-        return external_types
+    def _digest(self, node: ast.AST) -> str:
+        return _ast_digest(node, self._digests).hex()
 
     @staticmethod
     def _collect_module_type_context(tree: ast.Module) -> dict:
@@ -101,21 +481,8 @@ class ASTExtractor(ast.NodeVisitor):
         """
         type_map: dict = {}
         for stmt in tree.body:
-            if isinstance(stmt, ast.Assign):
-                if (isinstance(stmt.value, ast.Call)
-                        and isinstance(stmt.value.func, ast.Name)):
-                    for target in stmt.targets:
-                        if isinstance(target, ast.Name):
-                            type_map[target.id] = stmt.value.func.id
-                elif (isinstance(stmt.value, ast.Call)
-                      and isinstance(stmt.value.func, ast.Attribute)):
-                    for target in stmt.targets:
-                        if isinstance(target, ast.Name):
-                            type_map[target.id] = stmt.value.func.attr
-            elif isinstance(stmt, ast.AnnAssign):
-                if (isinstance(stmt.target, ast.Name)
-                        and isinstance(stmt.annotation, ast.Name)):
-                    type_map[stmt.target.id] = stmt.annotation.id
+            for var_name, type_name in _module_type_pairs(stmt):
+                type_map[var_name] = type_name
         return type_map
 
     def _scoped_name(self, name: str) -> str:
@@ -124,73 +491,9 @@ class ASTExtractor(ast.NodeVisitor):
             return ".".join(self._current_scope) + "." + name
         return name
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        self._visit_function(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        self._visit_function(node)
-
-    def _visit_function(self, node) -> None:
-        """Handle both sync and async function definitions."""
-        name = self._scoped_name(node.name)
-        type_ctx = self._extract_type_context(node)
-        old_ctx = self._type_context
-        self._type_context = type_ctx
-        params = [arg.arg for arg in node.args.args if arg.arg not in ("self", "cls")]
-        self._entities.append(ASTEntity(
-            entity_type="function",
-            name=name,
-            line_start=node.lineno,
-            line_end=node.end_lineno or node.lineno,
-            signature_hash=self._compute_signature_hash(node, "function"),
-            structure_hash=self._compute_structure_hash(node, "function"),
-            calls=self._extract_calls(node),
-            uses=self._extract_uses(node),
-            inherits=[],
-            imports=[],
-            type_refs=self._extract_type_refs(node),
-            type_context=type_ctx,
-            params=params,
-            decorators=self._extract_decorators(node),
-        ))
-        self._type_context = old_ctx
-        # Visit nested definitions
-        self._current_scope.append(node.name)
-        self.generic_visit(node)
-        self._current_scope.pop()
-
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
-        name = self._scoped_name(node.name)
-        base_names = []
-        for base in node.bases:
-            if isinstance(base, ast.Name):
-                base_names.append(base.id)
-            elif isinstance(base, ast.Attribute):
-                base_names.append(base.attr)
-
-        self._entities.append(ASTEntity(
-            entity_type="class",
-            name=name,
-            line_start=node.lineno,
-            line_end=node.end_lineno or node.lineno,
-            signature_hash=self._compute_signature_hash(node, "class"),
-            structure_hash=self._compute_structure_hash(node, "class"),
-            calls=self._extract_calls(node),
-            uses=self._extract_uses(node),
-            inherits=base_names,
-            imports=[],
-            decorators=self._extract_decorators(node),
-        ))
-        # Visit nested definitions
-        self._current_scope.append(node.name)
-        self.generic_visit(node)
-        self._current_scope.pop()
-
-    def visit_Assign(self, node: ast.Assign) -> None:
-        """Only extract module-level assignments."""
-        if self._current_scope:
-            return
-
+    @staticmethod
+    def _variable_entity(node: ast.Assign, digests: dict) -> Optional[ASTEntity]:
+        """Variable entity for a module-level Assign (uses left empty except __all__)."""
         target_names = []
         for target in node.targets:
             if isinstance(target, ast.Name):
@@ -201,21 +504,19 @@ class ASTExtractor(ast.NodeVisitor):
                         target_names.append(elt.id)
 
         if not target_names:
-            return
+            return None
 
         name = ", ".join(target_names)
-        sig = f"var:{name}|{ast.dump(node.value)}"
+        sig = f"var:{name}|{_ast_digest(node.value, digests).hex()}"
 
         # Extract __all__ export names
-        uses = self._extract_uses(node)
-        if name == "__all__" and isinstance(node.value, (ast.List, ast.Tuple)):
-            export_names = []
+        uses: List[str] = []
+        if _is_export_list(name, node):
             for elt in node.value.elts:
                 if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                    export_names.append(elt.value)
-            uses = export_names
+                    uses.append(elt.value)
 
-        self._entities.append(ASTEntity(
+        return ASTEntity(
             entity_type="variable",
             name=name,
             line_start=node.lineno,
@@ -226,41 +527,18 @@ class ASTExtractor(ast.NodeVisitor):
             uses=uses,
             inherits=[],
             imports=[],
-        ))
+        )
 
-    def visit_Import(self, node: ast.Import) -> None:
-        """One entity per imported name."""
-        sig = f"import:{ast.dump(node)}"
-        sig_hash = _sha256_short(sig)
+    def _append_imports(self, node) -> None:
+        """One import entity per name an Import/ImportFrom binds."""
+        sig_hash = _sha256_short(f"import:{self._digest(node)}")
         struct_hash = _sha256_short(f"other:{type(node).__name__}")
+        module = (node.module or "") if isinstance(node, ast.ImportFrom) else ""
 
         for alias in node.names:
-            imported_name = alias.asname or alias.name
             self._entities.append(ASTEntity(
                 entity_type="import",
-                name=imported_name,
-                line_start=node.lineno,
-                line_end=node.end_lineno or node.lineno,
-                signature_hash=sig_hash,
-                structure_hash=struct_hash,
-                calls=[],
-                uses=[],
-                inherits=[],
-                imports=[("", alias.name)],
-            ))
-
-    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
-        """One entity per imported name."""
-        sig = f"import:{ast.dump(node)}"
-        sig_hash = _sha256_short(sig)
-        struct_hash = _sha256_short(f"other:{type(node).__name__}")
-        module = node.module or ""
-
-        for alias in (node.names or []):
-            imported_name = alias.asname or alias.name
-            self._entities.append(ASTEntity(
-                entity_type="import",
-                name=imported_name,
+                name=alias.asname or alias.name,
                 line_start=node.lineno,
                 line_end=node.end_lineno or node.lineno,
                 signature_hash=sig_hash,
@@ -275,45 +553,34 @@ class ASTExtractor(ast.NodeVisitor):
         """Create synthetic __module__ entity for module-level calls."""
         module_calls = []
         for stmt in tree.body:
-            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
-                call = stmt.value
-                if isinstance(call.func, ast.Name):
-                    name = call.func.id
-                    if name not in BUILTINS and name not in self._stdlib_names:
-                        module_calls.append(name)
-                elif isinstance(call.func, ast.Attribute):
-                    bare = call.func.attr
-                    receiver = None
-                    if isinstance(call.func.value, ast.Name):
-                        receiver = call.func.value.id
-                    if receiver and receiver in self._stdlib_names:
-                        continue
-                    if bare not in BUILTINS and bare not in COMMON_ATTR_METHODS:
-                        module_calls.append(bare)
+            name = self._module_call_name(stmt)
+            if name is not None:
+                module_calls.append(name)
 
         if module_calls:
-            self._entities.append(ASTEntity(
-                entity_type="module_code",
-                name="__module__",
-                line_start=1,
-                line_end=1,
-                signature_hash="module",
-                structure_hash="module",
-                calls=module_calls,
-                uses=[],
-                inherits=[],
-                imports=[],
-            ))
+            self._entities.append(module_code_entity(module_calls))
+
+    def _module_call_name(self, stmt: ast.stmt) -> Optional[str]:
+        """Call name contributed to __module__ by a top-level statement, if any."""
+        if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+            call = stmt.value
+            if isinstance(call.func, ast.Name):
+                name = call.func.id
+                if name not in BUILTINS and name not in self._stdlib_names:
+                    return name
+            elif isinstance(call.func, ast.Attribute):
+                bare = call.func.attr
+                receiver = None
+                if isinstance(call.func.value, ast.Name):
+                    receiver = call.func.value.id
+                if receiver and receiver in self._stdlib_names:
+                    return None
+                if bare not in BUILTINS and bare not in COMMON_ATTR_METHODS:
+                    return bare
+        return None
 
     # Type annotation names to ignore (builtins and typing constructs)
-    _TYPE_BUILTINS = frozenset({
-        "str", "int", "float", "bool", "list", "dict", "set", "tuple",
-        "None", "bytes", "complex", "object", "type",
-        "Any", "Optional", "List", "Dict", "Set", "Tuple", "Union", "Type",
-        "Callable", "Iterator", "Generator", "Sequence", "Mapping",
-        "FrozenSet", "Deque", "DefaultDict", "OrderedDict", "Counter",
-        "ClassVar", "Final", "Literal", "TypeVar", "Protocol",
-    })
+    _TYPE_BUILTINS = _TYPE_BUILTINS
 
     @staticmethod
     def _extract_type_refs(node) -> List[str]:
@@ -325,11 +592,11 @@ class ASTExtractor(ast.NodeVisitor):
             if ann_node is None:
                 return
             if isinstance(ann_node, ast.Name):
-                if ann_node.id not in ASTExtractor._TYPE_BUILTINS and ann_node.id not in seen:
+                if ann_node.id not in _TYPE_BUILTINS and ann_node.id not in seen:
                     seen.add(ann_node.id)
                     refs.append(ann_node.id)
             elif isinstance(ann_node, ast.Attribute):
-                if ann_node.attr not in ASTExtractor._TYPE_BUILTINS and ann_node.attr not in seen:
+                if ann_node.attr not in _TYPE_BUILTINS and ann_node.attr not in seen:
                     seen.add(ann_node.attr)
                     refs.append(ann_node.attr)
             elif isinstance(ann_node, ast.Subscript):
@@ -393,13 +660,12 @@ class ASTExtractor(ast.NodeVisitor):
                     decorators.append(".".join(reversed(parts)))
         return decorators
 
-    @staticmethod
-    def _compute_signature_hash(node, entity_type: str) -> str:
+    def _compute_signature_hash(self, node, entity_type: str) -> str:
         """Compute signature hash that includes the body (detects ANY change)."""
         if entity_type == "function":
             args = ",".join(arg.arg for arg in node.args.args)
             sig = f"func:{node.name}({args})"
-            sig += f"|body:{_sha256_short(ast.dump(node), 8)}"
+            sig += f"|body:{self._digest(node)}"
             return _sha256_short(sig)
 
         if entity_type == "class":
@@ -410,10 +676,10 @@ class ASTExtractor(ast.NodeVisitor):
                 elif isinstance(base, ast.Attribute):
                     base_names.append(base.attr)
             sig = f"class:{node.name}({','.join(base_names)})"
-            sig += f"|body:{_sha256_short(ast.dump(node), 8)}"
+            sig += f"|body:{self._digest(node)}"
             return _sha256_short(sig)
 
-        return _sha256_short(f"other:{ast.dump(node)}")
+        return _sha256_short(f"other:{self._digest(node)}")
 
     @staticmethod
     def _compute_structure_hash(node, entity_type: str) -> str:
@@ -431,101 +697,44 @@ class ASTExtractor(ast.NodeVisitor):
 
         return _sha256_short(f"other:{type(node).__name__}")
 
-    @staticmethod
-    def _extract_type_context(node) -> dict:
-        """Extract variable-to-type mappings from annotations and assignments.
-
-        Sources:
-        - Parameter annotations: def foo(x: SomeClass) -> {"x": "SomeClass"}
-        - Constructor assignments: x = SomeClass() -> {"x": "SomeClass"}
-        - Annotated assignments: x: SomeClass = ... -> {"x": "SomeClass"}
-        """
-        type_map: dict = {}
-        # Parameter annotations
-        args_node = getattr(node, "args", None)
-        for arg in (args_node.args if args_node else []):
-            if arg.annotation:
-                if isinstance(arg.annotation, ast.Name):
-                    if arg.arg not in ("self", "cls"):
-                        type_map[arg.arg] = arg.annotation.id
-                elif isinstance(arg.annotation, ast.Attribute):
-                    if arg.arg not in ("self", "cls"):
-                        type_map[arg.arg] = arg.annotation.attr
-        # Constructor assignments: x = SomeClass()
-        for child in ast.walk(node):
-            if isinstance(child, ast.Assign):
-                if (isinstance(child.value, ast.Call)
-                        and isinstance(child.value.func, ast.Name)):
-                    for target in child.targets:
-                        if isinstance(target, ast.Name):
-                            type_map[target.id] = child.value.func.id
-            # Annotated assignments: x: SomeClass = ...
-            elif isinstance(child, ast.AnnAssign):
-                if (isinstance(child.target, ast.Name)
-                        and isinstance(child.annotation, ast.Name)):
-                    type_map[child.target.id] = child.annotation.id
-        return type_map
-
-    def _extract_calls(self, node) -> List[str]:
-        """Extract function calls within an AST subtree.
-
-        For self.method()/cls.method() inside a class, emits qualified
-        "ClassName.method" instead of bare "method".
-        Filters out BUILTINS, COMMON_ATTR_METHODS, and stdlib imports.
-        Uses type context to emit qualified names for typed receivers.
-        """
-        calls = []
-        # Enclosing class for self/cls resolution (last scope element)
-        enclosing_class = self._current_scope[-1] if self._current_scope else None
-
-        for child in ast.walk(node):
-            if isinstance(child, ast.Call):
-                if isinstance(child.func, ast.Name):
-                    name = child.func.id
-                    if name not in BUILTINS and name not in self._stdlib_names:
-                        calls.append(name)
-                elif isinstance(child.func, ast.Attribute):
-                    bare = child.func.attr
-                    receiver = None
-                    if isinstance(child.func.value, ast.Name):
-                        receiver = child.func.value.id
-
-                    if receiver in ("self", "cls") and enclosing_class:
-                        # self.bar() inside class Foo -> "Foo.bar"
-                        calls.append(f"{enclosing_class}.{bare}")
-                    elif receiver and receiver in self._stdlib_names:
-                        # Skip stdlib calls: json.dumps(), os.path.join(), etc.
-                        continue
-                    elif receiver and receiver in self._type_context:
-                        # Type-qualified: always emit even for COMMON_ATTR_METHODS
-                        # (type context makes the edge precise, not noisy)
-                        class_name = self._type_context[receiver]
-                        if class_name in self._external_type_names:
-                            continue  # Skip external library type methods
-                        calls.append(f"{class_name}.{bare}")
-                    elif receiver and receiver in self._module_type_context:
-                        # Module-level type context: x = SomeClass() → x.method()
-                        class_name = self._module_type_context[receiver]
-                        if class_name in self._external_type_names:
-                            continue
-                        calls.append(f"{class_name}.{bare}")
-                    elif bare not in BUILTINS and bare not in COMMON_ATTR_METHODS:
-                        if receiver and receiver not in BUILTINS:
-                            calls.append(f"{receiver}.{bare}")
-                        else:
-                            # Bare function call via unknown receiver — add
-                            # unqualified name only when there's no receiver
-                            calls.append(bare)
-        return calls
-
-    @staticmethod
-    def _extract_uses(node) -> List[str]:
-        """Extract all Name references with Load context."""
-        uses = []
-        for child in ast.walk(node):
-            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
-                uses.append(child.id)
-        return uses
+    def _call_name(self, func, enclosing_class: Optional[str], type_context: dict) -> Optional[str]:
+        """Graph name for a call target, or None if it should be skipped."""
+        if isinstance(func, ast.Name):
+            name = func.id
+            if name not in BUILTINS and name not in self._stdlib_names:
+                return name
+        elif isinstance(func, ast.Attribute):
+            bare = func.attr
+            receiver = None
+            if isinstance(func.value, ast.Name):
+                receiver = func.value.id
+
+            if receiver in ("self", "cls") and enclosing_class:
+                # self.bar() inside class Foo -> "Foo.bar"
+                return f"{enclosing_class}.{bare}"
+            elif receiver and receiver in self._stdlib_names:
+                # Skip stdlib calls: json.dumps(), os.path.join(), etc.
+                return None
+            elif receiver and receiver in type_context:
+                # Type-qualified: always emit even for COMMON_ATTR_METHODS
+                # (type context makes the edge precise, not noisy)
+                class_name = type_context[receiver]
+                if class_name in self._external_type_names:
+                    return None  # Skip external library type methods
+                return f"{class_name}.{bare}"
+            elif receiver and receiver in self._module_type_context:
+                # Module-level type context: x = SomeClass() → x.method()
+                class_name = self._module_type_context[receiver]
+                if class_name in self._external_type_names:
+                    return None
+                return f"{class_name}.{bare}"
+            elif bare not in BUILTINS and bare not in COMMON_ATTR_METHODS:
+                if receiver and receiver not in BUILTINS:
+                    return f"{receiver}.{bare}"
+                # Bare function call via unknown receiver — add
+                # unqualified name only when there's no receiver
+                return bare
+        return None
 
 
 def extract(source: str) -> List[ASTEntity]:
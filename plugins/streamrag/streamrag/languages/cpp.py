@@ -4,7 +4,8 @@ import re
 from typing import Dict, FrozenSet, List, Tuple
 
 from streamrag.languages.builtins import CPP_BUILTINS, CPP_COMMON_METHODS
-from streamrag.languages.regex_base import RegexExtractor
+from streamrag.languages.lexer import CPP_GRAMMAR
+from streamrag.languages.regex_base import ANY_OFFSET, RegexExtractor, anchored
 
 
 class CppExtractor(RegexExtractor):
@@ -23,26 +24,12 @@ class CppExtractor(RegexExtractor):
 
     # ── Comment/string stripping (C++ has no backtick strings) ──────────
 
-    _CPP_STRIP_PATTERN = re.compile(
-        r'(?:'
-        r'//[^\n]*'               # line comment
-        r'|/\*[\s\S]*?\*/'        # block comment
-        r"|'(?:[^'\\]|\\.)*'"     # char literal
-        r'|"(?:[^"\\]|\\.)*"'     # string literal
-        r'|R"([^(]*)\([\s\S]*?\)\1"'  # raw string R"delim(...)delim"
-        r')',
-        re.MULTILINE,
-    )
-
-    def _strip_comments_and_strings(self, source: str) -> str:
-        def _replace(m: re.Match) -> str:
-            return re.sub(r'[^\n]', ' ', m.group(0))
-        return self._CPP_STRIP_PATTERN.sub(_replace, source)
+    _GRAMMAR = CPP_GRAMMAR
 
     # ── Declaration patterns ────────────────────────────────────────────
 
     # Function: return_type name(params) { or ;
-    _FUNC_PATTERN = re.compile(
+    _FUNC_PATTERN = anchored(re.compile(
         r'(?:template\s*<[^>]*>\s*)?'
         r'(?:(?:static|inline|virtual|explicit|constexpr|consteval|extern)\s+)*'
         r'(?:[\w:*&<>]+\s+)+?'
@@ -51,16 +38,16 @@ class CppExtractor(RegexExtractor):
         r'(?:override\s*|final\s*)*'
         r'(?:\{|;)',
         re.MULTILINE,
-    )
+    ), ANY_OFFSET)
 
     # Constructor/destructor: ClassName(params) or ~ClassName()
-    _CTOR_PATTERN = re.compile(
+    _CTOR_PATTERN = anchored(re.compile(
         r'(?:explicit\s+)?~?(?P<name>[A-Z]\w*)\s*\([^)]*\)\s*'
         r'(?::\s*[^{;]*?)?\s*\{',
         re.MULTILINE,
-    )
+    ), ANY_OFFSET)
 
-    _CLASS_PATTERN = re.compile(
+    _CLASS_PATTERN = anchored(re.compile(
         r'(?:template\s*<[^>]*>\s*)?'
         r'class\s+(?P<name>[A-Z]\w*)\s*'
         r'(?:final\s*)?'
@@ -69,9 +56,9 @@ class CppExtractor(RegexExtractor):
         r'(?:\s*,\s*(?:(?:public|private|protected)\s+)?[A-Za-z_]\w*'
         r'(?:\s*<[^>]*>)?)*))?\s*\{',
         re.MULTILINE,
-    )
+    ), "template", "class")
 
-    _STRUCT_PATTERN = re.compile(
+    _STRUCT_PATTERN = anchored(re.compile(
         r'(?:template\s*<[^>]*>\s*)?'
         r'struct\s+(?P<name>[A-Z]\w*)\s*'
         r'(?:final\s*)?'
@@ -80,28 +67,28 @@ class CppExtractor(RegexExtractor):
         r'(?:\s*,\s*(?:(?:public|private|protected)\s+)?[A-Za-z_]\w*'
         r'(?:\s*<[^>]*>)?)*))?\s*\{',
         re.MULTILINE,
-    )
+    ), "template", "struct")
 
-    _ENUM_PATTERN = re.compile(
+    _ENUM_PATTERN = anchored(re.compile(
         r'enum\s+(?:class\s+)?(?P<name>[A-Z]\w*)\s*'
         r'(?::\s*\w+\s*)?\{',
         re.MULTILINE,
-    )
+    ), "enum")
 
-    _NAMESPACE_PATTERN = re.compile(
+    _NAMESPACE_PATTERN = anchored(re.compile(
         r'namespace\s+(?P<name>[A-Za-z_]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), "namespace")
 
-    _USING_ALIAS_PATTERN = re.compile(
+    _USING_ALIAS_PATTERN = anchored(re.compile(
         r'using\s+(?P<name>[A-Za-z_]\w*)\s*=',
         re.MULTILINE,
-    )
+    ), "using")
 
-    _TYPEDEF_PATTERN = re.compile(
+    _TYPEDEF_PATTERN = anchored(re.compile(
         r'typedef\s+.*?\s+(?P<name>[A-Za-z_]\w*)\s*;',
         re.MULTILINE,
-    )
+    ), "typedef")
 
     def _get_declaration_patterns(self) -> Dict[str, List[re.Pattern]]:
         return {
@@ -113,18 +100,18 @@ class CppExtractor(RegexExtractor):
 
     # ── Import patterns ─────────────────────────────────────────────────
 
-    _INCLUDE_LOCAL = re.compile(
+    _INCLUDE_LOCAL = anchored(re.compile(
         r'#\s*include\s+"(?P<path>[^"]+)"',
         re.MULTILINE,
-    )
-    _INCLUDE_SYSTEM = re.compile(
+    ), "#")
+    _INCLUDE_SYSTEM = anchored(re.compile(
         r'#\s*include\s+<(?P<path>[^>]+)>',
         re.MULTILINE,
-    )
-    _USING_NS = re.compile(
+    ), "#")
+    _USING_NS = anchored(re.compile(
         r'using\s+namespace\s+(?P<name>[A-Za-z_]\w*(?:::[A-Za-z_]\w*)*)\s*;',
         re.MULTILINE,
-    )
+    ), "using")
 
     def _get_import_patterns(self) -> List[re.Pattern]:
         return [self._INCLUDE_LOCAL, self._INCLUDE_SYSTEM, self._USING_NS]
@@ -1,10 +1,43 @@
 """Language extractor registry and factory."""
 
-from typing import Dict, List, Optional
+import importlib
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
 
 from streamrag.languages.base import LanguageExtractor
 
 
+class _LazyExtractor(NamedTuple):
+    """An extractor class not imported yet, keyed by the suffixes it handles."""
+    language_id: str
+    module: str
+    class_name: str
+    extensions: Sequence[str]
+
+
+# Built-in languages: (language_id, module, class, extensions). The
+# extensions mirror each extractor's supported_extensions so files can be
+# routed without importing the module.
+_BUILTIN_EXTRACTORS = (
+    ("python", "streamrag.languages.python", "PythonExtractor", (".py", ".pyi")),
+    ("typescript", "streamrag.languages.typescript", "TypeScriptExtractor", (".ts", ".tsx")),
+    ("javascript", "streamrag.languages.javascript", "JavaScriptExtractor",
+     (".js", ".jsx", ".mjs", ".cjs")),
+    ("rust", "streamrag.languages.rust", "RustExtractor", (".rs",)),
+    ("cpp", "streamrag.languages.cpp", "CppExtractor",
+     (".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx", ".h")),
+    ("c", "streamrag.languages.c", "CExtractor", (".c",)),
+    ("java", "streamrag.languages.java", "JavaExtractor", (".java",)),
+)
+
+
+def _suffix(file_path: str) -> str:
+    """Extension including the dot ("" if none): "src/a.test.ts" -> ".ts"."""
+    dot = file_path.rfind(".")
+    if dot < 0 or dot < max(file_path.rfind("/"), file_path.rfind("\\")):
+        return ""
+    return file_path[dot:]
+
+
 class ExtractorRegistry:
     """Registry for language extractors.
 
@@ -12,28 +45,63 @@ class ExtractorRegistry:
         registry = ExtractorRegistry()
         registry.register(PythonExtractor())
         extractor = registry.get_extractor("main.py")
+
+    register_lazy() records an extractor by module and class name; it is
+    imported and instantiated the first time a file with one of its
+    extensions is looked up.
     """
 
     def __init__(self) -> None:
         self._extractors: List[LanguageExtractor] = []
-        self._extension_cache: Dict[str, LanguageExtractor] = {}
+        self._languages: List[Union[LanguageExtractor, _LazyExtractor]] = []
+        self._extension_cache: Dict[str, Union[LanguageExtractor, _LazyExtractor]] = {}
+        # Registered extensions that are not a plain suffix (".d.ts", "Makefile")
+        self._compound: List[str] = []
 
     def register(self, extractor: LanguageExtractor) -> None:
         """Register a language extractor."""
         self._extractors.append(extractor)
-        for ext in extractor.supported_extensions:
-            self._extension_cache[ext] = extractor
+        self._languages.append(extractor)
+        self._add_extensions(extractor.supported_extensions, extractor)
+
+    def register_lazy(
+        self, language_id: str, module: str, class_name: str, extensions: Sequence[str]
+    ) -> None:
+        """Register an extractor to import on first use.
+
+        The extractor must handle exactly these extensions: until it is
+        loaded, files are matched by suffix only (no can_handle call).
+        """
+        lazy = _LazyExtractor(language_id, module, class_name, tuple(extensions))
+        self._languages.append(lazy)
+        self._add_extensions(lazy.extensions, lazy)
+
+    def _add_extensions(
+        self, extensions: Sequence[str], entry: Union[LanguageExtractor, _LazyExtractor]
+    ) -> None:
+        for ext in extensions:
+            self._extension_cache[ext] = entry
+            if _suffix(ext) != ext and ext not in self._compound:
+                self._compound.append(ext)
 
     def get_extractor(self, file_path: str) -> Optional[LanguageExtractor]:
         """Find the appropriate extractor for a file.
 
         Strategy:
-        1. Fast path: check extension cache
-        2. Slow path: call can_handle on each registered extractor
+        1. Fast path: look the file's suffix up in the extension cache
+           (compound extensions like ".d.ts" are checked first)
+        2. Slow path: call can_handle on each loaded extractor
         """
-        for ext, extractor in self._extension_cache.items():
+        key = _suffix(file_path)
+        for ext in self._compound:
             if file_path.endswith(ext):
-                return extractor
+                key = ext
+                break
+        extractor = self._extension_cache.get(key)
+        if isinstance(extractor, _LazyExtractor):
+            extractor = self._load(extractor)
+        if extractor is not None:
+            return extractor
 
         for extractor in self._extractors:
             if extractor.can_handle(file_path):
@@ -41,30 +109,36 @@ class ExtractorRegistry:
 
         return None
 
+    def _load(self, lazy: _LazyExtractor) -> LanguageExtractor:
+        """Import and instantiate a lazy extractor in place of its entry."""
+        cls = getattr(importlib.import_module(lazy.module), lazy.class_name)
+        extractor = cls()
+        self._extractors.append(extractor)
+        self._languages[self._languages.index(lazy)] = extractor
+        for ext, entry in self._extension_cache.items():
+            if entry is lazy:
+                self._extension_cache[ext] = extractor
+        return extractor
+
     @property
-    def supported_languages(self) -> List[str]:
+    def loaded_languages(self) -> List[str]:
+        """Languages whose extractor has been imported so far."""
         return [e.language_id for e in self._extractors]
 
+    @property
+    def supported_languages(self) -> List[str]:
+        return [e.language_id for e in self._languages]
+
     def can_handle(self, file_path: str) -> bool:
+        if _suffix(file_path) in self._extension_cache or any(
+                file_path.endswith(ext) for ext in self._compound):
+            return True  # No need to import a lazy extractor just to say yes
         return self.get_extractor(file_path) is not None
 
 
 def create_default_registry() -> ExtractorRegistry:
-    """Create a registry with all built-in extractors."""
-    from streamrag.languages.python import PythonExtractor
-    from streamrag.languages.typescript import TypeScriptExtractor
-    from streamrag.languages.javascript import JavaScriptExtractor
-    from streamrag.languages.rust import RustExtractor
-    from streamrag.languages.cpp import CppExtractor
-    from streamrag.languages.c import CExtractor
-    from streamrag.languages.java import JavaExtractor
-
+    """Create a registry with all built-in extractors (imported on first use)."""
     registry = ExtractorRegistry()
-    registry.register(PythonExtractor())
-    registry.register(TypeScriptExtractor())
-    registry.register(JavaScriptExtractor())
-    registry.register(RustExtractor())
-    registry.register(CppExtractor())
-    registry.register(CExtractor())
-    registry.register(JavaExtractor())
+    for language_id, module, class_name, extensions in _BUILTIN_EXTRACTORS:
+        registry.register_lazy(language_id, module, class_name, extensions)
     return registry
@@ -0,0 +1,242 @@
+"""Crate module tree for Rust files.
+
+Built the way rustc finds modules: a crate root is a file where Cargo
+looks for a target (src/lib.rs, src/main.rs, src/bin/*.rs,
+src/bin/*/main.rs, and build.rs or a file directly under tests/,
+examples/ or benches/ outside src/) and is module `crate`. `mod foo;`
+in a module file declares a child that lives in
+
+- "<dir>/foo.rs" or "<dir>/foo/mod.rs", where <dir> is the declaring
+  file's directory for crate roots and mod.rs files, and the declaring
+  file's path without ".rs" otherwise ("src/net.rs" -> "src/net/")
+
+Each file maps to (crate root, module path) and back, so a `use` path
+resolves with dict lookups:
+
+- "crate::a::b" from the crate root
+- "self::a", "super::super::a" from the using file's module
+- "a::b" from the using module when it declares `mod a`, else from the
+  crate root; otherwise it names an external crate (not indexed)
+
+A file a `mod` line claims is that module even where Cargo would also
+see a target root ("tests/common.rs" under `mod common;`). Segments
+past the last module file are inline modules (`mod a { ... }`) of that
+file. The tree is updated in place: a changed `mod` line
+attaches or detaches that child's subtree only, and the files it moved
+are kept for pop_moved() so their `use` edges can be re-resolved.
+"""
+
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CRATE_ROOT_NAMES = ("lib.rs", "main.rs", "build.rs")
+_TARGET_DIRS = ("examples", "tests", "benches")  # Package-level target directories
+
+Module = Tuple[str, Tuple[str, ...]]  # (crate root file, path segments)
+
+
+def is_rust(file_path: str) -> bool:
+    return file_path.endswith(".rs")
+
+
+def is_crate_root(file_path: str) -> bool:
+    """Whether file_path sits where Cargo looks for a target's root file."""
+    *dirs, name = file_path.split("/")
+    if dirs[-1:] == ["src"]:
+        return name in ("lib.rs", "main.rs")
+    if dirs[-2:] == ["src", "bin"]:
+        return True
+    if dirs[-3:-1] == ["src", "bin"]:
+        return name == "main.rs"
+    if "src" in dirs:
+        return False  # Package-level targets never live under src/
+    return name == "build.rs" or (bool(dirs) and dirs[-1] in _TARGET_DIRS)
+
+
+def dotted_module(path: str) -> str:
+    """'crate::a::b' -> 'a.b': a use path as a module-file-index key."""
+    return ".".join(s for s in path.split("::") if s and s not in ("crate", "self", "super"))
+
+
+class RustModuleIndex:
+    """File <-> (crate root, module path), from `mod` declarations and layout."""
+
+    def __init__(self) -> None:
+        self._files: Set[str] = set()
+        self._mods: Dict[str, List[str]] = {}  # file -> `mod` names it declares
+        self._module_of: Dict[str, Module] = {}
+        self._file_of: Dict[Module, str] = {}
+        self._roots: Dict[str, Set[str]] = {}  # directory -> crate roots attached there
+        self._moved: Set[str] = set()  # files attached/detached since pop_moved()
+
+    # ---- files ---------------------------------------------------------
+
+    def add_file(self, file_path: str) -> None:
+        if file_path in self._files:
+            return
+        self._files.add(file_path)
+        if not self._attach_to_parent(file_path) and is_crate_root(file_path):
+            self._attach(file_path, (file_path, ()))
+
+    def _attach_to_parent(self, file_path: str) -> bool:
+        """Attach file_path under an indexed module whose `mod` line claims it."""
+        if file_path == "mod.rs" or file_path.endswith("/mod.rs"):
+            directory = posixpath.dirname(posixpath.dirname(file_path))
+            name = posixpath.basename(posixpath.dirname(file_path))
+        else:
+            directory = posixpath.dirname(file_path)
+            name = posixpath.basename(file_path)[:-3]
+        parents = [posixpath.join(directory, base) for base in ("mod.rs",) + CRATE_ROOT_NAMES]
+        if directory:
+            parents.append(directory + ".rs")
+        parents.extend(sorted(self._roots.get(directory, ())))
+        for parent in parents:
+            module = self._module_of.get(parent)
+            if module is not None and name in self._mods.get(parent, ()) \
+                    and self._child_file(parent, name) == file_path:
+                self._attach(file_path, (module[0], module[1] + (name,)))
+                return True
+        return False
+
+    def remove_file(self, file_path: str) -> None:
+        self._files.discard(file_path)
+        self._release(file_path)
+        self._mods.pop(file_path, None)
+
+    def set_mods(self, file_path: str, names: Iterable[str]) -> None:
+        """Replace the `mod` declarations of a file, re-linking its children."""
+        names = sorted(set(names))
+        old = self._mods.get(file_path, [])
+        if names == old:
+            return
+        module = self._module_of.get(file_path)
+        if module is not None:
+            for name in set(old) - set(names):
+                child = self._file_of.get((module[0], module[1] + (name,)))
+                if child is not None:
+                    self._release(child)
+        if names:
+            self._mods[file_path] = names
+        else:
+            self._mods.pop(file_path, None)
+        if module is not None:
+            for name in set(names) - set(old):
+                self._attach_child(file_path, module, name)
+
+    def pop_moved(self) -> Set[str]:
+        """Indexed files whose module path changed since the last call."""
+        moved = self._moved & self._files
+        self._moved = set()
+        return moved
+
+    # ---- tree ----------------------------------------------------------
+
+    def _child_file(self, file_path: str, name: str) -> Optional[str]:
+        """File of `mod name;` declared in file_path, if indexed."""
+        module = self._module_of.get(file_path)
+        if (module is not None and not module[1]) or posixpath.basename(file_path) == "mod.rs":
+            directory = posixpath.dirname(file_path)
+        else:
+            directory = file_path[:-3]
+        for candidate in (posixpath.join(directory, name + ".rs"),
+                          posixpath.join(directory, name, "mod.rs")):
+            if candidate in self._files:
+                return candidate
+        return None
+
+    def _attach_child(self, file_path: str, module: Module, name: str) -> None:
+        child = self._child_file(file_path, name)
+        if child is None or child == module[0]:
+            return
+        current = self._module_of.get(child)
+        if current == (child, ()):
+            self._detach(child)  # Claimed by a `mod` line: a module, not a crate root
+        elif current is not None:
+            return
+        self._attach(child, (module[0], module[1] + (name,)))
+
+    def _attach(self, file_path: str, module: Module) -> None:
+        if module in self._file_of:
+            return
+        self._module_of[file_path] = module
+        self._file_of[module] = file_path
+        if not module[1]:
+            self._roots.setdefault(posixpath.dirname(file_path), set()).add(file_path)
+        self._moved.add(file_path)
+        for name in self._mods.get(file_path, ()):
+            self._attach_child(file_path, module, name)
+
+    def _detach(self, file_path: str) -> List[str]:
+        """Detach file_path and its subtree; returns the detached files."""
+        module = self._module_of.pop(file_path, None)
+        if module is None:
+            return []
+        del self._file_of[module]
+        if not module[1]:
+            roots = self._roots[posixpath.dirname(file_path)]
+            roots.discard(file_path)
+            if not roots:
+                del self._roots[posixpath.dirname(file_path)]
+        self._moved.add(file_path)
+        detached = [file_path]
+        for name in self._mods.get(file_path, ()):
+            child = self._file_of.get((module[0], module[1] + (name,)))
+            if child is not None:
+                detached.extend(self._detach(child))
+        return detached
+
+    def _release(self, file_path: str) -> None:
+        """Detach a subtree; its files laid out as crate roots become roots again."""
+        for detached in self._detach(file_path):
+            if detached in self._files and is_crate_root(detached) \
+                    and detached not in self._module_of:
+                self._attach(detached, (detached, ()))
+
+    # ---- resolution ----------------------------------------------------
+
+    def module_of(self, file_path: str) -> Optional[Module]:
+        return self._module_of.get(file_path)
+
+    def resolve_path(self, path: str, from_file: str) -> Optional[Tuple[str, List[str]]]:
+        """(file, inline module segments) a `use` path's module names, or None."""
+        current = self._module_of.get(from_file)
+        segments = [s for s in path.split("::") if s]
+        if current is None or not segments:
+            return None
+        root, module = current
+        if segments[0] == "crate":
+            module = ()
+            segments = segments[1:]
+        elif segments[0] in ("self", "super"):
+            while segments and segments[0] in ("self", "super"):
+                if segments[0] == "super":
+                    if not module:
+                        return None
+                    module = module[:-1]
+                segments = segments[1:]
+        elif segments[0] not in self._mods.get(from_file, ()):
+            if segments[0] not in self._mods.get(root, ()):
+                return None  # An external crate
+            module = ()
+        target = module + tuple(segments)
+        for cut in range(len(target), -1, -1):
+            file_path = self._file_of.get((root, target[:cut]))
+            if file_path is not None:
+                return file_path, list(target[cut:])
+        return None
+
+    def copy(self) -> "RustModuleIndex":
+        clone = RustModuleIndex()
+        clone._files = set(self._files)
+        clone._mods = {k: list(v) for k, v in self._mods.items()}
+        clone._module_of = dict(self._module_of)
+        clone._file_of = dict(self._file_of)
+        clone._roots = {k: set(v) for k, v in self._roots.items()}
+        return clone
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "files": len(self._files),
+            "crates": sum(1 for _, path in self._file_of if not path),
+            "modules": len(self._file_of),
+        }
@@ -0,0 +1,305 @@
+"""Module-resolution index for TypeScript and JavaScript imports.
+
+Maps an import specifier to the file it names, the way the TypeScript
+compiler does, with dict lookups only:
+
+- relative specifiers ("./api", "../shared") against the importer's
+  directory
+- tsconfig/jsconfig "paths" aliases ("@app/*" -> "src/app/*"), longest
+  prefix first, then "baseUrl"
+- a module path matches "<path>.ts", ".tsx", ".d.ts", ".js", ".jsx",
+  ".mjs", ".cjs" (in that order), then "<path>/index.*"
+
+The config that applies to a file is the nearest tsconfig.json (or
+jsconfig.json) above it, with relative "extends" chains merged.
+
+For barrel files the index also keeps, per file, where each imported or
+re-exported name comes from and which modules it re-exports with
+`export *`. The bridge follows those from a resolved file to the file
+that defines a name (reexport_sources), instead of scanning the graph.
+"""
+
+import json
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+TS_FAMILY_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+# Resolution order for an extensionless specifier
+_EXTENSION_ORDER = (".ts", ".tsx", ".d.ts", ".js", ".jsx", ".mjs", ".cjs")
+CONFIG_NAMES = ("tsconfig.json", "jsconfig.json")
+MAX_EXTENDS = 8
+
+
+def is_ts_family(file_path: str) -> bool:
+    return file_path.endswith(TS_FAMILY_EXTENSIONS)
+
+
+def is_ts_config(file_path: str) -> bool:
+    """tsconfig.json, jsconfig.json and variants like tsconfig.base.json."""
+    name = posixpath.basename(file_path.replace("\\", "/"))
+    return name.endswith(".json") and name.startswith(("tsconfig", "jsconfig"))
+
+
+def parse_jsonc(text: str) -> dict:
+    """Parse tsconfig-style JSON: comments and trailing commas allowed.
+
+    Returns {} for anything that is not a JSON object.
+    """
+    out = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == '"':
+            j = i + 1
+            while j < n and text[j] != '"':
+                j += 2 if text[j] == "\\" else 1
+            out.append(text[i:j + 1])
+            i = j + 1
+        elif text.startswith("//", i):
+            i = text.find("\n", i)
+            i = n if i < 0 else i
+        elif text.startswith("/*", i):
+            i = text.find("*/", i + 2)
+            i = n if i < 0 else i + 2
+        elif ch in "}]":
+            # Drop a trailing comma before the closing bracket
+            k = len(out) - 1
+            while k >= 0 and out[k].isspace():
+                k -= 1
+            if k >= 0 and out[k] == ",":
+                del out[k]
+            out.append(ch)
+            i += 1
+        else:
+            out.append(ch)
+            i += 1
+    try:
+        data = json.loads("".join(out))
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _split_module(file_path: str) -> Tuple[str, int]:
+    """'src/a.tsx' -> ('src/a', 1): module path and extension rank."""
+    for rank, ext in sorted(enumerate(_EXTENSION_ORDER), key=lambda item: -len(item[1])):
+        if file_path.endswith(ext):
+            return file_path[:-len(ext)], rank
+    return file_path, len(_EXTENSION_ORDER)
+
+
+def _join(base: str, path: str) -> str:
+    joined = posixpath.normpath(posixpath.join(base, path))
+    return "" if joined == "." else joined
+
+
+class TSModuleIndex:
+    """Specifier -> file resolution plus per-file import/re-export maps."""
+
+    def __init__(self) -> None:
+        self._files: Set[str] = set()
+        # module path -> {(is_index, extension rank, file)}
+        self._modules: Dict[str, Set[Tuple[int, int, str]]] = {}
+        self.configs: Dict[str, dict] = {}  # config path -> parsed JSON
+        self._config_dirs: Dict[str, str] = {}  # directory -> its tsconfig/jsconfig
+        self._options: Dict[str, Tuple[Optional[str], list]] = {}  # per config, lazy
+        self._imports: Dict[str, Dict[str, str]] = {}  # file -> {name: specifier}
+        self._stars: Dict[str, List[str]] = {}  # file -> `export *` specifiers
+
+    # ---- files ---------------------------------------------------------
+
+    def add_file(self, file_path: str) -> None:
+        if file_path in self._files:
+            return
+        self._files.add(file_path)
+        for key, entry in self._module_keys(file_path):
+            self._modules.setdefault(key, set()).add(entry)
+
+    def remove_file(self, file_path: str) -> None:
+        self.set_imports(file_path, [])
+        if file_path not in self._files:
+            return
+        self._files.discard(file_path)
+        for key, entry in self._module_keys(file_path):
+            entries = self._modules.get(key)
+            if entries is not None:
+                entries.discard(entry)
+                if not entries:
+                    del self._modules[key]
+
+    @staticmethod
+    def _module_keys(file_path: str) -> List[Tuple[str, Tuple[int, int, str]]]:
+        module, rank = _split_module(file_path)
+        keys = [(module, (0, rank, file_path))]
+        if posixpath.basename(module) == "index":
+            keys.append((posixpath.dirname(module), (1, rank, file_path)))
+        return keys
+
+    def set_imports(self, file_path: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Record (specifier, name) imports and re-exports of a file; '*' = export *."""
+        names: Dict[str, str] = {}
+        stars: List[str] = []
+        for specifier, name in pairs:
+            if name == "*":
+                stars.append(specifier)
+            else:
+                names[name] = specifier
+        if names:
+            self._imports[file_path] = names
+        else:
+            self._imports.pop(file_path, None)
+        if stars:
+            self._stars[file_path] = stars
+        else:
+            self._stars.pop(file_path, None)
+
+    # ---- configs -------------------------------------------------------
+
+    def set_config(self, config_path: str, config: dict) -> None:
+        """Add or replace a parsed tsconfig/jsconfig (path relative to the project)."""
+        self.configs[config_path] = config
+        if posixpath.basename(config_path) in CONFIG_NAMES:
+            directory = posixpath.dirname(config_path)
+            current = self._config_dirs.get(directory)
+            if current is None or posixpath.basename(config_path) == CONFIG_NAMES[0]:
+                self._config_dirs[directory] = config_path
+        self._options.clear()
+
+    def remove_config(self, config_path: str) -> None:
+        if self.configs.pop(config_path, None) is None:
+            return
+        directory = posixpath.dirname(config_path)
+        if self._config_dirs.get(directory) == config_path:
+            del self._config_dirs[directory]
+            for name in CONFIG_NAMES:
+                other = posixpath.join(directory, name)
+                if other in self.configs:
+                    self._config_dirs[directory] = other
+                    break
+        self._options.clear()
+
+    def config_for(self, file_path: str) -> Optional[str]:
+        """Nearest tsconfig.json/jsconfig.json above file_path."""
+        directory = posixpath.dirname(file_path)
+        while True:
+            config = self._config_dirs.get(directory)
+            if config is not None:
+                return config
+            if not directory or directory == "/":
+                return None
+            directory = posixpath.dirname(directory)
+
+    def _compiler_options(self, config_path: str) -> Tuple[Optional[str], list]:
+        """(baseUrl dir, [(prefix, suffix, wildcard, targets, base dir)]) for a config."""
+        cached = self._options.get(config_path)
+        if cached is not None:
+            return cached
+        base_url: Optional[str] = None
+        paths: Optional[dict] = None
+        paths_dir = ""
+        chain = []
+        current: Optional[str] = config_path
+        while current is not None and current in self.configs and len(chain) < MAX_EXTENDS:
+            chain.append(current)
+            extends = self.configs[current].get("extends")
+            current = None
+            if isinstance(extends, str) and extends.startswith("."):
+                target = _join(posixpath.dirname(chain[-1]), extends)
+                current = target if target.endswith(".json") else target + ".json"
+                if current in chain:
+                    current = None
+        # Nearest config wins: walk the chain child first
+        for path in chain:
+            options = self.configs[path].get("compilerOptions") or {}
+            if base_url is None and isinstance(options.get("baseUrl"), str):
+                base_url = _join(posixpath.dirname(path), options["baseUrl"])
+            if paths is None and isinstance(options.get("paths"), dict):
+                paths = options["paths"]
+                paths_dir = posixpath.dirname(path)
+        patterns = []
+        for pattern, targets in (paths or {}).items():
+            if not isinstance(targets, list):
+                continue
+            targets = [t for t in targets if isinstance(t, str)]
+            wildcard = "*" in pattern
+            prefix, _, suffix = pattern.partition("*")
+            patterns.append((prefix, suffix, wildcard, targets,
+                             base_url if base_url is not None else paths_dir))
+        patterns.sort(key=lambda p: (not p[2], len(p[0])), reverse=True)
+        result = (base_url, patterns)
+        self._options[config_path] = result
+        return result
+
+    # ---- resolution ----------------------------------------------------
+
+    def _lookup(self, module_path: str) -> Optional[str]:
+        if module_path in self._files:
+            return module_path
+        entries = self._modules.get(module_path)
+        if not entries:
+            module, rank = _split_module(module_path)
+            if rank == len(_EXTENSION_ORDER):
+                return None
+            entries = self._modules.get(module)  # "./a.js" written for a.ts
+            if not entries:
+                return None
+        return min(entries)[2]
+
+    def resolve(self, specifier: str, importer: str) -> Optional[str]:
+        """Indexed file that specifier names from importer, or None (packages)."""
+        if not specifier:
+            return None
+        if specifier.startswith(("./", "../")) or specifier in (".", ".."):
+            return self._lookup(_join(posixpath.dirname(importer), specifier))
+        config = self.config_for(importer)
+        if config is None:
+            return None
+        base_url, patterns = self._compiler_options(config)
+        for prefix, suffix, wildcard, targets, base in patterns:
+            if wildcard:
+                if (len(specifier) < len(prefix) + len(suffix)
+                        or not specifier.startswith(prefix) or not specifier.endswith(suffix)):
+                    continue
+                star = specifier[len(prefix):len(specifier) - len(suffix)]
+            elif specifier != prefix:
+                continue
+            else:
+                star = ""
+            for target in targets:
+                found = self._lookup(_join(base, target.replace("*", star, 1)))
+                if found is not None:
+                    return found
+        if base_url is not None:
+            return self._lookup(_join(base_url, specifier))
+        return None
+
+    def reexport_sources(self, file_path: str, name: str) -> List[str]:
+        """Files name may come from when file_path imports or re-exports it."""
+        sources = []
+        specifier = self._imports.get(file_path, {}).get(name)
+        if specifier is not None:
+            found = self.resolve(specifier, file_path)
+            if found is not None:
+                sources.append(found)
+        for specifier in self._stars.get(file_path, ()):
+            found = self.resolve(specifier, file_path)
+            if found is not None:
+                sources.append(found)
+        return sources
+
+    def copy(self) -> "TSModuleIndex":
+        clone = TSModuleIndex()
+        clone._files = set(self._files)
+        clone._modules = {k: set(v) for k, v in self._modules.items()}
+        clone.configs = dict(self.configs)
+        clone._config_dirs = dict(self._config_dirs)
+        clone._imports = {k: dict(v) for k, v in self._imports.items()}
+        clone._stars = {k: list(v) for k, v in self._stars.items()}
+        return clone
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "files": len(self._files),
+            "configs": len(self.configs),
+            "barrels": len(self._stars),
+        }
@@ -1,10 +1,12 @@
-"""Shadow AST: handles broken/incomplete code via binary search + regex fallback."""
+"""Shadow AST: handles broken/incomplete code via SyntaxError-guided isolation + regex fallback."""
 
 import ast
 import re
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+from streamrag.incremental_extractor import IncrementalExtractor, source_lines
 from streamrag.models import ASTEntity
 
 
@@ -30,81 +32,250 @@ CLASS_PATTERN = re.compile(r"^\s*class\s+(\w+)\s*(\([^)]*\))?:?", re.MULTILINE)
 IMPORT_PATTERN = re.compile(r"^\s*(from\s+[\w.]+\s+)?import\s+", re.MULTILINE)
 
 
+# Column-0 lines that continue the statement above them
+_CONTINUATION = re.compile(r"(?:else|elif|except|finally)\b|[)\]}]")
+_TRIPLE_QUOTE = re.compile(r'"""|\'\'\'')
+_CACHE_KEY = "<shadow>"
+
+
+def _top_level_blocks(lines: List[str]) -> List[int]:
+    """First line (1-indexed) of each top-level statement, found by indentation.
+
+    A statement starts at a column-0 line that is not blank, a comment, a
+    closing bracket or an else/elif/except/finally clause. Decorators stay
+    with what they decorate, and column-0 lines inside triple-quoted
+    strings are skipped. Lines before the first statement belong to it.
+    """
+    starts = [1]
+    decorators_only = False
+    quote: Optional[str] = None
+    for number, line in enumerate(lines, 1):
+        if quote is None and line[:1] not in ("", " ", "\t", "#", "\n", "\r", "\f") \
+                and not _CONTINUATION.match(line):
+            if decorators_only:
+                decorators_only = line.startswith("@")
+            else:
+                if number > 1:
+                    starts.append(number)
+                decorators_only = line.startswith("@")
+        if '"""' not in line and "'''" not in line:
+            continue
+        for m in _TRIPLE_QUOTE.finditer(line):
+            if quote is None:
+                quote = m.group(0)
+            elif m.group(0) == quote:
+                quote = None
+    return starts
+
+
+def _span(starts: List[int], index: int, total_lines: int) -> Tuple[int, int]:
+    """(first, last) line of block index."""
+    end = starts[index + 1] - 1 if index + 1 < len(starts) else total_lines
+    return starts[index], end
+
+
+def _blanked(lines: List[str], starts: List[int], broken: Set[int]) -> str:
+    """Source with the broken blocks' lines emptied: other line numbers stay put."""
+    out = list(lines)
+    for index in broken:
+        start, end = _span(starts, index, len(lines))
+        out[start - 1:end] = ["\n"] * (end - start + 1)
+    return "".join(out)
+
+
+def _syntax_error(text: str) -> Optional[Exception]:
+    try:
+        ast.parse(text)
+    except (SyntaxError, ValueError) as exc:  # ValueError: null bytes
+        return exc
+    return None
+
+
 class ShadowAST:
     """Parse source code with fallback for broken/incomplete code.
 
     Strategy:
-    1. Try full parse. If works -> single VALID region.
-    2. If SyntaxError: binary search for valid regions.
+    1. Extract the whole file. If it parses -> single VALID region.
+    2. If SyntaxError: blank the top-level block holding the error line
+       and extract again, until the rest parses. Each broken block is one
+       INVALID region; the blocks between them form VALID regions.
     3. Regex extraction on invalid regions with confidence scores.
+
+    Extraction goes through an IncrementalExtractor kept on the instance,
+    so re-parsing the next keystroke's source only re-parses the blocks
+    that changed; typing inside a broken block re-uses every valid one.
     """
 
+    def __init__(self) -> None:
+        self._extractor = IncrementalExtractor(max_files=1)
+        # Whether the last source needed isolation (None: nothing parsed yet).
+        # Unless it was valid, parse before extracting: the extractor would
+        # only fail on the same error.
+        self._last_broken: Optional[bool] = None
+        # (lines, block starts, broken indexes) of the last source, if broken
+        self._last_state: Optional[Tuple[List[str], List[int], Set[int]]] = None
+
     def parse(self, source: str) -> List[ParseRegion]:
         """Parse source into a list of ParseRegions."""
         if not source.strip():
             return []
 
-        lines = source.splitlines(keepends=True)
-        total_lines = len(lines)
+        lines = source_lines(source)
+        found = self._isolate_edit(lines) if self._last_broken else None
+        if found is None:
+            found = self._isolate(source, lines)
+        starts, broken, entities = found
+        self._last_broken = bool(broken)
+        self._last_state = (lines, starts, broken) if broken else None
 
-        # Try full parse first
-        try:
-            tree = ast.parse(source)
-            from streamrag.extractor import ASTExtractor
-            entities = ASTExtractor().extract(source)
+        if not broken:
             return [ParseRegion(
-                start_line=1, end_line=total_lines,
+                start_line=1, end_line=len(lines),
                 status=ParseStatus.VALID, entities=entities,
                 confidence=1.0, source=source,
             )]
-        except SyntaxError:
-            pass
+        return self._regions(lines, starts, broken, entities)
 
-        # Binary search for valid regions
-        return self._binary_search_regions(lines, 1, total_lines)
+    def _isolate(
+        self, source: str, lines: List[str]
+    ) -> Tuple[List[int], Set[int], List[ASTEntity]]:
+        """(block starts, broken block indexes, entities of the rest).
 
-    def _binary_search_regions(
-        self, lines: List[str], start: int, end: int
+        Blanks the block each SyntaxError points at until the rest parses:
+        one parse per broken block.
+        """
+        total_lines = len(lines)
+        starts: List[int] = []
+        broken: Set[int] = set()
+        text = source
+        while True:
+            if self._last_broken is not False and not broken:
+                error = _syntax_error(text)
+                entities = self._extractor.extract(text, _CACHE_KEY) if error is None else []
+            else:
+                entities = self._extractor.extract(text, _CACHE_KEY)
+                error = _syntax_error(text) if not entities else None
+            if error is None:
+                return starts, broken, entities
+            if not starts:
+                starts = _top_level_blocks(lines)
+            index = self._blame(error, starts, broken, total_lines)
+            if index is None:
+                return starts, broken, []
+            broken.add(index)
+            text = _blanked(lines, starts, broken)
+
+    def _isolate_edit(
+        self, lines: List[str]
+    ) -> Optional[Tuple[List[int], Set[int], List[ASTEntity]]]:
+        """_isolate for an edit to the last (broken) source, without a full parse.
+
+        Blocks outside the changed lines keep their last status; the one
+        block the edit touched is parsed on its own. None when the edit
+        spans several blocks, nothing is broken any more, or the rest does
+        not parse: the caller then isolates from scratch.
+        """
+        old_lines, old_starts, old_broken = self._last_state
+        old_spans = {_span(old_starts, i, len(old_lines)) for i in old_broken}
+        limit = min(len(old_lines), len(lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_lines[len(old_lines) - 1 - suffix] == lines[len(lines) - 1 - suffix]):
+            suffix += 1
+        changed_end = len(lines) - suffix  # Changed lines: prefix + 1 .. changed_end
+        delta = len(lines) - len(old_lines)
+
+        starts = _top_level_blocks(lines)
+        broken: Set[int] = set()
+        edited = []
+        for index in range(len(starts)):
+            start, end = _span(starts, index, len(lines))
+            if end <= prefix:
+                if (start, end) in old_spans:
+                    broken.add(index)
+            elif start > changed_end:
+                if (start - delta, end - delta) in old_spans:
+                    broken.add(index)
+            else:
+                edited.append(index)
+        if len(edited) > 1:
+            return None
+        for index in edited:
+            start, end = _span(starts, index, len(lines))
+            if _syntax_error("".join(lines[start - 1:end])) is not None:
+                broken.add(index)
+        if not broken:
+            return None
+        entities = self._extractor.extract(_blanked(lines, starts, broken), _CACHE_KEY)
+        if not entities:
+            return None
+        return starts, broken, entities
+
+    @staticmethod
+    def _blame(
+        error: Exception, starts: List[int], broken: Set[int], total_lines: int
+    ) -> Optional[int]:
+        """Index of the top-level block to blank for this error, or None."""
+        lineno = min(max(getattr(error, "lineno", None) or total_lines, 1), total_lines)
+        index = bisect_right(starts, lineno) - 1
+        # "expected an indented block" is reported on the line after the header
+        if isinstance(error, IndentationError) and lineno == starts[index] and index > 0 \
+                and index - 1 not in broken:
+            index -= 1
+        if index not in broken:
+            return index
+        candidates = [i for i in range(len(starts)) if i not in broken]
+        if not candidates:
+            return None
+        before = [i for i in candidates if i < index]
+        return before[-1] if before else candidates[0]
+
+    def _regions(
+        self, lines: List[str], starts: List[int], broken: Set[int],
+        entities: List[ASTEntity],
     ) -> List[ParseRegion]:
-        """Recursively split and parse to find valid/invalid regions."""
-        if start > end:
-            return []
-
-        chunk = "".join(lines[start - 1:end])
-
-        # Try parsing this chunk
-        try:
-            ast.parse(chunk)
-            from streamrag.extractor import ASTExtractor
-            entities = ASTExtractor().extract(chunk)
-            # Adjust line numbers to absolute positions
-            for e in entities:
-                e.line_start += start - 1
-                e.line_end += start - 1
-            return [ParseRegion(
-                start_line=start, end_line=end,
-                status=ParseStatus.VALID, entities=entities,
-                confidence=1.0, source=chunk,
-            )]
-        except SyntaxError:
-            pass
-
-        # Base case: single line
-        if start == end:
-            entities = self._regex_extract(chunk, start)
-            return [ParseRegion(
+        """VALID runs of intact blocks and one INVALID region per broken block."""
+        total_lines = len(lines)
+        spans: List[Tuple[int, int, bool]] = []
+        for index in range(len(starts)):
+            start, end = _span(starts, index, total_lines)
+            valid = index not in broken
+            if valid and spans and spans[-1][2]:
+                spans[-1] = (spans[-1][0], end, True)
+            else:
+                spans.append((start, end, valid))
+
+        regions: List[ParseRegion] = []
+        for start, end, valid in spans:
+            chunk = "".join(lines[start - 1:end])
+            if valid:
+                regions.append(ParseRegion(
+                    start_line=start, end_line=end,
+                    status=ParseStatus.VALID, entities=[],
+                    confidence=1.0, source=chunk,
+                ))
+                continue
+            found: List[ASTEntity] = []
+            for number in range(start, end + 1):
+                found.extend(self._regex_extract(lines[number - 1], number))
+            regions.append(ParseRegion(
                 start_line=start, end_line=end,
                 status=ParseStatus.INVALID,
-                entities=entities,
-                confidence=max((e.confidence if hasattr(e, 'confidence') else 0.5 for e in entities), default=0.0) if entities else 0.0,
+                entities=found,
+                confidence=max((e.__dict__.get("confidence", 0.5) for e in found), default=0.0),
                 source=chunk,
-            )]
+            ))
 
-        # Split in half and recurse
-        mid = (start + end) // 2
-        left = self._binary_search_regions(lines, start, mid)
-        right = self._binary_search_regions(lines, mid + 1, end)
-        return left + right
+        valid_regions = [r for r in regions if r.status == ParseStatus.VALID]
+        if valid_regions:
+            region_starts = [r.start_line for r in valid_regions]
+            for entity in entities:
+                index = max(bisect_right(region_starts, entity.line_start) - 1, 0)
+                valid_regions[index].entities.append(entity)
+        return regions
 
     def _regex_extract(self, text: str, line_num: int) -> List[ASTEntity]:
         """Extract entities from invalid regions using regex."""
@@ -169,49 +340,27 @@ class ShadowAST:
 
 
 class IncrementalShadowAST(ShadowAST):
-    """Shadow AST with incremental caching."""
+    """Shadow AST that keeps the last regions of one file.
+
+    Every ShadowAST already re-parses only the blocks that changed since
+    its previous source; this class also keeps the regions by line span.
+    """
 
     def __init__(self) -> None:
+        super().__init__()
         self._region_cache: Dict[Tuple[int, int], ParseRegion] = {}
         self._last_source: Optional[str] = None
 
     def update(self, source: str, changed_lines: Optional[range] = None) -> List[ParseRegion]:
-        """Re-parse only affected regions, merge with cache.
+        """Re-parse source, re-using every block the edit did not touch.
 
-        If changed_lines is None, re-parses everything.
+        changed_lines is accepted for compatibility; the changed blocks are
+        found by diffing against the previous source.
         """
-        if changed_lines is None or self._last_source is None:
-            regions = self.parse(source)
-            self._update_cache(regions)
-            self._last_source = source
-            return regions
-
-        lines = source.splitlines(keepends=True)
-        total_lines = len(lines)
-
-        # Find regions that overlap with changed lines
-        affected_start = changed_lines.start + 1  # Convert to 1-indexed
-        affected_end = min(changed_lines.stop, total_lines)
-
-        # Keep unaffected cached regions
-        new_regions: List[ParseRegion] = []
-        for (start, end), region in sorted(self._region_cache.items()):
-            if end < affected_start or start > affected_end:
-                # No overlap, keep cached
-                new_regions.append(region)
-
-        # Re-parse affected range
-        if affected_start <= total_lines:
-            reparsed = self._binary_search_regions(
-                lines, affected_start, min(affected_end, total_lines)
-            )
-            new_regions.extend(reparsed)
-
-        # Sort by start line
-        new_regions.sort(key=lambda r: r.start_line)
-        self._update_cache(new_regions)
+        regions = self.parse(source)
+        self._update_cache(regions)
         self._last_source = source
-        return new_regions
+        return regions
 
     def _update_cache(self, regions: List[ParseRegion]) -> None:
         """Update the region cache."""
@@ -7,6 +7,13 @@ from streamrag.extractor import ASTExtractor
 from streamrag.bridge import DeltaGraphBridge
 
 
+@pytest.fixture(autouse=True)
+def _isolated_extraction_cache(tmp_path_factory, monkeypatch):
+    """Keep the on-disk extraction cache out of the real ~/.claude."""
+    monkeypatch.setenv(
+        "STREAMRAG_EXTRACTION_CACHE_DIR", str(tmp_path_factory.mktemp("extraction_cache")))
+
+
 @pytest.fixture
 def empty_graph():
     return LiquidGraph()
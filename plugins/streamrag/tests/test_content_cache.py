@@ -0,0 +1,114 @@
+"""Tests for the byte-budgeted ContentCache used for bridge file contents."""
+
+import sys
+
+import pytest
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.content_cache import ContentCache
+from streamrag.models import CodeChange
+
+
+def test_get_refreshes_recency():
+    """A read moves the entry to the most-recent end, so it survives eviction."""
+    cache = ContentCache(max_entries=2)
+    cache["a.py"] = "a"
+    cache["b.py"] = "b"
+    assert cache.get("a.py") == "a"
+    cache["c.py"] = "c"
+    assert "a.py" in cache
+    assert "b.py" not in cache
+    assert cache.evictions == 1
+
+
+def test_byte_budget_evicts_lru():
+    big = "x" * 1000
+    budget = sys.getsizeof(big) * 2 + 10
+    cache = ContentCache(max_bytes=budget, compress_cold=False)
+    cache["a.py"] = big
+    cache["b.py"] = big + "b"
+    cache["c.py"] = big + "c"
+    assert list(cache) == ["b.py", "c.py"]
+    assert cache.total_bytes <= budget
+
+
+def test_oversized_entry_not_cached():
+    """An entry bigger than the whole budget is rejected instead of flushing the cache."""
+    cache = ContentCache(max_bytes=2000)
+    cache["small.py"] = "def f(): pass\n"
+    cache["huge.js"] = "y" * 5000
+    assert "huge.js" not in cache
+    assert "small.py" in cache
+    assert cache.rejected == 1
+
+
+def test_cold_entries_compressed_and_restored():
+    content = "def handler(request):\n    return request\n" * 200
+    cache = ContentCache(hot_entries=1)
+    cache["a.py"] = content
+    cache["b.py"] = "b = 1\n"
+    assert isinstance(cache._entries["a.py"], bytes)
+    assert cache.total_bytes < sys.getsizeof(content)
+    assert cache["a.py"] == content
+    assert isinstance(cache._entries["a.py"], str)
+
+
+def test_hit_miss_counters():
+    cache = ContentCache()
+    cache["a.py"] = "a"
+    cache.get("a.py")
+    cache.get("missing.py", "")
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_overwrite_and_delete_keep_byte_accounting():
+    cache = ContentCache()
+    cache["a.py"] = "a" * 100
+    cache["a.py"] = "a"
+    assert cache.total_bytes == sys.getsizeof("a")
+    del cache["a.py"]
+    assert cache.total_bytes == 0
+    assert len(cache) == 0
+
+
+def test_pop_leaves_counters_and_recency_alone():
+    cache = ContentCache(hot_entries=1)
+    cache["a.py"] = "a" * 1000
+    cache["b.py"] = "b"
+    cache["c.py"] = "c"
+    assert cache.pop("a.py") == "a" * 1000
+    assert cache.pop("missing.py", None) is None
+    with pytest.raises(KeyError):
+        cache.pop("missing.py")
+    assert list(cache) == ["b.py", "c.py"]
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+    assert cache.stats()["cold"] == 1
+    assert "b.py" in cache and cache.stats()["misses"] == 0
+
+
+def test_copy_is_independent():
+    cache = ContentCache()
+    cache["a.py"] = "a"
+    clone = cache.copy()
+    clone["b.py"] = "b"
+    assert "b.py" not in cache
+    assert clone.get("a.py") == "a"
+
+
+def test_bridge_keeps_frequently_edited_file():
+    """A file edited repeatedly stays cached while one-off files are evicted."""
+    bridge = DeltaGraphBridge()
+    bridge._file_contents = ContentCache(max_entries=3)
+    hot = "def hot():\n    return 0\n"
+    bridge.process_change(CodeChange("hot.py", "", hot))
+    for i in range(10):
+        bridge.process_change(CodeChange(f"f{i}.py", "", f"def f{i}():\n    pass\n"))
+        old = bridge._file_contents.get("hot.py", "")
+        assert old == hot
+        hot = f"def hot():\n    return {i + 1}\n"
+        bridge.process_change(CodeChange("hot.py", old, hot))
+    assert "hot.py" in bridge._file_contents
+    assert len(bridge._file_contents) == 3
@@ -0,0 +1,145 @@
+"""Tests for per-file extraction budgets (degraded and skipped files)."""
+
+import pickle
+import time
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.extraction_budget import (
+    DEGRADED, FULL, SKIPPED, ExtractionBudget, default_extraction_budget, looks_generated,
+)
+from streamrag.extraction_cache import ExtractionCache
+from streamrag.languages.registry import create_default_registry
+from streamrag.models import CodeChange
+
+TS = (
+    "import { api } from './api';\n\n"
+    "export class Store extends Base {\n"
+    "  load(id: string): Item {\n"
+    "    return api.fetch(id);\n"
+    "  }\n"
+    "}\n\n"
+    "function helper(x: Item) {\n"
+    "  return transform(x);\n"
+    "}\n"
+)
+PY = (
+    "import os\n\n"
+    "class Worker(Base):\n"
+    "    def run(self, x: int) -> int:\n"
+    "        return os.path.join(x)\n\n"
+    "def main():\n"
+    "    Worker().run(1)\n"
+)
+
+
+def _summary(entities):
+    return sorted((e.entity_type, e.name, e.line_start, e.line_end) for e in entities)
+
+
+def test_degraded_regex_keeps_declarations_without_calls():
+    ext = create_default_registry().get_extractor("a.ts")
+    full = ext.extract(TS, "a.ts")
+    partial = ext.extract_budgeted(TS, "a.ts", declarations_only=True)
+    assert _summary(partial) == _summary(full)
+    decls = [e for e in partial if e.entity_type != "import"]
+    assert all(e.partial and not e.calls and not e.type_refs for e in decls)
+    assert [e.inherits for e in decls if e.name == "Store"] == [["Base"]]
+    assert not any(e.partial for e in full)
+
+
+def test_degraded_python_keeps_declarations_without_calls():
+    ext = create_default_registry().get_extractor("a.py")
+    full = [e for e in ext.extract(PY) if e.entity_type != "module_code"]
+    partial = ext.extract_budgeted(PY, declarations_only=True)
+    assert _summary(partial) == _summary(full)
+    assert all(e.partial and not e.calls and not e.uses for e in partial)
+    assert {e.name: e.signature_hash for e in partial} == {e.name: e.signature_hash for e in full}
+
+
+def test_degraded_python_walk_without_match_case(monkeypatch):
+    """Python 3.9's ast has no match_case: the oversized-file walk must not need it."""
+    import ast
+    monkeypatch.delattr(ast, "match_case", raising=False)
+    source = PY + "try:\n    def fallback():\n        pass\nexcept ImportError:\n    def shim():\n        pass\n"
+    ext = create_default_registry().get_extractor("a.py")
+    mode, entities = ExtractionBudget(degrade_chars=len(PY)).extract(ext, source, "a.py")
+    assert mode == DEGRADED
+    assert {e.name for e in entities} == {"os", "Worker", "Worker.run", "main", "fallback", "shim"}
+
+
+def test_expired_deadline_degrades_remaining_declarations():
+    ext = create_default_registry().get_extractor("a.ts")
+    budget = ExtractionBudget(time_budget_s=1e-9)
+    mode, entities = budget.extract(ext, TS, "a.ts")
+    assert mode == DEGRADED
+    assert all(e.partial for e in entities if e.entity_type != "import")
+    assert budget.stats()["timed_out"] == 1 and budget.stats()["degraded"] == 1
+
+
+def test_size_thresholds_pick_mode():
+    ext = create_default_registry().get_extractor("a.ts")
+    budget = ExtractionBudget(degrade_chars=len(TS) - 1, skip_chars=len(TS) * 2)
+    assert budget.extract(ext, TS, "a.ts")[0] == DEGRADED
+    assert budget.extract(ext, TS * 3, "a.ts") == (SKIPPED, [])
+    budget.degrade_chars = 0
+    assert budget.extract(ext, TS, "a.ts")[0] == FULL
+    assert (budget.full, budget.degraded, budget.skipped) == (1, 1, 1)
+
+
+def test_looks_generated():
+    plain = "function f(a) {\n  return a + 1;\n}\n" * 2000
+    assert not looks_generated(plain, "src/app.js")
+    assert looks_generated(plain, "dist/app.min.js")
+    assert looks_generated("// Code generated by protoc-gen-ts. DO NOT EDIT.\n" + plain, "x.ts")
+    assert looks_generated(plain.replace("\n", ""), "src/app.js")
+    # Small files are cheap to extract in full whatever they look like
+    assert not looks_generated("var a=1;" * 100, "a.min.js")
+
+
+def test_minified_bundle_is_degraded_quickly():
+    bundle = "".join(
+        f"function f{i}(a){{return g{i}(a)+h(a)}}var v{i}=f{i}(1);" for i in range(20000))
+    ext = create_default_registry().get_extractor("app.js")
+    budget = ExtractionBudget()
+    start = time.perf_counter()
+    mode, entities = budget.extract(ext, bundle, "app.js")
+    assert mode == DEGRADED
+    assert time.perf_counter() - start < 5.0
+    assert len([e for e in entities if e.entity_type == "function"]) == 20000
+
+
+def test_bridge_marks_partial_nodes_and_recovers():
+    budget = ExtractionBudget(degrade_chars=len(TS) - 1)
+    cache = ExtractionCache()
+    bridge = DeltaGraphBridge(extraction_budget=budget, extraction_cache=cache)
+    bridge.process_change(CodeChange(file_path="a.ts", old_content="", new_content=TS))
+    nodes = [n for n in bridge.graph.get_nodes_by_file("a.ts") if n.type != "import"]
+    assert nodes and all(n.properties.get("partial") for n in nodes)
+    ext = create_default_registry().get_extractor("a.ts")
+    assert cache.get(ext, TS) is None  # Partial results are never cached
+
+    edited = TS.replace("transform(x)", "tx(x)")  # Now under the degrade size
+    bridge.process_change(CodeChange(file_path="a.ts", old_content=TS, new_content=edited))
+    nodes = [n for n in bridge.graph.get_nodes_by_file("a.ts") if n.type != "import"]
+    assert nodes and not any(n.properties.get("partial") for n in nodes)
+    assert any(n.properties["calls"] for n in nodes)
+
+
+def test_skipped_file_adds_nothing():
+    budget = ExtractionBudget(skip_chars=10)
+    bridge = DeltaGraphBridge(extraction_budget=budget)
+    bridge.process_change(CodeChange(file_path="big.py", old_content="", new_content=PY))
+    assert bridge.graph.get_nodes_by_file("big.py") == []
+    assert budget.skipped >= 1
+
+
+def test_default_budget_from_env(monkeypatch):
+    monkeypatch.setenv("STREAMRAG_EXTRACT_DEGRADE_KB", "1")
+    monkeypatch.setenv("STREAMRAG_EXTRACT_SKIP_KB", "0")
+    monkeypatch.setenv("STREAMRAG_EXTRACT_BUDGET_MS", "250")
+    budget = default_extraction_budget()
+    assert (budget.degrade_chars, budget.skip_chars, budget.time_budget_s) == (1024, 0, 0.25)
+    clone = pickle.loads(pickle.dumps(budget))
+    assert clone.stats() == budget.stats()
+    monkeypatch.setenv("STREAMRAG_EXTRACT_BUDGET", "0")
+    assert default_extraction_budget() is None
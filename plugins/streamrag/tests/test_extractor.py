@@ -1,6 +1,7 @@
 """Tests for ASTExtractor."""
 
 from streamrag.extractor import ASTExtractor, extract
+from tests.multipass_extractor import MultiPassASTExtractor
 
 
 def test_extract_function(extractor):
@@ -371,3 +372,133 @@ def test_extract_regular_var_uses_unchanged(extractor):
     vars_ = [e for e in entities if e.entity_type == "variable"]
     assert len(vars_) == 1
     assert "load_config" in vars_[0].uses
+
+
+# ---- fused single-pass extractor ----
+
+_DIFFERENTIAL_SOURCE = """
+import os
+from pathlib import Path
+from requests import Session
+
+__all__ = ["Service", "helper"]
+registry = Registry()
+client: Session = make_session()
+if DEBUG:
+    level = compute_level(os.environ)
+
+def helper(svc: Service, path: Path) -> Result:
+    cache = Cache()
+    cache.lookup(path)
+    svc.run(registry.get(path))
+    def inner(x):
+        db = Database()
+        db.query(x)
+        return [transform(y) for y in x if check(y)]
+    client.get("/")
+    return inner(svc)
+
+@register
+@options(retries=3)
+class Service(Base, mixins.Loggable):
+    default = Config()
+
+    def run(self, arg: "Any") -> None:
+        self.prepare(arg)
+        cls_helper = Helper()
+        cls_helper.go(lambda v: self.finish(v))
+
+    @classmethod
+    async def build(cls, n: int):
+        await cls.create(n)
+        class Local:
+            def method(self):
+                return self.value.compute()
+        return Local()
+
+    def prepare(self, arg):
+        try:
+            result = parse(arg)
+        except ValueError:
+            result = fallback()
+        with open_resource(result) as r:
+            r.consume()
+
+def late():
+    return json.dumps(helper(None, None))
+
+import json
+setup()
+"""
+
+
+def test_fused_matches_multi_pass_on_tricky_source():
+    """Single-pass extractor yields exactly the multi-pass output, order included."""
+    assert ASTExtractor().extract(_DIFFERENTIAL_SOURCE) == \
+        MultiPassASTExtractor().extract(_DIFFERENTIAL_SOURCE)
+
+
+def test_fused_matches_multi_pass_on_repo_sources():
+    """Differential check over the package's own modules."""
+    import pathlib
+    root = pathlib.Path(__file__).resolve().parent.parent / "streamrag"
+    paths = sorted(root.rglob("*.py"))
+    assert paths
+    for path in paths:
+        source = path.read_text()
+        assert ASTExtractor().extract(source) == MultiPassASTExtractor().extract(source), path
+
+
+def test_fused_extractor_reusable():
+    """State from one extract() call does not leak into the next."""
+    extractor = ASTExtractor()
+    first = extractor.extract("import os\ndef f():\n    os.getcwd()\n")
+    second = extractor.extract("def f():\n    os.getcwd()\n")
+    assert first[-1].calls == []
+    assert [e.calls for e in second if e.name == "f"] == [["os.getcwd"]]
+
+
+# ---- Merkle hashing ----
+
+def test_ast_digest_equality_matches_ast_dump():
+    """Subtrees share a digest exactly when their ast.dump() output matches."""
+    import ast
+    import pathlib
+    from streamrag.extractor import _ast_digest
+    root = pathlib.Path(__file__).resolve().parent.parent / "streamrag"
+    by_dump, by_digest = {}, {}
+    for path in sorted(root.glob("*.py")):
+        memo: dict = {}
+        for node in ast.walk(ast.parse(path.read_text())):
+            if isinstance(node, (ast.stmt, ast.expr)):
+                by_dump.setdefault(ast.dump(node), set()).add(_ast_digest(node, memo))
+                by_digest.setdefault(_ast_digest(node, memo), set()).add(ast.dump(node))
+    assert all(len(v) == 1 for v in by_dump.values())
+    assert all(len(v) == 1 for v in by_digest.values())
+
+
+def test_signature_hash_ignores_positions(extractor):
+    """Moving a function (blank lines, comments) keeps its signature hash."""
+    a = extractor.extract("def f(x):\n    return g(x)\n")[0]
+    b = extractor.extract("# header\n\n\ndef f(x):\n\n    return g(x)  # note\n")[0]
+    assert a.signature_hash == b.signature_hash
+
+
+def test_signature_hash_distinguishes_constant_types(extractor):
+    """1, 1.0, True and '1' are different bodies, as with ast.dump."""
+    hashes = {
+        extractor.extract(f"def f():\n    return {lit}\n")[0].signature_hash
+        for lit in ("1", "1.0", "True", "'1'", "b'1'")
+    }
+    assert len(hashes) == 5
+
+
+def test_class_hash_tracks_method_change(extractor):
+    """Editing a method changes both the method and the enclosing class hash."""
+    old = {e.name: e.signature_hash for e in extractor.extract(
+        "class A:\n    def m(self):\n        return 1\n    def n(self):\n        pass\n")}
+    new = {e.name: e.signature_hash for e in extractor.extract(
+        "class A:\n    def m(self):\n        return 2\n    def n(self):\n        pass\n")}
+    assert old["A"] != new["A"]
+    assert old["A.m"] != new["A.m"]
+    assert old["A.n"] == new["A.n"]
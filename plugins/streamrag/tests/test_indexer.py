@@ -0,0 +1,244 @@
+"""Tests for the parallel cold-start indexer and DeltaGraphBridge.bulk_load."""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+from streamrag import indexer
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.extractor import extract
+from streamrag.indexer import discover_source_files, extract_files, index_project, warm_sync
+from streamrag.storage.memory import deserialize_graph, serialize_graph
+
+
+def _write_project(root, files):
+    for rel, content in files.items():
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def _sample_files(n=40):
+    files = {"core/base.py": "class Base:\n    def run_all(self):\n        pass\n"}
+    for i in range(n):
+        files[f"pkg/mod_{i}.py"] = (
+            "from core.base import Base\n\n"
+            f"class Worker{i}(Base):\n"
+            f"    def step_{i}(self):\n"
+            f"        return helper_{i}()\n\n"
+            f"def helper_{i}():\n"
+            f"    return {i}\n"
+        )
+    return files
+
+
+def test_bulk_load_is_order_independent():
+    """Loading the same files in different orders yields the same graph."""
+    files = {
+        "a.py": "from b import helper\n\ndef caller():\n    return helper()\n",
+        "b.py": "def helper():\n    return 1\n",
+    }
+    extracted = [(fp, src, extract(src)) for fp, src in files.items()]
+
+    forward = DeltaGraphBridge()
+    forward.bulk_load(extracted)
+    backward = DeltaGraphBridge()
+    backward.bulk_load(list(reversed([(fp, src, extract(src)) for fp, src in files.items()])))
+
+    assert forward.graph.compute_hash() == backward.graph.compute_hash()
+    caller = forward.graph.query(name="caller")[0]
+    targets = {forward.graph.get_node(e.target_id).name
+               for e in forward.graph.get_outgoing_edges(caller.id)}
+    assert "helper" in targets
+
+
+def test_bulk_load_resolves_edges_to_later_files():
+    """A caller sorting before its callee still gets the cross-file edge."""
+    extracted = [
+        ("a.py", "", extract("def caller():\n    zeta_helper()\n")),
+        ("z.py", "", extract("def zeta_helper():\n    pass\n")),
+    ]
+    bridge = DeltaGraphBridge()
+    assert bridge.bulk_load(extracted) == 2
+    caller = bridge.graph.query(name="caller")[0]
+    assert any(e.edge_type == "calls" for e in bridge.graph.get_outgoing_edges(caller.id))
+    assert "a.py" in bridge._dependency_index["zeta_helper"]
+    assert bridge._module_file_index["z"] == "z.py"
+
+
+def test_bulk_load_replaces_existing_file_nodes():
+    """Re-loading a file drops its previous nodes first."""
+    bridge = DeltaGraphBridge()
+    bridge.bulk_load([("a.py", "", extract("def old():\n    pass\n"))])
+    bridge.bulk_load([("a.py", "", extract("def new():\n    pass\n"))])
+    names = {n.name for n in bridge.graph.get_nodes_by_file("a.py")}
+    assert names == {"new"}
+
+
+def test_discover_skips_build_dirs_and_respects_max_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {
+            "a.py": "x = 1\n",
+            "node_modules/dep.js": "function f() {}\n",
+            "src/b.ts": "function g() {}\n",
+            "notes.txt": "hi\n",
+        })
+        found = discover_source_files(tmpdir)
+        assert found == ["a.py", os.path.join("src", "b.ts")]
+        assert len(discover_source_files(tmpdir, max_files=1)) == 1
+
+
+def test_parallel_and_serial_indexing_agree(monkeypatch):
+    """Process-pool extraction produces the same graph as in-process extraction."""
+    monkeypatch.setattr(indexer, "PARALLEL_MIN_FILES", 2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, _sample_files())
+        serial = DeltaGraphBridge()
+        parallel = DeltaGraphBridge()
+        assert index_project(serial, tmpdir, workers=1) == 41
+        assert index_project(parallel, tmpdir, workers=2) == 41
+        assert serial.graph.compute_hash() == parallel.graph.compute_hash()
+        worker = serial.graph.query(name="Worker3")[0]
+        assert any(e.edge_type == "inherits" for e in serial.graph.get_outgoing_edges(worker.id))
+
+
+def test_index_project_skips_tracked_paths():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {"a.py": "def a():\n    pass\n", "b.py": "def b():\n    pass\n"})
+        bridge = DeltaGraphBridge()
+        assert index_project(bridge, tmpdir, skip_paths={"a.py"}) == 1
+        assert bridge._tracked_files == {"b.py"}
+
+
+def test_extract_files_zero_timeout_returns_nothing():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {"a.py": "def a():\n    pass\n"})
+        assert extract_files(tmpdir, ["a.py"], workers=1, timeout_s=-1) == []
+        assert len(extract_files(tmpdir, ["a.py"], workers=1)) == 1
+
+
+def _slow_chunk(project_dir, rel_paths, extraction_cache=None, extraction_budget=None):
+    time.sleep(1.5)
+    return []
+
+
+def test_parallel_extraction_returns_at_deadline(monkeypatch):
+    monkeypatch.setattr(indexer, "PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(indexer, "_extract_chunk", _slow_chunk)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, _sample_files(4))
+        start = time.monotonic()
+        assert extract_files(tmpdir, sorted(_sample_files(4)), workers=2, timeout_s=0.2) == []
+        assert time.monotonic() - start < 1.0
+
+
+def _stuck_chunk(project_dir, rel_paths, extraction_cache=None, extraction_budget=None):
+    time.sleep(30)
+    return []
+
+
+_TIMED_OUT_HOOK = """
+import sys, time
+from streamrag import indexer
+from tests import test_indexer
+indexer.PARALLEL_MIN_FILES = 2
+indexer._extract_chunk = test_indexer._stuck_chunk
+files = sorted(test_indexer._sample_files(4))
+test_indexer._write_project(sys.argv[1], test_indexer._sample_files(4))
+assert indexer.extract_files(sys.argv[1], files, workers=2, timeout_s=0.2) == []
+"""
+
+
+def test_timed_out_extraction_lets_the_process_exit():
+    """Workers still running at the deadline are stopped, not joined at exit."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        start = time.monotonic()
+        subprocess.run([sys.executable, "-c", _TIMED_OUT_HOOK, tmpdir],
+                       cwd=root, check=True, timeout=20)
+        assert time.monotonic() - start < 10
+
+
+# ---- warm sync ----
+
+
+def _reload(bridge):
+    """Round-trip through the persisted format (file contents are not saved)."""
+    return deserialize_graph(serialize_graph(bridge))
+
+
+def _rewrite(root, rel, content, bump_ns=10**9):
+    path = os.path.join(root, rel)
+    st = os.stat(path)
+    with open(path, "w") as f:
+        f.write(content)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_warm_sync_unchanged_tree_is_stat_only(monkeypatch):
+    """No file is read when every stat matches the recorded table."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {"a.py": "def a():\n    pass\n", "b.py": "def b():\n    pass\n"})
+        bridge = DeltaGraphBridge()
+        index_project(bridge, tmpdir, workers=1)
+        bridge = _reload(bridge)
+        monkeypatch.setattr(indexer, "content_hash", lambda _c: pytest.fail("hashed"))
+        counts = warm_sync(bridge, tmpdir)
+        assert counts["unchanged"] == 2
+        assert counts["changed"] == counts["added"] == counts["deleted"] == 0
+
+
+def test_warm_sync_reprocesses_changed_file_without_ghosts():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {
+            "lib.py": "def old_api():\n    pass\n\ndef keep():\n    pass\n",
+            "app.py": "from lib import keep\n\ndef main():\n    keep()\n",
+        })
+        bridge = DeltaGraphBridge()
+        index_project(bridge, tmpdir, workers=1)
+        bridge = _reload(bridge)
+        _rewrite(tmpdir, "lib.py", "def new_api():\n    pass\n\ndef keep():\n    pass\n")
+
+        counts = warm_sync(bridge, tmpdir)
+        assert counts["changed"] == 1
+        assert {n.name for n in bridge.graph.get_nodes_by_file("lib.py")} == {"new_api", "keep"}
+        # The untouched callee keeps its incoming edge from app.py
+        main = bridge.graph.query(name="main")[0]
+        targets = {bridge.graph.get_node(e.target_id).name for e in bridge.graph.get_outgoing_edges(main.id)}
+        assert "keep" in targets
+
+
+def test_warm_sync_touched_file_updates_stat_only():
+    """A new mtime with identical content is not reprocessed."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {"a.py": "def a():\n    pass\n"})
+        bridge = DeltaGraphBridge()
+        index_project(bridge, tmpdir, workers=1)
+        _rewrite(tmpdir, "a.py", "def a():\n    pass\n")
+        counts = warm_sync(bridge, tmpdir)
+        assert counts["touched"] == 1
+        assert counts["changed"] == 0
+        assert bridge._file_stats["a.py"][0] == os.stat(os.path.join(tmpdir, "a.py")).st_mtime_ns
+        assert warm_sync(bridge, tmpdir)["unchanged"] == 1
+
+
+def test_warm_sync_handles_added_and_deleted_files():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _write_project(tmpdir, {"a.py": "def a():\n    pass\n", "b.py": "def b():\n    pass\n"})
+        bridge = DeltaGraphBridge()
+        index_project(bridge, tmpdir, workers=1)
+        bridge = _reload(bridge)
+        os.remove(os.path.join(tmpdir, "b.py"))
+        _write_project(tmpdir, {"c.py": "def c():\n    pass\n", "d.py": "def d():\n    pass\n"})
+
+        counts = warm_sync(bridge, tmpdir, max_added=1)
+        assert counts["deleted"] == 1
+        assert counts["added"] == 1
+        assert bridge.graph.get_nodes_by_file("b.py") == []
+        assert "b.py" not in bridge._file_stats
+        assert bridge._tracked_files == {"a.py", "c.py"}
@@ -204,7 +204,7 @@ def test_use_import_simple(ext):
     imports = [e for e in entities if e.entity_type == "import"]
     assert len(imports) == 1
     assert imports[0].name == "User"
-    assert imports[0].imports == [("models", "User")]
+    assert imports[0].imports == [("crate::models", "User")]
 
 
 def test_use_import_braced(ext):
@@ -220,8 +220,8 @@ def test_use_import_glob(ext):
     entities = ext.extract(code, "main.rs")
     imports = [e for e in entities if e.entity_type == "import"]
     assert len(imports) == 1
-    assert imports[0].name == "*"
-    assert imports[0].imports == [("prelude", "*")]
+    assert imports[0].name == "crate::prelude::*"
+    assert imports[0].imports == [("crate::prelude", "*")]
 
 
 def test_use_import_rename(ext):
@@ -0,0 +1,140 @@
+"""Tests for the Rust crate module tree."""
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.models import CodeChange
+from streamrag.rust_module_index import RustModuleIndex, dotted_module
+from streamrag.storage.memory import deserialize_graph, serialize_graph
+
+LIB = "mod config;\npub mod net;\n\nuse crate::config::Settings;\n\npub fn start() {\n    let s = Settings::new();\n}\n"
+CONFIG = "pub struct Settings {\n    port: u16,\n}\n"
+NET = "pub mod tcp;\n\nuse super::config::*;\nuse self::tcp::connect;\n\npub fn serve() {\n    connect();\n}\n"
+TCP = "pub fn connect() {\n}\n\npub struct Stream {\n    fd: i32,\n}\n"
+DECOY = "pub struct Settings {\n    verbose: bool,\n}\n\npub fn connect() {\n}\n"
+
+
+def _index(mods):
+    index = RustModuleIndex()
+    for path, names in mods.items():
+        index.add_file(path)
+        index.set_mods(path, names)
+    return index
+
+
+def _add(bridge, path, content, old=""):
+    bridge.process_change(CodeChange(file_path=path, old_content=old, new_content=content))
+
+
+def _targets(bridge, path, name):
+    node = next(n for n in bridge.graph.get_nodes_by_file(path) if n.name == name)
+    return sorted((bridge.graph.get_node(e.target_id).file_path, bridge.graph.get_node(e.target_id).name)
+                  for e in bridge.graph.get_outgoing_edges(node.id) if e.edge_type == "imports")
+
+
+def test_tree_from_mod_declarations_and_layout():
+    # Children first: they attach once their parent declares them
+    index = _index({
+        "src/net/tcp.rs": [],
+        "src/config/mod.rs": [],
+        "src/net.rs": ["tcp"],
+        "src/lib.rs": ["config", "net"],
+        "src/bin/tool.rs": [],
+        "src/orphan.rs": [],
+    })
+    assert index.module_of("src/net/tcp.rs") == ("src/lib.rs", ("net", "tcp"))
+    assert index.module_of("src/config/mod.rs") == ("src/lib.rs", ("config",))
+    assert index.module_of("src/bin/tool.rs") == ("src/bin/tool.rs", ())
+    assert index.module_of("src/orphan.rs") is None
+    assert index.stats() == {"files": 6, "crates": 2, "modules": 5}
+
+
+def test_crate_roots_only_at_cargo_target_locations():
+    index = _index({
+        "src/lib.rs": ["cmd", "tests", "util"],
+        "src/util.rs": [],
+        "src/tests/mod.rs": ["helpers"],
+        "src/tests/helpers.rs": [],
+        "src/cmd.rs": ["build"],
+        "src/cmd/build.rs": [],
+        "build.rs": [],
+        "src/bin/cli/main.rs": [],
+        "tests/api.rs": [],
+    })
+    assert index.module_of("src/tests/mod.rs") == ("src/lib.rs", ("tests",))
+    assert index.module_of("src/tests/helpers.rs") == ("src/lib.rs", ("tests", "helpers"))
+    assert index.module_of("src/cmd/build.rs") == ("src/lib.rs", ("cmd", "build"))
+    assert index.resolve_path("crate::tests::helpers", "src/util.rs") == ("src/tests/helpers.rs", [])
+    assert index.resolve_path("super::util", "src/tests/mod.rs") == ("src/util.rs", [])
+    for root in ("build.rs", "src/bin/cli/main.rs", "tests/api.rs"):
+        assert index.module_of(root) == (root, ())
+
+
+def test_claimed_target_file_is_a_module_until_released():
+    index = _index({"tests/common.rs": [], "tests/api.rs": ["common"]})
+    assert index.module_of("tests/common.rs") == ("tests/api.rs", ("common",))
+    index.set_mods("tests/api.rs", [])
+    assert index.module_of("tests/common.rs") == ("tests/common.rs", ())
+    index.set_mods("tests/api.rs", ["common"])
+    assert index.module_of("tests/common.rs") == ("tests/api.rs", ("common",))
+    index.remove_file("tests/api.rs")
+    assert index.module_of("tests/common.rs") == ("tests/common.rs", ())
+
+
+def test_resolve_use_paths():
+    index = _index({"src/lib.rs": ["config", "net", "inner"], "src/config.rs": [],
+                    "src/net.rs": ["tcp"], "src/net/tcp.rs": []})
+    tcp = "src/net/tcp.rs"
+    assert index.resolve_path("crate::config", tcp) == ("src/config.rs", [])
+    assert index.resolve_path("super", tcp) == ("src/net.rs", [])
+    assert index.resolve_path("super::super::config", tcp) == ("src/config.rs", [])
+    assert index.resolve_path("self::tcp", "src/net.rs") == (tcp, [])
+    assert index.resolve_path("tcp", "src/net.rs") == (tcp, [])
+    assert index.resolve_path("net::tcp", "src/lib.rs") == (tcp, [])
+    assert index.resolve_path("config", tcp) == ("src/config.rs", [])  # 2015-style, from the crate root
+    assert index.resolve_path("crate::inner::deep", tcp) == ("src/lib.rs", ["inner", "deep"])
+    assert index.resolve_path("serde::de", tcp) is None
+    assert index.resolve_path("super::super::super", tcp) is None
+    assert dotted_module("super::super::net::tcp") == "net.tcp"
+
+
+def test_mod_line_change_relinks_subtree():
+    index = _index({"src/lib.rs": ["net"], "src/net.rs": ["tcp"], "src/net/tcp.rs": []})
+    index.set_mods("src/lib.rs", [])
+    assert index.module_of("src/net.rs") is None
+    assert index.module_of("src/net/tcp.rs") is None
+    index.set_mods("src/lib.rs", ["net"])
+    assert index.module_of("src/net/tcp.rs") == ("src/lib.rs", ("net", "tcp"))
+    index.remove_file("src/net.rs")
+    assert index.module_of("src/net/tcp.rs") is None
+    assert index.resolve_path("crate::net::tcp", "src/lib.rs") == ("src/lib.rs", ["net", "tcp"])
+
+
+def test_bridge_resolves_use_paths_through_tree():
+    bridge = DeltaGraphBridge()
+    _add(bridge, "other/src/config.rs", DECOY)
+    _add(bridge, "src/config.rs", CONFIG)
+    _add(bridge, "src/net/tcp.rs", TCP)
+    _add(bridge, "src/net.rs", NET)
+    _add(bridge, "src/lib.rs", LIB)
+    assert _targets(bridge, "src/lib.rs", "Settings") == [("src/config.rs", "Settings")]
+    # net.rs was indexed before lib.rs declared it: attaching it re-resolves its imports
+    assert _targets(bridge, "src/net.rs", "connect") == [("src/net/tcp.rs", "connect")]
+    assert _targets(bridge, "src/net.rs", "super::config::*") == [("src/config.rs", "Settings")]
+
+
+def test_mod_line_change_through_bridge_and_state():
+    bridge = DeltaGraphBridge()
+    for path, content in (("src/config.rs", CONFIG), ("src/net.rs", NET),
+                          ("src/net/tcp.rs", TCP), ("src/lib.rs", LIB)):
+        _add(bridge, path, content)
+    without_net = LIB.replace("pub mod net;\n", "")
+    _add(bridge, "src/lib.rs", without_net, old=LIB)
+    assert bridge._rust_index.module_of("src/net/tcp.rs") is None
+    _add(bridge, "src/lib.rs", LIB, old=without_net)
+    assert bridge._rust_index.module_of("src/net/tcp.rs") == ("src/lib.rs", ("net", "tcp"))
+
+    snap = bridge.snapshot()
+    loaded = deserialize_graph(serialize_graph(bridge))
+    bridge.remove_file("src/lib.rs")
+    assert bridge._rust_index.module_of("src/net.rs") is None
+    assert snap._rust_index.module_of("src/net.rs") == ("src/lib.rs", ("net",))
+    assert loaded._rust_index.resolve_path("super::config", "src/net.rs") == ("src/config.rs", [])
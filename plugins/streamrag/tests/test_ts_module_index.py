@@ -0,0 +1,142 @@
+"""Tests for TS/JS module resolution: tsconfig paths, index files and barrels."""
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.indexer import index_project
+from streamrag.languages.registry import create_default_registry
+from streamrag.models import CodeChange
+from streamrag.storage.memory import deserialize_graph, serialize_graph
+from streamrag.ts_module_index import TSModuleIndex, is_ts_config, parse_jsonc
+
+BASE_CONFIG = """{
+  // Shared by every app
+  "compilerOptions": {
+    "baseUrl": ".",
+    "paths": {
+      "@ui": ["libs/ui/src/index.ts"],
+      "@ui/*": ["libs/ui/src/*"],  /* deep imports */
+      "@/*": ["apps/web/src/*"],
+    },
+  },
+}
+"""
+APP_CONFIG = '{"extends": "../../tsconfig.base.json", "compilerOptions": {"strict": true}}'
+BUTTON = "export class Button {\n  render() {\n    return 1;\n  }\n}\n"
+DECOY = "export class Button {\n  click() {\n    return 2;\n  }\n}\n"
+BARREL = "export * from './theme';\nexport { Button } from './button';\n"
+PAGE = "import { Button } from '@ui';\n\nexport function page() {\n  return new Button();\n}\n"
+
+
+def _index(files, configs):
+    index = TSModuleIndex()
+    for path in files:
+        index.add_file(path)
+    for path, text in configs.items():
+        index.set_config(path, parse_jsonc(text))
+    return index
+
+
+def test_parse_jsonc_keeps_comment_like_strings():
+    config = parse_jsonc(BASE_CONFIG)
+    assert config["compilerOptions"]["paths"]["@/*"] == ["apps/web/src/*"]
+    assert parse_jsonc("not json") == {}
+    assert is_ts_config("apps/web/tsconfig.app.json") and not is_ts_config("package.json")
+
+
+def test_resolve_relative_index_and_aliases():
+    index = _index(
+        ["libs/ui/src/index.ts", "libs/ui/src/button.tsx", "apps/web/src/util.ts",
+         "apps/web/src/pages/home.ts", "apps/web/src/lib/index.js"],
+        {"tsconfig.base.json": BASE_CONFIG, "apps/web/tsconfig.json": APP_CONFIG},
+    )
+    importer = "apps/web/src/pages/home.ts"
+    assert index.config_for(importer) == "apps/web/tsconfig.json"
+    assert index.resolve("../util", importer) == "apps/web/src/util.ts"
+    assert index.resolve("../util.js", importer) == "apps/web/src/util.ts"
+    assert index.resolve("../lib", importer) == "apps/web/src/lib/index.js"
+    assert index.resolve("@ui", importer) == "libs/ui/src/index.ts"
+    assert index.resolve("@ui/button", importer) == "libs/ui/src/button.tsx"
+    assert index.resolve("@/util", importer) == "apps/web/src/util.ts"
+    assert index.resolve("react", importer) is None
+    # No config above the file: only relative specifiers resolve
+    assert index.resolve("@ui", "scripts/build.ts") is None
+
+
+def test_reexport_sources_follow_named_and_star_exports():
+    index = _index(["ui/index.ts", "ui/button.ts", "ui/theme.ts"], {})
+    index.set_imports("ui/index.ts", [("./theme", "*"), ("./button", "Button")])
+    assert index.reexport_sources("ui/index.ts", "Button") == ["ui/button.ts", "ui/theme.ts"]
+    assert index.reexport_sources("ui/index.ts", "Color") == ["ui/theme.ts"]
+    index.remove_file("ui/index.ts")
+    assert index.reexport_sources("ui/index.ts", "Color") == []
+
+
+def test_extractor_records_barrel_reexports():
+    ext = create_default_registry().get_extractor("index.ts")
+    source = BARREL + "export * from './hooks';\nexport * as icons from './icons';\n"
+    imports = {e.name: e.imports for e in ext.extract(source, "index.ts")}
+    assert imports["Button"] == [("./button", "Button")]
+    assert imports["* from ./theme"] == [("./theme", "*")]
+    assert imports["* from ./hooks"] == [("./hooks", "*")]
+    assert imports["icons"] == [("./icons", "icons")]
+
+
+def _import_target(bridge, path, name):
+    node = next(n for n in bridge.graph.get_nodes_by_file(path)
+                if n.type == "import" and n.name == name)
+    targets = [bridge.graph.get_node(e.target_id) for e in bridge.graph.get_outgoing_edges(node.id)
+               if e.edge_type == "imports"]
+    return sorted(t.file_path for t in targets)
+
+
+def test_bridge_resolves_alias_through_barrel():
+    bridge = DeltaGraphBridge()
+    bridge.update_ts_config("tsconfig.base.json", BASE_CONFIG)
+    bridge.update_ts_config("apps/web/tsconfig.json", APP_CONFIG)
+    for path, content in (("apps/admin/button.ts", DECOY),
+                          ("libs/ui/src/button.ts", BUTTON),
+                          ("libs/ui/src/theme.ts", "export const color = 1;\n"),
+                          ("libs/ui/src/index.ts", BARREL),
+                          ("apps/web/src/page.ts", PAGE)):
+        bridge.process_change(CodeChange(file_path=path, old_content="", new_content=content))
+    assert _import_target(bridge, "apps/web/src/page.ts", "Button") == ["libs/ui/src/button.ts"]
+
+
+def test_config_change_moves_existing_import_edges():
+    bridge = DeltaGraphBridge()
+    bridge.update_ts_config("tsconfig.json", BASE_CONFIG)
+    for path, content in (("apps/admin/button.ts", DECOY),
+                          ("libs/ui/src/button.ts", BUTTON),
+                          ("libs/ui/src/index.ts", BARREL),
+                          ("apps/web/src/page.ts", PAGE)):
+        bridge.process_change(CodeChange(file_path=path, old_content="", new_content=content))
+    assert _import_target(bridge, "apps/web/src/page.ts", "Button") == ["libs/ui/src/button.ts"]
+    retargeted = BASE_CONFIG.replace('"@ui": ["libs/ui/src/index.ts"]', '"@ui": ["apps/admin/button.ts"]')
+    assert bridge.update_ts_config("tsconfig.json", retargeted)
+    assert _import_target(bridge, "apps/web/src/page.ts", "Button") == ["apps/admin/button.ts"]
+    assert bridge.update_ts_config("tsconfig.json", retargeted) == []  # Unchanged: no work
+
+
+def test_index_project_loads_configs_and_state_keeps_them(tmp_path):
+    files = {
+        "tsconfig.base.json": BASE_CONFIG,
+        "apps/web/tsconfig.json": APP_CONFIG,
+        "apps/admin/button.ts": DECOY,
+        "libs/ui/src/button.ts": BUTTON,
+        "libs/ui/src/theme.ts": "export const color = 1;\n",
+        "libs/ui/src/index.ts": BARREL,
+        "apps/web/src/page.ts": PAGE,
+    }
+    for rel, content in files.items():
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    bridge = DeltaGraphBridge()
+    index_project(bridge, str(tmp_path), workers=1)
+    assert set(bridge._ts_index.configs) == {"tsconfig.base.json", "apps/web/tsconfig.json"}
+    assert _import_target(bridge, "apps/web/src/page.ts", "Button") == ["libs/ui/src/button.ts"]
+
+    loaded = deserialize_graph(serialize_graph(bridge))
+    assert loaded._ts_index.resolve("@ui/theme", "apps/web/src/page.ts") == "libs/ui/src/theme.ts"
+    assert loaded._ts_index.reexport_sources("libs/ui/src/index.ts", "color") == ["libs/ui/src/theme.ts"]
+    loaded.update_ts_config("apps/web/tsconfig.json", None)
+    assert loaded._ts_index.resolve("@ui/theme", "apps/web/src/page.ts") is None
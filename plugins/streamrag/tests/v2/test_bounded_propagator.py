@@ -115,3 +115,65 @@ def test_clear_async_queue():
     bp = BoundedPropagator()
     bp.clear_async_queue()
     assert bp.async_queue_size == 0
+
+
+def test_clear_async_queue_reports_dropped_files():
+    g = _make_chain_graph()
+    config = PropagatorConfig(max_sync_updates=0, max_async_updates=10, max_depth=3)
+    bp = BoundedPropagator(graph=g, config=config)
+    dropped = []
+    bp.on_clear = dropped.extend
+    bp.propagate("a.py")
+    queued = sorted(bp._queued)
+
+    bp.clear_async_queue()
+    assert dropped == queued and queued
+    assert bp.async_queue_size == 0
+
+
+def test_propagate_many_keeps_given_sources():
+    config = PropagatorConfig(max_sync_updates=0)
+    bp = BoundedPropagator(config=config)
+    bp.propagate_many(["a.py", "b.py"], affected=[("ua.py", 1, "a.py"), ("ub.py", 1, "b.py")])
+    assert bp._queued["ua.py"].source_file == "a.py"
+    assert bp._queued["ub.py"].source_file == "b.py"
+
+
+def test_async_queue_dedupes_repeated_files():
+    g = _make_chain_graph()
+    config = PropagatorConfig(max_sync_updates=0, max_async_updates=10, max_depth=3)
+    bp = BoundedPropagator(graph=g, config=config)
+
+    bp.propagate("a.py")
+    depth = bp.async_queue_size
+    bp.propagate("a.py")
+    assert bp.async_queue_size == depth
+    processed = bp.process_async_queue(max_items=100)
+    assert sorted(processed) == sorted(set(processed))
+    assert bp.queue_stats()["duplicates"] == depth
+
+
+def test_process_async_queue_time_budget():
+    """A zero budget still makes progress, one item per call."""
+    g = _make_chain_graph()
+    config = PropagatorConfig(max_sync_updates=0, max_async_updates=10, max_depth=3)
+    bp = BoundedPropagator(graph=g, config=config)
+
+    bp.propagate("a.py")
+    assert len(bp.process_async_queue(max_items=10, time_budget_ms=0)) == 1
+
+
+def test_queue_stats_report_depth_and_latency():
+    g = _make_chain_graph()
+    config = PropagatorConfig(max_sync_updates=0, max_async_updates=10, max_depth=3)
+    bp = BoundedPropagator(graph=g, config=config)
+
+    bp.propagate("a.py")
+    stats = bp.queue_stats()
+    assert stats["depth"] == 3
+    assert stats["oldest_wait_ms"] >= 0.0
+    bp.process_async_queue(max_items=10)
+    stats = bp.queue_stats()
+    assert stats["depth"] == 0
+    assert stats["processed"] == 3
+    assert stats["latency_ms_max"] >= stats["latency_ms_avg"] >= 0.0
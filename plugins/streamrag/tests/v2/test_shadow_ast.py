@@ -82,3 +82,70 @@ def test_incremental_full_reparse_on_none_changed_lines():
     source = "x = 1\ny = 2\n"
     regions = ishadow.update(source, changed_lines=None)
     assert len(regions) >= 1
+
+
+BROKEN = (
+    '"""Module doc.\n'
+    'col0 text inside the docstring\n'
+    '"""\n'
+    "import os\n\n"
+    "@decorator\n"
+    "def first(x):\n"
+    "    return os.path.join(x)\n\n"
+    "def broken(a, b:\n"
+    "    return a\n\n"
+    "class Kept(Base):\n"
+    "    def method(self):\n"
+    "        return first(1)\n"
+)
+
+
+def _layout(regions):
+    return [(r.start_line, r.end_line, r.status,
+             sorted((e.entity_type, e.name, e.line_start) for e in r.entities))
+            for r in regions]
+
+
+def test_isolates_only_the_broken_top_level_block():
+    regions = ShadowAST().parse(BROKEN)
+    assert [(r.start_line, r.end_line, r.status) for r in regions] == [
+        (1, 9, ParseStatus.VALID), (10, 12, ParseStatus.INVALID), (13, 15, ParseStatus.VALID)]
+    valid = {e.name for r in regions if r.status == ParseStatus.VALID for e in r.entities}
+    assert {"os", "first", "Kept", "Kept.method"} <= valid
+    assert [e.name for e in regions[1].entities] == ["broken"]
+    method = next(e for e in regions[2].entities if e.name == "Kept.method")
+    assert method.line_start == 14 and method.calls == ["first"]
+
+
+def test_missing_block_blames_the_header_not_the_next_statement():
+    source = "def empty():\n\ndef after():\n    return 1\n"
+    regions = ShadowAST().parse(source)
+    assert [(r.start_line, r.end_line, r.status) for r in regions] == [
+        (1, 2, ParseStatus.INVALID), (3, 4, ParseStatus.VALID)]
+    assert [e.name for e in regions[1].entities] == ["after"]
+
+
+def test_blames_by_ast_line_numbers_past_form_feeds():
+    """\x0c and \u2028 are not line breaks to the tokenizer, so not to the blame either."""
+    source = BROKEN.replace("import os\n\n", "import os  # \u2028 \u2029\n\x0c\n")
+    regions = ShadowAST().parse(source)
+    assert [(r.start_line, r.end_line, r.status) for r in regions] == [
+        (1, 9, ParseStatus.VALID), (10, 12, ParseStatus.INVALID), (13, 15, ParseStatus.VALID)]
+    assert [e.name for e in regions[1].entities] == ["broken"]
+
+
+def test_keystrokes_reuse_valid_blocks_and_match_a_fresh_parse(monkeypatch):
+    import ast
+    lines = BROKEN.replace("def broken(a, b:", "def broken(a, b):").splitlines(keepends=True)
+    typed = "    value = compute(a, [b for b in range(3)])"
+    sources = ["".join(lines[:10] + [typed[:n] + "\n"] + lines[10:]) for n in range(4, len(typed))]
+    warm = ShadowAST()
+    warm.parse("".join(lines))
+    parses = []
+    real_parse = ast.parse
+    monkeypatch.setattr(ast, "parse", lambda *a, **k: parses.append(1) or real_parse(*a, **k))
+    results = [warm.parse(s) for s in sources]
+    monkeypatch.setattr(ast, "parse", real_parse)
+    assert len(parses) <= 2 * len(sources)
+    for source, regions in zip(sources, results):
+        assert _layout(regions) == _layout(ShadowAST().parse(source))
@@ -12,39 +12,18 @@ if PLUGIN_ROOT not in sys.path:
     sys.path.insert(0, PLUGIN_ROOT)
 
 from streamrag.bridge import DeltaGraphBridge
-from streamrag.models import CodeChange
+from streamrag.extraction_budget import default_extraction_budget
+from streamrag.extraction_cache import default_extraction_cache
+from streamrag.indexer import index_project
 from streamrag.storage.memory import save_state, save_project_state
-from streamrag.languages.registry import create_default_registry
 
 
 def init_graph(project_dir: str, session_id: str = "default") -> DeltaGraphBridge:
     """Scan project for source files and build initial graph."""
-    bridge = DeltaGraphBridge()
-    registry = create_default_registry()
-    file_count = 0
-
-    for root, dirs, files in os.walk(project_dir):
-        # Skip hidden dirs, build artifacts, package managers
-        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in (
-            "__pycache__", "node_modules", ".git", "venv", ".venv",
-            "target", "out", "bin", "obj", "dist", "build",
-        )]
-
-        for fname in files:
-            if not registry.can_handle(fname):
-                continue
-
-            fpath = os.path.join(root, fname)
-            try:
-                with open(fpath, "r") as f:
-                    content = f.read()
-            except (IOError, UnicodeDecodeError):
-                continue
-
-            rel_path = os.path.relpath(fpath, project_dir)
-            change = CodeChange(file_path=rel_path, old_content="", new_content=content)
-            bridge.process_change(change)
-            file_count += 1
+    cache = default_extraction_cache()
+    budget = default_extraction_budget()
+    bridge = DeltaGraphBridge(extraction_cache=cache, extraction_budget=budget)
+    index_project(bridge, project_dir, extraction_cache=cache, extraction_budget=budget)
 
     save_state(bridge, session_id)
     try:
@@ -1,11 +1,20 @@
 """DeltaGraphBridge: Main pipeline for incremental graph updates."""
 
+import bisect
 import hashlib
-from collections import defaultdict, deque
-from typing import Dict, List, Optional, Set, Tuple
+import posixpath
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+from streamrag.content_cache import ContentCache
+from streamrag.extraction_budget import FULL, SKIPPED
 from streamrag.extractor import ASTExtractor, extract
 from streamrag.graph import LiquidGraph
+from streamrag.include_index import IncludeIndex, is_c_family
+from streamrag.java_index import JavaPackageIndex, is_java
+from streamrag.rust_module_index import RustModuleIndex, dotted_module, is_rust
+from streamrag.ts_module_index import TSModuleIndex, is_ts_family, parse_jsonc
 from streamrag.models import (
     ASTEntity, BUILTINS, COMMON_ATTR_METHODS, SUPPORTED_EXTENSIONS,
     CodeChange, GraphEdge, GraphNode, GraphOperation,
@@ -13,7 +22,8 @@ from streamrag.models import (
 )
 
 
-MAX_FILE_CONTENTS = 500  # Max files to cache full content for
+MAX_FILE_CONTENTS = 500  # Max files to cache full content for (bytes: STREAMRAG_CONTENT_CACHE_MB)
+MAX_SHADOW_FILES = 16  # Broken files whose ShadowAST blocks are kept between saves
 
 
 def _path_similarity(file_a: str, file_b: str) -> int:
@@ -35,6 +45,147 @@ def _generate_node_id(file_path: str, entity_type: str, name: str) -> str:
     return hashlib.sha256(raw.encode()).hexdigest()[:16]
 
 
+def _node_from_entity(file_path: str, entity: ASTEntity) -> GraphNode:
+    """Build the graph node for a freshly added entity."""
+    return GraphNode(
+        id=_generate_node_id(file_path, entity.entity_type, entity.name),
+        type=entity.entity_type,
+        name=entity.name,
+        file_path=file_path,
+        line_start=entity.line_start,
+        line_end=entity.line_end,
+        properties={
+            "signature_hash": entity.signature_hash,
+            "calls": entity.calls,
+            "uses": entity.uses,
+            "inherits": entity.inherits,
+            "imports": entity.imports,
+            "type_refs": entity.type_refs,
+            "params": entity.params,
+            "decorators": entity.decorators,
+            **({"partial": True} if entity.partial else {}),
+        },
+    )
+
+
+_RESOLVED_EDGE_TYPES = ("calls", "inherits", "imports", "uses_type", "decorated_by")
+
+
+def _entity_from_node(node: GraphNode) -> ASTEntity:
+    """Rebuild the reference lists of a graph node as an ASTEntity."""
+    props = node.properties
+    return ASTEntity(
+        entity_type=node.type,
+        name=node.name,
+        line_start=node.line_start,
+        line_end=node.line_end,
+        signature_hash=props.get("signature_hash", ""),
+        structure_hash="",
+        calls=list(props.get("calls", [])),
+        uses=list(props.get("uses", [])),
+        inherits=list(props.get("inherits", [])),
+        imports=[tuple(imp) for imp in props.get("imports", [])],
+        type_refs=list(props.get("type_refs", [])),
+        params=list(props.get("params", [])),
+        decorators=list(props.get("decorators", [])),
+        partial=props.get("partial", False),
+    )
+
+
+def _mentions(node: GraphNode, short_name: str) -> bool:
+    """True if any of the node's references could resolve to short_name."""
+    props = node.properties
+    for key in ("calls", "inherits", "type_refs", "decorators"):
+        for ref in props.get(key, ()):
+            if ref.rsplit(".", 1)[-1] == short_name:
+                return True
+    return any(imp[1] in (short_name, "*") for imp in props.get("imports", ()))
+
+
+def _stale_node_ids(
+    file_path: str, removed: List[ASTEntity], modified: List[ASTEntity]
+) -> List[str]:
+    """Node ids that a delta removes, renames away or changes."""
+    ids = [_generate_node_id(file_path, e.entity_type, e.name) for e in removed]
+    for entity in modified:
+        ids.append(_generate_node_id(file_path, entity.entity_type, entity.old_name or entity.name))
+    return ids
+
+
+def _merge_dependents(
+    into: Dict[str, Set[str]], more: Dict[str, Set[str]],
+    sources: Optional[Dict[str, str]] = None, source: str = "",
+) -> None:
+    """Merge dependents by file; sources records the changed file that first reached each."""
+    for fp, node_ids in more.items():
+        into.setdefault(fp, set()).update(node_ids)
+        if sources is not None:
+            sources.setdefault(fp, source)
+
+
+def _match_renames(
+    removed: List[ASTEntity], added: List[ASTEntity]
+) -> List[Tuple[ASTEntity, ASTEntity]]:
+    """Pair removed entities with added entities that look like renames.
+
+    A pair qualifies when entity_type and structure_hash match and the line
+    spans overlap. Candidates are bucketed by (entity_type, structure_hash),
+    and each bucket is sorted by line_start so the overlap check is a bisect
+    plus a short scan instead of a full removed x added comparison.
+
+    Removed entities are matched in line order; each picks the first unmatched
+    candidate starting inside its span, else the nearest earlier candidate
+    whose span still reaches it.
+    """
+    buckets: Dict[Tuple[str, str], List[ASTEntity]] = defaultdict(list)
+    for entity in added:
+        buckets[(entity.entity_type, entity.structure_hash)].append(entity)
+
+    pending: Dict[Tuple[str, str], List[ASTEntity]] = defaultdict(list)
+    for entity in removed:
+        key = (entity.entity_type, entity.structure_hash)
+        if key in buckets:
+            pending[key].append(entity)
+
+    pairs: List[Tuple[ASTEntity, ASTEntity]] = []
+    for key, olds in pending.items():
+        cands = sorted(buckets[key], key=lambda e: (e.line_start, e.line_end, e.name))
+        starts = [c.line_start for c in cands]
+        max_end: List[int] = []
+        for c in cands:
+            max_end.append(max(c.line_end, max_end[-1]) if max_end else c.line_end)
+        # next_free[i]: smallest unmatched index >= i (path-compressed)
+        next_free = list(range(len(cands) + 1))
+
+        def _find(i: int) -> int:
+            root = i
+            while next_free[root] != root:
+                root = next_free[root]
+            while next_free[i] != root:
+                next_free[i], i = root, next_free[i]
+            return root
+
+        olds.sort(key=lambda e: (e.line_start, e.line_end, e.name))
+        for old in olds:
+            lo = bisect.bisect_left(starts, old.line_start)
+            hi = bisect.bisect_right(starts, max(old.line_start, old.line_end))
+            match = _find(lo)
+            if match >= hi:
+                # Candidates starting before this span overlap only if they reach it
+                match = -1
+                i = lo - 1
+                while i >= 0 and max_end[i] >= old.line_start:
+                    if next_free[i] == i and cands[i].line_end >= old.line_start:
+                        match = i
+                        break
+                    i -= 1
+                if match < 0:
+                    continue
+            next_free[match] = match + 1
+            pairs.append((old, cands[match]))
+    return pairs
+
+
 class DeltaGraphBridge:
     """Orchestrates incremental graph updates from code changes.
 
@@ -44,13 +195,30 @@ class DeltaGraphBridge:
 
     def __init__(self, graph: Optional[LiquidGraph] = None,
                  extractor_registry: Optional["ExtractorRegistry"] = None,
-                 versioned: bool = False) -> None:
+                 versioned: bool = False,
+                 extraction_cache: Optional["ExtractionCache"] = None,
+                 extraction_budget: Optional["ExtractionBudget"] = None) -> None:
         self.graph = graph or LiquidGraph()
-        self._file_contents: Dict[str, str] = {}
+        self._file_contents = ContentCache(max_entries=MAX_FILE_CONTENTS)
+        # file -> IncrementalShadowAST, only while the file does not parse
+        self._shadow_asts: "OrderedDict[str, Any]" = OrderedDict()
         self._tracked_files: Set[str] = set()
         self._dependency_index: Dict[str, Set[str]] = defaultdict(set)
         self._module_file_index: Dict[str, str] = {}  # "api.auth.service" → "api/auth/service.py"
         self._module_file_collisions: Set[str] = set()  # short names with ambiguous mappings
+        # Reverse maps: file -> keys it contributed (keeps remove_file O(file))
+        self._file_dependency_names: Dict[str, Set[str]] = {}
+        self._file_module_suffixes: Dict[str, Set[str]] = {}
+        # C/C++ #include resolution: header suffixes and includer maps
+        self._include_index = IncludeIndex()
+        # TS/JS specifier resolution: tsconfig paths, index files, barrels
+        self._ts_index = TSModuleIndex()
+        # Java: fully-qualified names, package members, per-file imports
+        self._java_index = JavaPackageIndex()
+        # Rust: crate module tree from `mod` declarations and file layout
+        self._rust_index = RustModuleIndex()
+        # file -> (mtime_ns, size, content hash) as last indexed (warm sync)
+        self._file_stats: Dict[str, Tuple[int, int, str]] = {}
         self._last_confidence: str = "none"
         self._resolution_stats: Dict[str, int] = {
             "total_attempted": 0,
@@ -60,6 +228,9 @@ class DeltaGraphBridge:
             "external_skipped": 0,
         }
         self._registry = extractor_registry
+        self._extraction_cache = extraction_cache  # On-disk, content-addressed
+        self._batch_extraction = False  # Set by process_changes: cache in use
+        self._extraction_budget = extraction_budget  # Size/time limits per file
 
         # V2 components (opt-in)
         self._op_log: List = []  # List of V2 GraphOp objects
@@ -73,9 +244,22 @@ class DeltaGraphBridge:
 
         # HierarchicalGraph + BoundedPropagator (set externally after init)
         self._hierarchical = None
+        # file -> dependent node ids whose references need re-resolving (propagation)
+        self._pending_refresh: Dict[str, Set[str]] = {}
         self._propagator = None
         self._propagating: bool = False  # recursion guard for propagation
 
+    @property
+    def _propagator(self):
+        return self._bounded_propagator
+
+    @_propagator.setter
+    def _propagator(self, propagator) -> None:
+        """Attach a BoundedPropagator; refreshes it drops from its queue are forgotten."""
+        self._bounded_propagator = propagator
+        if propagator is not None:
+            propagator.on_clear = self._drop_refresh
+
     @property
     def version(self) -> int:
         """Current graph version (0 if versioning disabled)."""
@@ -95,13 +279,31 @@ class DeltaGraphBridge:
         For Python files, falls back to ShadowAST when the primary extractor
         returns empty on non-empty source (broken/incomplete code).
         Shadow fallback is opt-in to preserve is_semantic_change() behavior.
+        The extraction cache, when set, is consulted before the extractor
+        only for batches (process_changes): a single edit stays off disk and
+        keeps the extractor's in-memory incremental state warm.
+        With an extraction budget, oversized or generated files come back
+        partial (declarations only) or empty; only full results are cached.
         """
         if file_path:
             ext = self._extractor_registry.get_extractor(file_path)
             if ext is not None:
-                result = ext.extract(source, file_path)
+                cache = self._extraction_cache if self._batch_extraction else None
+                result = cache.get(ext, source) if cache is not None else None
+                if result is None:
+                    budget = self._extraction_budget
+                    if budget is None:
+                        mode, result = FULL, ext.extract(source, file_path)
+                    else:
+                        mode, result = budget.extract(ext, source, file_path)
+                        if mode == SKIPPED:
+                            return result
+                    if cache is not None and mode == FULL:
+                        cache.put(ext, source, result)
                 if not result and shadow_fallback and source.strip() and file_path.endswith((".py", ".pyi")):
-                    return self._shadow_extract(source)
+                    return self._shadow_extract(source, file_path)
+                if shadow_fallback:
+                    self._shadow_asts.pop(file_path, None)  # Parses again
                 return result
         # Fallback to original Python extractor
         result = extract(source)
@@ -109,11 +311,24 @@ class DeltaGraphBridge:
             return self._shadow_extract(source)
         return result
 
-    def _shadow_extract(self, source: str) -> List[ASTEntity]:
-        """Fallback extraction using ShadowAST for broken Python code."""
+    def _shadow_extract(self, source: str, file_path: str = "") -> List[ASTEntity]:
+        """Fallback extraction using ShadowAST for broken Python code.
+
+        Each broken file keeps its IncrementalShadowAST (up to
+        MAX_SHADOW_FILES, least recently used dropped first), so the next
+        save re-parses only the blocks the edit touched. The entry is
+        dropped once the file parses cleanly.
+        """
         try:
-            from streamrag.v2.shadow_ast import ShadowAST
-            regions = ShadowAST().parse(source)
+            from streamrag.v2.shadow_ast import IncrementalShadowAST, ParseStatus
+            shadow = self._shadow_asts.pop(file_path, None) if file_path else None
+            if shadow is None:
+                shadow = IncrementalShadowAST()
+            regions = shadow.update(source)
+            if file_path and any(r.status != ParseStatus.VALID for r in regions):
+                self._shadow_asts[file_path] = shadow
+                while len(self._shadow_asts) > MAX_SHADOW_FILES:
+                    self._shadow_asts.popitem(last=False)
             entities = []
             for region in regions:
                 for entity in region.entities:
@@ -150,7 +365,11 @@ class DeltaGraphBridge:
 
         Includes rename detection via entity_type + position_overlap + structure_hash.
         """
-        old_entities = self._extract(old_content, file_path)
+        if not old_content and file_path not in self._file_contents:
+            # Old text unknown (e.g. state reloaded from disk): diff against the graph
+            old_entities = self._entities_from_graph(file_path)
+        else:
+            old_entities = self._extract(old_content, file_path)
         new_entities = self._extract(new_content, file_path, shadow_fallback=True)
 
         old_map: Dict[str, ASTEntity] = {e.name: e for e in old_entities}
@@ -164,25 +383,14 @@ class DeltaGraphBridge:
 
         # Rename detection
         renamed: List[ASTEntity] = []
-        matched_added: Set[str] = set()
-
-        for old_name in list(potentially_removed):
-            old_entity = old_map[old_name]
-            for new_name in list(potentially_added - matched_added):
-                new_entity = new_map[new_name]
-                if (
-                    old_entity.entity_type == new_entity.entity_type
-                    and self._positions_overlap(old_entity, new_entity)
-                    and old_entity.structure_hash == new_entity.structure_hash
-                ):
-                    # It's a rename
-                    new_entity.old_name = old_name
-                    renamed.append(new_entity)
-                    matched_added.add(new_name)
-                    potentially_removed.discard(old_name)
-                    break
-
-        potentially_added -= matched_added
+        for old_entity, new_entity in _match_renames(
+            [old_map[n] for n in potentially_removed],
+            [new_map[n] for n in potentially_added],
+        ):
+            new_entity.old_name = old_entity.name
+            renamed.append(new_entity)
+            potentially_removed.discard(old_entity.name)
+            potentially_added.discard(new_entity.name)
 
         # Actual results
         added = [new_map[n] for n in potentially_added]
@@ -192,14 +400,23 @@ class DeltaGraphBridge:
         modified: List[ASTEntity] = []
         common_names = old_names & new_names
         for name in common_names:
-            if old_map[name].signature_hash != new_map[name].signature_hash:
-                modified.append(new_map[name])
+            old, new = old_map[name], new_map[name]
+            if old.signature_hash != new.signature_hash or old.partial != new.partial:
+                modified.append(new)
 
         # Renames are appended to modified
         modified.extend(renamed)
 
         return added, removed, modified
 
+    def _entities_from_graph(self, file_path: str) -> List[ASTEntity]:
+        """Rebuild a file's last-indexed entities from its graph nodes.
+
+        Carries names and signature hashes, which is all compute_delta needs
+        to tell unchanged from modified; no structure hash, so no renames.
+        """
+        return [_entity_from_node(node) for node in self.graph.get_nodes_by_file(file_path)]
+
     def process_change(self, change: CodeChange) -> List[GraphOperation]:
         """Main pipeline: process a code change and return graph operations.
 
@@ -219,12 +436,6 @@ class DeltaGraphBridge:
         if not self.is_semantic_change(old_content, new_content, file_path):
             self._file_contents[file_path] = new_content
             self._tracked_files.add(file_path)
-            # Evict cache to prevent unbounded growth from non-semantic changes
-            if len(self._file_contents) > MAX_FILE_CONTENTS:
-                excess = len(self._file_contents) - MAX_FILE_CONTENTS
-                keys_to_remove = list(self._file_contents.keys())[:excess]
-                for k in keys_to_remove:
-                    del self._file_contents[k]
             return []
 
         # 2. COMPUTE DELTA
@@ -232,74 +443,298 @@ class DeltaGraphBridge:
 
         operations: List[GraphOperation] = []
 
+        # Dependents of symbols about to disappear or change (edges cascade on removal)
+        dependents: Dict[str, Set[str]] = {}
+        if self._propagator:
+            dependents = self._dependents_of(file_path, _stale_node_ids(file_path, removed, modified))
+
         # 3. PROCESS REMOVALS (first!)
-        for entity in removed:
-            node_id = _generate_node_id(file_path, entity.entity_type, entity.name)
-            # Capture callers before removal (for proactive breaking-change detection)
-            had_callers = []
-            for edge in self.graph.get_incoming_edges(node_id):
-                src = self.graph.get_node(edge.source_id)
-                if src and src.file_path != file_path:
-                    had_callers.append(src.name)
-            self.graph.remove_node(node_id)
-            props = {"name": entity.name}
-            if had_callers:
-                props["had_callers"] = had_callers
-            operations.append(GraphOperation(
-                op_type="remove_node",
-                node_id=node_id,
-                node_type=entity.entity_type,
-                properties=props,
-            ))
+        operations.extend(self._apply_removals(file_path, removed))
 
         # 4. PROCESS ADDITIONS (imports first so edges exist for call resolution)
         added.sort(key=lambda e: (0 if e.entity_type == "import" else 1, e.name))
+        add_ops: List[Tuple[ASTEntity, GraphOperation]] = []
         for entity in added:
-            node_id = _generate_node_id(file_path, entity.entity_type, entity.name)
-            node = GraphNode(
-                id=node_id,
-                type=entity.entity_type,
-                name=entity.name,
-                file_path=file_path,
-                line_start=entity.line_start,
-                line_end=entity.line_end,
-                properties={
-                    "signature_hash": entity.signature_hash,
-                    "calls": entity.calls,
-                    "uses": entity.uses,
-                    "inherits": entity.inherits,
-                    "imports": entity.imports,
-                    "type_refs": entity.type_refs,
-                    "params": entity.params,
-                    "decorators": entity.decorators,
-                },
-            )
+            node = _node_from_entity(file_path, entity)
             self.graph.add_node(node)
+            op = GraphOperation(
+                op_type="add_node",
+                node_id=node.id,
+                node_type=entity.entity_type,
+                properties=node.properties,
+            )
+            operations.append(op)
+            add_ops.append((entity, op))
 
+        # 5. PROCESS MODIFICATIONS
+        operations.extend(self._apply_modifications(file_path, modified))
+        # Import indexes (package, includes, specifiers) before any edge is resolved
+        self._update_module_file_index(file_path)
+        self._update_import_indexes(file_path)
+
+        # 6. TWO-PASS EDGE RESOLUTION
+        for entity, op in add_ops:
             # First-pass edge creation
-            edges = self._create_first_pass_edges(entity, node_id, file_path)
+            op.edges = self._create_first_pass_edges(entity, op.node_id, file_path)
 
             # Reverse import sweep: link existing import nodes to this new definition
             if entity.entity_type in ("function", "class", "variable"):
-                for existing_node in list(self.graph._nodes.values()):
-                    if (existing_node.type == "import"
-                            and existing_node.name == entity.name
-                            and existing_node.file_path != file_path):
-                        if not self._edge_exists(existing_node.id, node_id, "imports"):
+                for existing_node in self.graph.query(entity_type="import", name=entity.name):
+                    if existing_node.file_path != file_path:
+                        if not self._edge_exists(existing_node.id, op.node_id, "imports"):
                             self.graph.add_edge(GraphEdge(
                                 source_id=existing_node.id,
-                                target_id=node_id,
+                                target_id=op.node_id,
                                 edge_type="imports",
                             ))
+        all_changed = added + modified
+        for entity in all_changed:
+            source_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+            self._resolve_pending_edges(entity, source_id, file_path)
+        operations.extend(self._refresh_moved_modules({file_path}))
+
+        # 7. UPDATE CACHES
+        self._file_contents[file_path] = new_content
+        self._tracked_files.add(file_path)
+        self._update_dependency_index(file_path)
+
+        # 8. RECORD IN VERSIONED GRAPH (if enabled)
+        if self._versioned:
+            for op in operations:
+                self._versioned.record_operation(op, file_path=file_path)
+
+        # 9. BOUNDED PROPAGATION (if enabled): re-resolve dependent entities only
+        if self._propagator and not self._propagating:
+            _merge_dependents(dependents, self._referrers_of(
+                file_path, added + [e for e in modified if e.old_name]))
+            self._propagating = True
+            try:
+                self._propagator.record_edit(file_path)
+                queued = self._queue_refresh(dependents)
+                result = self._propagator.propagate(
+                    file_path,
+                    update_fn=self._refresh_dependents,
+                    graph=self.graph,
+                    affected=[(fp, 1) for fp in sorted(dependents)],
+                )
+                self._drop_refresh(result.deferred, queued)
+                # Extend operations with sync-processed results (informational)
+                for fp in result.sync_processed:
+                    operations.append(GraphOperation(
+                        op_type="update_node",
+                        node_id="",
+                        node_type="propagation",
+                        properties={"file": fp, "phase": "sync"},
+                    ))
+            finally:
+                self._propagating = False
+
+        # 10. TRACK FILE IN HIERARCHICAL GRAPH (if enabled)
+        if self._hierarchical:
+            self._hierarchical.open_file(file_path)
+
+        return operations
+
+    def process_changes(
+        self, changes: List[CodeChange]
+    ) -> Tuple[List[GraphOperation], Dict[str, Any]]:
+        """Batch pipeline for multi-file events (checkout, rebase, codemods).
+
+        Runs each process_change stage once across the whole batch:
+        1. Semantic gate + delta per file (repeated paths are merged)
+        2. Removals for every file
+        3. Additions and modifications for every file, then module index
+        4. Edge resolution once, after every new node exists
+        5. Caches + versioning
+        6. One bounded propagation over the union of affected files
+
+        Returns (operations, profile); profile has per-stage counts and ms.
+        """
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def _lap(stage: str, since: float) -> float:
+            now = time.perf_counter()
+            timings[stage] = round((now - since) * 1000, 3)
+            return now
+
+        # Merge repeated paths: first old_content, last new_content
+        merged: Dict[str, CodeChange] = {}
+        for change in changes:
+            prev = merged.get(change.file_path)
+            if prev is not None:
+                change = CodeChange(
+                    file_path=change.file_path,
+                    old_content=prev.old_content,
+                    new_content=change.new_content,
+                )
+            merged[change.file_path] = change
+
+        # 1. SEMANTIC GATE + DELTA (many files at once: worth the extraction cache)
+        deltas: List[Tuple[str, str, List[ASTEntity], List[ASTEntity], List[ASTEntity]]] = []
+        self._batch_extraction = True
+        try:
+            for file_path in sorted(merged):
+                change = merged[file_path]
+                if not self.is_semantic_change(change.old_content, change.new_content, file_path):
+                    self._file_contents[file_path] = change.new_content
+                    self._tracked_files.add(file_path)
+                    continue
+                added, removed, modified = self.compute_delta(
+                    file_path, change.old_content, change.new_content)
+                deltas.append((file_path, change.new_content, added, removed, modified))
+        finally:
+            self._batch_extraction = False
+        mark = _lap("delta", start)
+
+        ops_by_file: Dict[str, List[GraphOperation]] = {fp: [] for fp, *_ in deltas}
+
+        dependents: Dict[str, Set[str]] = {}
+        sources: Dict[str, str] = {}  # dependent file -> changed file it depends on
+        if self._propagator:
+            for file_path, _, _, removed, modified in deltas:
+                _merge_dependents(dependents, self._dependents_of(
+                    file_path, _stale_node_ids(file_path, removed, modified)), sources, file_path)
+
+        # 2. REMOVALS (all files first, so nothing resolves to a dying node)
+        for file_path, _, _, removed, _ in deltas:
+            ops_by_file[file_path].extend(self._apply_removals(file_path, removed))
+        mark = _lap("removals", mark)
+
+        # 3. ADDITIONS + MODIFICATIONS (nodes only; edges wait for stage 4)
+        add_ops: List[Tuple[str, ASTEntity, GraphOperation]] = []
+        for file_path, _, added, _, modified in deltas:
+            for entity in added:
+                node = _node_from_entity(file_path, entity)
+                self.graph.add_node(node)
+                op = GraphOperation(
+                    op_type="add_node",
+                    node_id=node.id,
+                    node_type=entity.entity_type,
+                    properties=node.properties,
+                )
+                ops_by_file[file_path].append(op)
+                add_ops.append((file_path, entity, op))
+            ops_by_file[file_path].extend(self._apply_modifications(file_path, modified))
+        for file_path, *_ in deltas:
+            self._update_module_file_index(file_path)
+            self._update_import_indexes(file_path)
+        mark = _lap("additions", mark)
+
+        # 4. EDGE RESOLUTION (imports first so call resolution sees import edges)
+        add_ops.sort(key=lambda item: 0 if item[1].entity_type == "import" else 1)
+        for file_path, entity, op in add_ops:
+            op.edges = self._create_first_pass_edges(entity, op.node_id, file_path)
+            if entity.entity_type in ("function", "class", "variable"):
+                for existing_node in self.graph.query(entity_type="import", name=entity.name):
+                    if existing_node.file_path != file_path:
+                        if not self._edge_exists(existing_node.id, op.node_id, "imports"):
+                            self.graph.add_edge(GraphEdge(
+                                source_id=existing_node.id,
+                                target_id=op.node_id,
+                                edge_type="imports",
+                            ))
+        for file_path, _, _, _, modified in deltas:
+            for entity in modified:
+                source_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+                self._resolve_pending_edges(entity, source_id, file_path)
+        refreshed = self._refresh_moved_modules({fp for fp, *_ in deltas})
+        mark = _lap("edges", mark)
+
+        # 5. CACHES + VERSIONING
+        operations: List[GraphOperation] = []
+        for file_path, new_content, *_ in deltas:
+            self._file_contents[file_path] = new_content
+            self._tracked_files.add(file_path)
+            self._update_dependency_index(file_path)
+            if self._versioned:
+                for op in ops_by_file[file_path]:
+                    self._versioned.record_operation(op, file_path=file_path)
+            operations.extend(ops_by_file[file_path])
+        operations.extend(refreshed)
+        mark = _lap("caches", mark)
+
+        # 6. ONE BOUNDED PROPAGATION over the union of affected files
+        propagation = {"affected": 0, "sync": 0, "async": 0, "deferred": 0}
+        changed_files = [fp for fp, *_ in deltas]
+        if changed_files and self._propagator and not self._propagating:
+            for file_path, _, added, _, modified in deltas:
+                _merge_dependents(dependents, self._referrers_of(
+                    file_path, added + [e for e in modified if e.old_name]), sources, file_path)
+            self._propagating = True
+            try:
+                for file_path in changed_files:
+                    self._propagator.record_edit(file_path)
+                queued = self._queue_refresh(dependents)
+                result = self._propagator.propagate_many(
+                    changed_files,
+                    update_fn=self._refresh_dependents,
+                    graph=self.graph,
+                    affected=[(fp, 1, sources[fp]) for fp in sorted(dependents)],
+                )
+                self._drop_refresh(result.deferred, queued)
+                for fp in result.sync_processed:
+                    operations.append(GraphOperation(
+                        op_type="update_node",
+                        node_id="",
+                        node_type="propagation",
+                        properties={"file": fp, "phase": "sync"},
+                    ))
+                propagation = {
+                    "affected": result.total_affected,
+                    "sync": len(result.sync_processed),
+                    "async": len(result.async_queued),
+                    "deferred": len(result.deferred),
+                }
+            finally:
+                self._propagating = False
+        if self._hierarchical:
+            for file_path in changed_files:
+                self._hierarchical.open_file(file_path)
+        mark = _lap("propagation", mark)
+        timings["total"] = round((mark - start) * 1000, 3)
+
+        profile: Dict[str, Any] = {
+            "files": len(merged),
+            "semantic_files": len(deltas),
+            "added": sum(len(d[2]) for d in deltas),
+            "removed": sum(len(d[3]) for d in deltas),
+            "modified": sum(len(d[4]) for d in deltas),
+            "propagation": propagation,
+            "timings_ms": timings,
+        }
+        return operations, profile
+
+    def _apply_removals(
+        self, file_path: str, removed: List[ASTEntity]
+    ) -> List[GraphOperation]:
+        """Remove nodes for deleted entities, noting cross-file callers."""
+        operations: List[GraphOperation] = []
+        for entity in removed:
+            node_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+            # Capture callers before removal (for proactive breaking-change detection)
+            had_callers = []
+            for edge in self.graph.get_incoming_edges(node_id):
+                src = self.graph.get_node(edge.source_id)
+                if src and src.file_path != file_path:
+                    had_callers.append(src.name)
+            self.graph.remove_node(node_id)
+            props = {"name": entity.name}
+            if had_callers:
+                props["had_callers"] = had_callers
             operations.append(GraphOperation(
-                op_type="add_node",
+                op_type="remove_node",
                 node_id=node_id,
                 node_type=entity.entity_type,
-                properties=node.properties,
-                edges=edges,
+                properties=props,
             ))
+        return operations
 
-        # 5. PROCESS MODIFICATIONS
+    def _apply_modifications(
+        self, file_path: str, modified: List[ASTEntity]
+    ) -> List[GraphOperation]:
+        """Update changed entities in place; renames replace the old node."""
+        operations: List[GraphOperation] = []
         for entity in modified:
             if entity.old_name is not None:
                 # Rename: remove old, add new
@@ -324,6 +759,7 @@ class DeltaGraphBridge:
                         "params": entity.params,
                         "decorators": entity.decorators,
                         "renamed_from": entity.old_name,
+                        **({"partial": True} if entity.partial else {}),
                     },
                 )
                 self.graph.add_node(new_node)
@@ -342,6 +778,10 @@ class DeltaGraphBridge:
                     existing.properties["type_refs"] = entity.type_refs
                     existing.properties["params"] = entity.params
                     existing.properties["decorators"] = entity.decorators
+                    if entity.partial:
+                        existing.properties["partial"] = True
+                    else:
+                        existing.properties.pop("partial", None)
                     # Clear stale outgoing edges so re-resolution picks up changes
                     for edge in self.graph.get_outgoing_edges(node_id):
                         if edge.edge_type in ("calls", "inherits", "uses_type", "decorated_by"):
@@ -364,6 +804,7 @@ class DeltaGraphBridge:
                             "type_refs": entity.type_refs,
                             "params": entity.params,
                             "decorators": entity.decorators,
+                            **({"partial": True} if entity.partial else {}),
                         },
                     )
                     self.graph.add_node(node)
@@ -379,70 +820,174 @@ class DeltaGraphBridge:
                     **({"renamed_from": entity.old_name} if entity.old_name else {}),
                 },
             ))
+        return operations
 
-        # 6. TWO-PASS EDGE RESOLUTION
-        all_changed = added + modified
-        for entity in all_changed:
-            source_id = _generate_node_id(file_path, entity.entity_type, entity.name)
-            self._resolve_pending_edges(entity, source_id, file_path)
+    # ---- entity-level propagation -------------------------------------
 
-        # 7. UPDATE CACHES
-        self._file_contents[file_path] = new_content
-        self._tracked_files.add(file_path)
-        if len(self._file_contents) > MAX_FILE_CONTENTS:
-            # Evict oldest entries (FIFO via dict insertion order, Python 3.7+)
-            excess = len(self._file_contents) - MAX_FILE_CONTENTS
-            keys_to_remove = list(self._file_contents.keys())[:excess]
-            for k in keys_to_remove:
-                del self._file_contents[k]
-        self._update_dependency_index(file_path)
-        self._update_module_file_index(file_path)
+    def _dependents_of(self, file_path: str, node_ids: List[str]) -> Dict[str, Set[str]]:
+        """Entities in other files with an edge into node_ids, grouped by file."""
+        dependents: Dict[str, Set[str]] = {}
+        for node_id in node_ids:
+            for edge in self.graph.get_incoming_edges(node_id):
+                src = self.graph.get_node(edge.source_id)
+                if src and src.file_path != file_path:
+                    dependents.setdefault(src.file_path, set()).add(src.id)
+        return dependents
 
-        # 8. RECORD IN VERSIONED GRAPH (if enabled)
-        if self._versioned:
-            for op in operations:
-                self._versioned.record_operation(op, file_path=file_path)
+    def _referrers_of(self, file_path: str, entities: List[ASTEntity]) -> Dict[str, Set[str]]:
+        """Entities in other files that may now resolve to these new symbols.
 
-        # 9. BOUNDED PROPAGATION (if enabled)
-        if self._propagator and not self._propagating:
-            self._propagating = True
-            try:
-                self._propagator.record_edit(file_path)
-                result = self._propagator.propagate(
-                    file_path,
-                    update_fn=self._re_parse_file,
-                    graph=self.graph,
-                )
-                # Extend operations with sync-processed results (informational)
-                for fp in result.sync_processed:
-                    operations.append(GraphOperation(
-                        op_type="update_node",
-                        node_id="",
-                        node_type="propagation",
-                        properties={"file": fp, "phase": "sync"},
-                    ))
-            finally:
-                self._propagating = False
+        Candidate files are those linked to the new node (import edges from
+        the reverse sweep) or calling its name (dependency index); only
+        entities that actually mention the name are kept.
+        """
+        dependents: Dict[str, Set[str]] = {}
+        for entity in entities:
+            short = entity.name.rsplit(".", 1)[-1]
+            node_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+            files = set(self._dependency_index.get(entity.name, ()))
+            files.update(self._dependency_index.get(short, ()))
+            for edge in self.graph.get_incoming_edges(node_id):
+                src = self.graph.get_node(edge.source_id)
+                if src:
+                    files.add(src.file_path)
+            files.discard(file_path)
+            for fp in files:
+                for node in self.graph.get_nodes_by_file(fp):
+                    if _mentions(node, short):
+                        dependents.setdefault(fp, set()).add(node.id)
+        return dependents
+
+    def _refresh_moved_modules(self, changed: Set[str]) -> List[GraphOperation]:
+        """Re-resolve the `use` imports of files a `mod` change moved in a crate tree.
+
+        Files in changed were just resolved against the updated tree.
+        """
+        operations: List[GraphOperation] = []
+        for fp in sorted(self._rust_index.pop_moved() - changed):
+            imports = {n.id for n in self.graph.get_nodes_by_file(fp) if n.type == "import"}
+            if imports:
+                self._queue_refresh({fp: imports})
+                operations.extend(self._refresh_dependents(fp))
+        return operations
 
-        # 10. TRACK FILE IN HIERARCHICAL GRAPH (if enabled)
-        if self._hierarchical:
-            self._hierarchical.open_file(file_path)
+    def _queue_refresh(self, dependents: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+        """Record dependents for _refresh_dependents; returns the ids not already queued."""
+        queued: Dict[str, Set[str]] = {}
+        for fp, node_ids in dependents.items():
+            pending = self._pending_refresh.setdefault(fp, set())
+            new = node_ids - pending
+            if new:
+                pending.update(new)
+                queued[fp] = new
+        return queued
+
+    def _drop_refresh(
+        self, file_paths: List[str], queued: Optional[Dict[str, Set[str]]] = None
+    ) -> None:
+        """Forget pending refreshes of file_paths: all of them, or only the ids in queued.
+
+        A deferred file may still sit in the async queue from an earlier
+        propagation; the ids that one queued stay for the drain.
+        """
+        for fp in file_paths:
+            if queued is None:
+                self._pending_refresh.pop(fp, None)
+                continue
+            pending = self._pending_refresh.get(fp)
+            if pending is not None:
+                pending -= queued.get(fp, set())
+                if not pending:
+                    del self._pending_refresh[fp]
+
+    def _refresh_dependents(self, file_path: str) -> List[GraphOperation]:
+        """Re-resolve outgoing references of a file's pending dependent entities.
 
+        Works from the references stored on each node: no disk I/O and no
+        re-extraction. Used as the propagator's update function.
+        """
+        operations: List[GraphOperation] = []
+        for node_id in sorted(self._pending_refresh.pop(file_path, ())):
+            node = self.graph.get_node(node_id)
+            if node is None:
+                continue
+            for edge in self.graph.get_outgoing_edges(node_id):
+                if edge.edge_type in _RESOLVED_EDGE_TYPES:
+                    self.graph.remove_edge(edge.source_id, edge.target_id, edge.edge_type)
+            self._resolve_pending_edges(_entity_from_node(node), node_id, file_path)
+            operations.append(GraphOperation(
+                op_type="update_node",
+                node_id=node_id,
+                node_type=node.type,
+                properties={"name": node.name, "refreshed": True},
+            ))
         return operations
 
-    def _re_parse_file(self, file_path: str) -> List[GraphOperation]:
-        """Re-parse a file and update the graph (for propagation)."""
-        import os
-        try:
-            with open(file_path, "r") as f:
-                content = f.read()
-        except (IOError, OSError):
-            return []
-        old_content = self._file_contents.get(file_path, "")
-        if old_content == content:
+    def drain_propagation(
+        self, max_items: int = 10, time_budget_ms: Optional[float] = None
+    ) -> List[str]:
+        """Refresh dependents queued by earlier propagation (async phase).
+
+        Drained files do not propagate further: their ripple was already
+        bounded when they were queued. Returns the processed file paths.
+        """
+        if not self._propagator or self._propagating:
             return []
-        change = CodeChange(file_path=file_path, old_content=old_content, new_content=content)
-        return self.process_change(change)
+        self._propagating = True
+        try:
+            return self._propagator.process_async_queue(
+                max_items=max_items,
+                update_fn=self._refresh_dependents,
+                time_budget_ms=time_budget_ms,
+            )
+        finally:
+            self._propagating = False
+
+    def bulk_load(
+        self, extracted: List[Tuple[str, str, List[ASTEntity]]]
+    ) -> int:
+        """Cold-start merge of pre-extracted files into the graph.
+
+        Takes (file_path, content, entities) triples, typically produced by
+        streamrag.indexer in a process pool. Two phases, so the result does
+        not depend on file order:
+        1. Insert every node and register every module path
+        2. Resolve edges: imports for all files first, then everything else
+
+        Skips the semantic gate, versioning and propagation (there is no
+        previous state to diff against). Returns the number of files loaded.
+        """
+        extracted = sorted(extracted, key=lambda item: item[0])
+
+        # Phase 1: nodes and module index
+        loaded: List[Tuple[str, List[ASTEntity]]] = []
+        for file_path, content, entities in extracted:
+            if self.graph.get_nodes_by_file(file_path):
+                self.remove_file(file_path)
+            by_name: Dict[str, ASTEntity] = {e.name: e for e in entities}
+            for entity in by_name.values():
+                self.graph.add_node(_node_from_entity(file_path, entity))
+            self._file_contents[file_path] = content
+            self._tracked_files.add(file_path)
+            self._update_module_file_index(file_path)
+            self._update_import_indexes(file_path)
+            loaded.append((file_path, list(by_name.values())))
+
+        # Phase 2: edges (imports first so call resolution sees import edges)
+        for file_path, entities in loaded:
+            for entity in entities:
+                if entity.entity_type == "import":
+                    source_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+                    self._create_first_pass_edges(entity, source_id, file_path)
+        for file_path, entities in loaded:
+            for entity in entities:
+                if entity.entity_type != "import":
+                    source_id = _generate_node_id(file_path, entity.entity_type, entity.name)
+                    self._create_first_pass_edges(entity, source_id, file_path)
+            self._update_dependency_index(file_path)
+        self._rust_index.pop_moved()  # Phase 2 resolved against the whole tree
+
+        return len(loaded)
 
     def _create_first_pass_edges(
         self, entity: ASTEntity, source_id: str, file_path: str
@@ -582,10 +1127,8 @@ class DeltaGraphBridge:
 
         # Reverse import resolution: if this is a definition, link import nodes to it
         if entity.entity_type in ("function", "class", "variable"):
-            for node in list(self.graph._nodes.values()):
-                if (node.type == "import"
-                        and node.name == entity.name
-                        and node.file_path != file_path):
+            for node in self.graph.query(entity_type="import", name=entity.name):
+                if node.file_path != file_path:
                     if not self._edge_exists(node.id, source_id, "imports"):
                         self.graph.add_edge(GraphEdge(
                             source_id=node.id,
@@ -632,17 +1175,26 @@ class DeltaGraphBridge:
         edge to each exported definition.
         """
         edges: List[Tuple[str, str]] = []
-        target_file = self._module_file_index.get(module)
+        if is_java(file_path):
+            return self._expand_java_on_demand(source_id, file_path, module)
+        target_file = None
+        module_key = module
+        if is_ts_family(file_path):
+            target_file = self._ts_index.resolve(module, file_path)
+        elif is_rust(file_path):
+            found = self._rust_index.resolve_path(module, file_path)
+            target_file = found[0] if found is not None else None
+            module_key = dotted_module(module)
+        target_file = target_file or self._module_file_index.get(module_key)
         if not target_file:
             return edges
 
         export_names = self.get_module_exports(target_file)
         for name in export_names:
             # Find the definition node in the target file
-            for node in self.graph._nodes.values():
-                if (node.name == name
-                        and node.type in ("function", "class", "variable")
-                        and node.file_path == target_file):
+            for entity_type in ("function", "class", "variable"):
+                node = self.graph.get_node(_generate_node_id(target_file, entity_type, name))
+                if node is not None:
                     if not self._edge_exists(source_id, node.id, "imports"):
                         self.graph.add_edge(GraphEdge(
                             source_id=source_id,
@@ -659,6 +1211,30 @@ class DeltaGraphBridge:
                     break
         return edges
 
+    def _expand_java_on_demand(
+        self, source_id: str, file_path: str, module: str
+    ) -> List[Tuple[str, str]]:
+        """Expand Java `import module.*` from the package member map."""
+        edges: List[Tuple[str, str]] = []
+        for name, found in sorted(self._java_index.on_demand_members(module).items()):
+            node = self.graph.get_node(_generate_node_id(found[0], "class", found[1]))
+            if node is None or node.id == source_id:
+                continue
+            if not self._edge_exists(source_id, node.id, "imports"):
+                self.graph.add_edge(GraphEdge(
+                    source_id=source_id,
+                    target_id=node.id,
+                    edge_type="imports",
+                    properties={
+                        "module": module,
+                        "name": name,
+                        "confidence": "medium",
+                        "via_star": True,
+                    },
+                ))
+                edges.append((node.id, "imports"))
+        return edges
+
     def _follow_import_chain(self, import_node: GraphNode, max_hops: int = 5) -> Optional[GraphNode]:
         """Follow a chain of import nodes to find the actual definition.
 
@@ -693,7 +1269,24 @@ class DeltaGraphBridge:
         Uses module path to resolve to the correct file first,
         then falls back to cross-file name matching.
         Follows re-export chains when the immediate target is another import.
+        C/C++ #include directives name files, not definitions: they are
+        resolved by the include index and never scanned for here.
         """
+        if module in (".", "") and is_c_family(current_file):
+            return None
+        if module and is_ts_family(current_file):
+            target = self._find_ts_import_target(name, module, current_file)
+            if target is not None:
+                return target
+        if module and is_java(current_file):
+            target = self._find_java_import_target(name, module)
+            if target is not None:
+                return target
+        if module and is_rust(current_file):
+            target = self._find_rust_import_target(name, module, current_file)
+            if target is not None:
+                return target
+            module = dotted_module(module)
         # Strategy 1: Use module path to find the exact target file
         if module:
             target_file = self._module_file_index.get(module)
@@ -739,11 +1332,120 @@ class DeltaGraphBridge:
 
         return None
 
+    def _find_ts_import_target(
+        self, name: str, module: str, current_file: str, max_files: int = 16
+    ) -> Optional[GraphNode]:
+        """Definition a TS/JS import names, via the module index.
+
+        Resolves the specifier to a file, then follows barrel re-exports
+        (named, then `export *`) until a file defines name. Each step is a
+        dict lookup; node ids are derived from (file, type, name).
+        """
+        start = self._ts_index.resolve(module, current_file)
+        if start is None:
+            return None
+        queue = deque([start])
+        seen: Set[str] = set()
+        while queue and len(seen) < max_files:
+            file_path = queue.popleft()
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+            for entity_type in ("class", "function", "variable"):
+                node = self.graph.get_node(_generate_node_id(file_path, entity_type, name))
+                if node is not None:
+                    return node
+            queue.extend(self._ts_index.reexport_sources(file_path, name))
+        return None
+
+    def _find_rust_import_target(
+        self, name: str, module: str, current_file: str
+    ) -> Optional[GraphNode]:
+        """Definition a Rust `use` path names, via the crate module tree.
+
+        Items of inline modules are looked up as "inner.name", then "name",
+        in the file that holds them; a `pub use` re-export is followed.
+        """
+        found = self._rust_index.resolve_path(module, current_file)
+        if found is None:
+            return None
+        file_path, inline = found
+        for candidate in dict.fromkeys((".".join(inline + [name]), name)):
+            for entity_type in ("class", "function", "variable"):
+                node = self.graph.get_node(_generate_node_id(file_path, entity_type, candidate))
+                if node is not None:
+                    return node
+        reexport = self.graph.get_node(_generate_node_id(file_path, "import", name))
+        if reexport is not None:
+            return self._follow_import_chain(reexport)
+        return None
+
+    def _find_java_import_target(self, name: str, module: str) -> Optional[GraphNode]:
+        """Definition a Java import names, by fully-qualified name.
+
+        `import a.b.C;` names class C of package a.b; `import static
+        a.b.C.m;` names member m of class a.b.C.
+        """
+        found = self._java_index.lookup(f"{module}.{name}")
+        if found is not None:
+            return self.graph.get_node(_generate_node_id(found[0], "class", found[1]))
+        found = self._java_index.lookup(module)
+        if found is not None:
+            return self._java_member_node(found, name, ("function", "variable", "class"))
+        return None
+
+    def _java_member_node(
+        self, found: Tuple[str, str], member: str, entity_types: Tuple[str, ...]
+    ) -> Optional[GraphNode]:
+        """Member of the type found = (file, type name): "Type.member", else a bare
+        "member" in that file (members the extractor did not scope to the type)."""
+        file_path, type_name = found
+        for name in (f"{type_name}.{member}", member):
+            for entity_type in entity_types:
+                node = self.graph.get_node(_generate_node_id(file_path, entity_type, name))
+                if node is not None:
+                    return node
+        return None
+
+    def _find_java_type_target(
+        self, name: str, current_file: str, expected_type: str
+    ) -> Optional[GraphNode]:
+        """Resolve a Java type ("Money", "Outer.Inner") or "Type.member" reference.
+
+        Uses the scope rules of the package index (imports, same file,
+        same package, on-demand imports). A bare type name used as a call
+        is a constructor call: it resolves to the constructor if one is
+        declared, and to nothing otherwise, so the class lookup follows.
+        Returns None when the name is not a known type.
+        """
+        if expected_type == "class":
+            found = self._java_index.resolve_type(name, current_file)
+            if found is not None:
+                return self.graph.get_node(_generate_node_id(found[0], "class", found[1]))
+            return None
+        if expected_type != "function":
+            return None
+        receiver, _, member = name.rpartition(".")
+        if not receiver:
+            found = self._java_index.resolve_type(name, current_file)
+            if found is not None:
+                member = found[1].rsplit(".", 1)[-1]
+        else:
+            found = self._java_index.resolve_type(receiver, current_file)
+        if found is None:
+            return None
+        return self._java_member_node(found, member, ("function",))
+
     def _get_imported_file_paths(self, file_path: str) -> Set[str]:
-        """Get set of file paths that this file imports from via import edges."""
+        """Get set of file paths that this file imports from via import edges.
+
+        For C/C++ files this includes the headers its #include directives
+        resolve to.
+        """
         result: Set[str] = set()
-        nodes = self.graph.get_nodes_by_file(file_path)
-        for node in nodes:
+        if is_c_family(file_path):
+            result.update(self._include_index.includes(file_path))
+        for node in self.graph.get_nodes_by_file(file_path):
             if node.type == "import":
                 for edge in self.graph.get_outgoing_edges(node.id):
                     if edge.edge_type == "imports":
@@ -772,7 +1474,9 @@ class DeltaGraphBridge:
                 # No edge yet — try module index from import metadata
                 for module, _name in node.properties.get("imports", []):
                     if module:
-                        file_path = self._module_file_index.get(module)
+                        file_path = (self._ts_index.resolve(module, current_file)
+                                     if is_ts_family(current_file) else None)
+                        file_path = file_path or self._module_file_index.get(module)
                         if file_path:
                             return file_path
         # Try module-to-file index directly (receiver might be a module name)
@@ -804,6 +1508,15 @@ class DeltaGraphBridge:
         if name in BUILTINS:
             self._resolution_stats["external_skipped"] += 1
             return None
+        if is_java(current_file) and name[:1].isupper():
+            target = self._find_java_type_target(name, current_file, expected_type)
+            if target is not None:
+                self._last_confidence = "high"
+                self._resolution_stats["resolved"] += 1
+                if _is_test_file(target.file_path):
+                    self._resolution_stats["to_test_file"] += 1
+                return target
+
         # Note: COMMON_ATTR_METHODS filtering is handled by the extractor.
         # Bare names from ast.Name calls (e.g. run()) are legitimate function
         # calls. Qualified names (Type.method) are precise from type context.
@@ -1034,12 +1747,34 @@ class DeltaGraphBridge:
         return False
 
     def _update_dependency_index(self, file_path: str) -> None:
-        """Update the dependency index for a file (skips builtins)."""
-        nodes = self.graph.get_nodes_by_file(file_path)
-        for node in nodes:
+        """Update the dependency index for a file (skips builtins).
+
+        Names the file no longer calls are dropped, so the index never keeps
+        stale entries for a file that is still tracked.
+        """
+        names: Set[str] = set()
+        for node in self.graph.get_nodes_by_file(file_path):
             for called_name in node.properties.get("calls", []):
                 if called_name not in BUILTINS and called_name not in COMMON_ATTR_METHODS:
-                    self._dependency_index[called_name].add(file_path)
+                    names.add(called_name)
+        previous = self._file_dependency_names.get(file_path, set())
+        self._drop_dependency_names(file_path, previous - names)
+        for called_name in names:
+            self._dependency_index[called_name].add(file_path)
+        if names:
+            self._file_dependency_names[file_path] = names
+        else:
+            self._file_dependency_names.pop(file_path, None)
+
+    def _drop_dependency_names(self, file_path: str, names: Set[str]) -> None:
+        """Remove file_path from the dependency index entries for names."""
+        for name in names:
+            files = self._dependency_index.get(name)
+            if files is None:
+                continue
+            files.discard(file_path)
+            if not files:
+                del self._dependency_index[name]
 
     def _update_module_file_index(self, file_path: str) -> None:
         """Register file path as module path with all suffix variants.
@@ -1064,9 +1799,83 @@ class DeltaGraphBridge:
             # Only overwrite if not already set (first file wins for ambiguous suffixes)
             if suffix not in self._module_file_index:
                 self._module_file_index[suffix] = file_path
+                self._file_module_suffixes.setdefault(file_path, set()).add(suffix)
             elif self._module_file_index[suffix] != file_path:
                 self._module_file_collisions.add(suffix)
 
+    def _update_import_indexes(self, file_path: str) -> None:
+        """Refresh the language-specific import indexes for a file.
+
+        C/C++: registers the file as a header candidate and records its
+        #includes. TS/JS: registers the module path and the names the file
+        imports or re-exports (barrels). Java: registers the package and the
+        types the file declares, and its imports. Rust: places the file in
+        its crate's module tree and links the files its `mod` lines declare.
+        """
+        if is_c_family(file_path):
+            self._include_index.add_file(file_path)
+            specs = []
+            for node in self.graph.get_nodes_by_file(file_path):
+                if node.type == "import":
+                    for module, spec in node.properties.get("imports", []):
+                        if module in (".", ""):
+                            specs.append((spec, module == "."))
+            self._include_index.set_includes(file_path, sorted(specs))
+        elif is_ts_family(file_path):
+            self._ts_index.add_file(file_path)
+            pairs = []
+            for node in self.graph.get_nodes_by_file(file_path):
+                if node.type == "import":
+                    pairs.extend((module, name) for module, name in node.properties.get("imports", [])
+                                 if module)
+            self._ts_index.set_imports(file_path, sorted(pairs))
+        elif is_java(file_path):
+            package = ""
+            types = []
+            pairs = []
+            for node in self.graph.get_nodes_by_file(file_path):
+                if node.type == "module_code":
+                    package = node.name
+                elif node.type == "class":
+                    types.append(node.name)
+                elif node.type == "import":
+                    pairs.extend(node.properties.get("imports", []))
+            self._java_index.set_file(file_path, package, types)
+            self._java_index.set_imports(file_path, [tuple(p) for p in pairs])
+        elif is_rust(file_path):
+            self._rust_index.add_file(file_path)
+            self._rust_index.set_mods(file_path, [
+                node.name for node in self.graph.get_nodes_by_file(file_path)
+                if node.type == "module_code"])
+
+    def update_ts_config(self, config_path: str, content: Optional[str]) -> List[GraphOperation]:
+        """Load (or, with content None, drop) a tsconfig/jsconfig file.
+
+        config_path is project-relative, like the bridge's file paths. When
+        the config actually changes, the import nodes of TS/JS files under
+        its directory are re-resolved against it.
+        """
+        if content is None:
+            if config_path not in self._ts_index.configs:
+                return []
+            self._ts_index.remove_config(config_path)
+        else:
+            config = parse_jsonc(content)
+            if self._ts_index.configs.get(config_path) == config:
+                return []
+            self._ts_index.set_config(config_path, config)
+        directory = posixpath.dirname(config_path)
+        prefix = directory + "/" if directory else ""
+        operations: List[GraphOperation] = []
+        for fp in sorted(self._tracked_files):
+            if not (fp.startswith(prefix) and is_ts_family(fp)):
+                continue
+            imports = {n.id for n in self.graph.get_nodes_by_file(fp) if n.type == "import"}
+            if imports:
+                self._queue_refresh({fp: imports})
+                operations.extend(self._refresh_dependents(fp))
+        return operations
+
     def get_affected_files(
         self, changed_file: str, changed_entity_name: str,
         max_depth: int = 3,
@@ -1074,7 +1883,8 @@ class DeltaGraphBridge:
         """Find files affected by a change using BFS.
 
         Phase 1: Direct dependency index lookup
-        Phase 2: Cross-file edges pointing TO entities in the changed file
+        Phase 2: Cross-file edges pointing TO entities in the changed file,
+                 and files #including it (transitively, for C/C++ headers)
         Phase 3: Transitive BFS following graph edges (capped at max_depth)
         """
         affected: Set[str] = set()
@@ -1096,6 +1906,21 @@ class DeltaGraphBridge:
                     if source_node.file_path not in affected:
                         affected.add(source_node.file_path)
                         queue.append((source_node.file_path, 1))
+        # Files #including the changed header, then their includers
+        frontier = [changed_file]
+        seen = {changed_file}
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for header in frontier:
+                for includer in self._include_index.includers(header):
+                    if includer in seen:
+                        continue
+                    seen.add(includer)
+                    next_frontier.append(includer)
+                    if includer not in affected:
+                        affected.add(includer)
+                        queue.append((includer, depth))
+            frontier = next_frontier
 
         # Phase 3: Transitive BFS following INCOMING edges (callers of callers)
         visited: Set[str] = set(affected)
@@ -1130,19 +1955,43 @@ class DeltaGraphBridge:
             ))
         # Clean bridge caches
         self._file_contents.pop(file_path, None)
+        self._shadow_asts.pop(file_path, None)
+        self._include_index.remove_file(file_path)
+        self._ts_index.remove_file(file_path)
+        self._java_index.remove_file(file_path)
+        self._rust_index.remove_file(file_path)
         self._tracked_files.discard(file_path)
+        self._file_stats.pop(file_path, None)
         # Clean dependency index entries referencing this file
-        for key in list(self._dependency_index.keys()):
-            self._dependency_index[key].discard(file_path)
-            if not self._dependency_index[key]:
-                del self._dependency_index[key]
+        self._drop_dependency_names(
+            file_path, self._file_dependency_names.pop(file_path, set()))
         # Clean module_file_index entries pointing to this file
-        for key in list(self._module_file_index.keys()):
-            if self._module_file_index[key] == file_path:
+        for key in self._file_module_suffixes.pop(file_path, set()):
+            if self._module_file_index.get(key) == file_path:
                 del self._module_file_index[key]
                 self._module_file_collisions.discard(key)
         return operations
 
+    def _rebuild_reverse_indexes(self) -> None:
+        """Recompute file -> key maps from the forward indexes (after load)."""
+        self._file_dependency_names = {}
+        for name, files in self._dependency_index.items():
+            for fp in files:
+                self._file_dependency_names.setdefault(fp, set()).add(name)
+        self._file_module_suffixes = {}
+        for suffix, fp in self._module_file_index.items():
+            self._file_module_suffixes.setdefault(fp, set()).add(suffix)
+        self._include_index = IncludeIndex(self._include_index.include_roots)
+        configs = self._ts_index.configs
+        self._ts_index = TSModuleIndex()
+        for config_path, config in configs.items():
+            self._ts_index.set_config(config_path, config)
+        self._java_index = JavaPackageIndex()
+        self._rust_index = RustModuleIndex()
+        for fp in sorted(set(self.graph._nodes_by_file) | self._tracked_files):
+            self._update_import_indexes(fp)
+        self._rust_index.pop_moved()
+
     def get_module_exports(self, file_path: str) -> List[str]:
         """Get module exports: __all__ if defined, else all top-level names."""
         nodes = self.graph.get_nodes_by_file(file_path)
@@ -1169,20 +2018,24 @@ class DeltaGraphBridge:
         """Deep copy the bridge including graph, caches, and dependency index."""
         new_bridge = DeltaGraphBridge(self.graph.snapshot(),
                                       extractor_registry=self._registry)
-        new_bridge._file_contents = dict(self._file_contents)
+        new_bridge._file_contents = self._file_contents.copy()
         new_bridge._tracked_files = set(self._tracked_files)
         new_bridge._dependency_index = defaultdict(
             set, {k: set(v) for k, v in self._dependency_index.items()}
         )
         new_bridge._module_file_index = dict(self._module_file_index)
         new_bridge._module_file_collisions = set(self._module_file_collisions)
+        new_bridge._file_dependency_names = {
+            k: set(v) for k, v in self._file_dependency_names.items()
+        }
+        new_bridge._file_module_suffixes = {
+            k: set(v) for k, v in self._file_module_suffixes.items()
+        }
+        new_bridge._file_stats = dict(self._file_stats)
+        new_bridge._include_index = self._include_index.copy()
+        new_bridge._ts_index = self._ts_index.copy()
+        new_bridge._java_index = self._java_index.copy()
+        new_bridge._rust_index = self._rust_index.copy()
         new_bridge._resolution_stats = dict(self._resolution_stats)
         new_bridge._last_confidence = self._last_confidence
         return new_bridge
-
-    @staticmethod
-    def _positions_overlap(e1: ASTEntity, e2: ASTEntity) -> bool:
-        """Check if two entities overlap in position."""
-        if e1.line_start == e2.line_start:
-            return True
-        return e1.line_start <= e2.line_end and e2.line_start <= e1.line_end
@@ -0,0 +1,192 @@
+"""ContentCache: byte-budgeted LRU for the bridge's last-seen file contents."""
+
+import os
+import sys
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Union
+
+DEFAULT_MAX_MB = 64.0
+DEFAULT_HOT_ENTRIES = 32  # Most recently used entries kept uncompressed
+
+_MISSING = object()
+
+
+def _budget_from_env() -> int:
+    """Byte budget from STREAMRAG_CONTENT_CACHE_MB (default 64 MB)."""
+    try:
+        mb = float(os.environ.get("STREAMRAG_CONTENT_CACHE_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        mb = DEFAULT_MAX_MB
+    return int(mb * 1024 * 1024)
+
+
+class ContentCache(MutableMapping):
+    """Dict-like LRU of file_path -> content, bounded by bytes and entry count.
+
+    - Reads via get()/[] refresh recency; `in`, pop() and iteration do not.
+    - Entries pushed out of the hot window are zlib-compressed when that
+      saves space, and decompressed transparently on the next read.
+    - A single entry larger than the whole budget is not cached.
+    - hits/misses/evictions counters feed stats().
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        hot_entries: int = DEFAULT_HOT_ENTRIES,
+        compress_cold: bool = True,
+    ) -> None:
+        self.max_bytes = max_bytes if max_bytes is not None else _budget_from_env()
+        self.max_entries = max_entries
+        self.hot_entries = hot_entries
+        self.compress_cold = compress_cold
+        self._entries: "OrderedDict[str, Union[str, bytes]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._hot: "OrderedDict[str, None]" = OrderedDict()  # uncompressed keys, LRU first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejected = 0
+
+    # ---- mapping protocol -------------------------------------------------
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        self._entries.move_to_end(key)
+        if isinstance(value, bytes):
+            value = zlib.decompress(value).decode("utf-8", "surrogatepass")
+            self._store(key, value)
+            self._hot[key] = None
+            self._compress_cold()
+            self._evict()
+        else:
+            self._hot[key] = None
+            self._hot.move_to_end(key)
+            self._compress_cold()
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self._entries:
+            self.misses += 1
+            return default
+        return self[key]
+
+    def __setitem__(self, key: str, value: str) -> None:
+        if key in self._entries:
+            self._discard(key)
+        if sys.getsizeof(value) > self.max_bytes:
+            self.rejected += 1
+            return
+        self._store(key, value)
+        self._hot[key] = None
+        self._compress_cold()
+        self._evict()
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self._entries:
+            raise KeyError(key)
+        self._discard(key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:
+        """Remove key and return its content; not counted as a lookup."""
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._discard(key)
+        if isinstance(value, bytes):
+            value = zlib.decompress(value).decode("utf-8", "surrogatepass")
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---- internals --------------------------------------------------------
+
+    def _store(self, key: str, value: Union[str, bytes]) -> None:
+        """Set the stored form of key (most recent position) and re-account size."""
+        self._bytes -= self._sizes.get(key, 0)
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        size = sys.getsizeof(value)
+        self._sizes[key] = size
+        self._bytes += size
+
+    def _discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._hot.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+
+    def _compress_cold(self) -> None:
+        """Compress entries that fell out of the hot window."""
+        while len(self._hot) > self.hot_entries:
+            key, _ = self._hot.popitem(last=False)
+            if not self.compress_cold:
+                continue
+            value = self._entries[key]
+            blob = zlib.compress(value.encode("utf-8", "surrogatepass"), 1)
+            if sys.getsizeof(blob) < self._sizes[key]:
+                self._bytes += sys.getsizeof(blob) - self._sizes[key]
+                self._sizes[key] = sys.getsizeof(blob)
+                self._entries[key] = blob
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until both limits hold."""
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            key = next(iter(self._entries))
+            self._discard(key)
+            self.evictions += 1
+
+    # ---- public helpers ---------------------------------------------------
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def copy(self) -> "ContentCache":
+        """Independent copy with the same limits, contents and recency order."""
+        new = ContentCache(
+            max_bytes=self.max_bytes, max_entries=self.max_entries,
+            hot_entries=self.hot_entries, compress_cold=self.compress_cold,
+        )
+        new._entries = OrderedDict(self._entries)
+        new._sizes = dict(self._sizes)
+        new._hot = OrderedDict(self._hot)
+        new._bytes = self._bytes
+        return new
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "cold": len(self._entries) - len(self._hot),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "rejected": self.rejected,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def __repr__(self) -> str:
+        return f"ContentCache(entries={len(self)}, bytes={self._bytes}, max_bytes={self.max_bytes})"
@@ -0,0 +1,153 @@
+"""Per-file extraction budgets for oversized, minified and generated files.
+
+Every hook shares one 2-10 s timeout, and a single minified bundle or
+amalgamated C file can spend all of it in extraction. ExtractionBudget
+picks a mode for each file before extracting it:
+
+- full: the extractor's normal output.
+- degraded: declarations only (names, lines, hashes, inheritance,
+  decorators; no calls or uses), every entity marked partial. Used for
+  files over the degrade size and for files that look minified or
+  machine-written.
+- skipped: no entities, for files over the skip size.
+
+A time budget backs up the size rules. Extractors that can stop early
+(the regex ones) check the deadline between declarations and finish the
+file in degraded mode once it has passed.
+
+Sizes are in characters of decoded source.
+"""
+
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from streamrag.models import ASTEntity
+
+FULL = "full"
+DEGRADED = "degraded"
+SKIPPED = "skipped"
+
+DEFAULT_DEGRADE_KB = 512.0
+DEFAULT_SKIP_KB = 4096.0
+DEFAULT_TIME_BUDGET_MS = 1000.0
+
+GENERATED_MIN_CHARS = 16 * 1024  # Smaller files are cheap enough in full
+MINIFIED_AVG_LINE = 200  # Mean line length above which code counts as minified
+_HEADER_CHARS = 1024  # Generator banners sit at the top of the file
+
+_GENERATED_MARKER = re.compile(
+    r"@generated|do not edit|code generated by|auto-?generated", re.IGNORECASE)
+_GENERATED_NAME = re.compile(
+    r"(?:[.-]min|\.bundle)\.[cm]?js$|_pb2\.pyi?$|\.pb\.(?:h|cc)$|\.generated\.\w+$")
+
+
+def looks_generated(source: str, file_path: str = "") -> bool:
+    """Heuristic: minified, bundled or generator-written content.
+
+    Checks the file name (app.min.js, foo_pb2.py), a generator banner in
+    the header, and the mean line length. Only files of at least
+    GENERATED_MIN_CHARS are considered.
+    """
+    if len(source) < GENERATED_MIN_CHARS:
+        return False
+    if file_path and _GENERATED_NAME.search(file_path):
+        return True
+    if len(source) / (source.count("\n") + 1) > MINIFIED_AVG_LINE:
+        return True
+    return _GENERATED_MARKER.search(source, 0, _HEADER_CHARS) is not None
+
+
+def _kb_from_env(name: str, default: float) -> int:
+    """Character limit from a KB env var; 0 or less disables the limit."""
+    try:
+        kb = float(os.environ.get(name, default))
+    except ValueError:
+        kb = default
+    return max(0, int(kb * 1024))
+
+
+def default_extraction_budget() -> Optional["ExtractionBudget"]:
+    """Budget from the STREAMRAG_EXTRACT_* env vars, None when STREAMRAG_EXTRACT_BUDGET=0."""
+    if os.environ.get("STREAMRAG_EXTRACT_BUDGET", "1").strip().lower() in ("0", "false", "off"):
+        return None
+    try:
+        ms = float(os.environ.get("STREAMRAG_EXTRACT_BUDGET_MS", DEFAULT_TIME_BUDGET_MS))
+    except ValueError:
+        ms = DEFAULT_TIME_BUDGET_MS
+    return ExtractionBudget(
+        degrade_chars=_kb_from_env("STREAMRAG_EXTRACT_DEGRADE_KB", DEFAULT_DEGRADE_KB),
+        skip_chars=_kb_from_env("STREAMRAG_EXTRACT_SKIP_KB", DEFAULT_SKIP_KB),
+        time_budget_s=ms / 1000.0 if ms > 0 else None,
+    )
+
+
+class ExtractionBudget:
+    """Size and time limits for one extraction, with counters.
+
+    A limit of 0 or None is off. extract() returns (mode, entities). The
+    full/degraded/skipped counters count extractions by final mode and
+    feed stats(); timed_out counts extractions that started in full mode
+    and degraded part way.
+    """
+
+    def __init__(
+        self,
+        degrade_chars: Optional[int] = int(DEFAULT_DEGRADE_KB * 1024),
+        skip_chars: Optional[int] = int(DEFAULT_SKIP_KB * 1024),
+        time_budget_s: Optional[float] = DEFAULT_TIME_BUDGET_MS / 1000.0,
+    ) -> None:
+        self.degrade_chars = degrade_chars or 0
+        self.skip_chars = skip_chars or 0
+        self.time_budget_s = time_budget_s or None
+        self.full = 0
+        self.degraded = 0
+        self.skipped = 0
+        self.timed_out = 0
+
+    def __getstate__(self) -> dict:
+        # Pickled into indexer worker processes: settings only, fresh counters
+        return {"degrade_chars": self.degrade_chars, "skip_chars": self.skip_chars,
+                "time_budget_s": self.time_budget_s}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["degrade_chars"], state["skip_chars"], state["time_budget_s"])
+
+    def mode_for(self, source: str, file_path: str = "") -> str:
+        """FULL, DEGRADED or SKIPPED, from size and content alone."""
+        size = len(source)
+        if self.skip_chars and size > self.skip_chars:
+            return SKIPPED
+        if (self.degrade_chars and size > self.degrade_chars) or looks_generated(source, file_path):
+            return DEGRADED
+        return FULL
+
+    def extract(self, extractor, source: str, file_path: str = "") -> Tuple[str, List[ASTEntity]]:
+        """Run extractor within the budget. Returns (mode, entities)."""
+        mode = self.mode_for(source, file_path)
+        if mode == SKIPPED:
+            self.skipped += 1
+            return mode, []
+        deadline = time.monotonic() + self.time_budget_s if self.time_budget_s else None
+        entities = extractor.extract_budgeted(
+            source, file_path, deadline=deadline, declarations_only=mode == DEGRADED)
+        if mode == FULL and any(e.partial for e in entities):
+            mode = DEGRADED
+            self.timed_out += 1
+        if mode == DEGRADED:
+            self.degraded += 1
+        else:
+            self.full += 1
+        return mode, entities
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "degrade_chars": self.degrade_chars,
+            "skip_chars": self.skip_chars,
+            "time_budget_s": self.time_budget_s,
+            "full": self.full,
+            "degraded": self.degraded,
+            "skipped": self.skipped,
+            "timed_out": self.timed_out,
+        }
@@ -0,0 +1,270 @@
+"""Content-addressed on-disk cache of extraction results.
+
+Entries are keyed by (extractor id, extractor version, SHA-256 of the
+content), so identical files share one entry no matter which project,
+worktree or session produced them: a second worktree of the same repo
+indexes mostly from cache. The extractor version is a fingerprint of the
+extraction code itself, so upgrading StreamRAG never serves stale entities.
+
+Layout: <root>/<key[:2]>/<key[2:]>, one zlib-compressed JSON list of
+ASTEntity field tuples per entry. Writes go to a temp file in the same
+directory and are moved into place with os.replace, so readers in other
+processes see either nothing or a whole entry. Hits refresh the file's
+mtime; pruning deletes the least recently used entries once the directory
+outgrows its byte budget.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import fields
+from typing import Dict, List, Optional
+
+from streamrag.models import ASTEntity
+
+DEFAULT_MAX_MB = 256.0
+FORMAT_VERSION = 1
+TOUCH_INTERVAL_S = 3600.0  # Refresh an entry's mtime at most this often
+PRUNE_INTERVAL_S = 600.0  # Per-directory check, shared by all processes
+PRUNE_TARGET = 0.8  # Prune down to this fraction of the budget
+_STALE_TMP_S = 3600.0
+_PRUNE_MARKER = ".last_prune"
+
+_FIELDS = [f.name for f in fields(ASTEntity)]
+_TUPLE_LIST_FIELDS = {"imports"}
+
+# Modules whose code determines extraction output
+_EXTRACTION_SOURCES = ("extractor.py", "incremental_extractor.py", "models.py", "languages")
+_code_fingerprint: Optional[str] = None
+
+
+def default_cache_dir() -> str:
+    """STREAMRAG_EXTRACTION_CACHE_DIR, else ~/.claude/streamrag/extraction_cache."""
+    return os.environ.get("STREAMRAG_EXTRACTION_CACHE_DIR") or os.path.expanduser(
+        "~/.claude/streamrag/extraction_cache")
+
+
+def _budget_from_env() -> int:
+    """Byte budget from STREAMRAG_EXTRACTION_CACHE_MB (default 256 MB)."""
+    try:
+        mb = float(os.environ.get("STREAMRAG_EXTRACTION_CACHE_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        mb = DEFAULT_MAX_MB
+    return int(mb * 1024 * 1024)
+
+
+def default_extraction_cache() -> Optional["ExtractionCache"]:
+    """The shared cache, or None when STREAMRAG_EXTRACTION_CACHE=0."""
+    if os.environ.get("STREAMRAG_EXTRACTION_CACHE", "1").strip().lower() in ("0", "false", "off"):
+        return None
+    return ExtractionCache()
+
+
+def code_fingerprint() -> str:
+    """Digest of the extraction code (computed once per process)."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        package = os.path.dirname(os.path.abspath(__file__))
+        paths = []
+        for name in _EXTRACTION_SOURCES:
+            path = os.path.join(package, name)
+            if os.path.isdir(path):
+                paths.extend(os.path.join(path, f) for f in sorted(os.listdir(path))
+                             if f.endswith(".py"))
+            else:
+                paths.append(path)
+        digest = hashlib.blake2b(str(FORMAT_VERSION).encode(), digest_size=16)
+        for path in paths:
+            try:
+                with open(path, "rb") as f:
+                    digest.update(os.path.basename(path).encode() + b"\0" + f.read())
+            except OSError:
+                continue
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+
+def extractor_id(extractor) -> str:
+    cls = type(extractor)
+    return f"{getattr(extractor, 'language_id', '')}:{cls.__module__}.{cls.__qualname__}"
+
+
+def _encode(entities: List[ASTEntity]) -> bytes:
+    rows = [[getattr(e, name) for name in _FIELDS] for e in entities]
+    return zlib.compress(json.dumps(rows, separators=(",", ":")).encode("utf-8"), 1)
+
+
+def _decode(blob: bytes) -> List[ASTEntity]:
+    entities = []
+    for row in json.loads(zlib.decompress(blob).decode("utf-8")):
+        kwargs = dict(zip(_FIELDS, row))
+        for name in _TUPLE_LIST_FIELDS:
+            kwargs[name] = [tuple(item) for item in kwargs[name]]
+        entities.append(ASTEntity(**kwargs))
+    return entities
+
+
+class ExtractionCache:
+    """Persistent (extractor, content) -> List[ASTEntity] cache shared across processes.
+
+    get() returns fresh entity objects (callers may annotate them) or None.
+    put() never raises: a cache that cannot be written is just a miss next
+    time. hits/misses/writes/evictions counters feed stats().
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: Optional[int] = None) -> None:
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else _budget_from_env()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._written = 0  # Bytes written since this process last pruned
+        self._checked_prune = False
+
+    def __getstate__(self) -> dict:
+        # Pickled into indexer worker processes: settings only, fresh counters
+        return {"root": self.root, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["root"], state["max_bytes"])
+
+    def key(self, extractor, content: str) -> str:
+        digest = hashlib.sha256(
+            f"{extractor_id(extractor)}\0{code_fingerprint()}\0".encode())
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def get(self, extractor, content: str) -> Optional[List[ASTEntity]]:
+        path = self._path(self.key(extractor, content))
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            entities = _decode(blob)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, TypeError, KeyError, zlib.error):
+            self.misses += 1
+            self._remove(path)  # Corrupt or from an incompatible layout
+            return None
+        self.hits += 1
+        try:
+            if time.time() - os.stat(path).st_mtime > TOUCH_INTERVAL_S:
+                os.utime(path)
+        except OSError:
+            pass
+        return entities
+
+    def put(self, extractor, content: str, entities: List[ASTEntity]) -> None:
+        path = self._path(self.key(extractor, content))
+        try:
+            blob = _encode(entities)
+        except (TypeError, ValueError):
+            return  # Not JSON-serializable (custom extractor fields): skip
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            tmp = None
+        except OSError:
+            return
+        finally:
+            if tmp is not None:
+                self._remove(tmp)
+        self.writes += 1
+        self._written += len(blob)
+        self._maybe_prune()
+
+    # ---- eviction ---------------------------------------------------------
+
+    def _maybe_prune(self) -> None:
+        """Prune after writing 10% of the budget, or on the first write when due."""
+        if self._written > self.max_bytes * 0.1:
+            self.prune()
+            return
+        if self._checked_prune:
+            return
+        self._checked_prune = True
+        marker = os.path.join(self.root, _PRUNE_MARKER)
+        try:
+            due = time.time() - os.stat(marker).st_mtime > PRUNE_INTERVAL_S
+        except OSError:
+            due = True
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete least recently used entries until the cache fits its budget."""
+        self._written = 0
+        entries = []
+        total = 0
+        now = time.time()
+        try:
+            shards = [e.path for e in os.scandir(self.root) if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            return 0
+        for shard in shards:
+            try:
+                with os.scandir(shard) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if entry.name.startswith(".tmp-"):
+                            if now - st.st_mtime > _STALE_TMP_S:
+                                self._remove(entry.path)  # Left by a killed writer
+                            continue
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                        total += st.st_size
+            except OSError:
+                continue
+
+        removed = 0
+        if total > self.max_bytes:
+            entries.sort()
+            target = self.max_bytes * PRUNE_TARGET
+            for _mtime, size, path in entries:
+                if total <= target:
+                    break
+                if self._remove(path):
+                    total -= size
+                    removed += 1
+        self.evictions += removed
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, _PRUNE_MARKER), "w"):
+                pass
+        except OSError:
+            pass
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "root": self.root,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
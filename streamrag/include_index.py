@@ -0,0 +1,184 @@
+"""Include-path index for C and C++ files.
+
+Every C-family file is registered under its basename and each longer
+path suffix ("util.h", "core/util.h", "src/core/util.h"), so an #include
+resolves with a few dict lookups instead of a scan over the graph.
+Resolution follows the compiler's search order:
+
+- "quoted" includes: the including file's directory, then the include
+  roots, then the suffix map
+- <angle> includes: the include roots, then the suffix map
+
+A suffix shared by several files goes to the one with the longest common
+directory prefix with the includer (ties: first by path).
+
+The index also keeps each file's resolved includes and the reverse map
+(header -> includers), so a header change fans out to the files that
+include it without walking graph edges. Include relations are between
+files, not nodes, so they live here rather than as graph edges.
+
+Include roots are project-relative directories, from
+STREAMRAG_INCLUDE_PATHS (os.pathsep-separated, e.g. "include:src").
+"""
+
+import os
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+C_FAMILY_EXTENSIONS = (".c", ".h", ".cpp", ".cc", ".cxx", ".hpp", ".hh", ".hxx")
+
+
+def is_c_family(file_path: str) -> bool:
+    return file_path.endswith(C_FAMILY_EXTENSIONS)
+
+
+def default_include_roots() -> List[str]:
+    """Include roots from STREAMRAG_INCLUDE_PATHS (empty when unset)."""
+    value = os.environ.get("STREAMRAG_INCLUDE_PATHS", "")
+    return [root for root in value.split(os.pathsep) if root.strip()]
+
+
+def _suffixes(file_path: str) -> List[str]:
+    """'src/core/util.h' -> ['util.h', 'core/util.h', 'src/core/util.h']."""
+    parts = file_path.split("/")
+    return ["/".join(parts[i:]) for i in range(len(parts) - 1, -1, -1) if parts[i]]
+
+
+def _shared_dirs(file_a: str, file_b: str) -> int:
+    shared = 0
+    for a, b in zip(file_a.split("/")[:-1], file_b.split("/")[:-1]):
+        if a != b:
+            break
+        shared += 1
+    return shared
+
+
+class IncludeIndex:
+    """Header suffix -> files, plus forward and reverse include maps.
+
+    set_includes() records a file's #include directives as (spec, local)
+    pairs, local meaning the quoted form. Includes that do not resolve yet
+    (the header is not indexed) are re-resolved when a file with that
+    basename is added, and resolved ones when such a file is removed.
+    """
+
+    def __init__(self, include_roots: Optional[Iterable[str]] = None) -> None:
+        roots = default_include_roots() if include_roots is None else include_roots
+        self.include_roots = [posixpath.normpath(r.replace("\\", "/")) for r in roots]
+        self._files: Set[str] = set()
+        self._by_suffix: Dict[str, Set[str]] = {}
+        self._specs: Dict[str, List[Tuple[str, bool]]] = {}  # file -> #include specs
+        self._includes: Dict[str, Set[str]] = {}  # file -> resolved headers
+        self._includers: Dict[str, Set[str]] = {}  # header -> files including it
+        self._spec_users: Dict[str, Set[str]] = {}  # spec basename -> files with that spec
+
+    def add_file(self, file_path: str) -> None:
+        """Register a C-family file as an include candidate."""
+        if file_path in self._files:
+            return
+        self._files.add(file_path)
+        for suffix in _suffixes(file_path):
+            self._by_suffix.setdefault(suffix, set()).add(file_path)
+        self._reresolve(posixpath.basename(file_path))
+
+    def remove_file(self, file_path: str) -> None:
+        """Forget a file: as a header and as an includer."""
+        self.set_includes(file_path, [])
+        if file_path not in self._files:
+            return
+        self._files.discard(file_path)
+        for suffix in _suffixes(file_path):
+            files = self._by_suffix.get(suffix)
+            if files is not None:
+                files.discard(file_path)
+                if not files:
+                    del self._by_suffix[suffix]
+        self._reresolve(posixpath.basename(file_path))
+
+    def resolve(self, spec: str, includer: str, local: bool = True) -> Optional[str]:
+        """Indexed file an #include of spec in includer refers to, or None."""
+        spec = spec.strip().replace("\\", "/")
+        if not spec:
+            return None
+        if local:
+            candidate = posixpath.normpath(posixpath.join(posixpath.dirname(includer), spec))
+            if candidate in self._files:
+                return candidate
+        for root in self.include_roots:
+            candidate = posixpath.normpath(posixpath.join(root, spec))
+            if candidate in self._files:
+                return candidate
+        key = posixpath.normpath(spec)
+        while key.startswith("../"):
+            key = key[3:]
+        candidates = self._by_suffix.get(key)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return next(iter(candidates))
+        return max(sorted(candidates), key=lambda c: _shared_dirs(includer, c))
+
+    def set_includes(self, file_path: str, specs: List[Tuple[str, bool]]) -> Set[str]:
+        """Replace file_path's #include specs; returns the resolved headers."""
+        for spec, _local in self._specs.pop(file_path, ()):
+            users = self._spec_users.get(posixpath.basename(spec))
+            if users is not None:
+                users.discard(file_path)
+                if not users:
+                    del self._spec_users[posixpath.basename(spec)]
+        if specs:
+            self._specs[file_path] = list(specs)
+            for spec, _local in specs:
+                self._spec_users.setdefault(posixpath.basename(spec), set()).add(file_path)
+        return self._resolve_file(file_path)
+
+    def _resolve_file(self, file_path: str) -> Set[str]:
+        headers = set()
+        for spec, local in self._specs.get(file_path, ()):
+            header = self.resolve(spec, file_path, local)
+            if header is not None and header != file_path:
+                headers.add(header)
+        for header in self._includes.pop(file_path, set()) - headers:
+            includers = self._includers.get(header)
+            if includers is not None:
+                includers.discard(file_path)
+                if not includers:
+                    del self._includers[header]
+        if headers:
+            self._includes[file_path] = headers
+            for header in headers:
+                self._includers.setdefault(header, set()).add(file_path)
+        return headers
+
+    def _reresolve(self, basename: str) -> None:
+        """Re-resolve the files including some path with this basename."""
+        for file_path in list(self._spec_users.get(basename, ())):
+            self._resolve_file(file_path)
+
+    def includes(self, file_path: str) -> Set[str]:
+        """Headers file_path includes (resolved ones only)."""
+        return self._includes.get(file_path, set())
+
+    def includers(self, header: str) -> Set[str]:
+        """Files whose #include directives resolve to header."""
+        return self._includers.get(header, set())
+
+    def copy(self) -> "IncludeIndex":
+        clone = IncludeIndex(self.include_roots)
+        clone._files = set(self._files)
+        clone._by_suffix = {k: set(v) for k, v in self._by_suffix.items()}
+        clone._specs = {k: list(v) for k, v in self._specs.items()}
+        clone._includes = {k: set(v) for k, v in self._includes.items()}
+        clone._includers = {k: set(v) for k, v in self._includers.items()}
+        clone._spec_users = {k: set(v) for k, v in self._spec_users.items()}
+        return clone
+
+    def stats(self) -> Dict[str, object]:
+        specs = sum(len(v) for v in self._specs.values())
+        resolved = sum(len(v) for v in self._includes.values())
+        return {
+            "include_roots": list(self.include_roots),
+            "files": len(self._files),
+            "includes": specs,
+            "resolved": resolved,
+        }
@@ -0,0 +1,278 @@
+"""Incremental Python extraction: re-parse only the top-level blocks an edit touched.
+
+The previous parse of each file is kept as a list of top-level blocks (one
+per module statement, decorators included) with the entities they produced.
+A new version is diffed against it by common prefix/suffix lines; the
+changed lines are widened to whole blocks, only that slice is parsed, and
+every other block's entities are reused with their line numbers shifted.
+
+Anything that could make the slice parse differently in place falls back
+to a full parse: a slice that does not parse on its own, a `__future__`
+import, or a change to the file-wide context the extractor uses (import
+name sets, module-level type context).
+"""
+
+import ast
+import copy
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from streamrag.extractor import ASTExtractor, _module_type_pairs, module_code_entity
+from streamrag.models import ASTEntity
+
+DEFAULT_MAX_FILES = 128
+MAX_VERSIONS = 2  # Callers often extract old and new content back to back
+FULL_PARSE_RATIO = 0.5  # Re-parse everything once the slice covers this much
+
+# A line as Python's tokenizer counts them: str.splitlines() also breaks
+# on \x0c, \x1c-\x1e, \x85, \u2028 and \u2029, which ast line numbers do not
+_LINE = re.compile(r"[^\r\n]*(?:\r\n?|\n)|[^\r\n]+")
+
+
+def source_lines(source: str) -> List[str]:
+    """source split into lines (ends kept) numbered the way ast numbers them."""
+    return _LINE.findall(source)
+
+
+@dataclass
+class _Block:
+    """One top-level statement of a parsed file."""
+    start: int  # 1-based, first decorator line included
+    end: int
+    entities: List[ASTEntity]
+    stdlib_names: FrozenSet[str]
+    external_type_names: FrozenSet[str]
+    type_pairs: List[Tuple[str, str]]
+    module_call: Optional[str]
+
+
+@dataclass
+class _FileState:
+    source: str
+    lines: List[str]
+    blocks: List[_Block]
+    stdlib_names: FrozenSet[str]
+    external_type_names: FrozenSet[str]
+
+
+def _block_start(stmt: ast.stmt) -> int:
+    decorators = getattr(stmt, "decorator_list", None)
+    if decorators:
+        return min(stmt.lineno, min(d.lineno for d in decorators))
+    return stmt.lineno
+
+
+def _shifted(block: _Block, delta: int) -> _Block:
+    if not delta:
+        return block
+    entities = []
+    for entity in block.entities:
+        moved = copy.copy(entity)
+        moved.line_start += delta
+        moved.line_end += delta
+        entities.append(moved)
+    return _Block(
+        block.start + delta, block.end + delta, entities, block.stdlib_names,
+        block.external_type_names, block.type_pairs, block.module_call,
+    )
+
+
+class IncrementalExtractor:
+    """Per-file incremental front end for ASTExtractor.
+
+    extract(source, file_path) returns exactly what ASTExtractor().extract
+    would. Counters (full, incremental, reused) feed stats().
+    """
+
+    def __init__(self, max_files: int = DEFAULT_MAX_FILES) -> None:
+        self.max_files = max_files
+        self._extractor = ASTExtractor()
+        self._files: "OrderedDict[str, List[_FileState]]" = OrderedDict()
+        self.full = 0
+        self.incremental = 0
+        self.reused = 0
+        self.blocks_reparsed = 0
+        self.blocks_reused = 0
+
+    def extract(self, source: str, file_path: str = "") -> List[ASTEntity]:
+        if not file_path:
+            return self._extractor.extract(source)
+        versions = self._files.get(file_path)
+        state = None
+        if versions is not None:
+            self._files.move_to_end(file_path)
+            for version in versions:
+                if version.source == source:
+                    self.reused += 1
+                    return self._materialize(version)
+            state = self._extract_incremental(versions[0], source)
+            if state is not None:
+                self.incremental += 1
+        if state is None:
+            state = self._extract_full(source)
+            if state is None:
+                return []  # Empty or unparsable; keep the last good versions
+            self.full += 1
+        self._remember(file_path, state)
+        return self._materialize(state)
+
+    def forget(self, file_path: str) -> None:
+        self._files.pop(file_path, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "files": len(self._files),
+            "full": self.full,
+            "incremental": self.incremental,
+            "reused": self.reused,
+            "blocks_reparsed": self.blocks_reparsed,
+            "blocks_reused": self.blocks_reused,
+        }
+
+    # ---- internals --------------------------------------------------------
+
+    def _remember(self, file_path: str, state: _FileState) -> None:
+        versions = self._files.setdefault(file_path, [])
+        versions.insert(0, state)
+        del versions[MAX_VERSIONS:]
+        self._files.move_to_end(file_path)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+
+    def _materialize(self, state: _FileState) -> List[ASTEntity]:
+        """Fresh entity objects (callers may annotate them, e.g. old_name)."""
+        entities = [copy.copy(e) for block in state.blocks for e in block.entities]
+        module_calls = [b.module_call for b in state.blocks if b.module_call is not None]
+        if module_calls:
+            entities.append(module_code_entity(module_calls))
+        return entities
+
+    def _extract_full(self, source: str) -> Optional[_FileState]:
+        if not source.strip():
+            return None
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return None
+        lines = source_lines(source)
+        blocks = self._blocks_for(tree, None, None, None)
+        return _FileState(
+            source, lines, blocks,
+            frozenset(self._extractor._stdlib_names),
+            frozenset(self._extractor._external_type_names),
+        )
+
+    def _blocks_for(
+        self,
+        tree: ast.Module,
+        stdlib_names: Optional[FrozenSet[str]],
+        external_type_names: Optional[FrozenSet[str]],
+        module_type_context: Optional[dict],
+    ) -> List[_Block]:
+        """Extract tree and split its entities and context by top-level statement."""
+        extractor = self._extractor
+        entities = extractor.extract_tree(
+            tree, stdlib_names, external_type_names, module_type_context)
+        if entities and entities[-1].entity_type == "module_code":
+            entities.pop()
+
+        blocks = [
+            _Block(_block_start(stmt), stmt.end_lineno or stmt.lineno, [],
+                   frozenset(), frozenset(), _module_type_pairs(stmt),
+                   extractor._module_call_name(stmt))
+            for stmt in tree.body
+        ]
+        starts = [b.start for b in blocks]
+        # Entities come out in preorder, so each block's run is contiguous
+        for entity in entities:
+            blocks[bisect_right(starts, entity.line_start) - 1].entities.append(entity)
+        per_block: Dict[int, Tuple[set, set]] = {}
+        for lineno, stdlib, external in extractor.import_lines:
+            names = per_block.setdefault(bisect_right(starts, lineno) - 1, (set(), set()))
+            names[0].update(stdlib)
+            names[1].update(external)
+        for index, (stdlib, external) in per_block.items():
+            blocks[index].stdlib_names = frozenset(stdlib)
+            blocks[index].external_type_names = frozenset(external)
+        return blocks
+
+    def _extract_incremental(self, old: _FileState, source: str) -> Optional[_FileState]:
+        """Re-extract only the blocks touched by the edit, or None to fall back."""
+        if not old.blocks or not source.strip():
+            return None
+        old_lines = old.lines
+        new_lines = source_lines(source)
+        old_n, new_n = len(old_lines), len(new_lines)
+
+        # Changed window: [prefix, old_n - suffix) in old lines (0-based)
+        limit = min(old_n, new_n)
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix
+               and old_lines[old_n - 1 - suffix] == new_lines[new_n - 1 - suffix]):
+            suffix += 1
+        lo, hi = prefix, old_n - suffix
+
+        # Widen to whole blocks; block i covers 0-based lines [start - 1, end)
+        blocks = old.blocks
+        if hi > lo:
+            touched = [i for i, b in enumerate(blocks) if b.start - 1 < hi and b.end > lo]
+        else:  # Pure insertion before line lo: only matters inside a block
+            touched = [i for i, b in enumerate(blocks) if b.start - 1 < lo < b.end]
+        if touched:
+            first, last = touched[0], touched[-1]
+            lo = min(lo, blocks[first].start - 1)
+            hi = max(hi, blocks[last].end)
+            # Statements sharing a line (a = 1; b = 2) go into the same slice
+            while first > 0 and blocks[first - 1].end > lo:
+                first -= 1
+                lo = min(lo, blocks[first].start - 1)
+            while last + 1 < len(blocks) and blocks[last + 1].start - 1 < hi:
+                last += 1
+                hi = max(hi, blocks[last].end)
+        else:
+            first = sum(1 for b in blocks if b.end <= lo)
+            last = first - 1
+        kept_before, replaced, kept_after = blocks[:first], blocks[first:last + 1], blocks[last + 1:]
+
+        delta = new_n - old_n
+        new_hi = hi + delta
+        if (new_hi - lo) > FULL_PARSE_RATIO * max(new_n, 1):
+            return None
+        text = "".join(new_lines[lo:new_hi])
+        if "__future__" in text:
+            return None  # Only legal at the top of the whole file
+        try:
+            tree = ast.parse(text)
+        except SyntaxError:
+            return None
+        if lo:
+            ast.increment_lineno(tree, lo)
+
+        # The slice must not change the context every other block was extracted with
+        old_pairs = [p for b in replaced for p in b.type_pairs]
+        new_pairs = [p for stmt in tree.body for p in _module_type_pairs(stmt)]
+        if old_pairs != new_pairs:
+            return None
+        module_type_context: dict = {}
+        for block in blocks:
+            for var_name, type_name in block.type_pairs:
+                module_type_context[var_name] = type_name
+        new_blocks = self._blocks_for(
+            tree, old.stdlib_names, old.external_type_names, module_type_context)
+        if (frozenset().union(*(b.stdlib_names for b in replaced))
+                != frozenset().union(*(b.stdlib_names for b in new_blocks))
+                or frozenset().union(*(b.external_type_names for b in replaced))
+                != frozenset().union(*(b.external_type_names for b in new_blocks))):
+            return None
+
+        self.blocks_reparsed += len(new_blocks)
+        self.blocks_reused += len(kept_before) + len(kept_after)
+        blocks = kept_before + new_blocks + [_shifted(b, delta) for b in kept_after]
+        return _FileState(
+            source, new_lines, blocks, old.stdlib_names, old.external_type_names)
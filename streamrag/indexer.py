@@ -0,0 +1,366 @@
+"""Cold-start indexer: parallel extraction with a two-phase graph merge.
+
+Reading and extracting files is CPU-bound and independent per file, so it
+runs in a ProcessPoolExecutor. Workers return plain ASTEntity lists; the
+parent then hands everything to DeltaGraphBridge.bulk_load, which inserts all
+nodes before resolving any edges.
+
+warm_sync reconciles a reloaded graph with the working tree: stat first,
+hash only when the stat moved, reprocess only what actually changed.
+"""
+
+import hashlib
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from streamrag.extraction_budget import FULL
+from streamrag.models import ASTEntity, CodeChange
+from streamrag.ts_module_index import CONFIG_NAMES, is_ts_family
+
+SKIP_DIRS = {
+    ".git", "__pycache__", "node_modules", "venv", ".venv",
+    ".tox", ".mypy_cache", ".pytest_cache", "dist", "build", ".eggs",
+    "target", "out", "bin", "obj",
+}
+
+PARALLEL_MIN_FILES = 32  # Below this, pool startup costs more than it saves
+CHUNK_SIZE = 16  # Files per worker task
+
+ExtractedFile = Tuple[str, str, List[ASTEntity]]  # (rel_path, content, entities)
+
+_worker_registry = None
+
+
+def _get_registry():
+    """Per-process extractor registry (workers build their own)."""
+    global _worker_registry
+    if _worker_registry is None:
+        from streamrag.languages.registry import create_default_registry
+        _worker_registry = create_default_registry()
+    return _worker_registry
+
+
+def default_workers() -> int:
+    """Worker count: STREAMRAG_INDEX_WORKERS, else the CPU count."""
+    env = os.environ.get("STREAMRAG_INDEX_WORKERS", "")
+    if env.isdigit() and int(env) > 0:
+        return int(env)
+    return os.cpu_count() or 1
+
+
+def _scan_source_files(
+    project_dir: str, registry, skip_dirs: Iterable[str] = SKIP_DIRS
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield (rel_path, DirEntry) for supported files, in sorted walk order.
+
+    Uses os.scandir so callers get stat results without extra syscalls.
+    """
+    skip = set(skip_dirs)
+    stack = [project_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if not entry.name.startswith(".") and entry.name not in skip:
+                    subdirs.append(entry.path)
+            elif registry.can_handle(entry.name):
+                yield os.path.relpath(entry.path, project_dir), entry
+        stack.extend(reversed(subdirs))
+
+
+def discover_source_files(
+    project_dir: str,
+    registry=None,
+    max_files: Optional[int] = None,
+    skip_dirs: Iterable[str] = SKIP_DIRS,
+) -> List[str]:
+    """Walk project_dir and return relative paths of supported files, sorted."""
+    registry = registry or _get_registry()
+    found: List[str] = []
+    for rel_path, _entry in _scan_source_files(project_dir, registry, skip_dirs):
+        found.append(rel_path)
+        if max_files is not None and len(found) >= max_files:
+            break
+    return found
+
+
+def _extract_chunk(
+    project_dir: str, rel_paths: List[str], extraction_cache=None, extraction_budget=None
+) -> List[ExtractedFile]:
+    """Worker entry point: read and extract a batch of files."""
+    registry = _get_registry()
+    results: List[ExtractedFile] = []
+    for rel_path in rel_paths:
+        try:
+            with open(os.path.join(project_dir, rel_path), "r") as f:
+                content = f.read()
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+        extractor = registry.get_extractor(rel_path)
+        if extractor is None:
+            continue
+        entities = None
+        if extraction_cache is not None:
+            entities = extraction_cache.get(extractor, content)
+        if entities is None:
+            mode = FULL
+            try:
+                if extraction_budget is None:
+                    entities = extractor.extract(content, rel_path)
+                else:
+                    mode, entities = extraction_budget.extract(extractor, content, rel_path)
+            except Exception:
+                entities = []
+            else:
+                if extraction_cache is not None and mode == FULL:
+                    extraction_cache.put(extractor, content, entities)
+        results.append((rel_path, content, entities))
+    return results
+
+
+def extract_files(
+    project_dir: str,
+    rel_paths: List[str],
+    workers: Optional[int] = None,
+    timeout_s: Optional[float] = None,
+    extraction_cache=None,
+    extraction_budget=None,
+) -> List[ExtractedFile]:
+    """Read and extract files, in a process pool when it pays off.
+
+    Files not finished within timeout_s are dropped. Falls back to in-process
+    extraction for small batches or when a pool cannot be created.
+    extraction_cache (an ExtractionCache) is consulted before extracting;
+    extraction_budget (an ExtractionBudget) limits each file. Workers get a
+    copy of the budget, so its counters only move for in-process extraction.
+    """
+    workers = workers or default_workers()
+    chunks = [rel_paths[i:i + CHUNK_SIZE] for i in range(0, len(rel_paths), CHUNK_SIZE)]
+    deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+
+    if workers > 1 and len(rel_paths) >= PARALLEL_MIN_FILES:
+        try:
+            return _extract_parallel(project_dir, chunks, workers, deadline,
+                                     extraction_cache, extraction_budget)
+        except (OSError, ImportError, NotImplementedError, RuntimeError):
+            pass  # No usable multiprocessing here (sandbox, frozen app)
+
+    results: List[ExtractedFile] = []
+    for chunk in chunks:
+        if deadline is not None and time.monotonic() > deadline:
+            break
+        results.extend(_extract_chunk(project_dir, chunk, extraction_cache, extraction_budget))
+    return results
+
+
+def _extract_parallel(
+    project_dir: str,
+    chunks: List[List[str]],
+    workers: int,
+    deadline: Optional[float],
+    extraction_cache=None,
+    extraction_budget=None,
+) -> List[ExtractedFile]:
+    results: List[ExtractedFile] = []
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(chunks)))
+    timed_out = False
+    try:
+        pending = {
+            executor.submit(_extract_chunk, project_dir, c, extraction_cache, extraction_budget)
+            for c in chunks
+        }
+        while pending:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results.extend(fut.result())
+    finally:
+        # Past the deadline, stop the chunks still running: the interpreter's
+        # exit handler would otherwise join the workers and hold the hook open
+        processes = list((executor._processes or {}).values()) if timed_out else []
+        executor.shutdown(wait=not timed_out, cancel_futures=True)
+        for proc in processes:
+            proc.terminate()
+        for proc in processes:
+            proc.join(1.0)
+    return results
+
+
+def index_project(
+    bridge,
+    project_dir: str,
+    registry=None,
+    max_files: Optional[int] = None,
+    timeout_s: Optional[float] = None,
+    workers: Optional[int] = None,
+    skip_paths: Optional[Set[str]] = None,
+    extraction_cache=None,
+    extraction_budget=None,
+) -> int:
+    """Cold-start a bridge from project_dir. Returns number of files loaded.
+
+    skip_paths: relative paths already in the graph (not re-indexed, but
+    still counted against max_files).
+    extraction_cache: ExtractionCache to read and fill (None = extract all).
+    extraction_budget: ExtractionBudget for oversized/generated files
+    (None = extract everything in full).
+    """
+    rel_paths = discover_source_files(project_dir, registry, max_files=max_files)
+    load_ts_configs(bridge, project_dir, rel_paths)
+    if skip_paths:
+        rel_paths = [p for p in rel_paths if p not in skip_paths]
+    if not rel_paths:
+        return 0
+    extracted = extract_files(project_dir, rel_paths, workers=workers, timeout_s=timeout_s,
+                              extraction_cache=extraction_cache,
+                              extraction_budget=extraction_budget)
+    loaded = bridge.bulk_load(extracted)
+    record_file_stats(bridge, project_dir, [(fp, content) for fp, content, _ in extracted])
+    return loaded
+
+
+def load_ts_configs(bridge, project_dir: str, rel_paths: Iterable[str]) -> int:
+    """Load the tsconfig/jsconfig files that govern the given TS/JS files.
+
+    Checks each directory containing a TS/JS file and its ancestors for
+    tsconfig.json/jsconfig.json, follows relative "extends", and drops
+    configs that no longer exist. Returns the number of configs loaded.
+    """
+    dirs: Set[str] = set()
+    for rel_path in rel_paths:
+        if not is_ts_family(rel_path):
+            continue
+        directory = os.path.dirname(rel_path)
+        while directory not in dirs:
+            dirs.add(directory)
+            if not directory:
+                break
+            directory = os.path.dirname(directory)
+    if not dirs and not bridge._ts_index.configs:
+        return 0
+
+    pending = [os.path.join(d, name) if d else name for d in sorted(dirs) for name in CONFIG_NAMES]
+    loaded: Set[str] = set()
+    while pending:
+        config_path = pending.pop()
+        if config_path in loaded:
+            continue
+        try:
+            with open(os.path.join(project_dir, config_path), "r") as f:
+                content = f.read()
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+        loaded.add(config_path)
+        bridge.update_ts_config(config_path, content)
+        extends = bridge._ts_index.configs[config_path].get("extends")
+        if isinstance(extends, str) and extends.startswith("."):
+            target = os.path.normpath(os.path.join(os.path.dirname(config_path), extends))
+            pending.append(target if target.endswith(".json") else target + ".json")
+    for config_path in list(bridge._ts_index.configs):
+        if config_path not in loaded:
+            bridge.update_ts_config(config_path, None)
+    return len(loaded)
+
+
+# ---- warm sync ------------------------------------------------------------
+
+
+def content_hash(content: str) -> str:
+    """Fast content fingerprint for the per-file stat table."""
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def record_file_stats(
+    bridge, project_dir: str, files: Iterable[Tuple[str, str]]
+) -> None:
+    """Remember (mtime_ns, size, hash) for files whose content was just indexed."""
+    for rel_path, content in files:
+        try:
+            st = os.stat(os.path.join(project_dir, rel_path))
+        except OSError:
+            continue
+        bridge._file_stats[rel_path] = (st.st_mtime_ns, st.st_size, content_hash(content))
+
+
+def warm_sync(
+    bridge,
+    project_dir: str,
+    registry=None,
+    skip_dirs: Iterable[str] = SKIP_DIRS,
+    max_added: Optional[int] = None,
+) -> Dict[str, int]:
+    """Bring a reloaded graph up to date with files changed while it was offline.
+
+    A known file is read and hashed only when its (mtime, size) differs
+    from the recorded stat, and reprocessed only when the hash differs too.
+    New files (up to max_added) are indexed, deleted files removed. All
+    changes go through one DeltaGraphBridge.process_changes batch.
+
+    Returns counts: scanned, unchanged, touched (stat moved, same hash),
+    changed, added, deleted.
+    """
+    registry = registry or _get_registry()
+    known = set(bridge._tracked_files) | set(bridge._file_stats)
+    counts = {"scanned": 0, "unchanged": 0, "touched": 0, "changed": 0, "added": 0, "deleted": 0}
+
+    on_disk: Set[str] = set()
+    changes: List[CodeChange] = []
+    new_stats: Dict[str, Tuple[int, int, str]] = {}
+    for rel_path, entry in _scan_source_files(project_dir, registry, skip_dirs):
+        is_new = rel_path not in known
+        if is_new and max_added is not None and counts["added"] >= max_added:
+            continue
+        on_disk.add(rel_path)
+        counts["scanned"] += 1
+        try:
+            st = entry.stat()
+        except OSError:
+            continue
+        prev = bridge._file_stats.get(rel_path)
+        if prev is not None and prev[0] == st.st_mtime_ns and prev[1] == st.st_size:
+            counts["unchanged"] += 1
+            continue
+        try:
+            with open(entry.path, "r") as f:
+                content = f.read()
+        except (IOError, OSError, UnicodeDecodeError):
+            continue
+        digest = content_hash(content)
+        new_stats[rel_path] = (st.st_mtime_ns, st.st_size, digest)
+        if prev is not None and prev[2] == digest:
+            counts["touched"] += 1
+            continue
+        counts["added" if is_new else "changed"] += 1
+        changes.append(CodeChange(
+            file_path=rel_path,
+            old_content=bridge._file_contents.get(rel_path, ""),
+            new_content=content,
+        ))
+
+    for rel_path in sorted(known - on_disk):
+        if not os.path.exists(os.path.join(project_dir, rel_path)):
+            bridge.remove_file(rel_path)
+            counts["deleted"] += 1
+
+    load_ts_configs(bridge, project_dir, on_disk)
+    if changes:
+        bridge.process_changes(changes)
+    bridge._file_stats.update(new_stats)
+    return counts
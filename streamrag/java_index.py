@@ -0,0 +1,170 @@
+"""Package / fully-qualified-name index for Java files.
+
+Every class, interface, enum and record is registered under its
+fully-qualified name ("com.acme.billing.InvoiceService", nested types as
+"com.acme.billing.InvoiceService.Line"), and every package keeps a map of
+its top-level types, so Java names resolve with dict lookups instead of
+a scan over the graph by simple name.
+
+A simple type name used in a file resolves the way javac does:
+
+- a single-type import ("import com.acme.core.Money;")
+- a type declared in the same file
+- a type in the same package (no import needed)
+- a type-import-on-demand ("import com.acme.util.*;")
+
+Qualified names ("Outer.Inner", "com.acme.core.Money") resolve their
+first segment that way, or as a fully-qualified name.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def is_java(file_path: str) -> bool:
+    return file_path.endswith(".java")
+
+
+class JavaPackageIndex:
+    """FQN -> defining file, package -> members, and each file's imports.
+
+    set_file() records a file's package and the type names it declares
+    (as the bridge names class nodes: "Outer", "Outer.Inner").
+    set_imports() records its import declarations as (module, name)
+    pairs, name "*" meaning an on-demand import of module.
+    """
+
+    def __init__(self) -> None:
+        self._packages: Dict[str, str] = {}  # file -> package ("" = default package)
+        self._types: Dict[str, List[str]] = {}  # file -> declared type names
+        self._fqns: Dict[str, Set[str]] = {}  # FQN -> defining files
+        self._members: Dict[str, Dict[str, Set[str]]] = {}  # package -> {type: files}
+        self._single: Dict[str, Dict[str, str]] = {}  # file -> {simple name: FQN}
+        self._on_demand: Dict[str, List[str]] = {}  # file -> packages/types imported with .*
+
+    # ---- files ---------------------------------------------------------
+
+    def set_file(self, file_path: str, package: str, type_names: Iterable[str]) -> None:
+        """Replace the package and declared types registered for a file."""
+        self._unregister(file_path)
+        names = sorted(set(type_names))
+        self._packages[file_path] = package
+        self._types[file_path] = names
+        for name in names:
+            self._fqns.setdefault(self._qualify(package, name), set()).add(file_path)
+            if "." not in name:
+                self._members.setdefault(package, {}).setdefault(name, set()).add(file_path)
+
+    def remove_file(self, file_path: str) -> None:
+        self._unregister(file_path)
+        self.set_imports(file_path, [])
+
+    def _unregister(self, file_path: str) -> None:
+        package = self._packages.pop(file_path, None)
+        if package is None:
+            return
+        for name in self._types.pop(file_path, []):
+            fqn = self._qualify(package, name)
+            files = self._fqns.get(fqn)
+            if files is not None:
+                files.discard(file_path)
+                if not files:
+                    del self._fqns[fqn]
+            members = self._members.get(package, {})
+            files = members.get(name)
+            if files is not None:
+                files.discard(file_path)
+                if not files:
+                    del members[name]
+                    if not members:
+                        del self._members[package]
+
+    def set_imports(self, file_path: str, pairs: Iterable[Tuple[str, str]]) -> None:
+        """Record a file's (module, name) import declarations."""
+        single: Dict[str, str] = {}
+        on_demand: List[str] = []
+        for module, name in pairs:
+            if name == "*":
+                on_demand.append(module)
+            else:
+                single[name] = self._qualify(module, name)
+        if single:
+            self._single[file_path] = single
+        else:
+            self._single.pop(file_path, None)
+        if on_demand:
+            self._on_demand[file_path] = on_demand
+        else:
+            self._on_demand.pop(file_path, None)
+
+    @staticmethod
+    def _qualify(package: str, name: str) -> str:
+        return f"{package}.{name}" if package else name
+
+    # ---- resolution ----------------------------------------------------
+
+    def lookup(self, fqn: str) -> Optional[Tuple[str, str]]:
+        """(file, type name within the file) declaring fqn, or None."""
+        files = self._fqns.get(fqn)
+        if not files:
+            return None
+        file_path = min(files)
+        package = self._packages[file_path]
+        return file_path, fqn[len(package) + 1:] if package else fqn
+
+    def on_demand_members(self, module: str) -> Dict[str, Tuple[str, str]]:
+        """Types `import module.*` brings in: {simple name: (file, type name)}.
+
+        module is a package (its top-level types) or a type (its member types).
+        """
+        members = self._members.get(module)
+        if members is not None:
+            return {name: self.lookup(self._qualify(module, name)) for name in members}
+        found = self.lookup(module)
+        if found is None:
+            return {}
+        file_path, outer = found
+        prefix = f"{outer}."
+        return {name[len(prefix):]: (file_path, name) for name in self._types[file_path]
+                if name.startswith(prefix) and "." not in name[len(prefix):]}
+
+    def resolve_type(self, name: str, file_path: str) -> Optional[Tuple[str, str]]:
+        """(file, type name within the file) that name refers to in file_path."""
+        head, _, rest = name.partition(".")
+        fqn = self._resolve_simple(head, file_path)
+        if fqn is not None:
+            found = self.lookup(f"{fqn}.{rest}" if rest else fqn)
+            if found is not None:
+                return found
+        return self.lookup(name) if rest else None
+
+    def _resolve_simple(self, name: str, file_path: str) -> Optional[str]:
+        fqn = self._single.get(file_path, {}).get(name)
+        if fqn is not None:
+            return fqn
+        package = self._packages.get(file_path, "")
+        if name in self._types.get(file_path, ()):
+            return self._qualify(package, name)
+        if name in self._members.get(package, {}):
+            return self._qualify(package, name)
+        for module in self._on_demand.get(file_path, ()):
+            fqn = self._qualify(module, name)
+            if fqn in self._fqns:
+                return fqn
+        return None
+
+    def copy(self) -> "JavaPackageIndex":
+        clone = JavaPackageIndex()
+        clone._packages = dict(self._packages)
+        clone._types = {k: list(v) for k, v in self._types.items()}
+        clone._fqns = {k: set(v) for k, v in self._fqns.items()}
+        clone._members = {p: {n: set(f) for n, f in m.items()} for p, m in self._members.items()}
+        clone._single = {k: dict(v) for k, v in self._single.items()}
+        clone._on_demand = {k: list(v) for k, v in self._on_demand.items()}
+        return clone
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "files": len(self._packages),
+            "packages": len(self._members),
+            "types": len(self._fqns),
+        }
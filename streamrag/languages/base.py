@@ -1,7 +1,7 @@
 """Abstract base for language extractors."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from streamrag.models import ASTEntity
 
@@ -12,6 +12,9 @@ class LanguageExtractor(ABC):
     Every language extractor must:
     1. Declare which files it can handle (by extension or content inspection)
     2. Extract ASTEntity objects from source code
+
+    Extractors may also override extract_budgeted() to support a cheaper
+    declarations-only mode and an early-stop deadline.
     """
 
     @abstractmethod
@@ -28,6 +31,19 @@ class LanguageExtractor(ABC):
         """
         ...
 
+    def extract_budgeted(
+        self, source: str, file_path: str = "",
+        deadline: Optional[float] = None, declarations_only: bool = False,
+    ) -> List[ASTEntity]:
+        """Extract under an ExtractionBudget.
+
+        declarations_only asks for entities without body analysis (no
+        calls or uses), marked partial. deadline is a
+        time.monotonic() value after which an extractor that can stop early
+        should finish in that mode. The default ignores both.
+        """
+        return self.extract(source, file_path)
+
     @property
     @abstractmethod
     def language_id(self) -> str:
@@ -8,7 +8,8 @@ import re
 from typing import Dict, FrozenSet, List, Tuple
 
 from streamrag.languages.builtins import C_BUILTINS, C_COMMON_METHODS
-from streamrag.languages.regex_base import RegexExtractor
+from streamrag.languages.lexer import C_GRAMMAR
+from streamrag.languages.regex_base import ANY_OFFSET, RegexExtractor, anchored
 
 
 class CExtractor(RegexExtractor):
@@ -27,54 +28,41 @@ class CExtractor(RegexExtractor):
 
     # ── Comment/string stripping ────────────────────────────────────────
 
-    _C_STRIP_PATTERN = re.compile(
-        r'(?:'
-        r'//[^\n]*'               # line comment
-        r'|/\*[\s\S]*?\*/'        # block comment
-        r"|'(?:[^'\\]|\\.)*'"     # char literal
-        r'|"(?:[^"\\]|\\.)*"'     # string literal
-        r')',
-        re.MULTILINE,
-    )
-
-    def _strip_comments_and_strings(self, source: str) -> str:
-        def _replace(m: re.Match) -> str:
-            return re.sub(r'[^\n]', ' ', m.group(0))
-        return self._C_STRIP_PATTERN.sub(_replace, source)
+    _GRAMMAR = C_GRAMMAR
 
     # ── Declaration patterns ────────────────────────────────────────────
 
-    _FUNC_PATTERN = re.compile(
+    _FUNC_PATTERN = anchored(re.compile(
         r'(?:(?:static|inline|extern)\s+)*'
         r'(?:[\w*]+\s+)+?'
         r'(?P<name>[a-z_]\w*)\s*\([^)]*\)\s*\{',
         re.MULTILINE,
-    )
+    ), ANY_OFFSET)
 
-    _STRUCT_PATTERN = re.compile(
+    _STRUCT_PATTERN = anchored(re.compile(
         r'(?:typedef\s+)?struct\s+(?P<name>[A-Za-z_]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), "typedef", "struct")
 
-    _ENUM_PATTERN = re.compile(
+    _ENUM_PATTERN = anchored(re.compile(
         r'(?:typedef\s+)?enum\s+(?P<name>[A-Za-z_]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), "typedef", "enum")
 
-    _UNION_PATTERN = re.compile(
+    _UNION_PATTERN = anchored(re.compile(
         r'(?:typedef\s+)?union\s+(?P<name>[A-Za-z_]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), "typedef", "union")
 
-    _TYPEDEF_PATTERN = re.compile(
+    _TYPEDEF_PATTERN = anchored(re.compile(
         r'typedef\s+.*?\s+(?P<name>[A-Za-z_]\w*)\s*;',
         re.MULTILINE,
-    )
+    ), "typedef")
 
-    _DEFINE_PATTERN = re.compile(
+    _DEFINE_PATTERN = anchored(re.compile(
         r'#\s*define\s+(?P<name>[A-Za-z_]\w*)(?:\s*\([^)]*\))?',
         re.MULTILINE,
-    )
+    ), "#")
 
     def _get_declaration_patterns(self) -> Dict[str, List[re.Pattern]]:
         return {
@@ -85,14 +73,14 @@ class CExtractor(RegexExtractor):
 
     # ── Import patterns ─────────────────────────────────────────────────
 
-    _INCLUDE_LOCAL = re.compile(
+    _INCLUDE_LOCAL = anchored(re.compile(
         r'#\s*include\s+"(?P<path>[^"]+)"',
         re.MULTILINE,
-    )
-    _INCLUDE_SYSTEM = re.compile(
+    ), "#")
+    _INCLUDE_SYSTEM = anchored(re.compile(
         r'#\s*include\s+<(?P<path>[^>]+)>',
         re.MULTILINE,
-    )
+    ), "#")
 
     def _get_import_patterns(self) -> List[re.Pattern]:
         return [self._INCLUDE_LOCAL, self._INCLUDE_SYSTEM]
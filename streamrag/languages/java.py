@@ -1,10 +1,12 @@
 """Java language extractor using regex-based parsing."""
 
 import re
-from typing import Dict, FrozenSet, List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from streamrag.languages.builtins import JAVA_BUILTINS, JAVA_COMMON_METHODS
-from streamrag.languages.regex_base import RegexExtractor
+from streamrag.languages.lexer import JAVA_GRAMMAR, Token
+from streamrag.languages.regex_base import ANY_OFFSET, LINE_START, RegexExtractor, anchored
+from streamrag.models import ASTEntity
 
 
 class JavaExtractor(RegexExtractor):
@@ -23,79 +25,73 @@ class JavaExtractor(RegexExtractor):
 
     # ── Comment/string stripping ────────────────────────────────────────
 
-    _JAVA_STRIP_PATTERN = re.compile(
-        r'(?:'
-        r'//[^\n]*'               # line comment
-        r'|/\*[\s\S]*?\*/'        # block comment (includes javadoc)
-        r"|'(?:[^'\\]|\\.)*'"     # char literal
-        r'|"(?:[^"\\]|\\.)*"'     # string literal
-        r'|"""[\s\S]*?"""'         # text blocks (Java 13+)
-        r')',
-        re.MULTILINE,
-    )
-
-    def _strip_comments_and_strings(self, source: str) -> str:
-        def _replace(m: re.Match) -> str:
-            return re.sub(r'[^\n]', ' ', m.group(0))
-        return self._JAVA_STRIP_PATTERN.sub(_replace, source)
+    _GRAMMAR = JAVA_GRAMMAR
 
     # ── Declaration patterns ────────────────────────────────────────────
 
-    _MODIFIERS = r'(?:(?:public|private|protected|static|final|abstract|synchronized|native|strictfp|sealed|non-sealed|default)\s+)*'
+    _MODIFIER_WORDS = ("public", "private", "protected", "static", "final", "abstract",
+                       "synchronized", "native", "strictfp", "sealed", "non-sealed", "default")
+    _MODIFIERS = r'(?:(?:' + "|".join(_MODIFIER_WORDS) + r')\s+)*'
 
-    _CLASS_PATTERN = re.compile(
+    _CLASS_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'class\s+(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?'
         r'(?:\s+extends\s+(?P<inherits>[A-Za-z_]\w*(?:\s*<[^>]*>)?))?'
         r'(?:\s+implements\s+[A-Za-z_][\w.,<>\s]*)?\s*\{',
         re.MULTILINE,
-    )
+    ), *_MODIFIER_WORDS, "class")
 
-    _INTERFACE_PATTERN = re.compile(
+    _INTERFACE_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'interface\s+(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?'
         r'(?:\s+extends\s+(?P<inherits>[A-Za-z_][\w.,<>\s]*))?'
         r'\s*\{',
         re.MULTILINE,
-    )
+    ), *_MODIFIER_WORDS, "interface")
 
-    _ENUM_PATTERN = re.compile(
+    _ENUM_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'enum\s+(?P<name>[A-Z]\w*)\s*'
         r'(?:\s+implements\s+(?P<inherits>[A-Za-z_][\w.,<>\s]*))?'
         r'\s*\{',
         re.MULTILINE,
-    )
+    ), *_MODIFIER_WORDS, "enum")
 
-    _RECORD_PATTERN = re.compile(
+    _RECORD_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'record\s+(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?\s*\([^)]*\)'
         r'(?:\s+implements\s+(?P<inherits>[A-Za-z_][\w.,<>\s]*))?'
         r'\s*\{',
         re.MULTILINE,
-    )
+    ), *_MODIFIER_WORDS, "record")
 
-    _ANNOTATION_TYPE_PATTERN = re.compile(
+    _ANNOTATION_TYPE_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'@interface\s+(?P<name>[A-Z]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), *_MODIFIER_WORDS, "@interface")
 
-    _METHOD_PATTERN = re.compile(
+    _METHOD_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'(?:<[^>]*>\s+)?'  # generic type params
         r'(?:[\w<>\[\],.\s]+?\s+)'  # return type
         r'(?P<name>[a-z_]\w*)\s*\([^)]*\)\s*'
         r'(?:throws\s+[\w.,\s]+)?\s*\{',
         re.MULTILINE,
-    )
+    ), ANY_OFFSET)
 
-    _CONSTRUCTOR_PATTERN = re.compile(
+    _CONSTRUCTOR_PATTERN = anchored(re.compile(
         _MODIFIERS +
         r'(?P<name>[A-Z]\w*)\s*\([^)]*\)\s*'
         r'(?:throws\s+[\w.,\s]+)?\s*\{',
         re.MULTILINE,
-    )
+    ), ANY_OFFSET)
+
+    # The package declaration: module_code entity named after the package
+    _PACKAGE_PATTERN = anchored(re.compile(
+        r'^[ \t]*package\s+(?P<name>[A-Za-z_][\w.]*)\s*;',
+        re.MULTILINE,
+    ), LINE_START)
 
     def _get_declaration_patterns(self) -> Dict[str, List[re.Pattern]]:
         return {
@@ -103,8 +99,29 @@ class JavaExtractor(RegexExtractor):
             "class": [self._CLASS_PATTERN, self._INTERFACE_PATTERN,
                        self._ENUM_PATTERN, self._RECORD_PATTERN,
                        self._ANNOTATION_TYPE_PATTERN],
+            "module_code": [self._PACKAGE_PATTERN],
         }
 
+    def _extract_declarations(
+        self, source: str, lines: List[str],
+        stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        deadline: Optional[float] = None,
+        declarations_only: bool = False,
+    ) -> List[ASTEntity]:
+        entities = super()._extract_declarations(
+            source, lines, stripped, stripped_lines, line_offsets, deadline, declarations_only)
+        for entity in entities:
+            if entity.entity_type == "module_code":
+                # `package a.b;` has no body: do not run on to the first type's braces
+                text = f"package {entity.name};"
+                entity.line_end = entity.line_start
+                entity.calls, entity.type_refs, entity.decorators = [], [], []
+                entity.signature_hash = self._compute_signature_hash(text)
+                entity.structure_hash = self._compute_structure_hash(text, entity.name)
+                entity.partial = False
+        return entities
+
     # ── Inheritance extraction ──────────────────────────────────────────
 
     def _extract_inherits(self, match: re.Match) -> List[str]:
@@ -124,14 +141,26 @@ class JavaExtractor(RegexExtractor):
 
     # ── Import patterns ─────────────────────────────────────────────────
 
-    _IMPORT_PATTERN = re.compile(
+    _IMPORT_PATTERN = anchored(re.compile(
         r'import\s+(?:static\s+)?(?P<path>[\w.]+)\.(?P<name>[A-Za-z_]\w*|\*)\s*;',
         re.MULTILINE,
-    )
+    ), "import")
 
     def _get_import_patterns(self) -> List[re.Pattern]:
         return [self._IMPORT_PATTERN]
 
+    def _extract_imports(
+        self, stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        tokens: Optional[List[Token]] = None,
+    ) -> List[ASTEntity]:
+        entities = super()._extract_imports(stripped, stripped_lines, line_offsets, tokens)
+        for entity in entities:
+            if entity.name == "*":
+                # One node per on-demand import: keep their node ids apart
+                entity.name = f"{entity.imports[0][0]}.*"
+        return entities
+
     def _parse_import_match(self, match: re.Match) -> List[Tuple[str, str]]:
         path = match.group("path")
         name = match.group("name")
@@ -0,0 +1,243 @@
+"""Single-pass comment/string lexer for the regex-based extractors.
+
+Each language used to blank comments and strings with one alternation
+regex (//...|/*...*/|'...'|"..."). This lexer reproduces those patterns
+exactly -- at every offset the first rule that matches wins, as in the
+alternation -- so lex(source, grammar).text is the text the regex
+substitution produced, with the same length and newlines.
+
+The difference is cost on bad input. The next place a token can start is
+found with one search for any opener literal, and a rule that fails to close
+(unterminated string, comment or raw string) remembers how far it
+scanned: a later opener of the same rule inside that range would fail
+at the same place, so it is skipped instead of rescanned. Thousands of
+unterminated quotes or a stray /* in a minified bundle stay linear where
+the regexes went quadratic.
+
+lex() also returns the token spans it blanked, in source order.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+COMMENT = "comment"
+STRING = "string"
+
+# Rule modes
+LINE = "line"            # opener to end of line
+BLOCK = "block"          # opener to the first closer literal
+QUOTED = "quoted"        # backslash escapes; an escape never spans a newline
+RAW_HASH = "raw_hash"    # Rust r#"..."# (prefix "r" plus one or more '#')
+RAW_DELIM = "raw_delim"  # C++ R"delim(...)delim"
+
+Token = Tuple[int, int, str]  # (start, end, kind)
+
+
+class Rule(NamedTuple):
+    """One alternative of a grammar.
+
+    opener starts with the rule's trigger character; prefixes are the
+    literals that may precede it ("" = none), tried longest first.
+    """
+    kind: str
+    opener: str
+    mode: str
+    closer: str = ""
+    prefixes: Tuple[str, ...] = ("",)
+
+
+class LexResult(NamedTuple):
+    text: str
+    tokens: List[Token]
+
+
+class Grammar:
+    """Ordered rules for one language; earlier rules win at the same offset."""
+
+    def __init__(self, name: str, rules: Sequence[Rule]) -> None:
+        self.name = name
+        self.rules = tuple(rules)
+        self.bodies = {
+            rule.opener: re.compile(
+                r"[^{q}\\]*(?:\\.[^{q}\\]*)*".format(q=re.escape(rule.opener)))
+            for rule in self.rules if rule.mode == QUOTED
+        }
+        # trigger char -> (index, rule, quoted body pattern or None), in rule order
+        by_trigger: Dict[str, List[Tuple[int, Rule, Optional[Pattern]]]] = {}
+        for index, rule in enumerate(self.rules):
+            by_trigger.setdefault(rule.opener[0], []).append(
+                (index, rule, self.bodies.get(rule.opener) if rule.mode == QUOTED else None))
+        self.by_trigger = by_trigger
+        # Trigger chars with a prefixed rule, whose token may start before them
+        self.prefixed = frozenset(
+            rule.opener[0] for rule in self.rules if rule.prefixes != ("",))
+        # Offsets where some opener starts (so "/" alone is not a stop)
+        openers = sorted({rule.opener for rule in self.rules}, key=len, reverse=True)
+        self.trigger = re.compile("|".join(re.escape(o) for o in openers))
+
+    def __repr__(self) -> str:
+        return f"Grammar({self.name!r})"
+
+
+_RAW_HASH_END = re.compile(r'"#+\s')
+
+_LINE_COMMENT = Rule(COMMENT, "//", LINE)
+_BLOCK_COMMENT = Rule(COMMENT, "/*", BLOCK, "*/")
+_SINGLE = Rule(STRING, "'", QUOTED)
+_DOUBLE = Rule(STRING, '"', QUOTED)
+
+DEFAULT_GRAMMAR = Grammar("default", (
+    _LINE_COMMENT,
+    _BLOCK_COMMENT,
+    Rule(STRING, "'''", BLOCK, "'''"),
+    Rule(STRING, '"""', BLOCK, '"""'),
+    _SINGLE,
+    _DOUBLE,
+    Rule(STRING, "`", QUOTED),
+))
+
+C_GRAMMAR = Grammar("c", (_LINE_COMMENT, _BLOCK_COMMENT, _SINGLE, _DOUBLE))
+
+CPP_GRAMMAR = Grammar("cpp", (
+    _LINE_COMMENT,
+    _BLOCK_COMMENT,
+    _SINGLE,
+    _DOUBLE,
+    Rule(STRING, '"', RAW_DELIM, prefixes=("R",)),
+))
+
+JAVA_GRAMMAR = Grammar("java", (
+    _LINE_COMMENT,
+    _BLOCK_COMMENT,
+    _SINGLE,
+    _DOUBLE,
+    # After _DOUBLE, as in the original pattern: "" wins, so a text block
+    # lexes as an empty string followed by an ordinary one
+    Rule(STRING, '"""', BLOCK, '"""'),
+))
+
+RUST_GRAMMAR = Grammar("rust", (
+    _LINE_COMMENT,
+    _BLOCK_COMMENT,
+    Rule(STRING, '"', RAW_HASH, prefixes=("r#",)),
+    Rule(STRING, '"', BLOCK, '"', prefixes=("r",)),
+    Rule(STRING, "'", QUOTED, prefixes=("b", "")),
+    Rule(STRING, '"', QUOTED, prefixes=("b", "")),
+))
+
+
+def _blank(text: str) -> str:
+    """Spaces for every character except newlines."""
+    if "\n" not in text:
+        return " " * len(text)
+    return "\n".join(" " * len(part) for part in text.split("\n"))
+
+
+def _prefix_start(source: str, q: int, prefix: str, floor: int) -> int:
+    """Offset where prefix ends right before q (not below floor), else -1."""
+    if not prefix:
+        return q
+    if prefix == "r#":
+        i = q
+        while i > floor and source[i - 1] == "#":
+            i -= 1
+        if i < q and i - 1 >= floor and source[i - 1] == "r":
+            return i - 1
+        return -1
+    start = q - len(prefix)
+    if start >= floor and source.startswith(prefix, start):
+        return start
+    return -1
+
+
+def lex(source: str, grammar: Grammar = DEFAULT_GRAMMAR) -> LexResult:
+    """Blank comments and strings in source; return the text and token spans."""
+    n = len(source)
+    by_trigger = grammar.by_trigger
+    prefixed = grammar.prefixed
+    find_trigger = grammar.trigger.search
+    startswith = source.startswith
+    # failed[i]: rule i cannot close an opener whose trigger is before this
+    failed = [0] * len(grammar.rules)
+    raw_closers_missing = set()
+
+    pieces: List[str] = []
+    tokens: List[Token] = []
+    emitted = 0  # source[:emitted] is already in pieces
+    pos = 0      # where the next token may start
+    while True:
+        m = find_trigger(source, pos)
+        if m is None:
+            break
+        q = m.start()
+
+        char = source[q]
+        if char in prefixed:
+            candidates = []
+            for entry in by_trigger[char]:
+                if q < failed[entry[0]] or not startswith(entry[1].opener, q):
+                    continue
+                for prefix in entry[1].prefixes:
+                    start = _prefix_start(source, q, prefix, pos)
+                    if start >= 0:
+                        candidates.append((start, entry))
+            candidates.sort(key=lambda c: (c[0], c[1][0]))
+        else:
+            candidates = [
+                (q, entry) for entry in by_trigger[char]
+                if q >= failed[entry[0]] and startswith(entry[1].opener, q)
+            ]
+
+        end = -1
+        for start, (index, rule, body) in candidates:
+            if q < failed[index]:
+                continue  # An earlier candidate already ran this rule's scan
+            if body is not None:
+                stop = body.match(source, q + 1).end()
+                if stop < n and source[stop] == rule.opener:
+                    end = stop + 1
+                else:
+                    failed[index] = stop  # Escaped openers before stop end here too
+            elif rule.mode == LINE:
+                end = source.find("\n", q)
+                if end < 0:
+                    end = n
+            elif rule.mode == BLOCK:
+                found = source.find(rule.closer, q + len(rule.opener))
+                if found >= 0:
+                    end = found + len(rule.closer)
+                else:
+                    failed[index] = n + 1
+            elif rule.mode == RAW_HASH:
+                close = _RAW_HASH_END.search(source, q + 1)
+                if close is not None:
+                    end = close.end()
+                else:
+                    failed[index] = n + 1
+            else:  # RAW_DELIM
+                paren = source.find("(", q + 1)
+                if paren < 0:
+                    failed[index] = n + 1
+                else:
+                    closer = ")" + source[q + 1:paren] + '"'
+                    found = -1
+                    if closer not in raw_closers_missing:
+                        found = source.find(closer, paren + 1)
+                    if found >= 0:
+                        end = found + len(closer)
+                    else:
+                        raw_closers_missing.add(closer)
+            if end >= 0:
+                pieces.append(source[emitted:start])
+                text = source[start:end]
+                pieces.append(" " * (end - start) if "\n" not in text else _blank(text))
+                tokens.append((start, end, rule.kind))
+                emitted = pos = end
+                break
+        if end < 0:
+            pos = q + 1
+
+    if not tokens:
+        return LexResult(source, tokens)
+    pieces.append(source[emitted:])
+    return LexResult("".join(pieces), tokens)
@@ -1,17 +1,23 @@
 """Python language extractor -- wraps the existing ASTExtractor."""
 
-from typing import List
+from typing import List, Optional
 
 from streamrag.extractor import ASTExtractor
+from streamrag.incremental_extractor import IncrementalExtractor
 from streamrag.languages.base import LanguageExtractor
 from streamrag.models import ASTEntity
 
 
 class PythonExtractor(LanguageExtractor):
-    """Python code extractor using the stdlib ast module."""
+    """Python code extractor using the stdlib ast module.
 
-    def __init__(self) -> None:
+    With a file_path, re-extraction of a file seen before only re-parses the
+    top-level blocks that changed (see IncrementalExtractor).
+    """
+
+    def __init__(self, incremental: bool = True) -> None:
         self._extractor = ASTExtractor()
+        self._incremental = IncrementalExtractor() if incremental else None
 
     @property
     def language_id(self) -> str:
@@ -25,4 +31,15 @@ class PythonExtractor(LanguageExtractor):
         return any(file_path.endswith(ext) for ext in self.supported_extensions)
 
     def extract(self, source: str, file_path: str = "") -> List[ASTEntity]:
+        if file_path and self._incremental is not None:
+            return self._incremental.extract(source, file_path)
         return self._extractor.extract(source)
+
+    def extract_budgeted(
+        self, source: str, file_path: str = "",
+        deadline: Optional[float] = None, declarations_only: bool = False,
+    ) -> List[ASTEntity]:
+        """ast.parse cannot stop early: only declarations_only is honoured."""
+        if declarations_only:
+            return self._extractor.extract_declarations(source)
+        return self.extract(source, file_path)
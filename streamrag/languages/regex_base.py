@@ -1,23 +1,133 @@
 """Shared base class for regex-based language extractors.
 
-Provides comment/string stripping, brace-counting, call extraction,
+Provides comment/string stripping, brace matching, call extraction,
 hash computation, and scope tracking. Language-specific subclasses
 provide declaration patterns, import patterns, and builtin sets.
 """
 
 import hashlib
 import re
+import time
 from abc import abstractmethod
+from bisect import bisect_right
+from itertools import accumulate
 from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from streamrag.languages.base import LanguageExtractor
+from streamrag.languages.lexer import DEFAULT_GRAMMAR, Grammar, LexResult, Token, lex
 from streamrag.models import ASTEntity
 
+# Partial entities hash at most this much of their declaration: on a
+# minified line every declaration's "body" is the rest of the file
+_PARTIAL_HASH_CHARS = 2048
+
 
 def _sha256_short(text: str, length: int = 12) -> str:
     return hashlib.sha256(text.encode()).hexdigest()[:length]
 
 
+def _line_offsets(lines: List[str]) -> List[int]:
+    """Start offset of each line, for text == "\n".join(lines)."""
+    return [0, *accumulate(len(line) + 1 for line in lines[:-1])]
+
+
+def _line_at(line_offsets: List[int], pos: int) -> int:
+    """1-based line number of character offset pos."""
+    return bisect_right(line_offsets, pos)
+
+
+def _token_at(tokens: List[Token], starts: List[int], pos: int) -> bool:
+    """Whether pos falls inside one of the (source-ordered) lexer tokens."""
+    i = bisect_right(starts, pos) - 1
+    return i >= 0 and pos < tokens[i][1]
+
+
+# ── Anchored scanning ───────────────────────────────────────────────────
+#
+# Declaration and import patterns start with optional keyword groups, e.g.
+# (?:export\s+)?(?:default\s+)?class\s+..., which finditer() would try at
+# every offset. Instead each pattern declares its anchors with anchored():
+# the keywords one of which every match starts with ("export", "default",
+# "class"). One locator regex per pattern list finds all keywords in a
+# single pass, and each hit is handed only to the patterns that can start
+# there; the matches are exactly finditer()'s.
+#
+# Patterns without a leading keyword declare LINE_START (they begin with ^,
+# so finditer() rejects every other offset at C speed) or ANY_OFFSET (C/C++
+# functions, Java methods: a match may start anywhere) and run finditer().
+
+LINE_START = "^"  # Anchor: the pattern begins with ^ (MULTILINE)
+ANY_OFFSET = "*"  # Anchor: no leading keyword; tried at every offset
+
+_anchors: Dict[re.Pattern, Tuple[str, ...]] = {}
+
+
+def anchored(pattern: re.Pattern, *anchors: str) -> re.Pattern:
+    """Declare where matches of pattern can start; returns pattern."""
+    _anchors[pattern] = anchors
+    return pattern
+
+
+class _Scanner:
+    """All matches of several anchored patterns, from one locator pass."""
+
+    def __init__(self, patterns: Tuple[re.Pattern, ...]) -> None:
+        self.patterns = patterns
+        self.own_scan: List[int] = []  # LINE_START, ANY_OFFSET or undeclared: finditer
+        starts: Dict[str, List[int]] = {}
+        for i, pattern in enumerate(patterns):
+            anchors = _anchors.get(pattern)
+            if not anchors or LINE_START in anchors or ANY_OFFSET in anchors:
+                self.own_scan.append(i)
+                continue
+            for anchor in anchors:
+                starts.setdefault(anchor, []).append(i)
+        # The locator reports the longest keyword at an offset: hand its hit
+        # to the patterns of every keyword that is a prefix of it as well
+        self.dispatch: Dict[str, List[int]] = {
+            word: sorted({i for other, ids in starts.items() if word.startswith(other) for i in ids})
+            for word in starts
+        }
+        words = "|".join(re.escape(w) for w in sorted(starts, key=len, reverse=True))
+        self.locator = re.compile(words) if words else None
+
+    def scan(self, text: str) -> List[List[re.Match]]:
+        """Per pattern, its non-overlapping matches in text, leftmost first."""
+        found: List[List[re.Match]] = [[] for _ in self.patterns]
+        for i in self.own_scan:
+            found[i] = list(self.patterns[i].finditer(text))
+        if self.locator is None:
+            return found
+        patterns, dispatch = self.patterns, self.dispatch
+        next_pos = [0] * len(patterns)
+        search, n, pos = self.locator.search, len(text), 0
+        while pos <= n:
+            hit = search(text, pos)
+            if hit is None:
+                break
+            at = hit.start()
+            for i in dispatch[hit.group()]:
+                if at >= next_pos[i]:
+                    m = patterns[i].match(text, at)
+                    if m is not None:
+                        found[i].append(m)
+                        next_pos[i] = m.end() if m.end() > at else at + 1
+            pos = at + 1
+        return found
+
+
+_scanners: Dict[Tuple[re.Pattern, ...], _Scanner] = {}
+
+
+def _scan(patterns: List[re.Pattern], text: str) -> List[List[re.Match]]:
+    """Matches of each pattern in text, all patterns located in one pass."""
+    key = tuple(patterns)
+    scanner = _scanners.get(key)
+    if scanner is None:
+        scanner = _scanners[key] = _Scanner(key)
+    return scanner.scan(text)
+
+
 class RegexExtractor(LanguageExtractor):
     """Abstract regex-based extractor.
 
@@ -31,51 +141,68 @@ class RegexExtractor(LanguageExtractor):
 
     # ── Comment / string stripping ──────────────────────────────────────
 
-    # Regex to match comments and strings while preserving line structure.
-    # Order matters: longest match first to avoid partial matches.
-    _STRIP_PATTERN = re.compile(
-        r'(?:'
-        r'//[^\n]*'               # single-line comment //
-        r'|/\*[\s\S]*?\*/'        # block comment /* ... */
-        r"|'''[\s\S]*?'''"        # Python triple-single
-        r'|"""[\s\S]*?"""'        # Python triple-double
-        r"|'(?:[^'\\]|\\.)*'"     # single-quoted string
-        r'|"(?:[^"\\]|\\.)*"'     # double-quoted string
-        r'|`(?:[^`\\]|\\.)*`'     # backtick template literal
-        r')',
-        re.MULTILINE,
-    )
+    # Comment/string grammar for lexer.lex; subclasses swap in their own
+    _GRAMMAR: Grammar = DEFAULT_GRAMMAR
+
+    def _lex(self, source: str) -> LexResult:
+        """Blanked source plus the (start, end, kind) span of each comment/string."""
+        return lex(source, self._GRAMMAR)
 
     def _strip_comments_and_strings(self, source: str) -> str:
         """Replace comments and string contents with spaces, preserving line numbers."""
-        def _replace(m: re.Match) -> str:
-            text = m.group(0)
-            # Preserve newlines so line numbers stay correct
-            return re.sub(r'[^\n]', ' ', text)
-        return self._STRIP_PATTERN.sub(_replace, source)
+        return self._lex(source).text
 
-    # ── Brace counting ──────────────────────────────────────────────────
+    # ── Brace matching ──────────────────────────────────────────────────
 
-    def _find_body_end(self, stripped_lines: List[str], start_line: int) -> int:
+    _BRACE = re.compile(r'[{}]')
+
+    def _body_end_map(self, stripped_lines: List[str]) -> List[int]:
+        """Body end line for a declaration starting on each line, in one pass.
+
+        Matches every brace pair with a stack (open offset -> close offset),
+        then sweeps lines bottom-up tracking the first '{' at or after each
+        line start. Entry i is the 0-indexed line of that brace's match, or
+        the last line when there is no '{' or it is never closed.
+        """
+        text = "\n".join(stripped_lines)
+        offsets = _line_offsets(stripped_lines)
+        last_line = len(stripped_lines) - 1
+        close_of: Dict[int, int] = {}
+        stack: List[int] = []
+        opens: List[int] = []
+        for m in self._BRACE.finditer(text):
+            pos = m.start()
+            if text[pos] == "{":
+                stack.append(pos)
+                opens.append(pos)
+            elif stack:
+                close_of[stack.pop()] = pos
+
+        body_ends = [last_line] * len(stripped_lines)
+        k = len(opens) - 1
+        first_open = -1
+        for i in range(last_line, -1, -1):
+            while k >= 0 and opens[k] >= offsets[i]:
+                first_open = opens[k]
+                k -= 1
+            if first_open >= 0 and first_open in close_of:
+                body_ends[i] = _line_at(offsets, close_of[first_open]) - 1
+        return body_ends
+
+    def _find_body_end(
+        self, stripped_lines: List[str], start_line: int,
+        body_ends: Optional[List[int]] = None,
+    ) -> int:
         """Find the closing brace line for a declaration starting at start_line.
 
         start_line is 0-indexed into stripped_lines.
-        Returns 0-indexed line number of closing brace.
+        Returns 0-indexed line number of the brace closing the first '{'
+        at or after start_line (last line if there is none). Pass a
+        precomputed _body_end_map() to make repeated lookups O(1).
         """
-        depth = 0
-        found_open = False
-        for i in range(start_line, len(stripped_lines)):
-            line = stripped_lines[i]
-            for ch in line:
-                if ch == '{':
-                    depth += 1
-                    found_open = True
-                elif ch == '}':
-                    depth -= 1
-                    if found_open and depth == 0:
-                        return i
-        # No closing brace found — return last line
-        return len(stripped_lines) - 1
+        if body_ends is None:
+            body_ends = self._body_end_map(stripped_lines)
+        return body_ends[start_line]
 
     # ── Call extraction ─────────────────────────────────────────────────
 
@@ -216,20 +343,38 @@ class RegexExtractor(LanguageExtractor):
         Pipeline: strip -> extract imports -> extract declarations ->
         find bodies -> extract calls/types/inheritance -> apply scoping.
         """
+        return self._extract(source)
+
+    def extract_budgeted(
+        self, source: str, file_path: str = "",
+        deadline: Optional[float] = None, declarations_only: bool = False,
+    ) -> List[ASTEntity]:
+        """Same pipeline; declarations past the deadline skip body analysis."""
+        return self._extract(source, deadline, declarations_only)
+
+    def _extract(
+        self, source: str, deadline: Optional[float] = None,
+        declarations_only: bool = False,
+    ) -> List[ASTEntity]:
         if not source or not source.strip():
             return []
 
         lines = source.split("\n")
-        stripped = self._strip_comments_and_strings(source)
+        lexed = self._lex(source)
+        stripped = lexed.text
         stripped_lines = stripped.split("\n")
+        # Stripping preserves length and newlines: one offset table serves both
+        line_offsets = _line_offsets(lines)
         entities: List[ASTEntity] = []
 
-        # 1. Extract imports (use original source so string literals are intact)
-        entities.extend(self._extract_imports(source, lines))
+        # 1. Extract imports (use original source so string literals are intact;
+        #    the lexer's spans drop imports that are commented out or quoted)
+        entities.extend(self._extract_imports(source, lines, line_offsets, lexed.tokens))
 
         # 2. Extract declarations
         entities.extend(self._extract_declarations(
-            source, lines, stripped, stripped_lines
+            source, lines, stripped, stripped_lines, line_offsets,
+            deadline=deadline, declarations_only=declarations_only,
         ))
 
         # 3. Apply scoping
@@ -238,14 +383,25 @@ class RegexExtractor(LanguageExtractor):
         return entities
 
     def _extract_imports(
-        self, stripped: str, stripped_lines: List[str]
+        self, stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        tokens: Optional[List[Token]] = None,
     ) -> List[ASTEntity]:
-        """Extract import entities using language-specific patterns."""
+        """Extract import entities using language-specific patterns.
+
+        Matches starting inside a comment/string token are skipped.
+        """
+        if line_offsets is None:
+            line_offsets = _line_offsets(stripped_lines)
+        tokens = tokens or []
+        token_starts = [t[0] for t in tokens]
         entities = []
-        for pattern in self._get_import_patterns():
-            for m in pattern.finditer(stripped):
-                line_num = stripped[:m.start()].count("\n") + 1
-                end_line = stripped[:m.end()].count("\n") + 1
+        for matches in _scan(self._get_import_patterns(), stripped):
+            for m in matches:
+                if tokens and _token_at(tokens, token_starts, m.start()):
+                    continue
+                line_num = _line_at(line_offsets, m.start())
+                end_line = _line_at(line_offsets, m.end())
                 import_pairs = self._parse_import_match(m)
                 for module, name in import_pairs:
                     sig = f"import:{module}:{name}"
@@ -263,68 +419,99 @@ class RegexExtractor(LanguageExtractor):
     def _extract_declarations(
         self, source: str, lines: List[str],
         stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        deadline: Optional[float] = None,
+        declarations_only: bool = False,
     ) -> List[ASTEntity]:
-        """Extract declaration entities using language-specific patterns."""
-        entities = []
-        patterns = self._get_declaration_patterns()
+        """Extract declaration entities using language-specific patterns.
 
-        for entity_type, pat_list in patterns.items():
-            for pattern in pat_list:
-                for m in pattern.finditer(stripped):
-                    name = m.group("name")
-                    if not name:
-                        continue
-
-                    line_start = stripped[:m.start()].count("\n") + 1
-                    decl_line_idx = line_start - 1  # 0-indexed
-
-                    # Find body end via brace counting
-                    line_end = self._find_body_end(stripped_lines, decl_line_idx) + 1
-
-                    # If no braces found on this line, check if it's a one-liner
-                    if line_end == line_start:
-                        # For variables/type aliases, just use the match end
-                        if entity_type == "variable":
-                            line_end = stripped[:m.end()].count("\n") + 1
-
-                    # Extract raw body text for call extraction
-                    body_lines = lines[decl_line_idx:line_end]
-                    body_text = "\n".join(body_lines)
-                    stripped_body = "\n".join(stripped_lines[decl_line_idx:line_end])
-
-                    # Extract calls
-                    calls = self._extract_calls_from_body(stripped_body)
-
-                    # Extract JSX components (TS/JS only)
-                    jsx = self._extract_jsx_components(stripped_body)
-                    calls.extend(c for c in jsx if c not in calls)
+        With declarations_only, or for every match once the monotonic
+        deadline has passed, bodies are not analysed: the entity gets no
+        calls or type refs, a hash of its first _PARTIAL_HASH_CHARS, and
+        partial=True.
+        """
+        if line_offsets is None:
+            line_offsets = _line_offsets(stripped_lines)
+        body_ends = self._body_end_map(stripped_lines)
+        entities = []
+        typed = [(entity_type, pattern) for entity_type, pat_list
+                 in self._get_declaration_patterns().items() for pattern in pat_list]
 
-                    # Extract type refs
-                    type_refs = self._extract_type_refs_from_text(stripped_body)
+        for (entity_type, _), matches in zip(typed, _scan([p for _, p in typed], stripped)):
+            for m in matches:
+                name = m.group("name")
+                if not name:
+                    continue
 
-                    # Extract inherits
-                    inherits = self._extract_inherits(m)
+                line_start = _line_at(line_offsets, m.start())
+                decl_line_idx = line_start - 1  # 0-indexed
 
-                    # Extract decorators from original lines
-                    decorators = self._extract_decorators(stripped_lines, decl_line_idx)
+                # Find body end via the precomputed brace map
+                line_end = self._find_body_end(stripped_lines, decl_line_idx, body_ends) + 1
 
-                    # Compute hashes from original source
-                    sig_text = "\n".join(lines[decl_line_idx:line_end])
-                    sig_hash = self._compute_signature_hash(sig_text)
-                    struct_hash = self._compute_structure_hash(sig_text, name)
+                # If no braces found on this line, check if it's a one-liner
+                if line_end == line_start:
+                    # For variables/type aliases, just use the match end
+                    if entity_type == "variable":
+                        line_end = _line_at(line_offsets, m.end())
 
+                if not declarations_only and deadline is not None \
+                        and time.monotonic() > deadline:
+                    declarations_only = True
+                if declarations_only:
+                    end = line_offsets[line_end - 1] + len(lines[line_end - 1])
+                    sig_text = source[m.start():min(end, m.start() + _PARTIAL_HASH_CHARS)]
                     entities.append(ASTEntity(
                         entity_type=entity_type,
                         name=name,
                         line_start=line_start,
                         line_end=line_end,
-                        signature_hash=sig_hash,
-                        structure_hash=struct_hash,
-                        calls=calls,
-                        inherits=inherits,
-                        type_refs=type_refs,
-                        decorators=decorators,
+                        signature_hash=self._compute_signature_hash(sig_text),
+                        structure_hash=self._compute_structure_hash(sig_text, name),
+                        inherits=self._extract_inherits(m),
+                        decorators=self._extract_decorators(stripped_lines, decl_line_idx),
+                        partial=True,
                     ))
+                    continue
+
+                # Extract raw body text for call extraction
+                body_lines = lines[decl_line_idx:line_end]
+                body_text = "\n".join(body_lines)
+                stripped_body = "\n".join(stripped_lines[decl_line_idx:line_end])
+
+                # Extract calls
+                calls = self._extract_calls_from_body(stripped_body)
+
+                # Extract JSX components (TS/JS only)
+                jsx = self._extract_jsx_components(stripped_body)
+                calls.extend(c for c in jsx if c not in calls)
+
+                # Extract type refs
+                type_refs = self._extract_type_refs_from_text(stripped_body)
+
+                # Extract inherits
+                inherits = self._extract_inherits(m)
+
+                # Extract decorators from original lines
+                decorators = self._extract_decorators(stripped_lines, decl_line_idx)
+
+                # Compute hashes from original source
+                sig_text = "\n".join(lines[decl_line_idx:line_end])
+                sig_hash = self._compute_signature_hash(sig_text)
+                struct_hash = self._compute_structure_hash(sig_text, name)
+
+                entities.append(ASTEntity(
+                    entity_type=entity_type,
+                    name=name,
+                    line_start=line_start,
+                    line_end=line_end,
+                    signature_hash=sig_hash,
+                    structure_hash=struct_hash,
+                    calls=calls,
+                    inherits=inherits,
+                    type_refs=type_refs,
+                    decorators=decorators,
+                ))
 
         return entities
 
@@ -1,10 +1,12 @@
 """Rust language extractor using regex-based parsing."""
 
 import re
-from typing import Dict, FrozenSet, List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from streamrag.languages.builtins import RUST_BUILTINS, RUST_COMMON_METHODS
-from streamrag.languages.regex_base import RegexExtractor
+from streamrag.languages.lexer import RUST_GRAMMAR, Token
+from streamrag.languages.regex_base import RegexExtractor, anchored
+from streamrag.models import ASTEntity
 
 
 class RustExtractor(RegexExtractor):
@@ -23,79 +25,64 @@ class RustExtractor(RegexExtractor):
 
     # ── Comment/string stripping override for Rust raw strings ──────────
 
-    _RUST_STRIP_PATTERN = re.compile(
-        r'(?:'
-        r'//[^\n]*'                   # line comment
-        r'|/\*[\s\S]*?\*/'            # block comment
-        r'|r#+"[\s\S]*?"#+\s'         # raw string r#"..."#
-        r'|r"[^"]*"'                  # raw string r"..."
-        r"|b?'(?:[^'\\]|\\.)*'"       # char literal / byte char
-        r'|b?"(?:[^"\\]|\\.)*"'       # string / byte string
-        r')',
-        re.MULTILINE,
-    )
-
-    def _strip_comments_and_strings(self, source: str) -> str:
-        def _replace(m: re.Match) -> str:
-            return re.sub(r'[^\n]', ' ', m.group(0))
-        return self._RUST_STRIP_PATTERN.sub(_replace, source)
+    _GRAMMAR = RUST_GRAMMAR
 
     # ── Declaration patterns ────────────────────────────────────────────
 
-    _FN_PATTERN = re.compile(
+    _FN_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?(?:async\s+)?(?:unsafe\s+)?(?:extern\s+"[^"]*"\s+)?'
         r'fn\s+(?P<name>[a-z_]\w*)\s*(?:<[^>]*>)?\s*\(',
         re.MULTILINE,
-    )
+    ), "pub", "async", "unsafe", "extern", "fn")
 
-    _STRUCT_PATTERN = re.compile(
+    _STRUCT_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?struct\s+'
         r'(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?',
         re.MULTILINE,
-    )
+    ), "pub", "struct")
 
-    _ENUM_PATTERN = re.compile(
+    _ENUM_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?enum\s+'
         r'(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?',
         re.MULTILINE,
-    )
+    ), "pub", "enum")
 
-    _TRAIT_PATTERN = re.compile(
+    _TRAIT_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?(?:unsafe\s+)?trait\s+'
         r'(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?'
         r'(?:\s*:\s*(?P<inherits>[A-Za-z_]\w*(?:\s*\+\s*[A-Za-z_]\w*)*))?',
         re.MULTILINE,
-    )
+    ), "pub", "unsafe", "trait")
 
-    _IMPL_PATTERN = re.compile(
+    _IMPL_PATTERN = anchored(re.compile(
         r'impl\s*(?:<[^>]*>)?\s+'
         r'(?:(?P<trait>[A-Z]\w*)\s+for\s+)?'
         r'(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?\s*\{',
         re.MULTILINE,
-    )
+    ), "impl")
 
-    _TYPE_ALIAS_PATTERN = re.compile(
+    _TYPE_ALIAS_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?type\s+'
         r'(?P<name>[A-Z]\w*)\s*(?:<[^>]*>)?\s*=',
         re.MULTILINE,
-    )
+    ), "pub", "type")
 
-    _CONST_STATIC_PATTERN = re.compile(
+    _CONST_STATIC_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?(?:const|static)\s+'
         r'(?P<name>[A-Z_]\w*)\s*:',
         re.MULTILINE,
-    )
+    ), "pub", "const", "static")
 
-    _MOD_PATTERN = re.compile(
+    _MOD_PATTERN = anchored(re.compile(
         r'(?:pub(?:\([^)]*\))?\s+)?mod\s+'
         r'(?P<name>[a-z_]\w*)\s*[{;]',
         re.MULTILINE,
-    )
+    ), "pub", "mod")
 
-    _MACRO_RULES_PATTERN = re.compile(
+    _MACRO_RULES_PATTERN = anchored(re.compile(
         r'macro_rules!\s+(?P<name>[a-z_]\w*)',
         re.MULTILINE,
-    )
+    ), "macro_rules!")
 
     def _get_declaration_patterns(self) -> Dict[str, List[re.Pattern]]:
         return {
@@ -106,6 +93,27 @@ class RustExtractor(RegexExtractor):
             "module_code": [self._MOD_PATTERN],
         }
 
+    def _extract_declarations(
+        self, source: str, lines: List[str],
+        stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        deadline: Optional[float] = None,
+        declarations_only: bool = False,
+    ) -> List[ASTEntity]:
+        entities = super()._extract_declarations(
+            source, lines, stripped, stripped_lines, line_offsets, deadline, declarations_only)
+        for entity in entities:
+            if entity.entity_type == "module_code" and re.search(
+                    rf'\bmod\s+{entity.name}\s*;', stripped_lines[entity.line_start - 1]):
+                # `mod foo;` has no body here: do not run on to the next item's braces
+                text = f"mod {entity.name};"
+                entity.line_end = entity.line_start
+                entity.calls, entity.type_refs = [], []
+                entity.signature_hash = self._compute_signature_hash(text)
+                entity.structure_hash = self._compute_structure_hash(text, entity.name)
+                entity.partial = False
+        return entities
+
     # ── Inheritance extraction for traits and impl blocks ───────────────
 
     def _extract_inherits(self, match: re.Match) -> List[str]:
@@ -136,26 +144,39 @@ class RustExtractor(RegexExtractor):
 
     # ── Import patterns ─────────────────────────────────────────────────
 
-    _USE_SIMPLE = re.compile(
-        r'use\s+(?:(?:crate|super|self)::)?(?P<path>[\w:]+)::(?P<name>[A-Za-z_]\w*)\s*;',
+    # Paths keep their crate::/self::/super:: anchor for module-tree resolution
+    _USE_SIMPLE = anchored(re.compile(
+        r'use\s+(?P<path>[\w:]+)::(?P<name>[A-Za-z_]\w*)\s*;',
         re.MULTILINE,
-    )
-    _USE_BRACED = re.compile(
-        r'use\s+(?:(?:crate|super|self)::)?(?P<path>[\w:]+)::\{(?P<names>[^}]+)\}\s*;',
+    ), "use")
+    _USE_BRACED = anchored(re.compile(
+        r'use\s+(?P<path>[\w:]+)::\{(?P<names>[^}]+)\}\s*;',
         re.MULTILINE,
-    )
-    _USE_GLOB = re.compile(
-        r'use\s+(?:(?:crate|super|self)::)?(?P<path>[\w:]+)::\*\s*;',
+    ), "use")
+    _USE_GLOB = anchored(re.compile(
+        r'use\s+(?P<path>[\w:]+)::\*\s*;',
         re.MULTILINE,
-    )
-    _USE_RENAME = re.compile(
-        r'use\s+(?:(?:crate|super|self)::)?(?P<path>[\w:]+)::(?P<orig>[A-Za-z_]\w*)\s+as\s+(?P<name>[A-Za-z_]\w*)\s*;',
+    ), "use")
+    _USE_RENAME = anchored(re.compile(
+        r'use\s+(?P<path>[\w:]+)::(?P<orig>[A-Za-z_]\w*)\s+as\s+(?P<name>[A-Za-z_]\w*)\s*;',
         re.MULTILINE,
-    )
+    ), "use")
 
     def _get_import_patterns(self) -> List[re.Pattern]:
         return [self._USE_RENAME, self._USE_BRACED, self._USE_SIMPLE, self._USE_GLOB]
 
+    def _extract_imports(
+        self, stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        tokens: Optional[List[Token]] = None,
+    ) -> List[ASTEntity]:
+        entities = super()._extract_imports(stripped, stripped_lines, line_offsets, tokens)
+        for entity in entities:
+            if entity.name == "*":
+                # One node per glob import: keep their node ids apart
+                entity.name = f"{entity.imports[0][0]}::*"
+        return entities
+
     def _parse_import_match(self, match: re.Match) -> List[Tuple[str, str]]:
         pattern = match.re
         if pattern is self._USE_RENAME:
@@ -1,10 +1,12 @@
 """TypeScript language extractor using regex-based parsing."""
 
 import re
-from typing import Dict, FrozenSet, List, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from streamrag.languages.builtins import TS_BUILTINS, TS_COMMON_METHODS, TS_TYPE_BUILTINS
-from streamrag.languages.regex_base import RegexExtractor
+from streamrag.languages.lexer import Token
+from streamrag.languages.regex_base import LINE_START, RegexExtractor, anchored
+from streamrag.models import ASTEntity
 
 
 class TypeScriptExtractor(RegexExtractor):
@@ -23,56 +25,56 @@ class TypeScriptExtractor(RegexExtractor):
 
     # ── Declaration patterns ────────────────────────────────────────────
 
-    _FUNC_PATTERN = re.compile(
+    _FUNC_PATTERN = anchored(re.compile(
         r'(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*(?:<[^>]*>)?\s*\(',
         re.MULTILINE,
-    )
+    ), "export", "default", "async", "function")
 
-    _ARROW_PATTERN = re.compile(
+    _ARROW_PATTERN = anchored(re.compile(
         r'(?:export\s+)?(?:const|let|var)\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*'
         r'(?::\s*[^=]+?)?\s*=\s*(?:async\s+)?'
         r'(?:\([^)]*\)|[A-Za-z_$]\w*)\s*(?::\s*[^=]*?)?\s*=>',
         re.MULTILINE,
-    )
+    ), "export", "const", "let", "var")
 
-    _CLASS_PATTERN = re.compile(
+    _CLASS_PATTERN = anchored(re.compile(
         r'(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*(?:<[^>]*>)?'
         r'(?:\s+extends\s+(?P<inherits>[A-Za-z_$][\w.]*(?:\s*<[^>]*>)?'
         r'(?:\s*,\s*[A-Za-z_$][\w.]*(?:\s*<[^>]*>)?)*))?'
         r'(?:\s+implements\s+[^{]*?)?\s*\{',
         re.MULTILINE,
-    )
+    ), "export", "default", "abstract", "class")
 
-    _INTERFACE_PATTERN = re.compile(
+    _INTERFACE_PATTERN = anchored(re.compile(
         r'(?:export\s+)?(?:default\s+)?interface\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*(?:<[^>]*>)?'
         r'(?:\s+extends\s+(?P<inherits>[A-Za-z_$][\w.]*(?:\s*<[^>]*>)?'
         r'(?:\s*,\s*[A-Za-z_$][\w.]*(?:\s*<[^>]*>)?)*))?'
         r'\s*\{',
         re.MULTILINE,
-    )
+    ), "export", "default", "interface")
 
-    _ENUM_PATTERN = re.compile(
+    _ENUM_PATTERN = anchored(re.compile(
         r'(?:export\s+)?(?:const\s+)?enum\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*\{',
         re.MULTILINE,
-    )
+    ), "export", "const", "enum")
 
-    _TYPE_ALIAS_PATTERN = re.compile(
+    _TYPE_ALIAS_PATTERN = anchored(re.compile(
         r'(?:export\s+)?type\s+'
         r'(?P<name>[A-Za-z_$]\w*)\s*(?:<[^>]*>)?\s*=',
         re.MULTILINE,
-    )
+    ), "export", "type")
 
-    _METHOD_PATTERN = re.compile(
+    _METHOD_PATTERN = anchored(re.compile(
         r'^\s+(?:public\s+|private\s+|protected\s+)?'
         r'(?:static\s+)?(?:readonly\s+)?(?:async\s+)?(?:get\s+|set\s+)?'
         r'(?P<name>[A-Za-z_$]\w*)\s*(?:<[^>]*>)?\s*\(',
         re.MULTILINE,
-    )
+    ), LINE_START)
 
     def _get_declaration_patterns(self) -> Dict[str, List[re.Pattern]]:
         return {
@@ -83,29 +85,52 @@ class TypeScriptExtractor(RegexExtractor):
 
     # ── Import patterns ─────────────────────────────────────────────────
 
-    _IMPORT_NAMED = re.compile(
+    _IMPORT_NAMED = anchored(re.compile(
         r'import\s+\{([^}]+)\}\s+from\s+[\'"]([^\'"]+)[\'"]',
         re.MULTILINE,
-    )
-    _IMPORT_DEFAULT = re.compile(
+    ), "import")
+    _IMPORT_DEFAULT = anchored(re.compile(
         r'import\s+([A-Za-z_$]\w*)\s+from\s+[\'"]([^\'"]+)[\'"]',
         re.MULTILINE,
-    )
-    _IMPORT_STAR = re.compile(
+    ), "import")
+    _IMPORT_STAR = anchored(re.compile(
         r'import\s+\*\s+as\s+([A-Za-z_$]\w*)\s+from\s+[\'"]([^\'"]+)[\'"]',
         re.MULTILINE,
-    )
-    _REQUIRE = re.compile(
+    ), "import")
+    _REQUIRE = anchored(re.compile(
         r'(?:const|let|var)\s+(?:\{([^}]+)\}|([A-Za-z_$]\w*))\s*=\s*require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
         re.MULTILINE,
-    )
+    ), "const", "let", "var")
+
+    # Barrel re-exports: recorded as imports of the re-exporting file
+    _EXPORT_FROM = anchored(re.compile(
+        r'export\s+(?:type\s+)?\{([^}]*)\}\s+from\s+[\'"]([^\'"]+)[\'"]',
+        re.MULTILINE,
+    ), "export")
+    _EXPORT_STAR = anchored(re.compile(
+        r'export\s+\*\s+(?:as\s+([A-Za-z_$]\w*)\s+)?from\s+[\'"]([^\'"]+)[\'"]',
+        re.MULTILINE,
+    ), "export")
 
     def _get_import_patterns(self) -> List[re.Pattern]:
-        return [self._IMPORT_NAMED, self._IMPORT_DEFAULT, self._IMPORT_STAR, self._REQUIRE]
+        return [self._IMPORT_NAMED, self._IMPORT_DEFAULT, self._IMPORT_STAR, self._REQUIRE,
+                self._EXPORT_FROM, self._EXPORT_STAR]
+
+    def _extract_imports(
+        self, stripped: str, stripped_lines: List[str],
+        line_offsets: Optional[List[int]] = None,
+        tokens: Optional[List[Token]] = None,
+    ) -> List[ASTEntity]:
+        entities = super()._extract_imports(stripped, stripped_lines, line_offsets, tokens)
+        for entity in entities:
+            if entity.name == "*":
+                # A barrel has one `export * from` per module: keep their node ids apart
+                entity.name = f"* from {entity.imports[0][0]}"
+        return entities
 
     def _parse_import_match(self, match: re.Match) -> List[Tuple[str, str]]:
         pattern = match.re
-        if pattern is self._IMPORT_NAMED:
+        if pattern is self._IMPORT_NAMED or pattern is self._EXPORT_FROM:
             names_str = match.group(1)
             module = match.group(2)
             pairs = []
@@ -124,6 +149,8 @@ class TypeScriptExtractor(RegexExtractor):
             return [(match.group(2), match.group(1))]
         elif pattern is self._IMPORT_STAR:
             return [(match.group(2), match.group(1))]
+        elif pattern is self._EXPORT_STAR:
+            return [(match.group(2), match.group(1) or "*")]
         elif pattern is self._REQUIRE:
             destructured = match.group(1)
             default_name = match.group(2)
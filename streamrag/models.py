@@ -22,6 +22,7 @@ class ASTEntity:
     params: List[str] = field(default_factory=list)  # function parameter names (excluding self/cls)
     decorators: List[str] = field(default_factory=list)
     old_name: Optional[str] = None  # set during rename detection
+    partial: bool = False  # degraded extraction: no calls/uses/type refs recorded
 
 
 @dataclass
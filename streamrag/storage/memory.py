@@ -45,7 +45,9 @@ def serialize_graph(bridge: DeltaGraphBridge) -> dict:
         "dependency_index": {k: list(v) for k, v in bridge._dependency_index.items()},
         "module_file_index": bridge._module_file_index,
         "module_file_collisions": list(bridge._module_file_collisions),
+        "ts_configs": bridge._ts_index.configs,
         "resolution_stats": bridge._resolution_stats,
+        "file_stats": {fp: list(st) for fp, st in bridge._file_stats.items()},
     }
 
     # Versioned graph state (if enabled)
@@ -91,14 +93,11 @@ def deserialize_graph(data: dict) -> DeltaGraphBridge:
     bridge = DeltaGraphBridge(graph=graph)
     # Backward compat: old format stored full file contents, new format stores only keys
     if "file_contents_keys" in data:
-        bridge._file_contents = {}
         bridge._tracked_files = set(data.get("file_contents_keys", []))
     elif "file_contents" in data:
-        bridge._file_contents = data["file_contents"]
-        bridge._tracked_files = set(bridge._file_contents.keys())
-    else:
-        bridge._file_contents = {}
-        bridge._tracked_files = set()
+        for fp, content in data["file_contents"].items():
+            bridge._file_contents[fp] = content
+        bridge._tracked_files = set(data["file_contents"].keys())
 
     dep_idx = data.get("dependency_index", {})
     for k, v in dep_idx.items():
@@ -106,6 +105,13 @@ def deserialize_graph(data: dict) -> DeltaGraphBridge:
 
     bridge._module_file_index = data.get("module_file_index", {})
     bridge._module_file_collisions = set(data.get("module_file_collisions", []))
+    for config_path, config in data.get("ts_configs", {}).items():
+        bridge._ts_index.set_config(config_path, config)
+    bridge._rebuild_reverse_indexes()
+    bridge._file_stats = {
+        fp: (int(st[0]), int(st[1]), str(st[2]))
+        for fp, st in data.get("file_stats", {}).items()
+    }
 
     stats = data.get("resolution_stats", {})
     bridge._resolution_stats = {
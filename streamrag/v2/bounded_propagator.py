@@ -11,7 +11,7 @@ from streamrag.graph import LiquidGraph
 
 @dataclass
 class PropagatorConfig:
-    max_sync_updates: int = 5
+    max_sync_updates: int = 25  # Entity-level refreshes are cheap (no I/O, no parsing)
     max_async_updates: int = 50
     max_depth: int = 3
     sync_timeout_ms: float = 50.0
@@ -28,6 +28,7 @@ class PendingPropagation:
     file_path: str = field(compare=False)
     depth: int = field(compare=False, default=0)
     source_file: str = field(compare=False, default="")
+    enqueued_at: float = field(compare=False, default=0.0)  # monotonic seconds
 
 
 class PropagationResult:
@@ -67,8 +68,15 @@ class BoundedPropagator:
         self.graph = graph or LiquidGraph()
         self.config = config or PropagatorConfig()
         self._async_queue: List[PendingPropagation] = []
+        self._queued: Dict[str, PendingPropagation] = {}  # file -> live heap entry
+        self._drain_stats: Dict[str, float] = {
+            "processed": 0, "duplicates": 0,
+            "latency_ms_total": 0.0, "latency_ms_max": 0.0, "latency_ms_last": 0.0,
+        }
         self._open_files: Set[str] = set()
         self._recent_edits: Dict[str, float] = {}  # file_path -> timestamp
+        # Called with the files clear_async_queue() dropped (the bridge forgets their refreshes)
+        self.on_clear: Optional[Callable[[List[str]], None]] = None
 
     def set_open_files(self, files: Set[str]) -> None:
         """Update the set of currently open files."""
@@ -106,13 +114,22 @@ class BoundedPropagator:
 
         Returns list of (file_path, depth) tuples.
         """
+        return [(fp, depth) for fp, depth, _src in self._bfs_affected([changed_file], graph)]
+
+    def _bfs_affected(
+        self, changed_files: List[str], graph: Optional[LiquidGraph] = None
+    ) -> List[Tuple[str, int, str]]:
+        """Multi-source BFS: (file_path, depth, source_file) for each affected file.
+
+        Changed files themselves are never reported as affected.
+        """
         g = graph or self.graph
-        affected: List[Tuple[str, int]] = []
-        visited: Set[str] = {changed_file}
-        queue: deque = deque([(changed_file, 0)])
+        affected: List[Tuple[str, int, str]] = []
+        visited: Set[str] = set(changed_files)
+        queue: deque = deque((fp, 0, fp) for fp in changed_files)
 
         while queue:
-            current_file, depth = queue.popleft()
+            current_file, depth, source_file = queue.popleft()
             if depth >= self.config.max_depth:
                 continue
 
@@ -122,8 +139,8 @@ class BoundedPropagator:
                     source = g.get_node(edge.source_id)
                     if source and source.file_path not in visited:
                         visited.add(source.file_path)
-                        affected.append((source.file_path, depth + 1))
-                        queue.append((source.file_path, depth + 1))
+                        affected.append((source.file_path, depth + 1, source_file))
+                        queue.append((source.file_path, depth + 1, source_file))
 
         return affected
 
@@ -132,6 +149,7 @@ class BoundedPropagator:
         changed_file: str,
         update_fn: Optional[Callable[[str], None]] = None,
         graph: Optional[LiquidGraph] = None,
+        affected: Optional[List[Tuple[str, int]]] = None,
     ) -> PropagationResult:
         """Execute bounded propagation.
 
@@ -139,14 +157,40 @@ class BoundedPropagator:
             changed_file: The file that changed
             update_fn: Callback to process a file update
             graph: Optional graph override
+            affected: Precomputed (file_path, depth) list; skips the BFS
+        """
+        if affected is not None:
+            affected = [(fp, depth, changed_file) for fp, depth in affected]
+        return self.propagate_many(
+            [changed_file], update_fn=update_fn, graph=graph, affected=affected,
+        )
+
+    def propagate_many(
+        self,
+        changed_files: List[str],
+        update_fn: Optional[Callable[[str], None]] = None,
+        graph: Optional[LiquidGraph] = None,
+        affected: Optional[List[Tuple[str, int, str]]] = None,
+    ) -> PropagationResult:
+        """Execute one bounded propagation for a batch of changed files.
+
+        Affected files are the union over all changed files (each at its
+        smallest depth), so a dependent shared by many changed files is
+        updated once. Sync/async/deferred budgets apply to the whole batch.
+        Callers that already know the dependents pass them as `affected`:
+        (file_path, depth, source_file), source_file being the changed
+        file it depends on.
         """
         result = PropagationResult()
 
         # 1. Find affected files
-        affected = self.find_affected_files(changed_file, graph)
-        result.total_affected = len(affected)
+        if affected is not None:
+            found = list(affected)
+        else:
+            found = self._bfs_affected(list(changed_files), graph)
+        result.total_affected = len(found)
 
-        if not affected:
+        if not found:
             return result
 
         # 2. Prioritize
@@ -155,9 +199,9 @@ class BoundedPropagator:
                 priority=self.compute_priority(fp, depth),
                 file_path=fp,
                 depth=depth,
-                source_file=changed_file,
+                source_file=source_file,
             )
-            for fp, depth in affected
+            for fp, depth, source_file in found
         ]
         prioritized.sort(key=lambda p: p.priority)
 
@@ -184,7 +228,7 @@ class BoundedPropagator:
         # 4. Phase 2: ASYNC
         async_items = remaining[:self.config.max_async_updates]
         for item in async_items:
-            heapq.heappush(self._async_queue, item)
+            self._enqueue(item)
             result.async_queued.append(item.file_path)
 
         # 5. Phase 3: DEFERRED
@@ -194,25 +238,83 @@ class BoundedPropagator:
 
         return result
 
+    def _enqueue(self, item: PendingPropagation) -> None:
+        """Push onto the async heap, keeping one live entry per file.
+
+        A file already queued at an equal or better priority is not pushed
+        again; a better priority supersedes the old entry (left in the heap
+        and skipped on pop) but keeps its original enqueue time.
+        """
+        current = self._queued.get(item.file_path)
+        if current is not None and current.priority <= item.priority:
+            self._drain_stats["duplicates"] += 1
+            return
+        if current is not None:
+            self._drain_stats["duplicates"] += 1
+        item.enqueued_at = current.enqueued_at if current else time.monotonic()
+        self._queued[item.file_path] = item
+        heapq.heappush(self._async_queue, item)
+        if len(self._async_queue) > 2 * len(self._queued) + 16:
+            self._async_queue = list(self._queued.values())
+            heapq.heapify(self._async_queue)
+
     def process_async_queue(
         self,
         max_items: int = 10,
         update_fn: Optional[Callable[[str], None]] = None,
+        time_budget_ms: Optional[float] = None,
     ) -> List[str]:
-        """Process items from the async queue."""
+        """Process items from the async queue, best priority first.
+
+        Each queued file is processed once however often it was queued.
+        Stops after max_items, or once time_budget_ms has elapsed (at least
+        one item is always processed).
+        """
         processed: List[str] = []
-        for _ in range(min(max_items, len(self._async_queue))):
-            if not self._async_queue:
+        start = time.perf_counter()
+        while self._async_queue and len(processed) < max_items:
+            if (time_budget_ms is not None and processed
+                    and (time.perf_counter() - start) * 1000 >= time_budget_ms):
                 break
             item = heapq.heappop(self._async_queue)
+            if self._queued.get(item.file_path) is not item:
+                continue  # superseded
+            del self._queued[item.file_path]
             if update_fn:
                 update_fn(item.file_path)
             processed.append(item.file_path)
+
+            latency_ms = (time.monotonic() - item.enqueued_at) * 1000
+            stats = self._drain_stats
+            stats["processed"] += 1
+            stats["latency_ms_total"] += latency_ms
+            stats["latency_ms_last"] = latency_ms
+            stats["latency_ms_max"] = max(stats["latency_ms_max"], latency_ms)
         return processed
 
     @property
     def async_queue_size(self) -> int:
-        return len(self._async_queue)
+        return len(self._queued)
 
     def clear_async_queue(self) -> None:
+        dropped = sorted(self._queued)
         self._async_queue = []
+        self._queued = {}
+        if dropped and self.on_clear is not None:
+            self.on_clear(dropped)
+
+    def queue_stats(self) -> Dict[str, Any]:
+        """Queue depth and drain latency (enqueue -> processed) metrics."""
+        stats = self._drain_stats
+        now = time.monotonic()
+        oldest = min((i.enqueued_at for i in self._queued.values()), default=None)
+        processed = int(stats["processed"])
+        return {
+            "depth": len(self._queued),
+            "processed": processed,
+            "duplicates": int(stats["duplicates"]),
+            "latency_ms_avg": round(stats["latency_ms_total"] / processed, 3) if processed else 0.0,
+            "latency_ms_max": round(stats["latency_ms_max"], 3),
+            "latency_ms_last": round(stats["latency_ms_last"], 3),
+            "oldest_wait_ms": round((now - oldest) * 1000, 3) if oldest is not None else 0.0,
+        }
@@ -0,0 +1,198 @@
+"""Multi-pass reference for the single-traversal Python extractor.
+
+MultiPassASTExtractor is the original visitor-based extractor: a
+NodeVisitor plus one ast.walk per entity per concern (calls, Name loads,
+type context). ASTExtractor must produce identical output; this class is
+its ground truth for the differential tests and
+benchmarks/bench_python_extractor.py. Hashing, call naming and the
+import/variable entities are shared with ASTExtractor.
+"""
+
+import ast
+from typing import List
+
+from streamrag.extractor import (
+    ASTExtractor, _external_type_import_names, _is_export_list, _param_type_context,
+    _stdlib_import_names, _type_assignments,
+)
+from streamrag.models import ASTEntity
+
+
+class MultiPassASTExtractor(ASTExtractor, ast.NodeVisitor):
+    """Reference extractor: a NodeVisitor plus one ast.walk per entity per concern."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._type_context: dict = {}
+
+    def extract(self, source: str) -> List[ASTEntity]:
+        """Extract all entities from Python source code.
+
+        Returns empty list on empty content or SyntaxError.
+        """
+        if not source.strip():
+            return []
+
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            return []
+
+        self._current_scope = []
+        self._entities = []
+        self._stdlib_names = self._collect_stdlib_imports(tree)
+        self._external_type_names = self._collect_external_type_names(tree)
+        self._type_context = {}
+        self._module_type_context: dict = self._collect_module_type_context(tree)
+        self._digests = {}
+        self.visit(tree)
+        self._extract_module_calls(tree)
+        self._digests = {}
+        return self._entities
+
+    @staticmethod
+    def _collect_stdlib_imports(tree: ast.Module) -> set:
+        """Pre-pass: collect names imported from stdlib or external packages."""
+        stdlib_names: set = set()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                stdlib_names.update(_stdlib_import_names(node))
+        return stdlib_names
+
+    @staticmethod
+    def _collect_external_type_names(tree: ast.Module) -> set:
+        """Pre-pass: collect PascalCase names imported from external packages.
+
+        e.g. `from httpx import AsyncClient` → {"AsyncClient"}
+        These are used to filter out method calls on external types.
+        """
+        external_types: set = set()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                external_types.update(_external_type_import_names(node))
+        return external_types
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def _visit_function(self, node) -> None:
+        """Handle both sync and async function definitions."""
+        name = self._scoped_name(node.name)
+        type_ctx = self._extract_type_context(node)
+        old_ctx = self._type_context
+        self._type_context = type_ctx
+        params = [arg.arg for arg in node.args.args if arg.arg not in ("self", "cls")]
+        self._entities.append(ASTEntity(
+            entity_type="function",
+            name=name,
+            line_start=node.lineno,
+            line_end=node.end_lineno or node.lineno,
+            signature_hash=self._compute_signature_hash(node, "function"),
+            structure_hash=self._compute_structure_hash(node, "function"),
+            calls=self._extract_calls(node),
+            uses=self._extract_uses(node),
+            inherits=[],
+            imports=[],
+            type_refs=self._extract_type_refs(node),
+            type_context=type_ctx,
+            params=params,
+            decorators=self._extract_decorators(node),
+        ))
+        self._type_context = old_ctx
+        # Visit nested definitions
+        self._current_scope.append(node.name)
+        self.generic_visit(node)
+        self._current_scope.pop()
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        name = self._scoped_name(node.name)
+        base_names = []
+        for base in node.bases:
+            if isinstance(base, ast.Name):
+                base_names.append(base.id)
+            elif isinstance(base, ast.Attribute):
+                base_names.append(base.attr)
+
+        self._entities.append(ASTEntity(
+            entity_type="class",
+            name=name,
+            line_start=node.lineno,
+            line_end=node.end_lineno or node.lineno,
+            signature_hash=self._compute_signature_hash(node, "class"),
+            structure_hash=self._compute_structure_hash(node, "class"),
+            calls=self._extract_calls(node),
+            uses=self._extract_uses(node),
+            inherits=base_names,
+            imports=[],
+            decorators=self._extract_decorators(node),
+        ))
+        # Visit nested definitions
+        self._current_scope.append(node.name)
+        self.generic_visit(node)
+        self._current_scope.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Only extract module-level assignments."""
+        if self._current_scope:
+            return
+        entity = self._variable_entity(node, self._digests)
+        if entity is None:
+            return
+        if not _is_export_list(entity.name, node):
+            entity.uses = self._extract_uses(node)
+        self._entities.append(entity)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        """One entity per imported name."""
+        self._append_imports(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        """One entity per imported name."""
+        self._append_imports(node)
+
+    @staticmethod
+    def _extract_type_context(node) -> dict:
+        """Extract variable-to-type mappings from annotations and assignments.
+
+        Sources:
+        - Parameter annotations: def foo(x: SomeClass) -> {"x": "SomeClass"}
+        - Constructor assignments: x = SomeClass() -> {"x": "SomeClass"}
+        - Annotated assignments: x: SomeClass = ... -> {"x": "SomeClass"}
+        """
+        type_map = _param_type_context(node)
+        for child in ast.walk(node):
+            if isinstance(child, (ast.Assign, ast.AnnAssign)):
+                for var_name, type_name in _type_assignments(child):
+                    type_map[var_name] = type_name
+        return type_map
+
+    def _extract_calls(self, node) -> List[str]:
+        """Extract function calls within an AST subtree.
+
+        For self.method()/cls.method() inside a class, emits qualified
+        "ClassName.method" instead of bare "method".
+        Filters out BUILTINS, COMMON_ATTR_METHODS, and stdlib imports.
+        Uses type context to emit qualified names for typed receivers.
+        """
+        calls = []
+        # Enclosing class for self/cls resolution (last scope element)
+        enclosing_class = self._current_scope[-1] if self._current_scope else None
+
+        for child in ast.walk(node):
+            if isinstance(child, ast.Call):
+                name = self._call_name(child.func, enclosing_class, self._type_context)
+                if name is not None:
+                    calls.append(name)
+        return calls
+
+    @staticmethod
+    def _extract_uses(node) -> List[str]:
+        """Extract all Name references with Load context."""
+        uses = []
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                uses.append(child.id)
+        return uses
@@ -537,6 +537,44 @@ def test_remove_file_cleans_module_index(bridge):
     assert "service" not in bridge._module_file_index
 
 
+def test_dependency_index_drops_calls_removed_from_tracked_file(bridge):
+    """Calls that disappear from a still-tracked file leave no stale entries."""
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    v1 = "def caller():\n    helper()\n"
+    bridge.process_change(CodeChange("b.py", "", v1))
+    assert "b.py" in bridge._dependency_index["helper"]
+
+    v2 = "def caller():\n    return 1\n"
+    bridge.process_change(CodeChange("b.py", v1, v2))
+    assert "helper" not in bridge._dependency_index
+    assert "b.py" not in bridge._file_dependency_names
+
+
+def test_remove_file_keeps_other_files_entries(bridge):
+    """remove_file only drops keys the removed file contributed."""
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange("b.py", "", "def one():\n    helper()\n"))
+    bridge.process_change(CodeChange("pkg/c.py", "", "def two():\n    helper()\n"))
+
+    bridge.remove_file("b.py")
+    assert bridge._dependency_index["helper"] == {"pkg/c.py"}
+    assert bridge._module_file_index["pkg.c"] == "pkg/c.py"
+    assert "b" not in bridge._module_file_index
+    assert "b.py" not in bridge._file_module_suffixes
+
+
+def test_remove_file_after_deserialize_uses_rebuilt_reverse_maps(bridge):
+    """Reverse maps are rebuilt on load, so removal still cleans the indexes."""
+    from streamrag.storage.memory import deserialize_graph, serialize_graph
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange("api/b.py", "", "def caller():\n    helper()\n"))
+
+    restored = deserialize_graph(serialize_graph(bridge))
+    restored.remove_file("api/b.py")
+    assert all("api/b.py" not in v for v in restored._dependency_index.values())
+    assert "api.b" not in restored._module_file_index
+
+
 def test_remove_file_cleans_file_contents(bridge):
     """remove_file removes file_contents and tracked_files caches."""
     bridge.process_change(CodeChange("test.py", "", "def foo():\n    pass\n"))
@@ -1128,3 +1166,271 @@ def test_module_index_collision_cleared_on_remove(bridge):
 
     bridge.remove_file("pkg1/utils.py")
     assert "utils" not in bridge._module_file_collisions
+
+
+def test_rename_requires_matching_entity_type(bridge):
+    """A function replaced by a same-shaped class is remove+add, not a rename."""
+    _, removed, modified = bridge.compute_delta(
+        "test.py", "def alpha():\n    pass\n", "class Beta:\n    pass\n",
+    )
+    assert [e.name for e in removed] == ["alpha"]
+    assert not any(e.old_name for e in modified)
+
+
+def test_rename_requires_position_overlap(bridge):
+    """Same structure at a distant position is not treated as a rename."""
+    code_v1 = "def alpha(x):\n    return x\n"
+    code_v2 = "\n" * 20 + "def beta(x):\n    return x\n"
+    added, removed, modified = bridge.compute_delta("test.py", code_v1, code_v2)
+    assert [e.name for e in added] == ["beta"]
+    assert [e.name for e in removed] == ["alpha"]
+    assert modified == []
+
+
+def test_rename_requires_same_structure(bridge):
+    """A different parameter list breaks the structure hash match."""
+    code_v1 = "def alpha(x):\n    return x\n"
+    code_v2 = "def beta(x, y):\n    return x\n"
+    added, removed, modified = bridge.compute_delta("test.py", code_v1, code_v2)
+    assert [e.name for e in added] == ["beta"]
+    assert [e.name for e in removed] == ["alpha"]
+
+
+def test_rename_whole_module_api(bridge, fifty_functions_code):
+    """Renaming every function pairs each old name with the one at its position."""
+    renamed_code = fifty_functions_code.replace("def func_", "def renamed_")
+    added, removed, modified = bridge.compute_delta(
+        "test.py", fifty_functions_code, renamed_code,
+    )
+    assert added == []
+    assert removed == []
+    pairs = {e.name: e.old_name for e in modified}
+    assert len(pairs) == 50
+    assert all(pairs[f"renamed_{i}"] == f"func_{i}" for i in range(50))
+
+
+def test_rename_identical_shapes_match_by_position(bridge):
+    """Renames of identically shaped functions stay positional, one-to-one."""
+    code_v1 = "def a(x):\n    return x\n\ndef b(x):\n    return x\n"
+    code_v2 = "def c(x):\n    return x\n\ndef d(x):\n    return x\n"
+    _, _, modified = bridge.compute_delta("test.py", code_v1, code_v2)
+    assert {e.name: e.old_name for e in modified} == {"c": "a", "d": "b"}
+
+
+def test_rename_with_shifted_span(bridge):
+    """A renamed entity that moved but still overlaps its old span is a rename."""
+    code_v1 = "def alpha(x):\n    y = x\n    return y\n"
+    code_v2 = "\ndef beta(x):\n    y = x\n    return y\n"
+    _, removed, modified = bridge.compute_delta("test.py", code_v1, code_v2)
+    assert removed == []
+    assert [(e.name, e.old_name) for e in modified] == [("beta", "alpha")]
+
+
+def test_rename_extra_added_entity_stays_added(bridge):
+    """Only one added entity can claim a removed one; the rest are additions."""
+    code_v1 = "def alpha(x):\n    return x\n"
+    code_v2 = "def beta(x):\n    return x\ndef gamma(x):\n    return x\n"
+    added, removed, modified = bridge.compute_delta("test.py", code_v1, code_v2)
+    assert removed == []
+    assert [(e.name, e.old_name) for e in modified] == [("beta", "alpha")]
+    assert [e.name for e in added] == ["gamma"]
+
+
+# ---- process_changes (batch API) ----
+
+
+def _edge_set(graph):
+    return {
+        (graph.get_node(e.source_id).name, graph.get_node(e.target_id).name, e.edge_type)
+        for e in graph.get_all_edges()
+    }
+
+
+def test_process_changes_resolves_forward_references():
+    """A caller listed before its callee still gets the cross-file edge."""
+    batch = DeltaGraphBridge()
+    ops, profile = batch.process_changes([
+        CodeChange("app.py", "", "from lib import helper\n\ndef main():\n    helper()\n"),
+        CodeChange("lib.py", "", "def helper():\n    return 1\n"),
+    ])
+    assert ("main", "helper", "calls") in _edge_set(batch.graph)
+    assert profile["files"] == 2
+    assert profile["added"] == len([op for op in ops if op.op_type == "add_node"])
+
+    sequential = DeltaGraphBridge()
+    sequential.process_change(CodeChange("lib.py", "", "def helper():\n    return 1\n"))
+    sequential.process_change(CodeChange(
+        "app.py", "", "from lib import helper\n\ndef main():\n    helper()\n"))
+    assert _edge_set(batch.graph) == _edge_set(sequential.graph)
+
+
+def test_process_changes_move_between_files():
+    """Removals run first, so a function moved across files is not lost."""
+    bridge = DeltaGraphBridge()
+    bridge.process_changes([
+        CodeChange("a.py", "", "def shared():\n    pass\n"),
+        CodeChange("c.py", "", "from b import shared\n\ndef use():\n    shared()\n"),
+    ])
+    bridge.process_changes([
+        CodeChange("b.py", "", "def shared():\n    pass\n"),
+        CodeChange("a.py", "def shared():\n    pass\n", ""),
+    ])
+    assert [n.file_path for n in bridge.graph.query(name="shared", entity_type="function")] == ["b.py"]
+    import_node = bridge.graph.query(entity_type="import", file_path="c.py")[0]
+    targets = [bridge.graph.get_node(e.target_id) for e in bridge.graph.get_outgoing_edges(import_node.id)]
+    assert [t.file_path for t in targets] == ["b.py"]
+
+
+def test_process_changes_merges_repeated_paths():
+    """Several events for one path collapse into first-old to last-new."""
+    bridge = DeltaGraphBridge()
+    _, profile = bridge.process_changes([
+        CodeChange("m.py", "", "def a():\n    pass\n"),
+        CodeChange("m.py", "def a():\n    pass\n", "def b():\n    pass\n"),
+    ])
+    assert profile["files"] == 1
+    assert {n.name for n in bridge.graph.get_nodes_by_file("m.py")} == {"b"}
+    assert bridge._file_contents["m.py"] == "def b():\n    pass\n"
+
+
+def test_process_changes_propagates_once_over_union():
+    """A dependent of several changed files is refreshed once per batch."""
+    from streamrag.v2.bounded_propagator import BoundedPropagator
+
+    bridge = DeltaGraphBridge()
+    bridge.process_change(CodeChange("a.py", "", "def fa():\n    pass\n"))
+    bridge.process_change(CodeChange("b.py", "", "def fb():\n    pass\n"))
+    bridge.process_change(CodeChange(
+        "user.py", "",
+        "from a import fa\nfrom b import fb\n\ndef run():\n    fa()\n    fb()\n"))
+    bridge._propagator = BoundedPropagator(graph=bridge.graph)
+    reparsed = []
+    bridge._refresh_dependents = lambda fp: reparsed.append(fp) or []
+
+    _, profile = bridge.process_changes([
+        CodeChange("a.py", "def fa():\n    pass\n", "def fa():\n    return 1\n"),
+        CodeChange("b.py", "def fb():\n    pass\n", "def fb():\n    return 2\n"),
+    ])
+    assert reparsed == ["user.py"]
+    assert profile["propagation"]["affected"] == 1
+    assert profile["modified"] == 2
+    assert set(profile["timings_ms"]) >= {"delta", "removals", "edges", "propagation", "total"}
+
+
+def test_process_changes_skips_non_semantic(bridge):
+    """Whitespace-only changes are cached but produce no operations."""
+    bridge.process_change(CodeChange("w.py", "", "def f():\n    pass\n"))
+    ops, profile = bridge.process_changes([
+        CodeChange("w.py", "def f():\n    pass\n", "def f():\n\n    pass\n"),
+    ])
+    assert ops == []
+    assert profile["semantic_files"] == 0
+    assert bridge._file_contents["w.py"] == "def f():\n\n    pass\n"
+
+
+# ---- entity-level propagation ----
+
+
+def _bridge_with_propagator(**config):
+    from streamrag.v2.bounded_propagator import BoundedPropagator, PropagatorConfig
+
+    bridge = DeltaGraphBridge()
+    bridge._propagator = BoundedPropagator(graph=bridge.graph, config=PropagatorConfig(**config))
+    return bridge
+
+
+def _call_targets(bridge, name):
+    node = bridge.graph.query(name=name)[0]
+    return {
+        (bridge.graph.get_node(e.target_id).file_path, bridge.graph.get_node(e.target_id).name)
+        for e in bridge.graph.get_outgoing_edges(node.id) if e.edge_type == "calls"
+    }
+
+
+def test_propagation_relinks_moved_function_without_disk():
+    """Dependents re-resolve from stored references; none of these files exist on disk."""
+    bridge = _bridge_with_propagator()
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange("user.py", "", "def run():\n    helper()\n"))
+    assert _call_targets(bridge, "run") == {("a.py", "helper")}
+
+    bridge.process_change(CodeChange("a.py", "def helper():\n    pass\n", ""))
+    assert _call_targets(bridge, "run") == set()
+    bridge.process_change(CodeChange("b.py", "", "def helper():\n    pass\n"))
+    assert _call_targets(bridge, "run") == {("b.py", "helper")}
+
+
+def test_propagation_links_callers_of_renamed_symbol():
+    bridge = _bridge_with_propagator()
+    bridge.process_change(CodeChange("a.py", "", "def old_name(x):\n    return x\n"))
+    bridge.process_change(CodeChange("user.py", "", "def run():\n    new_name(1)\n"))
+    assert _call_targets(bridge, "run") == set()
+
+    bridge.process_change(CodeChange(
+        "a.py", "def old_name(x):\n    return x\n", "def new_name(x):\n    return x\n"))
+    assert _call_targets(bridge, "run") == {("a.py", "new_name")}
+
+
+def test_propagation_queues_only_dependent_entities():
+    """Only entities that referenced the changed symbol are scheduled for refresh."""
+    bridge = _bridge_with_propagator(max_sync_updates=0)
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange(
+        "user.py", "", "def run():\n    helper()\n\ndef other():\n    return 2\n"))
+
+    bridge.process_change(CodeChange(
+        "a.py", "def helper():\n    pass\n", "def helper():\n    return 1\n"))
+    run = bridge.graph.query(name="run")[0]
+    assert bridge._pending_refresh == {"user.py": {run.id}}
+    assert bridge.drain_propagation() == ["user.py"]
+    assert bridge._pending_refresh == {}
+    assert _call_targets(bridge, "run") == {("a.py", "helper")}
+
+
+def test_deferred_file_keeps_refreshes_queued_earlier():
+    """Deferring a file drops only this propagation's ids, not those still in the async queue."""
+    bridge = _bridge_with_propagator(max_sync_updates=0, max_async_updates=1)
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange("b.py", "", "def other_helper():\n    pass\n"))
+    bridge.process_change(CodeChange(
+        "user.py", "", "def run():\n    helper()\n\ndef other():\n    other_helper()\n"))
+    bridge.process_change(CodeChange("open.py", "", "def show():\n    other_helper()\n"))
+    bridge._propagator.set_open_files({"open.py"})
+    run = bridge.graph.query(name="run")[0]
+
+    bridge.process_change(CodeChange(
+        "a.py", "def helper():\n    pass\n", "def helper():\n    return 1\n"))
+    assert bridge._pending_refresh == {"user.py": {run.id}}
+    bridge.process_change(CodeChange(
+        "b.py", "def other_helper():\n    pass\n", "def other_helper():\n    return 2\n"))
+    assert bridge._pending_refresh["user.py"] == {run.id}
+    assert sorted(bridge.drain_propagation()) == ["open.py", "user.py"]
+    assert bridge._pending_refresh == {}
+
+
+def test_clearing_async_queue_forgets_pending_refreshes():
+    bridge = _bridge_with_propagator(max_sync_updates=0)
+    bridge.process_change(CodeChange("a.py", "", "def helper():\n    pass\n"))
+    bridge.process_change(CodeChange("user.py", "", "def run():\n    helper()\n"))
+    bridge.process_change(CodeChange(
+        "a.py", "def helper():\n    pass\n", "def helper():\n    return 1\n"))
+    assert bridge._pending_refresh
+
+    bridge._propagator.clear_async_queue()
+    assert bridge._pending_refresh == {}
+
+
+def test_process_changes_attributes_dependents_to_their_source():
+    bridge = _bridge_with_propagator(max_sync_updates=0)
+    bridge.process_change(CodeChange("a.py", "", "def fa():\n    pass\n"))
+    bridge.process_change(CodeChange("b.py", "", "def fb():\n    pass\n"))
+    bridge.process_change(CodeChange("ua.py", "", "def run_a():\n    fa()\n"))
+    bridge.process_change(CodeChange("ub.py", "", "def run_b():\n    fb()\n"))
+
+    bridge.process_changes([
+        CodeChange("a.py", "def fa():\n    pass\n", "def fa():\n    return 1\n"),
+        CodeChange("b.py", "def fb():\n    pass\n", "def fb():\n    return 2\n"),
+    ])
+    queued = bridge._propagator._queued
+    assert queued["ua.py"].source_file == "a.py"
+    assert queued["ub.py"].source_file == "b.py"
@@ -305,6 +305,49 @@ class TestDaemonUnit(unittest.TestCase):
         self.daemon._maybe_auto_init()
         self.assertIs(self.daemon.bridge, bridge_before)
 
+    def test_load_warm_syncs_saved_state(self):
+        """A restarted daemon picks up files edited while it was down."""
+        from streamrag.storage.memory import _get_project_state_path, save_project_state
+
+        self.daemon._maybe_auto_init()
+        save_project_state(self.daemon.bridge, self.project_dir)
+        self.addCleanup(os.remove, _get_project_state_path(self.project_dir))
+        path = os.path.join(self.project_dir, "test_file.py")
+        st = os.stat(path)
+        with open(path, "w") as f:
+            f.write("def foo():\n    return 1\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        restarted = StreamRAGDaemon(self.project_dir)
+        bridge = restarted._ensure_bridge()
+        self.assertEqual(restarted._warm_sync_stats["changed"], 1)
+        names = {n.name for n in bridge.graph.get_nodes_by_file("test_file.py")}
+        self.assertEqual(names, {"foo"})
+        self.assertTrue(restarted._dirty)
+
+    def test_drain_refreshes_queued_dependents(self):
+        """Queued dependents are refreshed by the drain, then leave the queue."""
+        from streamrag.v2.bounded_propagator import PropagatorConfig
+
+        with open(os.path.join(self.project_dir, "user.py"), "w") as f:
+            f.write("from test_file import foo\n\ndef run():\n    foo()\n")
+        bridge = self.daemon._ensure_bridge()
+        self.daemon._maybe_auto_init()
+        bridge._propagator.config = PropagatorConfig(max_sync_updates=0)
+
+        old = bridge._file_contents.get("test_file.py", "")
+        bridge.process_change(CodeChange("test_file.py", old, old.replace("pass", "return 1", 1)))
+        self.assertEqual(bridge._propagator.async_queue_size, 1)
+
+        self.assertEqual(self.daemon._drain_propagation_slice(), ["user.py"])
+        self.assertEqual(bridge._propagator.async_queue_size, 0)
+        run = bridge.graph.query(name="run", file_path="user.py")[0]
+        self.assertIn("calls", {e.edge_type for e in bridge.graph.get_outgoing_edges(run.id)})
+        stats = self.daemon.handle_ping({})["propagation_queue"]
+        self.assertEqual(stats["processed"], 1)
+        self.assertEqual(stats["drain_slices"], 1)
+        self.assertEqual(self.daemon._drain_propagation_slice(), [])
+
     def test_save_if_dirty(self):
         """_save_if_dirty only saves when dirty."""
         self.daemon._ensure_bridge()
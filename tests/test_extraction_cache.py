@@ -0,0 +1,147 @@
+"""Tests for the content-addressed on-disk extraction cache."""
+
+import os
+import pickle
+import shutil
+import time
+
+from streamrag import extraction_cache
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.extraction_cache import ExtractionCache, default_extraction_cache
+from streamrag.indexer import index_project
+from streamrag.languages.registry import create_default_registry
+from streamrag.models import CodeChange
+from streamrag.storage.memory import serialize_graph
+
+PY = (
+    "import os\n"
+    "from app import Service\n\n"
+    "class Worker(Service):\n"
+    "    def run(self, x: int) -> int:\n"
+    "        return os.path.join(x)\n"
+)
+RS = "use std::io;\n\nfn main() {\n    helper(1);\n}\n"
+
+
+def _files(root):
+    return sorted(
+        os.path.join(d, f) for d, _, names in os.walk(root) for f in names
+        if not f.startswith(".")
+    )
+
+
+def test_roundtrip_returns_equal_fresh_entities(tmp_path):
+    registry = create_default_registry()
+    cache = ExtractionCache(str(tmp_path))
+    for path, source in (("a.py", PY), ("a.rs", RS)):
+        ext = registry.get_extractor(path)
+        entities = ext.extract(source, path)
+        assert cache.get(ext, source) is None
+        cache.put(ext, source, entities)
+        first = cache.get(ext, source)
+        assert first == entities
+        assert first[0] is not cache.get(ext, source)[0]
+        assert all(isinstance(i, tuple) for e in first for i in e.imports)
+    assert cache.stats()["hits"] == 4
+    assert cache.stats()["misses"] == 2
+    assert not [f for f in os.listdir(tmp_path) if f.startswith(".tmp-")]
+
+
+def test_key_covers_extractor_content_and_code_version(tmp_path, monkeypatch):
+    registry = create_default_registry()
+    py, ts = registry.get_extractor("a.py"), registry.get_extractor("a.ts")
+    cache = ExtractionCache(str(tmp_path))
+    cache.put(py, PY, py.extract(PY))
+    assert cache.get(ts, PY) is None
+    assert cache.get(py, PY + "\n") is None
+    assert cache.get(py, PY) is not None
+    monkeypatch.setattr(extraction_cache, "_code_fingerprint", "other-version")
+    assert cache.get(py, PY) is None
+
+
+def test_corrupt_entry_is_a_miss_and_removed(tmp_path):
+    ext = create_default_registry().get_extractor("a.py")
+    cache = ExtractionCache(str(tmp_path))
+    cache.put(ext, PY, ext.extract(PY))
+    (path,) = _files(str(tmp_path))
+    with open(path, "wb") as f:
+        f.write(b"not zlib")
+    assert cache.get(ext, PY) is None
+    assert not os.path.exists(path)
+
+
+def test_prune_evicts_least_recently_used(tmp_path):
+    ext = create_default_registry().get_extractor("a.py")
+    cache = ExtractionCache(str(tmp_path), max_bytes=10 ** 9)
+    sources = [PY.replace("Worker", f"Worker{i}") for i in range(6)]
+    for source in sources:
+        cache.put(ext, source, ext.extract(source))
+    now = time.time()
+    for age, source in enumerate(reversed(sources)):
+        path = cache._path(cache.key(ext, source))
+        os.utime(path, (now - 10 * age, now - 10 * age))
+    size = os.path.getsize(cache._path(cache.key(ext, sources[0])))
+    cache.max_bytes = size * 4
+    removed = cache.prune()
+    assert removed >= 2
+    # Oldest go first; the newest entries survive
+    assert cache.get(ext, sources[0]) is None
+    assert cache.get(ext, sources[-1]) is not None
+    assert sum(os.path.getsize(p) for p in _files(str(tmp_path))) <= cache.max_bytes
+
+
+def test_second_worktree_indexes_from_cache(tmp_path):
+    first = tmp_path / "repo"
+    for i in range(5):
+        (first / "pkg").mkdir(parents=True, exist_ok=True)
+        (first / "pkg" / f"m{i}.py").write_text(f"from pkg.m0 import f0\n\ndef f{i}():\n    return f0()\n")
+    (first / "main.rs").write_text(RS)
+    second = tmp_path / "worktree"
+    shutil.copytree(first, second)
+
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    cold = DeltaGraphBridge(extraction_cache=cache)
+    assert index_project(cold, str(first), workers=1, extraction_cache=cache) == 6
+    assert cache.hits == 0 and cache.writes == 6
+
+    warm = DeltaGraphBridge(extraction_cache=cache)
+    assert index_project(warm, str(second), workers=1, extraction_cache=cache) == 6
+    assert cache.hits == 6 and cache.writes == 6
+
+    plain = DeltaGraphBridge()
+    index_project(plain, str(second), workers=1)
+    assert serialize_graph(warm)["nodes"] == serialize_graph(plain)["nodes"]
+    assert serialize_graph(warm)["edges"] == serialize_graph(plain)["edges"]
+
+
+def test_bridge_uses_cache_for_batches_only(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cached = DeltaGraphBridge(extraction_cache=cache)
+    plain = DeltaGraphBridge()
+    edited = PY.replace("return os.path.join(x)", "return os.path.join(x, x)")
+    for bridge in (cached, plain):
+        bridge.process_change(CodeChange(file_path="w.py", old_content="", new_content=PY))
+    # Single edits (the keystroke path) never touch the disk
+    assert (cache.hits, cache.misses, cache.writes) == (0, 0, 0)
+    for bridge in (cached, plain):
+        bridge.process_changes([CodeChange(file_path="w.py", old_content=PY, new_content=edited)])
+        bridge.process_changes([CodeChange(file_path="w.py", old_content=edited, new_content=PY)])
+    assert serialize_graph(cached)["nodes"] == serialize_graph(plain)["nodes"]
+    assert cache.writes >= 1 and cache.hits >= 1
+
+
+def test_default_cache_location_and_opt_out(tmp_path, monkeypatch):
+    monkeypatch.setenv("STREAMRAG_EXTRACTION_CACHE_DIR", str(tmp_path))
+    assert default_extraction_cache().root == str(tmp_path)
+    monkeypatch.delenv("STREAMRAG_EXTRACTION_CACHE_DIR")
+    assert default_extraction_cache().root == os.path.expanduser(
+        "~/.claude/streamrag/extraction_cache")
+    monkeypatch.setenv("STREAMRAG_EXTRACTION_CACHE", "0")
+    assert default_extraction_cache() is None
+
+
+def test_pickles_settings_only(tmp_path):
+    cache = ExtractionCache(str(tmp_path), max_bytes=1234)
+    cache.hits = 5
+    clone = pickle.loads(pickle.dumps(cache))
+    assert (clone.root, clone.max_bytes, clone.hits) == (str(tmp_path), 1234, 0)
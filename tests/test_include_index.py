@@ -0,0 +1,99 @@
+"""Tests for the C/C++ include-path index."""
+
+import os
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.include_index import IncludeIndex, default_include_roots
+from streamrag.models import CodeChange
+from streamrag.storage.memory import deserialize_graph, serialize_graph
+
+UTIL_H = "int helper(int x) {\n    return x + 1;\n}\n"
+OTHER_H = "int helper(int x) {\n    return x - 1;\n}\n"
+MAIN_C = '#include "core/util.h"\n#include <stdio.h>\n\nint main(void) {\n    return helper(1);\n}\n'
+
+
+def _add(bridge, path, content):
+    bridge.process_change(CodeChange(file_path=path, old_content="", new_content=content))
+
+
+def _call_target(bridge, path, caller):
+    node = next(n for n in bridge.graph.get_nodes_by_file(path) if n.name == caller)
+    edges = [e for e in bridge.graph.get_outgoing_edges(node.id) if e.edge_type == "calls"]
+    return [(bridge.graph.get_node(e.target_id).file_path, e.properties["confidence"]) for e in edges]
+
+
+def test_resolution_order():
+    index = IncludeIndex(include_roots=["include"])
+    for path in ("src/util.h", "include/util.h", "lib/core/util.h", "src/main.c"):
+        index.add_file(path)
+    assert index.resolve("util.h", "src/main.c", local=True) == "src/util.h"
+    assert index.resolve("util.h", "src/main.c", local=False) == "include/util.h"
+    assert index.resolve("core/util.h", "src/main.c") == "lib/core/util.h"
+    assert index.resolve("../lib/core/util.h", "src/main.c") == "lib/core/util.h"
+    assert index.resolve("stdio.h", "src/main.c", local=False) is None
+
+
+def test_ambiguous_suffix_prefers_nearest_directory():
+    index = IncludeIndex(include_roots=[])
+    for path in ("a/x/util.h", "b/y/util.h"):
+        index.add_file(path)
+    assert index.resolve("util.h", "b/y/z/main.c", local=False) == "b/y/util.h"
+    assert index.resolve("util.h", "a/main.c", local=False) == "a/x/util.h"
+
+
+def test_includers_follow_header_add_and_remove():
+    index = IncludeIndex(include_roots=[])
+    index.add_file("src/main.c")
+    assert index.set_includes("src/main.c", [("util.h", True)]) == set()
+    index.add_file("lib/util.h")  # Indexed after its includer
+    assert index.includes("src/main.c") == {"lib/util.h"}
+    assert index.includers("lib/util.h") == {"src/main.c"}
+    index.add_file("src/util.h")  # Same directory wins for a quoted include
+    assert index.includers("src/util.h") == {"src/main.c"}
+    assert index.includers("lib/util.h") == set()
+    index.remove_file("src/util.h")
+    assert index.includes("src/main.c") == {"lib/util.h"}
+    index.remove_file("src/main.c")
+    assert index.includers("lib/util.h") == set()
+    assert index.stats()["includes"] == 0
+
+
+def test_bridge_prefers_included_header_for_calls():
+    bridge = DeltaGraphBridge()
+    _add(bridge, "src/helper.h", OTHER_H)
+    _add(bridge, "src/core/util.h", UTIL_H)
+    _add(bridge, "src/main.c", MAIN_C)
+    assert _call_target(bridge, "src/main.c", "main") == [("src/core/util.h", "high")]
+    assert bridge._include_index.includes("src/main.c") == {"src/core/util.h"}
+
+
+def test_header_change_fans_out_to_includers():
+    bridge = DeltaGraphBridge()
+    _add(bridge, "src/core/util.h", UTIL_H)
+    _add(bridge, "src/core/api.h", '#include "util.h"\n\nint api(void);\n')
+    _add(bridge, "src/main.c", '#include "core/api.h"\n\nint main(void) {\n    return 0;\n}\n')
+    affected = bridge.get_affected_files("src/core/util.h", "helper")
+    assert {"src/core/api.h", "src/main.c"} <= set(affected)
+    assert "src/main.c" not in bridge.get_affected_files("src/core/util.h", "helper", max_depth=1)
+
+    bridge.remove_file("src/core/api.h")
+    assert bridge._include_index.includers("src/core/util.h") == set()
+
+
+def test_index_rebuilt_after_load_and_snapshot():
+    bridge = DeltaGraphBridge()
+    _add(bridge, "src/core/util.h", UTIL_H)
+    _add(bridge, "src/main.c", MAIN_C)
+    loaded = deserialize_graph(serialize_graph(bridge))
+    assert loaded._include_index.includers("src/core/util.h") == {"src/main.c"}
+    snap = bridge.snapshot()
+    bridge.remove_file("src/main.c")
+    assert snap._include_index.includers("src/core/util.h") == {"src/main.c"}
+
+
+def test_default_include_roots(monkeypatch):
+    monkeypatch.setenv("STREAMRAG_INCLUDE_PATHS", "include" + os.pathsep + "src")
+    assert default_include_roots() == ["include", "src"]
+    assert IncludeIndex().include_roots == ["include", "src"]
+    monkeypatch.delenv("STREAMRAG_INCLUDE_PATHS")
+    assert default_include_roots() == []
@@ -0,0 +1,166 @@
+"""Tests for incremental Python re-extraction."""
+
+import pathlib
+import random
+
+from streamrag.extractor import ASTExtractor
+from streamrag.incremental_extractor import IncrementalExtractor
+from streamrag.languages.python import PythonExtractor
+
+BASE = (
+    "import os\n"
+    "from app import Service\n"
+    "\n"
+    "client = Service()\n"
+    "\n"
+    "def first(a):\n"
+    "    return helper(a)\n"
+    "\n"
+    "\n"
+    "@register\n"
+    "def second(b):\n"
+    "    client.send(b)\n"
+    "    return os.path.join(b)\n"
+    "\n"
+    "class Third:\n"
+    "    def method(self):\n"
+    "        self.other()\n"
+    "\n"
+    "setup()\n"
+)
+
+
+def _check(inc, source):
+    got = inc.extract(source, "mod.py")
+    assert got == ASTExtractor().extract(source)
+    return got
+
+
+def test_first_extract_is_full():
+    """A file seen for the first time gets a full parse."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    assert inc.stats()["full"] == 1
+
+
+def test_same_source_reuses_entities():
+    """Re-extracting identical content returns equal but fresh entities."""
+    inc = IncrementalExtractor()
+    first = _check(inc, BASE)
+    second = _check(inc, BASE)
+    assert inc.stats()["reused"] == 1
+    assert all(a is not b for a, b in zip(first, second))
+
+
+def test_body_edit_reparses_one_block():
+    """Editing one function body re-parses only that top-level statement."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    _check(inc, BASE.replace("return helper(a)", "return helper(a) + 1"))
+    stats = inc.stats()
+    assert stats["incremental"] == 1
+    assert stats["blocks_reparsed"] == 1
+
+
+def test_inserted_lines_shift_later_entities():
+    """Blocks after the edit are reused with shifted line numbers."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    entities = _check(inc, BASE.replace("    return helper(a)\n", "    a += 1\n    a += 2\n    return helper(a)\n"))
+    third = [e for e in entities if e.name == "Third"][0]
+    assert third.line_start == 17
+    assert inc.stats()["incremental"] == 1
+
+
+def test_decorator_edit_includes_decorated_block():
+    """A decorator line belongs to the block of the def it decorates."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    _check(inc, BASE.replace("@register\n", "@register_v2\n"))
+    assert inc.stats()["incremental"] == 1
+
+
+def test_import_change_falls_back_to_full():
+    """New stdlib imports change call filtering everywhere: full parse."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    _check(inc, BASE.replace("def first(a):\n", "import helper, json\ndef first(a):\n"))
+    assert inc.stats()["full"] == 2
+
+
+def test_module_type_context_change_falls_back_to_full():
+    """Rebinding a module-level typed variable re-extracts everything."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    _check(inc, BASE.replace("client = Service()", "client = Other()"))
+    assert inc.stats()["full"] == 2
+
+
+def test_untrusted_boundary_falls_back_to_full():
+    """Indenting a def into the previous block cannot be parsed in isolation."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    _check(inc, BASE.replace("\n\n@register\ndef second", "\n\n    @register\n    def second"))
+    assert inc.stats()["incremental"] == 0
+
+
+def test_syntax_error_keeps_last_good_version():
+    """Broken content yields no entities; the next fix diffs against the last good parse."""
+    inc = IncrementalExtractor()
+    _check(inc, BASE)
+    assert inc.extract(BASE.replace("def first(a):", "def first(a:"), "mod.py") == []
+    _check(inc, BASE.replace("helper(a)", "helper(a, 2)"))
+    assert inc.stats()["incremental"] == 1
+
+
+def test_statements_sharing_a_line():
+    """`a = 1; b = 2` statements are re-parsed together."""
+    inc = IncrementalExtractor()
+    source = BASE + "a = 1; b = 2\n"
+    _check(inc, source)
+    _check(inc, source.replace("b = 2", "b = 3"))
+
+
+def test_lines_are_split_where_ast_counts_them():
+    """Form feeds, \x1c-\x1e, \x85 and \u2028/\u2029 are not line breaks to ast."""
+    inc = IncrementalExtractor()
+    source = BASE.replace("\n\n\n@register", "\n\x0c\n\n@register") + 's = "a\x1cb\u2028c"  # \x85\n'
+    _check(inc, source)
+    zz = _check(inc, source + "def zz():\n    pass\n")
+    assert [(e.line_start, e.line_end) for e in zz if e.name == "zz"] == [(21, 22)]
+
+
+def test_python_extractor_uses_incremental_with_path():
+    """PythonExtractor goes incremental only when given a file path."""
+    ext = PythonExtractor()
+    assert ext.extract(BASE, "mod.py") == ext.extract(BASE)
+    assert PythonExtractor(incremental=False).extract(BASE, "mod.py") == ext.extract(BASE)
+
+
+def test_random_edits_match_full_extraction():
+    """Differential check over single-line edits of the package's own modules."""
+    rng = random.Random(7)
+    edits = [
+        lambda line: line.replace("self", "that", 1),
+        lambda line: line.replace("return", "return not", 1),
+        lambda line: "",
+        lambda line: "\n" + line,
+        lambda line: line.replace("(", "(1, ", 1),
+        lambda line: "x = Foo()\n" + line,
+        lambda line: "\x0c\n" + line,
+        lambda line: line.replace("(", "('\x1c\x1d\x1e\x85', ", 1),
+        lambda line: "# \u2028 \u2029\n" + line,
+    ]
+    root = pathlib.Path(__file__).resolve().parent.parent / "streamrag"
+    for path in sorted(root.glob("*.py")):
+        inc = IncrementalExtractor()
+        current = path.read_text()
+        inc.extract(current, "mod.py")
+        for _ in range(5):
+            lines = current.splitlines(keepends=True)
+            index = rng.randrange(len(lines))
+            lines[index] = rng.choice(edits)(lines[index])
+            source = "".join(lines)
+            assert inc.extract(source, "mod.py") == ASTExtractor().extract(source), (path, index)
+            if ASTExtractor().extract(source):
+                current = source
@@ -285,15 +285,17 @@ def test_extract_static_import(ext):
 def test_wildcard_import(ext):
     code = (
         "import java.util.*;\n"
+        "import java.io.*;\n"
         "\n"
         "public class Main {\n"
         "}\n"
     )
     entities = ext.extract(code, "Main.java")
     imports = [e for e in entities if e.entity_type == "import"]
-    assert len(imports) == 1
-    assert imports[0].name == "*"
-    assert imports[0].imports[0][0] == "java.util"
+    assert len(imports) == 2
+    assert imports[0].name == "java.util.*"
+    assert imports[0].imports == [("java.util", "*")]
+    assert imports[1].imports == [("java.io", "*")]
 
 
 # ── 13. Annotation extraction as decorators ──────────────────────────────
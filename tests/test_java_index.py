@@ -0,0 +1,96 @@
+"""Tests for the Java package / fully-qualified-name index."""
+
+from streamrag.bridge import DeltaGraphBridge
+from streamrag.java_index import JavaPackageIndex
+from streamrag.models import CodeChange
+from streamrag.storage.memory import deserialize_graph, serialize_graph
+
+MONEY = "package com.acme.core;\n\npublic class Money {\n    public static Money zero() {\n        return null;\n    }\n}\n"
+OTHER_MONEY = "package com.acme.legacy;\n\npublic class Money {\n    int cents;\n}\n"
+BASE = "package com.acme.billing;\n\npublic class BaseService {\n    int id;\n}\n"
+UTIL = "package com.acme.util;\n\npublic class Clock {\n    int now;\n}\n"
+FORMAT = "package com.acme.util;\n\npublic class Format {\n    int width;\n}\n"
+SERVICE = (
+    "package com.acme.billing;\n\n"
+    "import com.acme.core.Money;\n"
+    "import com.acme.util.*;\n"
+    "import static com.acme.core.Money.zero;\n\n"
+    "public class InvoiceService extends BaseService {\n"
+    "    public Money total() {\n"
+    "        return Money.zero();\n"
+    "    }\n"
+    "}\n"
+)
+
+
+def _bridge(*files):
+    bridge = DeltaGraphBridge()
+    for path, content in files:
+        bridge.process_change(CodeChange(file_path=path, old_content="", new_content=content))
+    return bridge
+
+
+def _targets(bridge, path, name, edge_type):
+    node = next(n for n in bridge.graph.get_nodes_by_file(path) if n.name == name)
+    return sorted((bridge.graph.get_node(e.target_id).file_path, bridge.graph.get_node(e.target_id).name)
+                  for e in bridge.graph.get_outgoing_edges(node.id) if e.edge_type == edge_type)
+
+
+def test_resolve_type_follows_java_scope_rules():
+    index = JavaPackageIndex()
+    index.set_file("core/Money.java", "com.acme.core", ["Money"])
+    index.set_file("legacy/Money.java", "com.acme.legacy", ["Money"])
+    index.set_file("billing/Invoice.java", "com.acme.billing", ["Invoice", "Invoice.Line"])
+    index.set_file("billing/Service.java", "com.acme.billing", ["Service"])
+    index.set_file("util/Clock.java", "com.acme.util", ["Clock"])
+    index.set_imports("billing/Service.java", [("com.acme.legacy", "Money"), ("com.acme.util", "*")])
+
+    assert index.resolve_type("Money", "billing/Service.java") == ("legacy/Money.java", "Money")
+    assert index.resolve_type("Invoice", "billing/Service.java") == ("billing/Invoice.java", "Invoice")
+    assert index.resolve_type("Invoice.Line", "billing/Service.java") == ("billing/Invoice.java", "Invoice.Line")
+    assert index.resolve_type("Clock", "billing/Service.java") == ("util/Clock.java", "Clock")
+    assert index.resolve_type("com.acme.core.Money", "billing/Service.java") == ("core/Money.java", "Money")
+    assert index.resolve_type("Clock", "billing/Invoice.java") is None
+    assert index.on_demand_members("com.acme.billing.Invoice") == {"Line": ("billing/Invoice.java", "Invoice.Line")}
+
+    index.remove_file("util/Clock.java")
+    assert index.on_demand_members("com.acme.util") == {}
+    assert index.stats() == {"files": 4, "packages": 3, "types": 5}
+
+
+def test_bridge_resolves_imports_by_fully_qualified_name():
+    bridge = _bridge(("core/Money.java", MONEY), ("legacy/Money.java", OTHER_MONEY),
+                     ("billing/BaseService.java", BASE), ("billing/InvoiceService.java", SERVICE))
+    path = "billing/InvoiceService.java"
+    assert _targets(bridge, path, "Money", "imports") == [("core/Money.java", "Money")]
+    assert [f for f, _ in _targets(bridge, path, "zero", "imports")] == ["core/Money.java"]
+    # Same package: no import needed
+    assert _targets(bridge, path, "InvoiceService", "inherits") == [("billing/BaseService.java", "BaseService")]
+
+
+def test_wildcard_import_expands_from_package_members():
+    bridge = _bridge(("util/Clock.java", UTIL), ("core/Money.java", MONEY),
+                     ("billing/InvoiceService.java", SERVICE))
+    path = "billing/InvoiceService.java"
+    assert _targets(bridge, path, "com.acme.util.*", "imports") == [("util/Clock.java", "Clock")]
+    # The member map follows types added to the package
+    bridge.process_change(CodeChange(file_path="util/Format.java", old_content="", new_content=FORMAT))
+    assert bridge._java_index.on_demand_members("com.acme.util") == {
+        "Clock": ("util/Clock.java", "Clock"), "Format": ("util/Format.java", "Format")}
+
+
+def test_index_follows_package_change_remove_and_load():
+    bridge = _bridge(("core/Money.java", MONEY), ("billing/InvoiceService.java", SERVICE))
+    moved = MONEY.replace("com.acme.core", "com.acme.money")
+    bridge.process_change(CodeChange(file_path="core/Money.java", old_content=MONEY, new_content=moved))
+    assert bridge._java_index.lookup("com.acme.core.Money") is None
+    assert bridge._java_index.lookup("com.acme.money.Money") == ("core/Money.java", "Money")
+
+    snap = bridge.snapshot()
+    loaded = deserialize_graph(serialize_graph(bridge))
+    bridge.remove_file("core/Money.java")
+    assert bridge._java_index.lookup("com.acme.money.Money") is None
+    assert snap._java_index.lookup("com.acme.money.Money") == ("core/Money.java", "Money")
+    assert loaded._java_index.resolve_type("Money", "billing/InvoiceService.java") is None
+    assert loaded._java_index.resolve_type("InvoiceService", "billing/InvoiceService.java") == (
+        "billing/InvoiceService.java", "InvoiceService")
@@ -73,3 +73,69 @@ def test_language_extractor_abc():
     """Cannot instantiate LanguageExtractor directly."""
     with pytest.raises(TypeError):
         LanguageExtractor()
+
+
+def test_default_registry_table_matches_extractors():
+    """The lazy table routes exactly what each extractor says it handles."""
+    import importlib
+    from streamrag.languages.registry import _BUILTIN_EXTRACTORS
+
+    for language_id, module, class_name, extensions in _BUILTIN_EXTRACTORS:
+        extractor = getattr(importlib.import_module(module), class_name)()
+        assert extractor.language_id == language_id
+        assert list(extensions) == extractor.supported_extensions
+
+
+def test_default_registry_loads_languages_on_first_use():
+    registry = create_default_registry()
+    assert registry.loaded_languages == []
+    assert registry.can_handle("lib.rs") is True
+    assert registry.loaded_languages == []  # Answered from the suffix alone
+    rust = registry.get_extractor("src/lib.rs")
+    assert rust.language_id == "rust"
+    assert registry.get_extractor("main.rs") is rust
+    assert registry.loaded_languages == ["rust"]
+    assert registry.get_extractor("a.test.tsx").language_id == "typescript"
+    assert registry.get_extractor("bundle.mjs").language_id == "javascript"
+    assert registry.get_extractor("include/x.h").language_id == "cpp"
+    assert registry.get_extractor("dir.py/README") is None
+    assert registry.loaded_languages == ["rust", "typescript", "javascript", "cpp"]
+    assert registry.supported_languages == [
+        "python", "typescript", "javascript", "rust", "cpp", "c", "java"]
+
+
+def test_default_registry_imports_no_language_module_up_front():
+    import os
+    import subprocess
+    import sys
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = (
+        "import sys\n"
+        "from streamrag.languages.registry import create_default_registry\n"
+        "r = create_default_registry()\n"
+        "assert r.can_handle('a.java') and not r.can_handle('a.go')\n"
+        "r.get_extractor('a.c')\n"
+        "print(sorted(m for m in sys.modules if m.startswith('streamrag.languages.')))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=root, check=True).stdout
+    assert "streamrag.languages.c'" in out
+    for name in ("python", "typescript", "javascript", "rust", "cpp", "java"):
+        assert f"streamrag.languages.{name}'" not in out
+
+
+def test_registry_compound_extension():
+    class DeclarationExtractor(PythonExtractor):
+        @property
+        def language_id(self):
+            return "dts"
+
+        @property
+        def supported_extensions(self):
+            return [".d.ts"]
+
+    registry = create_default_registry()
+    registry.register(DeclarationExtractor())
+    assert registry.get_extractor("types/index.d.ts").language_id == "dts"
+    assert registry.get_extractor("index.ts").language_id == "typescript"
@@ -0,0 +1,139 @@
+"""Tests for the comment/string lexer behind RegexExtractor stripping."""
+
+import random
+import re
+
+from streamrag.languages.lexer import (
+    C_GRAMMAR, COMMENT, CPP_GRAMMAR, DEFAULT_GRAMMAR, JAVA_GRAMMAR, RUST_GRAMMAR,
+    STRING, lex,
+)
+from streamrag.languages.registry import create_default_registry
+
+# The alternation regexes the lexer replaced; it must agree with them exactly
+REFERENCE = {
+    "default": (DEFAULT_GRAMMAR, re.compile(
+        r'''(?://[^\n]*|/\*[\s\S]*?\*/|\'\'\'[\s\S]*?\'\'\'|"""[\s\S]*?"""'''
+        r'''|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`)''')),
+    "c": (C_GRAMMAR, re.compile(
+        r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")''')),
+    "cpp": (CPP_GRAMMAR, re.compile(
+        r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"'''
+        r'''|R"([^(]*)\([\s\S]*?\)\1")''')),
+    "java": (JAVA_GRAMMAR, re.compile(
+        r'''(?://[^\n]*|/\*[\s\S]*?\*/|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"'''
+        r'''|"""[\s\S]*?""")''')),
+    "rust": (RUST_GRAMMAR, re.compile(
+        r'''(?://[^\n]*|/\*[\s\S]*?\*/|r#+"[\s\S]*?"#+\s|r"[^"]*"'''
+        r'''|b?'(?:[^'\\]|\\.)*'|b?"(?:[^"\\]|\\.)*")''')),
+}
+
+_PIECES = list("/*'\"`\\\n rRb#()x\t") + [
+    "//", "/*", "*/", "'''", '"""', 'R"(', ')"', 'r#"', '"# ', "\\\n", "b'", "ab",
+]
+
+
+def _reference(pattern, source):
+    text = pattern.sub(lambda m: re.sub(r'[^\n]', ' ', m.group(0)), source)
+    return text, [m.span() for m in pattern.finditer(source)]
+
+
+def _check(name, source):
+    grammar, pattern = REFERENCE[name]
+    result = lex(source, grammar)
+    assert (result.text, [t[:2] for t in result.tokens]) == _reference(pattern, source), \
+        (name, source)
+
+
+def test_matches_reference_regex_on_random_fragments():
+    rng = random.Random(40)
+    for name in REFERENCE:
+        for _ in range(3000):
+            source = "".join(rng.choice(_PIECES) for _ in range(rng.randint(0, 24)))
+            _check(name, source)
+
+
+def test_matches_reference_regex_on_edge_cases():
+    cases = [
+        "",
+        "no tokens at all",
+        'a = "unterminated',
+        'a = "esc \\" still open',
+        'x = "line \\\ncontinued" + "next"',
+        "/* never closed\nint a;",
+        "x /* a */ y /* b",
+        "s = '''doc\nstring''' + 'x'",
+        "t = '''open\n'x'",
+        'j = """text\nblock"""',
+        'R"d(raw ) d" )d" R"(x)"',
+        'R"( no close',
+        'let s = r#"a "# b"# ; r"x" b\'c\' br"y"',
+        "fn f<'a>(x: &'a str) -> &'a str {}",
+        "`tpl ${a} \\` more` // tail",
+        '"a\\\\" b "c"',
+    ]
+    for name in REFERENCE:
+        for source in cases:
+            _check(name, source)
+
+
+def test_preserves_length_and_newlines():
+    source = 'int a; /* one\ntwo */ char *s = "x\\ny";\n// end\n'
+    text = lex(source, C_GRAMMAR).text
+    assert len(text) == len(source)
+    assert [i for i, c in enumerate(text) if c == "\n"] == \
+        [i for i, c in enumerate(source) if c == "\n"]
+    assert text.split("\n")[0] == "int a; " + " " * 6
+
+
+def test_token_spans_and_kinds():
+    source = 'a = "s"; // c\nb = `t`; /* d */'
+    result = lex(source)
+    assert [(source[s:e], kind) for s, e, kind in result.tokens] == [
+        ('"s"', STRING), ("// c", COMMENT), ("`t`", STRING), ("/* d */", COMMENT),
+    ]
+
+
+def test_prefixed_tokens_start_at_prefix():
+    source = 'let a = br"x"; let b = r##"y"## ;'
+    result = lex(source, RUST_GRAMMAR)
+    assert [source[s:e] for s, e, _ in result.tokens] == ['r"x"', 'r##"y"## ']
+    cpp = 'auto s = R"sql(SELECT ")" )sql";'
+    spans = lex(cpp, CPP_GRAMMAR).tokens
+    assert [cpp[s:e] for s, e, _ in spans] == ['R"sql(SELECT ")" )sql"']
+
+
+def test_adversarial_inputs_match_reference():
+    # Inputs that send the alternation regexes quadratic (kept small here)
+    inputs = [
+        '"' + '\\"' * 300,
+        "x /* y\n" * 300,
+        'R"(' * 300,
+        "'''\n" * 301,
+        "r#\"" * 300,
+    ]
+    for name in REFERENCE:
+        for source in inputs:
+            _check(name, source)
+
+
+def test_adversarial_inputs_scale_linearly():
+    # Each of these took tens of seconds with the regexes at this size
+    for source, grammar in (
+        ('"' + '\\"' * 200000, C_GRAMMAR),
+        ("x /* y\n" * 50000, DEFAULT_GRAMMAR),
+        ('R"(' * 100000, CPP_GRAMMAR),
+    ):
+        result = lex(source, grammar)
+        assert len(result.text) == len(source)
+
+
+def test_extractors_use_their_grammar():
+    registry = create_default_registry()
+    source = 'x = `a` + R"(b)" + r"c";'
+    expected = {
+        "a.ts": DEFAULT_GRAMMAR, "a.js": DEFAULT_GRAMMAR, "a.c": C_GRAMMAR,
+        "a.cpp": CPP_GRAMMAR, "A.java": JAVA_GRAMMAR, "a.rs": RUST_GRAMMAR,
+    }
+    for path, grammar in expected.items():
+        ext = registry.get_extractor(path)
+        assert ext._strip_comments_and_strings(source) == lex(source, grammar).text
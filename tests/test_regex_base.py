@@ -326,3 +326,179 @@ def test_decorators_stop_at_non_decorator_line():
     widget = [e for e in entities if e.name == "Widget"]
     assert len(widget) == 1
     assert widget[0].decorators == ["Component"]
+
+
+# ---------------------------------------------------------------------------
+# 13. Line numbering (_line_offsets, _line_at)
+# ---------------------------------------------------------------------------
+
+def test_line_at_matches_newline_count():
+    from streamrag.languages.regex_base import _line_at, _line_offsets
+    text = "a\n\nbc\r\nd\n\n"
+    offsets = _line_offsets(text.split("\n"))
+    for pos in range(len(text) + 1):
+        assert _line_at(offsets, pos) == text[:pos].count("\n") + 1
+
+
+def test_line_numbers_after_multiline_comment():
+    ext = _make_extractor()
+    source = (
+        "import { A } from './a';\n"
+        "/* one\n"
+        "   two\n"
+        "*/\n"
+        "function late() {\n"
+        "  return 1;\n"
+        "}\n"
+    )
+    entities = ext.extract(source, "test.ts")
+    late = [e for e in entities if e.name == "late"][0]
+    assert (late.line_start, late.line_end) == (5, 7)
+    assert [e.line_start for e in entities if e.entity_type == "import"] == [1]
+
+
+def test_imports_inside_comments_and_strings_are_skipped():
+    from streamrag.languages.registry import create_default_registry
+    registry = create_default_registry()
+    ts = (
+        "import { A } from './a';\n"
+        "// import { B } from './b';\n"
+        "/*\n"
+        "import { C } from './c';\n"
+        "*/\n"
+        "const doc = `\n"
+        "import { D } from './d';\n"
+        "`;\n"
+    )
+    rs = "use crate::a::A;\n// use crate::b::B;\nconst S: &str = \"\nuse crate::c::C;\n\";\n"
+    java = "package p;\nimport a.A;\n/* import b.B; */\n"
+    for path, source, expected in (("t.ts", ts, ["A"]), ("t.rs", rs, ["A"]), ("T.java", java, ["A"])):
+        entities = registry.get_extractor(path).extract(source, path)
+        assert [e.name for e in entities if e.entity_type == "import"] == expected, path
+
+
+# ---------------------------------------------------------------------------
+# 14. Brace map (_body_end_map)
+# ---------------------------------------------------------------------------
+
+def test_body_end_map_nested_declarations():
+    ext = _make_extractor()
+    lines = [
+        "class A {",        # 0
+        "  m() {",          # 1
+        "    if (x) { y }",  # 2
+        "  }",              # 3
+        "}",                # 4
+        "function f() {",   # 5
+        "}",                # 6
+    ]
+    assert ext._body_end_map(lines) == [4, 3, 2, 6, 6, 6, 6]
+
+
+def test_body_end_map_skips_stray_close_before_open():
+    """A '}' before the declaration's own '{' no longer drags the body to EOF."""
+    ext = _make_extractor()
+    lines = ["} else {", "  go()", "}", "", "function g() {", "}", ""]
+    assert ext._find_body_end(lines, 0) == 2
+
+
+def test_body_end_map_unclosed_brace_runs_to_last_line():
+    ext = _make_extractor()
+    lines = ["function f() {", "  x()", "function g() {", "}"]
+    assert ext._body_end_map(lines)[0] == 3
+
+
+# ---------------------------------------------------------------------------
+# 15. Anchored scanning (_scan) — differential against finditer
+# ---------------------------------------------------------------------------
+
+_SCAN_CORPUS = """
+import { A, B } from './a';
+import * as util from "util";
+const x = require('x');
+export default async function* gen<T>(a: T) { return a; }
+export abstract class Base<T> extends Root implements I { m() {} }
+class subclassOfNothing {}  // "subclass" contains "class"
+exporter.exported = 1; defaultValue(); classify(x);
+export const enum Color { Red }
+export type Alias<T> = T[];
+interface Shape extends Base { area(): number; }
+pub(crate) async unsafe fn run<'a>(x: &'a str) -> u8 { 0 }
+pub fn plain() {}
+pub(super) struct Point<T> { x: T }
+impl<T> Display for Point<T> { fn fmt(&self) {} }
+macro_rules! my_macro { () => {} }
+pub const LIMIT: usize = 3; static COUNTER: u32 = 0;
+use std::collections::{HashMap, HashSet};
+template<typename T> class Box final : public Base<T> { };
+typedef struct node { int v; } node_t;
+namespace ns { enum class Mode : int { A }; }
+using Alias = std::vector<int>;
+#include <stdio.h>
+#include "local.h"
+static int first(int a) { return a; } int second(int b) { return b; }
+Widget::Widget(int x) : x_(x) {
+}
+public final class Service extends Base implements Runnable {
+    @interface Marker {}
+    non-sealed interface Api {}
+    record Pair(int a, int b) {}
+    public enum Level { LOW, HIGH }
+
+    private static int count(String s) { return 0; }
+    void a() {} void b() {}
+}
+"""
+
+_SCAN_PATHS = ("a.ts", "a.js", "a.c", "a.cpp", "A.java", "a.rs")
+
+
+def _all_patterns(ext):
+    patterns = [p for pats in ext._get_declaration_patterns().values() for p in pats]
+    return patterns + list(ext._get_import_patterns())
+
+
+def test_scan_matches_finditer_for_every_pattern():
+    from streamrag.languages.regex_base import RegexExtractor, _anchors, _scan
+    from streamrag.languages.registry import create_default_registry
+
+    registry = create_default_registry()
+    seen = 0
+    for path in _SCAN_PATHS:
+        ext = registry.get_extractor(path)
+        assert isinstance(ext, RegexExtractor)
+        stripped = ext._strip_comments_and_strings(_SCAN_CORPUS)
+        patterns = _all_patterns(ext)
+        assert all(_anchors.get(p) for p in patterns), path  # Every built-in pattern declares anchors
+        for text in (_SCAN_CORPUS, stripped, _SCAN_CORPUS * 3):
+            # All patterns located together, each with finditer's matches
+            got = [[(m.span(), m.groupdict()) for m in ms] for ms in _scan(patterns, text)]
+            expected = [[(m.span(), m.groupdict()) for m in p.finditer(text)] for p in patterns]
+            assert got == expected, path
+        seen += len(patterns)
+    assert seen > 50
+
+
+def test_scan_hands_a_keyword_hit_to_patterns_of_its_prefixes():
+    import re
+    from streamrag.languages.regex_base import anchored, _scan
+
+    short = anchored(re.compile(r'con(?P<name>\w+)'), "con")
+    long = anchored(re.compile(r'constexpr\s+(?P<name>\w+)'), "constexpr")
+    found = _scan([short, long], "constexpr int x; contour")
+    assert [m.group("name") for m in found[0]] == ["stexpr", "tour"]
+    assert [m.group("name") for m in found[1]] == ["int"]
+
+
+def test_extract_identical_with_finditer_baseline(monkeypatch):
+    from streamrag.languages import regex_base
+    from streamrag.languages.registry import create_default_registry
+
+    registry = create_default_registry()
+    fast = {p: registry.get_extractor(p).extract(_SCAN_CORPUS, p) for p in _SCAN_PATHS}
+    names = {e.name for e in fast["a.c"] + fast["A.java"]}
+    assert {"first", "second", "Service.a", "Service.b", "Service.Level"} <= names
+    monkeypatch.setattr(regex_base, "_scan",
+                        lambda patterns, text: [list(p.finditer(text)) for p in patterns])
+    for path in _SCAN_PATHS:
+        assert registry.get_extractor(path).extract(_SCAN_CORPUS, path) == fast[path], path
@@ -2,6 +2,7 @@
 
 import unittest
 
+from streamrag import bridge as bridge_module
 from streamrag.bridge import DeltaGraphBridge
 from streamrag.models import CodeChange
 
@@ -82,6 +83,36 @@ class TestShadowASTIntegration(unittest.TestCase):
         # May or may not extract depending on regex extractor, but should NOT crash
         # and should NOT use ShadowAST (which is Python-only)
 
+    def test_broken_file_keeps_shadow_between_saves(self):
+        """A broken file re-uses its IncrementalShadowAST until it parses again."""
+        bridge = DeltaGraphBridge()
+        body = "".join(f"def f{i}(x):\n    return x\n\n" for i in range(20))
+        first = body + "def typing(x)\n    return x\n"
+        bridge._extract(first, "test.py", shadow_fallback=True)
+        shadow = bridge._shadow_asts["test.py"]
+        second = first.replace("return x\n", "return x +\n", 1)
+        warm = bridge._extract(second, "test.py", shadow_fallback=True)
+        self.assertIs(bridge._shadow_asts["test.py"], shadow)
+        fresh = DeltaGraphBridge()._extract(second, "test.py", shadow_fallback=True)
+        summary = lambda es: sorted((e.name, e.line_start, e.signature_hash) for e in es)
+        self.assertEqual(summary(warm), summary(fresh))
+
+        fixed = body + "def typing(x):\n    return x\n"
+        bridge._extract(fixed, "test.py", shadow_fallback=True)
+        self.assertNotIn("test.py", bridge._shadow_asts)
+
+    def test_shadow_cache_is_bounded(self):
+        """Only the most recently edited broken files keep a ShadowAST."""
+        bridge = DeltaGraphBridge()
+        count = bridge_module.MAX_SHADOW_FILES + 3
+        for i in range(count):
+            bridge._extract("def foo(x)\n    return x\n", f"m{i}.py", shadow_fallback=True)
+        self.assertEqual(len(bridge._shadow_asts), bridge_module.MAX_SHADOW_FILES)
+        self.assertIn(f"m{count - 1}.py", bridge._shadow_asts)
+        self.assertNotIn("m0.py", bridge._shadow_asts)
+        bridge.remove_file(f"m{count - 1}.py")
+        self.assertNotIn(f"m{count - 1}.py", bridge._shadow_asts)
+
 
 class TestParamsExtraction(unittest.TestCase):
     """Test that function parameters are stored in ASTEntity.params."""
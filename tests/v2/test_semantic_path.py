@@ -1,5 +1,6 @@
 """Tests for V2 semantic paths."""
 
+from streamrag.extractor import ASTExtractor
 from streamrag.v2.semantic_path import (
     SemanticPath, ScopeAwareExtractor, find_entity_at_position, resolve_name,
 )
@@ -144,3 +145,31 @@ def test_syntax_error():
     ext = ScopeAwareExtractor()
     paths = ext.extract("def broken(:", "test.py")
     assert paths == []
+
+
+def test_extract_with_entities_shares_hashes():
+    code = (
+        "import os\n\n"
+        "LIMIT = 10\n\n"
+        "class Store(Base):\n"
+        "    def get(self, key, default=None):\n"
+        "        value = os.environ.get(key)\n"
+        "        return value or default\n"
+    )
+    entities, paths = ScopeAwareExtractor("s.py").extract_with_entities(code)
+    assert entities == ASTExtractor().extract(code)
+    by_name = {e.name: e.signature_hash for e in entities}
+    addressed = {(p.scope_chain, p.entity_type, p.name): p for p in paths}
+    assert addressed[((), "class", "Store")].signature_hash == by_name["Store"]
+    assert addressed[(("Store",), "function", "get")].signature_hash == by_name["Store.get"]
+    assert addressed[((), "variable", "LIMIT")].signature_hash == by_name["LIMIT"]
+    assert addressed[((), "import", "os")].signature_hash == by_name["os"]
+    assert (("Store", "get"), "parameter", "default") in addressed
+    assert (("Store", "get"), "variable", "value") in addressed
+    assert all(p.file_path == "s.py" for p in paths)
+
+
+def test_ast_extractor_skips_paths_by_default():
+    ext = ASTExtractor()
+    ext.extract("def foo(x):\n    return x\n")
+    assert ext.paths == []